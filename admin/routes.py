@@ -7,7 +7,7 @@ import os, json
 from collections import defaultdict
 from collections.abc import Mapping, Sequence
 from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
 import datetime as datetime_module
 import io
@@ -66,10 +66,11 @@ from models.database import (
     PlayerDevelopmentPlan,
     Setting,
     SavedStatProfile,
+    IngestJob,
     RecordDefinition,
     RecordEntry,
 )
-from models.database import PageView
+from models.database import PageView, PageViewDaily
 from models.uploaded_file import UploadedFile
 from models.recruit import Recruit, RecruitShotTypeStat
 from models.user import User
@@ -80,7 +81,9 @@ from utils.db_helpers import array_agg_or_group_concat
 from utils.skill_config import shot_map, label_map
 from utils.shottype import (
     compute_3fg_breakdown_from_shots,
+    delete_player_shot_details,
     gather_labels_for_shot,
+    player_stats_label_filter,
     get_player_shottype_3fg_breakdown,
 )
 from test_parse import (
@@ -102,6 +105,16 @@ from services.reports.advanced_possession import (
 # BEGIN Playcall Report
 from services.reports.playcall import invalidate_playcall_report
 # END Playcall Report
+from services.report_cache import get_report_cache
+from services.page_views import get_page_view_writer
+from services.ingest_jobs import (
+    active_jobs,
+    cancel_job,
+    enqueue_job,
+    job_payload,
+    register_job_handler,
+)
+from services.progress import get_progress
 from parse_recruits_csv import parse_recruits_csv
 from stats_config import LEADERBOARD_STATS
 
@@ -175,6 +188,7 @@ def parse_game_type_params(param_source, default_types=DEFAULT_GAME_TYPE_SELECTI
 from utils.leaderboard_helpers import (
     get_player_overall_stats,
     get_on_court_metrics,
+    get_on_off_summaries,
     get_on_off_summary,
     get_turnover_rates_onfloor,
     get_rebound_rates_onfloor,
@@ -190,6 +204,9 @@ from utils.records.stat_keys import (
 )
 from utils.records.candidate_builder import build_game_candidates, get_missing_stat_keys
 from utils.records.evaluator import evaluate_candidates, evaluate_season_candidates
+from utils.records.batch import build_candidates_frame, evaluate_candidates_frame
+from utils.records.current_max import invalidate_current_max
+from utils.records.incremental import evaluate_game_records
 from utils.records.season_candidate_builder import build_season_candidates
 from utils.player_stats_helpers.cooe import get_game_on_off_stats
 from utils.scope import resolve_scope
@@ -223,9 +240,22 @@ from services.leaderboard_game import (
     fetch_pnr_grade_last_game,
     get_season_window,
 )
+from services.stat_rollups import (
+    ensure_season_rollups,
+    rebuild_season_rollups,
+    refresh_game_rollups,
+    refresh_practice_rollups,
+    refresh_rollups,
+    rollup_sum_query,
+)
 from models.eybl import ExternalIdentityMap, IdentitySynonym, UnifiedStats
-from utils.reparse_uploaded_file import reparse_uploaded_file
-from utils.lineup import compute_lineup_totals, format_lineup_efficiencies
+from utils.reparse_uploaded_file import record_parse_fingerprint, reparse_uploaded_file
+from utils.lineup import (
+    format_lineup_efficiencies,
+    game_lineup_accumulator,
+    invalidate_lineup_partials,
+)
+from utils.possession_index import invalidate_possession_index
 
 try:  # Optional CSRF protection – not every deployment wires this up
     from app.extensions import csrf  # type: ignore[attr-defined]
@@ -827,6 +857,39 @@ def compute_leaderboard_for_key(stat_key, rows, shot_details=None):
     return {"rows": leaderboard, "team_totals": team_totals}
 
 
+def _label_filtered_player_sums(season_id, ps_fields, label_set, start_dt=None, end_dt=None):
+    """Sum ``ps_fields`` per player straight from PlayerStats (label filters need the raw rows)."""
+    ps_q = (
+        db.session.query(
+            PlayerStats.player_name.label('player'),
+            *[func.coalesce(func.sum(getattr(PlayerStats, k)), 0).label(k) for k in ps_fields]
+        )
+        .filter(PlayerStats.season_id == season_id)
+    )
+    ps_q = ps_q.filter(player_stats_label_filter(label_set))
+    if start_dt or end_dt:
+        ps_q = (
+            ps_q
+            .outerjoin(Game, PlayerStats.game_id == Game.id)
+            .outerjoin(Practice, PlayerStats.practice_id == Practice.id)
+        )
+        if start_dt:
+            ps_q = ps_q.filter(
+                or_(
+                    and_(PlayerStats.game_id != None, Game.game_date >= start_dt),
+                    and_(PlayerStats.practice_id != None, Practice.date >= start_dt),
+                )
+            )
+        if end_dt:
+            ps_q = ps_q.filter(
+                or_(
+                    and_(PlayerStats.game_id != None, Game.game_date <= end_dt),
+                    and_(PlayerStats.practice_id != None, Practice.date <= end_dt),
+                )
+            )
+    return ps_q.group_by(PlayerStats.player_name).all()
+
+
 def compute_leaderboard(stat_key, season_id, start_dt=None, end_dt=None, label_set=None):
     """Return (config, rows) for the leaderboard.
 
@@ -879,42 +942,16 @@ def compute_leaderboard(stat_key, season_id, start_dt=None, end_dt=None, label_s
     roster_lookup = dict(roster_lookup_rows)
     roster_players = set(roster_lookup)
 
-    ps_q = (
-        db.session.query(
-            PlayerStats.player_name.label('player'),
-            *[func.coalesce(func.sum(getattr(PlayerStats, k)), 0).label(k) for k in ps_fields]
-        )
-        .filter(PlayerStats.season_id == season_id)
-    )
-    if label_set:
-        clauses = []
-        for lbl in label_set:
-            pattern = f"%{lbl}%"
-            clauses.append(PlayerStats.shot_type_details.ilike(pattern))
-            clauses.append(PlayerStats.stat_details.ilike(pattern))
-        ps_q = ps_q.filter(or_(*clauses))
-    if start_dt or end_dt:
-        ps_q = (
-            ps_q
-            .outerjoin(Game, PlayerStats.game_id == Game.id)
-            .outerjoin(Practice, PlayerStats.practice_id == Practice.id)
+    if not label_set:
+        # Unfiltered totals come from the per-day rollups (services.stat_rollups).
+        ensure_season_rollups(season_id)
+        ps_results = rollup_sum_query(
+            season_id, ps_fields, start_date=start_dt, end_date=end_dt
+        ).all()
+    else:
+        ps_results = _label_filtered_player_sums(
+            season_id, ps_fields, label_set, start_dt, end_dt
         )
-        if start_dt:
-            ps_q = ps_q.filter(
-                or_(
-                    and_(PlayerStats.game_id != None, Game.game_date >= start_dt),
-                    and_(PlayerStats.practice_id != None, Practice.date >= start_dt),
-                )
-            )
-        if end_dt:
-            ps_q = ps_q.filter(
-                or_(
-                    and_(PlayerStats.game_id != None, Game.game_date <= end_dt),
-                    and_(PlayerStats.practice_id != None, Practice.date <= end_dt),
-                )
-            )
-    ps_q = ps_q.group_by(PlayerStats.player_name)
-    ps_results = ps_q.all()
 
     bc_fields = [
         'total_blue_collar','reb_tip','def_reb','misc',
@@ -938,12 +975,7 @@ def compute_leaderboard(stat_key, season_id, start_dt=None, end_dt=None, label_s
                 PlayerStats.game_id == BlueCollarStats.game_id,
             ),
         )
-        bc_clauses = []
-        for lbl in label_set:
-            pattern = f"%{lbl}%"
-            bc_clauses.append(PlayerStats.shot_type_details.ilike(pattern))
-            bc_clauses.append(PlayerStats.stat_details.ilike(pattern))
-        bc_q = bc_q.filter(or_(*bc_clauses))
+        bc_q = bc_q.filter(player_stats_label_filter(label_set))
     if start_dt or end_dt:
         bc_q = (
             bc_q
@@ -1141,17 +1173,18 @@ def compute_leaderboard(stat_key, season_id, start_dt=None, end_dt=None, label_s
     candidate_players &= roster_players
 
     extra_rows = {}
+    summaries = get_on_off_summaries(
+        [roster_lookup[p] for p in candidate_players if roster_lookup.get(p)],
+        date_from=start_dt,
+        date_to=end_dt,
+        labels=helper_labels,
+    )
     for player in candidate_players:
         player_id = roster_lookup.get(player)
         if not player_id:
             continue
 
-        summary = get_on_off_summary(
-            player_id=player_id,
-            date_from=start_dt,
-            date_to=end_dt,
-            labels=helper_labels,
-        )
+        summary = summaries[player_id]
         turnover_rates = get_turnover_rates_onfloor(
             player_id=player_id,
             date_from=start_dt,
@@ -1279,12 +1312,7 @@ def compute_leaderboard(stat_key, season_id, start_dt=None, end_dt=None, label_s
         .filter(PlayerStats.season_id == season_id)
     )
     if label_set:
-        s_clauses = []
-        for lbl in label_set:
-            pattern = f"%{lbl}%"
-            s_clauses.append(PlayerStats.shot_type_details.ilike(pattern))
-            s_clauses.append(PlayerStats.stat_details.ilike(pattern))
-        shot_rows = shot_rows.filter(or_(*s_clauses))
+        shot_rows = shot_rows.filter(player_stats_label_filter(label_set))
     if start_dt or end_dt:
         shot_rows = (
             shot_rows
@@ -2536,6 +2564,13 @@ def get_game_field_catalog():
     return jsonify(_group_game_field_catalog())
 
 
+@admin_bp.route('/api/report-cache/stats', methods=['GET'])
+@admin_required
+def get_report_cache_stats():
+    cache = get_report_cache()
+    return jsonify(cache.stats() if cache is not None else {})
+
+
 def _parse_iso_date(value):
     """Return ``date`` parsed from ISO-8601 string or ``None`` when invalid."""
 
@@ -2904,150 +2939,180 @@ def _format_shooting_split(makes, attempts, mode, session_count):
     }
 
 
-def _collect_player_session_stats(roster_entry, source='practice', date_from=None, date_to=None, game_ids=None):
-    """Return aggregated PlayerStats/BlueCollar totals for a roster entry."""
+_SESSION_STAT_FIELDS = (
+    'points',
+    'assists',
+    'turnovers',
+    'foul_by',
+    'atr_makes',
+    'atr_attempts',
+    'fg2_makes',
+    'fg2_attempts',
+    'fg3_makes',
+    'fg3_attempts',
+    'ftm',
+    'fta',
+    'crash_positive',
+    'crash_missed',
+    'back_man_positive',
+    'back_man_missed',
+    'box_out_positive',
+    'box_out_missed',
+    'off_reb_given_up',
+)
 
-    source_value = (source or 'practice').strip().lower()
-    is_game = source_value == 'game'
-    normalized_game_ids = [gid for gid in _parse_int_list(game_ids)] if is_game else []
+_SESSION_BLUE_FIELDS = (
+    'total_blue_collar',
+    'deflection',
+    'charge_taken',
+    'floor_dive',
+    'reb_tip',
+    'misc',
+    'steal',
+    'block',
+    'off_reb',
+    'def_reb',
+)
 
-    ps_query = (
-        PlayerStats.query
-        .filter(
-            PlayerStats.player_name == roster_entry.player_name,
-            PlayerStats.season_id == roster_entry.season_id,
-            (PlayerStats.game_id != None) if is_game else (PlayerStats.practice_id != None),
-        )
-    )
+# extra-average key prefix -> PlayerStats column (skipped when the column is absent)
+_SESSION_EXTRA_FIELDS = {'good_shot': 'good_shot_pct', 'oreb_pct': 'oreb_pct'}
 
-    if is_game and normalized_game_ids:
-        ps_query = ps_query.filter(PlayerStats.game_id.in_(normalized_game_ids))
 
+def _filter_session_window(query, model, is_game, game_ids, date_from, date_to):
+    session_col = model.game_id if is_game else model.practice_id
+    query = query.filter(session_col != None)  # noqa: E711
+    if is_game and game_ids:
+        query = query.filter(model.game_id.in_(game_ids))
     if date_from or date_to:
         if is_game:
-            ps_query = ps_query.join(Game, PlayerStats.game_id == Game.id)
-            if date_from:
-                ps_query = ps_query.filter(Game.game_date >= date_from)
-            if date_to:
-                ps_query = ps_query.filter(Game.game_date <= date_to)
+            query = query.join(Game, model.game_id == Game.id)
+            session_date = Game.game_date
         else:
-            ps_query = ps_query.join(Practice, PlayerStats.practice_id == Practice.id)
-            if date_from:
-                ps_query = ps_query.filter(Practice.date >= date_from)
-            if date_to:
-                ps_query = ps_query.filter(Practice.date <= date_to)
-
-    ps_records = ps_query.all()
-
-    session_ids = {
-        rec.game_id if is_game else rec.practice_id
-        for rec in ps_records
-        if (rec.game_id if is_game else rec.practice_id)
-    }
+            query = query.join(Practice, model.practice_id == Practice.id)
+            session_date = Practice.date
+        if date_from:
+            query = query.filter(session_date >= date_from)
+        if date_to:
+            query = query.filter(session_date <= date_to)
+    return query
 
-    numeric_fields = {
-        'points': 0,
-        'assists': 0,
-        'turnovers': 0,
-        'foul_by': 0,
-        'atr_makes': 0,
-        'atr_attempts': 0,
-        'fg2_makes': 0,
-        'fg2_attempts': 0,
-        'fg3_makes': 0,
-        'fg3_attempts': 0,
-        'ftm': 0,
-        'fta': 0,
-        'crash_positive': 0,
-        'crash_missed': 0,
-        'back_man_positive': 0,
-        'back_man_missed': 0,
-        'box_out_positive': 0,
-        'box_out_missed': 0,
-        'off_reb_given_up': 0,
-    }
 
-    extra_averages = {
-        'good_shot_sum': 0.0,
-        'good_shot_count': 0,
-        'oreb_pct_sum': 0.0,
-        'oreb_pct_count': 0,
-    }
+def _collect_session_stats_for_players(roster_entries, source='practice', date_from=None, date_to=None, game_ids=None):
+    """Return ``{roster_id: aggregates}`` for every roster entry in one pass.
 
-    for rec in ps_records:
-        for field in numeric_fields:
-            numeric_fields[field] += getattr(rec, field, 0) or 0
+    One grouped PlayerStats query and one grouped BlueCollarStats query cover
+    the whole list; each aggregate has the shape the custom stats tables
+    expect (totals, blue, extra, session_count, session_ids).
+    """
 
-        good_pct = getattr(rec, 'good_shot_pct', None)
-        if good_pct is not None:
-            extra_averages['good_shot_sum'] += good_pct
-            extra_averages['good_shot_count'] += 1
+    roster_entries = list(roster_entries)
+    source_value = (source or 'practice').strip().lower()
+    is_game = source_value == 'game'
+    normalized_game_ids = [gid for gid in _parse_int_list(game_ids)] if is_game else []
 
-        oreb_pct = getattr(rec, 'oreb_pct', None)
-        if oreb_pct is not None:
-            extra_averages['oreb_pct_sum'] += oreb_pct
-            extra_averages['oreb_pct_count'] += 1
+    results = {}
+    sessions = {}
+    by_name = {}
+    for entry in roster_entries:
+        results[entry.id] = {
+            'player_name': entry.player_name,
+            'jersey': _extract_jersey_number(entry.player_name),
+            'session_count': 0,
+            'session_ids': [],
+            'totals': {field: 0 for field in _SESSION_STAT_FIELDS},
+            'blue': {field: 0 for field in _SESSION_BLUE_FIELDS},
+            'extra': {
+                'good_shot_sum': 0.0,
+                'good_shot_count': 0,
+                'oreb_pct_sum': 0.0,
+                'oreb_pct_count': 0,
+            },
+        }
+        sessions[entry.id] = set()
+        by_name.setdefault((entry.season_id, entry.player_name), []).append(entry.id)
 
-    bc_query = (
-        BlueCollarStats.query
-        .filter(
-            BlueCollarStats.player_id == roster_entry.id,
-            BlueCollarStats.season_id == roster_entry.season_id,
-            (BlueCollarStats.game_id != None) if is_game else (BlueCollarStats.practice_id != None),
-        )
-    )
+    if not roster_entries:
+        return results
 
-    if is_game and normalized_game_ids:
-        bc_query = bc_query.filter(BlueCollarStats.game_id.in_(normalized_game_ids))
+    season_ids = {entry.season_id for entry in roster_entries}
+    extra_columns = [
+        (key, getattr(PlayerStats, column))
+        for key, column in _SESSION_EXTRA_FIELDS.items()
+        if hasattr(PlayerStats, column)
+    ]
 
-    if date_from or date_to:
-        if is_game:
-            bc_query = bc_query.join(Game, BlueCollarStats.game_id == Game.id)
-            if date_from:
-                bc_query = bc_query.filter(Game.game_date >= date_from)
-            if date_to:
-                bc_query = bc_query.filter(Game.game_date <= date_to)
-        else:
-            bc_query = bc_query.join(Practice, BlueCollarStats.practice_id == Practice.id)
-            if date_from:
-                bc_query = bc_query.filter(Practice.date >= date_from)
-            if date_to:
-                bc_query = bc_query.filter(Practice.date <= date_to)
-
-    blue_records = bc_query.all()
-
-    session_ids.update(
-        rec.game_id if is_game else rec.practice_id
-        for rec in blue_records
-        if (rec.game_id if is_game else rec.practice_id)
-    )
-
-    blue_totals = {
-        'total_blue_collar': 0,
-        'deflection': 0,
-        'charge_taken': 0,
-        'floor_dive': 0,
-        'reb_tip': 0,
-        'misc': 0,
-        'steal': 0,
-        'block': 0,
-        'off_reb': 0,
-        'def_reb': 0,
-    }
+    ps_session = PlayerStats.game_id if is_game else PlayerStats.practice_id
+    ps_query = db.session.query(
+        PlayerStats.season_id,
+        PlayerStats.player_name,
+        ps_session,
+        *[func.coalesce(func.sum(getattr(PlayerStats, field)), 0) for field in _SESSION_STAT_FIELDS],
+        *[
+            expr
+            for _key, column in extra_columns
+            for expr in (func.coalesce(func.sum(column), 0.0), func.count(column))
+        ],
+    ).filter(
+        PlayerStats.season_id.in_(season_ids),
+        PlayerStats.player_name.in_({entry.player_name for entry in roster_entries}),
+    )
+    ps_query = _filter_session_window(
+        ps_query, PlayerStats, is_game, normalized_game_ids, date_from, date_to
+    ).group_by(PlayerStats.season_id, PlayerStats.player_name, ps_session)
+
+    stat_count = len(_SESSION_STAT_FIELDS)
+    for row in ps_query:
+        season_id, player_name, session_id = row[0], row[1], row[2]
+        values = row[3:3 + stat_count]
+        extras = row[3 + stat_count:]
+        for roster_id in by_name.get((season_id, player_name), ()):
+            aggregate = results[roster_id]
+            for field, value in zip(_SESSION_STAT_FIELDS, values):
+                aggregate['totals'][field] += value or 0
+            for index, (key, _column) in enumerate(extra_columns):
+                aggregate['extra'][f'{key}_sum'] += extras[2 * index] or 0.0
+                aggregate['extra'][f'{key}_count'] += extras[2 * index + 1] or 0
+            if session_id:
+                sessions[roster_id].add(session_id)
+
+    bc_session = BlueCollarStats.game_id if is_game else BlueCollarStats.practice_id
+    bc_query = db.session.query(
+        BlueCollarStats.player_id,
+        BlueCollarStats.season_id,
+        bc_session,
+        *[func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0) for field in _SESSION_BLUE_FIELDS],
+    ).filter(BlueCollarStats.player_id.in_(results))
+    bc_query = _filter_session_window(
+        bc_query, BlueCollarStats, is_game, normalized_game_ids, date_from, date_to
+    ).group_by(BlueCollarStats.player_id, BlueCollarStats.season_id, bc_session)
+
+    seasons_by_id = {entry.id: entry.season_id for entry in roster_entries}
+    for row in bc_query:
+        roster_id, season_id, session_id = row[0], row[1], row[2]
+        if seasons_by_id.get(roster_id) != season_id:
+            continue
+        aggregate = results[roster_id]
+        for field, value in zip(_SESSION_BLUE_FIELDS, row[3:]):
+            aggregate['blue'][field] += value or 0
+        if session_id:
+            sessions[roster_id].add(session_id)
 
-    for rec in blue_records:
-        for field in blue_totals:
-            blue_totals[field] += getattr(rec, field, 0) or 0
+    for roster_id, session_ids in sessions.items():
+        results[roster_id]['session_count'] = len(session_ids)
+        results[roster_id]['session_ids'] = sorted(session_ids)
+    return results
 
-    return {
-        'player_name': roster_entry.player_name,
-        'jersey': _extract_jersey_number(roster_entry.player_name),
-        'session_count': len(session_ids),
-        'session_ids': sorted(session_ids),
-        'totals': numeric_fields,
-        'blue': blue_totals,
-        'extra': extra_averages,
-    }
+
+def _collect_player_session_stats(roster_entry, source='practice', date_from=None, date_to=None, game_ids=None):
+    """Return aggregated PlayerStats/BlueCollar totals for a roster entry."""
+
+    return _collect_session_stats_for_players(
+        [roster_entry],
+        source=source,
+        date_from=date_from,
+        date_to=date_to,
+        game_ids=game_ids,
+    )[roster_entry.id]
 
 
 def _build_practice_cells(
@@ -3543,15 +3608,26 @@ def _build_practice_table_dataset(request_data):
     team_off_total = None
     team_def_total = None
 
-    for roster_entry in roster_rows:
-        aggregates = _collect_player_session_stats(
-            roster_entry,
-            source='practice',
+    aggregates_by_player = _collect_session_stats_for_players(
+        roster_rows,
+        source='practice',
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+    onoff_by_player = {}
+    if not isinstance(possessions, Mapping):
+        onoff_by_player = get_on_off_summaries(
+            [r.id for r in roster_rows],
             date_from=date_from,
             date_to=date_to,
+            labels=helper_labels,
         )
 
-        onoff = get_on_off_summary(
+    for roster_entry in roster_rows:
+        aggregates = aggregates_by_player[roster_entry.id]
+
+        onoff = onoff_by_player.get(roster_entry.id) or get_on_off_summary(
             player_id=roster_entry.id,
             date_from=date_from,
             date_to=date_to,
@@ -3749,25 +3825,6 @@ def _build_game_table_dataset(request_data):
     possessions = request_data.get('possessions')
     label_set = _normalize_labels(labels if labels else None)
 
-    game_ids_by_season: dict[int, list[int]] = {}
-
-    def _get_game_ids_for_season(season_id: int) -> list[int]:
-        if season_id in game_ids_by_season:
-            return game_ids_by_season[season_id]
-
-        game_query = Game.query.filter(Game.season_id == season_id)
-
-        if selected_game_ids_set:
-            game_query = game_query.filter(Game.id.in_(selected_game_ids_set))
-
-        if date_from:
-            game_query = game_query.filter(Game.game_date >= date_from)
-        if date_to:
-            game_query = game_query.filter(Game.game_date <= date_to)
-
-        game_ids_by_season[season_id] = [game.id for game in game_query.all()]
-        return game_ids_by_season[season_id]
-
     roster_rows: list[Roster] = []
     if player_ids:
         roster_rows = Roster.query.filter(Roster.id.in_(player_ids)).all()
@@ -3796,16 +3853,35 @@ def _build_game_table_dataset(request_data):
     team_off_total = None
     team_def_total = None
 
-    for roster_entry in roster_rows:
-        game_ids = _get_game_ids_for_season(roster_entry.season_id)
-        aggregates = _collect_player_session_stats(
-            roster_entry,
-            source='game',
-            date_from=date_from,
-            date_to=date_to,
-            game_ids=game_ids,
+    season_ids = {r.season_id for r in roster_rows}
+    game_ids_by_season: dict[int, list[int]] = {season_id: [] for season_id in season_ids}
+    if season_ids:
+        game_query = db.session.query(Game.id, Game.season_id).filter(Game.season_id.in_(season_ids))
+        if selected_game_ids_set:
+            game_query = game_query.filter(Game.id.in_(selected_game_ids_set))
+        if date_from:
+            game_query = game_query.filter(Game.game_date >= date_from)
+        if date_to:
+            game_query = game_query.filter(Game.game_date <= date_to)
+        for game_id, game_season_id in game_query.order_by(Game.id):
+            game_ids_by_season[game_season_id].append(game_id)
+
+    aggregates_by_player: dict[int, dict[str, Any]] = {}
+    for season_id in season_ids:
+        aggregates_by_player.update(
+            _collect_session_stats_for_players(
+                [r for r in roster_rows if r.season_id == season_id],
+                source='game',
+                date_from=date_from,
+                date_to=date_to,
+                game_ids=game_ids_by_season[season_id],
+            )
         )
 
+    for roster_entry in roster_rows:
+        game_ids = game_ids_by_season[roster_entry.season_id]
+        aggregates = aggregates_by_player[roster_entry.id]
+
         onoff = get_game_on_off_stats(game_ids, roster_entry.id)
         reb_rates = get_rebound_rates_onfloor(
             player_id=roster_entry.id,
@@ -4193,19 +4269,27 @@ def correlation_workbench_api():
     if not isinstance(payload, Mapping):
         return jsonify({'error': 'Request payload must be a JSON object'}), 400
 
+    def _is_list(value):
+        return isinstance(value, Sequence) and not isinstance(value, (bytes, str))
+
+    mode = str(payload.get('mode') or 'studies').lower()
     studies = payload.get('studies')
     scope = payload.get('scope')
 
-    if not isinstance(studies, Sequence) or isinstance(studies, (bytes, str)):
-        return jsonify({'error': 'studies must be a non-empty list'}), 400
-    if not studies:
+    if mode not in {'studies', 'matrix'}:
+        return jsonify({'error': f"Unsupported mode '{mode}'"}), 400
+    if mode == 'studies' and (not _is_list(studies) or not studies):
         return jsonify({'error': 'studies must be a non-empty list'}), 400
+    if mode == 'matrix':
+        for field in ('x_metrics', 'y_metrics'):
+            if payload.get(field) is not None and not _is_list(payload.get(field)):
+                return jsonify({'error': f'{field} must be a list'}), 400
     if not isinstance(scope, Mapping):
         return jsonify({'error': 'scope must be a JSON object'}), 400
 
     group_by_value = scope.get('group_by', 'player')
 
-    from services.correlation import Grouping, run_studies
+    from services.correlation import Grouping, run_correlation_matrix, run_studies
 
     try:
         grouping = Grouping(str(group_by_value).lower())
@@ -4223,7 +4307,14 @@ def correlation_workbench_api():
     scope['group_by'] = grouping.value
 
     try:
-        result = run_studies(studies=studies, scope=scope)
+        if mode == 'matrix':
+            result = run_correlation_matrix(
+                scope=scope,
+                x_metrics=payload.get('x_metrics'),
+                y_metrics=payload.get('y_metrics'),
+            )
+        else:
+            result = run_studies(studies=studies, scope=scope)
     except (ValueError, TypeError) as exc:
         return jsonify({'error': str(exc)}), 400
 
@@ -4424,11 +4515,12 @@ def custom_stats_parity():
     date_from = _parse_iso_date(date_from_param)
     date_to = _parse_iso_date(date_to_param)
 
-    aggregates = _collect_player_practice_stats(
-        roster_entry,
+    aggregates = _collect_session_stats_for_players(
+        [roster_entry],
+        source='practice',
         date_from=date_from,
         date_to=date_to,
-    )
+    )[roster_entry.id]
 
     totals = dict(aggregates.get('totals', {}))
     blue_totals = dict(aggregates.get('blue', {}))
@@ -5838,6 +5930,7 @@ def record_entries_create():
     )
     db.session.add(entry)
     db.session.commit()
+    invalidate_current_max(entry.record_definition_id)
     flash("Record entry created.", "success")
     return redirect(url_for('admin.record_entries_list'))
 
@@ -5885,6 +5978,7 @@ def record_entries_update(entry_id: int):
             entry=entry,
         )
 
+    previous_definition_id = entry.record_definition_id
     entry.record_definition_id = definition.id
     entry.holder_entity_type = definition.entity_type
     entry.holder_player_id = (
@@ -5910,6 +6004,7 @@ def record_entries_update(entry_id: int):
     if entry.is_forced_current:
         entry.is_current = True
     db.session.commit()
+    invalidate_current_max(previous_definition_id, entry.record_definition_id)
     flash("Record entry updated.", "success")
     return redirect(url_for('admin.record_entries_list'))
 
@@ -5920,6 +6015,7 @@ def record_entries_toggle_current(entry_id: int):
     entry = RecordEntry.query.get_or_404(entry_id)
     entry.is_current = not entry.is_current
     db.session.commit()
+    invalidate_current_max(entry.record_definition_id)
     state = "current" if entry.is_current else "not current"
     flash(f'Record entry set to {state}.', 'success')
     return redirect(url_for('admin.record_entries_list'))
@@ -5933,6 +6029,7 @@ def record_entries_toggle_forced(entry_id: int):
     if entry.is_forced_current:
         entry.is_current = True
     db.session.commit()
+    invalidate_current_max(entry.record_definition_id)
     state = "forced current" if entry.is_forced_current else "not forced"
     flash(f'Record entry set to {state}.', 'success')
     return redirect(url_for('admin.record_entries_list'))
@@ -5944,11 +6041,65 @@ def record_entries_toggle_active(entry_id: int):
     entry = RecordEntry.query.get_or_404(entry_id)
     entry.is_active = not entry.is_active
     db.session.commit()
+    invalidate_current_max(entry.record_definition_id)
     state = "activated" if entry.is_active else "deactivated"
     flash(f"Record entry {state}.", "success")
     return redirect(url_for('admin.record_entries_list'))
 
 
+def _records_recompute_batch(games, definitions, dry_run, totals, failures):
+    """Recompute every game in one pass; returns per-game rows like the loop does."""
+    per_game = [
+        {
+            "game_date": game.game_date,
+            "opponent_name": game.opponent_name,
+            "candidates_built": 0,
+            "created": 0,
+            "updated": 0,
+            "changed_definitions": None,
+            "status": "OK",
+        }
+        for game in games
+    ]
+    if not games:
+        return per_game
+    stats: dict = {}
+    try:
+        frame = build_candidates_frame([game.id for game in games], definitions)
+        if dry_run:
+            nested = db.session.begin_nested()
+            try:
+                evaluate_candidates_frame(frame, definitions, stats=stats)
+                db.session.flush()
+            finally:
+                if nested.is_active:
+                    nested.rollback()
+        else:
+            evaluate_candidates_frame(frame, definitions, stats=stats)
+            db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        logger.exception("Failed to batch recompute records for %s games", len(games))
+        for game_result in per_game:
+            game_result["status"] = "FAILED"
+        failures.append({"game_id": "all", "opponent_name": "batch recompute", "error": str(exc)})
+        return per_game
+
+    built = frame["game_id"].value_counts().to_dict() if not frame.empty else {}
+    by_game = stats.get("per_game", {})
+    for game, game_result in zip(games, per_game):
+        game_result["candidates_built"] = int(built.get(game.id, 0))
+        game_result["created"] = by_game.get(game.id, {}).get("created", 0)
+        game_result["updated"] = by_game.get(game.id, {}).get("updated", 0)
+
+    totals["total_definitions_evaluated"] = len(definitions) * len(games)
+    totals["total_candidates_built"] = len(frame)
+    totals["total_auto_entries_created"] = stats.get("auto_created", 0)
+    totals["total_auto_entries_updated"] = stats.get("auto_updated", 0)
+    totals["total_definitions_with_current_changes"] = stats.get("definitions_with_current_changes", 0)
+    return per_game
+
+
 @admin_bp.route('/records/recompute', methods=['GET', 'POST'])
 @admin_required
 def records_recompute():
@@ -5958,6 +6109,7 @@ def records_recompute():
         "include_inactive_definitions": False,
         "dry_run": False,
         "limit_games": "",
+        "batch_mode": True,
     }
     errors: dict[str, str] = {}
     results = None
@@ -5968,6 +6120,7 @@ def records_recompute():
         form_data["include_inactive_definitions"] = bool(request.form.get("include_inactive_definitions"))
         form_data["dry_run"] = bool(request.form.get("dry_run"))
         form_data["limit_games"] = (request.form.get("limit_games") or "").strip()
+        form_data["batch_mode"] = bool(request.form.get("batch_mode"))
 
         start_date = None
         end_date = None
@@ -6019,29 +6172,45 @@ def records_recompute():
                 "total_definitions_with_current_changes": 0,
             }
 
-            for game in games:
-                game_result = {
-                    "game_date": game.game_date,
-                    "opponent_name": game.opponent_name,
-                    "candidates_built": 0,
-                    "created": 0,
-                    "updated": 0,
-                    "changed_definitions": 0,
-                    "status": "OK",
-                }
-                try:
-                    candidates = build_game_candidates(
-                        game.id,
-                        include_inactive=include_inactive,
-                        scope="GAME",
-                        definitions=definitions,
-                    )
-                    game_result["candidates_built"] = len(candidates)
-                    stats: dict[str, int] = {}
-
-                    if dry_run:
-                        nested = db.session.begin_nested()
-                        try:
+            if form_data["batch_mode"]:
+                per_game = _records_recompute_batch(games, definitions, dry_run, totals, failures)
+            else:
+                for game in games:
+                    game_result = {
+                        "game_date": game.game_date,
+                        "opponent_name": game.opponent_name,
+                        "candidates_built": 0,
+                        "created": 0,
+                        "updated": 0,
+                        "changed_definitions": 0,
+                        "status": "OK",
+                    }
+                    try:
+                        candidates = build_game_candidates(
+                            game.id,
+                            include_inactive=include_inactive,
+                            scope="GAME",
+                            definitions=definitions,
+                        )
+                        game_result["candidates_built"] = len(candidates)
+                        stats: dict[str, int] = {}
+
+                        if dry_run:
+                            nested = db.session.begin_nested()
+                            try:
+                                evaluate_candidates(
+                                    game_id=game.id,
+                                    candidates=candidates,
+                                    scope="GAME",
+                                    include_inactive=include_inactive,
+                                    definitions=definitions,
+                                    stats=stats,
+                                )
+                                db.session.flush()
+                            finally:
+                                if nested.is_active:
+                                    nested.rollback()
+                        else:
                             evaluate_candidates(
                                 game_id=game.id,
                                 candidates=candidates,
@@ -6050,43 +6219,31 @@ def records_recompute():
                                 definitions=definitions,
                                 stats=stats,
                             )
-                            db.session.flush()
-                        finally:
-                            if nested.is_active:
-                                nested.rollback()
-                    else:
-                        evaluate_candidates(
-                            game_id=game.id,
-                            candidates=candidates,
-                            scope="GAME",
-                            include_inactive=include_inactive,
-                            definitions=definitions,
-                            stats=stats,
+                            db.session.commit()
+
+                        game_result["created"] = stats.get("auto_created", 0)
+                        game_result["updated"] = stats.get("auto_updated", 0)
+                        game_result["changed_definitions"] = stats.get("definitions_with_current_changes", 0)
+
+                        totals["total_definitions_evaluated"] += stats.get("definitions_evaluated", 0)
+                        totals["total_candidates_built"] += game_result["candidates_built"]
+                        totals["total_auto_entries_created"] += game_result["created"]
+                        totals["total_auto_entries_updated"] += game_result["updated"]
+                        totals["total_definitions_with_current_changes"] += game_result["changed_definitions"]
+                    except Exception as exc:
+                        db.session.rollback()
+                        logger.exception("Failed to recompute records for game %s", game.id)
+                        game_result["status"] = "FAILED"
+                        failures.append(
+                            {
+                                "game_id": game.id,
+                                "opponent_name": game.opponent_name,
+                                "error": str(exc),
+                            }
                         )
-                        db.session.commit()
-
-                    game_result["created"] = stats.get("auto_created", 0)
-                    game_result["updated"] = stats.get("auto_updated", 0)
-                    game_result["changed_definitions"] = stats.get("definitions_with_current_changes", 0)
-
-                    totals["total_definitions_evaluated"] += stats.get("definitions_evaluated", 0)
-                    totals["total_candidates_built"] += game_result["candidates_built"]
-                    totals["total_auto_entries_created"] += game_result["created"]
-                    totals["total_auto_entries_updated"] += game_result["updated"]
-                    totals["total_definitions_with_current_changes"] += game_result["changed_definitions"]
-                except Exception as exc:
-                    db.session.rollback()
-                    logger.exception("Failed to recompute records for game %s", game.id)
-                    game_result["status"] = "FAILED"
-                    failures.append(
-                        {
-                            "game_id": game.id,
-                            "opponent_name": game.opponent_name,
-                            "error": str(exc),
-                        }
-                    )
 
-                per_game.append(game_result)
+                    per_game.append(game_result)
+                invalidate_current_max()
 
             logger.info(
                 "Recomputed records for %s games (%s failures)",
@@ -6113,6 +6270,7 @@ def records_recompute():
                 "include_inactive_definitions": include_inactive,
                 "dry_run": dry_run,
                 "limit_games": limit_games,
+                "batch_mode": form_data["batch_mode"],
             }
 
     return render_template(
@@ -6365,173 +6523,268 @@ def upload_file():
     flash("Files uploaded successfully!", "success")
     return redirect(url_for('admin.dashboard', season_id=season_id))
 
-@admin_bp.route('/parse/<int:file_id>', methods=['POST'])
-@admin_required
-def parse_file(file_id):
-    uploaded_file = UploadedFile.query.get_or_404(file_id)
-    filename      = uploaded_file.filename
-    upload_path   = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+def _mark_parse_error(file_id, exc):
+    uploaded_file = db.session.get(UploadedFile, file_id)
+    if uploaded_file is not None:
+        uploaded_file.parse_status = 'Error'
+        uploaded_file.parse_error = str(exc)
+        db.session.commit()
 
-    # 1) Ensure file exists
-    if not os.path.exists(upload_path):
-        flash(f"File '{filename}' not found on server.", "error")
-        return redirect(url_for('admin.files_view_unique'))
 
-    try:
-        current_app.logger.debug(f"Starting parse for file '{filename}' at '{upload_path}'")
+def _parse_uploaded_file(uploaded_file, upload_path, ctx):
+    """Parse ``uploaded_file`` into its practice/recruit/game tables.
 
-        raw_category = uploaded_file.category
-        category = normalize_category(raw_category)
-        if raw_category != category:
-            current_app.logger.info(
-                "Normalizing stored category '%s' -> '%s' during parse", raw_category, category
-            )
-            uploaded_file.category = category
+    Returns a small dict describing what was written, which the parse route
+    turns into the usual flash + redirect once the job has finished.
+    """
+    filename = uploaded_file.filename
+    current_app.logger.debug(f"Starting parse for file '{filename}' at '{upload_path}'")
 
-        # always pick up season from the upload record (or default to latest)
-        season_id = (
-            uploaded_file.season_id
-            or Season.query.order_by(Season.start_date.desc()).first().id
+    raw_category = uploaded_file.category
+    category = normalize_category(raw_category)
+    if raw_category != category:
+        current_app.logger.info(
+            "Normalizing stored category '%s' -> '%s' during parse", raw_category, category
         )
+        uploaded_file.category = category
 
-        # PRACTICE branch
-        if category in ['Summer Workouts', 'Pickup', 'Fall Workouts', 'Official Practice']:
-            parsed_date = _date_from_filename(filename)
-            # use the parsed date if available, otherwise fallback to stored value/today
-            file_date = parsed_date or uploaded_file.file_date or date.today()
-            if parsed_date and uploaded_file.file_date != parsed_date:
-                uploaded_file.file_date = parsed_date
-
-            # Check if a practice for this date already exists
-            practice = Practice.query.filter_by(
-                season_id=season_id,
-                date=file_date,
-            ).first()
+    # always pick up season from the upload record (or default to latest)
+    season_id = (
+        uploaded_file.season_id
+        or Season.query.order_by(Season.start_date.desc()).first().id
+    )
 
-            if not practice:
-                practice = Practice(
-                    season_id=season_id,
-                    date=file_date,
-                    category=category,
-                )
-                db.session.add(practice)
-                db.session.flush()  # ensures practice.id is available
-            else:
-                if practice.category != category:
-                    practice.category = category
+    # PRACTICE branch
+    if category in ['Summer Workouts', 'Pickup', 'Fall Workouts', 'Official Practice']:
+        parsed_date = _date_from_filename(filename)
+        # use the parsed date if available, otherwise fallback to stored value/today
+        file_date = parsed_date or uploaded_file.file_date or date.today()
+        if parsed_date and uploaded_file.file_date != parsed_date:
+            uploaded_file.file_date = parsed_date
 
-                # Existing practice: clear any previously parsed stats so we can re-parse
-                PlayerStats.query.filter_by(practice_id=practice.id).delete()
-                BlueCollarStats.query.filter_by(practice_id=practice.id).delete()
-                db.session.flush()
+        # Check if a practice for this date already exists
+        practice = Practice.query.filter_by(
+            season_id=season_id,
+            date=file_date,
+        ).first()
 
-            # 2b) parse into your practice tables
-            results = parse_practice_csv(
-                upload_path,
+        if not practice:
+            practice = Practice(
                 season_id=season_id,
+                date=file_date,
                 category=category,
-                file_date=file_date,
             )
+            db.session.add(practice)
+            db.session.flush()  # ensures practice.id is available
+        else:
+            if practice.category != category:
+                practice.category = category
 
-            raw_lineups = results.get('lineup_efficiencies', {})
-            json_lineups = format_lineup_efficiencies(raw_lineups)
+            # Existing practice: clear any previously parsed stats so we can re-parse
+            ctx.progress(10, "Clearing previous stats")
+            delete_player_shot_details(PlayerStats.practice_id == practice.id)
+            PlayerStats.query.filter_by(practice_id=practice.id).delete()
+            BlueCollarStats.query.filter_by(practice_id=practice.id).delete()
+            db.session.flush()
 
-            uploaded_file.lineup_efficiencies = json.dumps(json_lineups)
-            uploaded_file.player_on_off = json.dumps(results.get('player_on_off', {}))
+        # 2b) parse into your practice tables
+        ctx.progress(25, "Parsing practice CSV")
+        results = parse_practice_csv(
+            upload_path,
+            season_id=season_id,
+            category=category,
+            file_date=file_date,
+        )
 
-            # 3) mark the upload as parsed
-            uploaded_file.parse_status = 'Parsed Successfully'
-            uploaded_file.last_parsed  = datetime.utcnow()
-            db.session.commit()
+        raw_lineups = results.get('lineup_efficiencies', {})
+        json_lineups = format_lineup_efficiencies(raw_lineups)
 
-            flash("Practice parsed successfully! You can now edit it.", "success")
-            return redirect(
-                url_for('admin.edit_practice',
-                        practice_id=practice.id,
-                        season_id=season_id)
-            )
+        uploaded_file.lineup_efficiencies = json.dumps(json_lineups)
+        uploaded_file.player_on_off = json.dumps(results.get('player_on_off', {}))
 
-        # RECRUIT branch
-        elif uploaded_file.category == 'Recruit':
-            parse_recruits_csv(upload_path, uploaded_file.recruit_id)
-            uploaded_file.parse_status = 'Parsed Successfully'
-            uploaded_file.last_parsed = datetime.utcnow()
-            db.session.commit()
+        # 3) mark the upload as parsed
+        uploaded_file.parse_status = 'Parsed Successfully'
+        uploaded_file.last_parsed  = datetime.utcnow()
+        record_parse_fingerprint(uploaded_file, upload_path)
+        db.session.commit()
+        return {'target': 'practice', 'practice_id': practice.id, 'season_id': season_id}
+
+    # RECRUIT branch
+    if uploaded_file.category == 'Recruit':
+        ctx.progress(25, "Parsing recruit CSV")
+        parse_recruits_csv(upload_path, uploaded_file.recruit_id)
+        uploaded_file.parse_status = 'Parsed Successfully'
+        uploaded_file.last_parsed = datetime.utcnow()
+        db.session.commit()
+        return {'target': 'recruit', 'recruit_id': uploaded_file.recruit_id}
 
-            flash('Recruit file parsed successfully!', 'success')
-            return redirect(url_for('recruits.detail_recruit', id=uploaded_file.recruit_id))
+    # GAME branch
+    # 2c) run your existing game parser
+    ctx.progress(25, "Parsing game CSV")
+    parse_csv_params = inspect.signature(parse_csv).parameters
+    # Reuse the worker's app instead of letting the parser build its own.
+    parse_kwargs = {"app": ctx.app} if "app" in parse_csv_params else {}
+    if "file_date" in parse_csv_params:
+        results = parse_csv(upload_path, None, season_id, uploaded_file.file_date, **parse_kwargs)
+    else:
+        results = parse_csv(upload_path, None, season_id, **parse_kwargs)
 
-        # GAME branch
-        else:
-            # 2c) run your existing game parser
-            parse_csv_params = inspect.signature(parse_csv).parameters
-            if "file_date" in parse_csv_params:
-                results = parse_csv(upload_path, None, season_id, uploaded_file.file_date)
-            else:
-                results = parse_csv(upload_path, None, season_id)
-
-            # 2d) JSON-ify the lineup efficiencies
-            raw_lineups = results.get('lineup_efficiencies', {})
-            json_lineups = format_lineup_efficiencies(raw_lineups)
-
-            # 3) update UploadedFile with breakdowns + status
-            uploaded_file.parse_status        = 'Parsed Successfully'
-            uploaded_file.last_parsed         = datetime.utcnow()
-            uploaded_file.offensive_breakdown = json.dumps({
-                "possession_type": results.get('offensive_breakdown', {}),
-                "periodic": results.get('periodic_offense', {}),
-                "shot_clock": results.get('shot_clock_offense', {}),
-                "possession_start": results.get('possession_start_offense', {}),
-                "paint_touches": results.get('paint_touches_offense', {}),
-                "shot_clock_pt": results.get('shot_clock_pt_offense', {}),
-            })
-            uploaded_file.defensive_breakdown = json.dumps({
-                "possession_type": results.get('defensive_breakdown', {}),
-                "periodic": results.get('periodic_defense', {}),
-                "shot_clock": results.get('shot_clock_defense', {}),
-                "possession_start": results.get('possession_start_defense', {}),
-                "paint_touches": results.get('paint_touches_defense', {}),
-                "shot_clock_pt": results.get('shot_clock_pt_defense', {}),
-            })
-            uploaded_file.lineup_efficiencies = json.dumps(json_lineups)
-            db.session.commit()
+    # 2d) JSON-ify the lineup efficiencies
+    raw_lineups = results.get('lineup_efficiencies', {})
+    json_lineups = format_lineup_efficiencies(raw_lineups)
 
-            # 4) redirect into your game editor
-            game = Game.query.filter_by(csv_filename=filename).first()
-            if not game:
-                flash(
-                    f"Parsed OK but couldn’t find Game record for '{filename}'",
-                    "warning"
-                )
-                return redirect(url_for('admin.dashboard'))
+    # 3) update UploadedFile with breakdowns + status
+    uploaded_file.parse_status        = 'Parsed Successfully'
+    uploaded_file.last_parsed         = datetime.utcnow()
+    record_parse_fingerprint(uploaded_file, upload_path)
+    uploaded_file.offensive_breakdown = json.dumps({
+        "possession_type": results.get('offensive_breakdown', {}),
+        "periodic": results.get('periodic_offense', {}),
+        "shot_clock": results.get('shot_clock_offense', {}),
+        "possession_start": results.get('possession_start_offense', {}),
+        "paint_touches": results.get('paint_touches_offense', {}),
+        "shot_clock_pt": results.get('shot_clock_pt_offense', {}),
+    })
+    uploaded_file.defensive_breakdown = json.dumps({
+        "possession_type": results.get('defensive_breakdown', {}),
+        "periodic": results.get('periodic_defense', {}),
+        "shot_clock": results.get('shot_clock_defense', {}),
+        "possession_start": results.get('possession_start_defense', {}),
+        "paint_touches": results.get('paint_touches_defense', {}),
+        "shot_clock_pt": results.get('shot_clock_pt_defense', {}),
+    })
+    uploaded_file.lineup_efficiencies = json.dumps(json_lineups)
+    db.session.commit()
 
-            try:
-                candidates = build_game_candidates(game.id)
-                evaluate_candidates(game.id, candidates)
-                db.session.commit()
-            except Exception:
-                db.session.rollback()
-                current_app.logger.exception(
-                    "Failed to update game records after parse for game %s",
-                    game.id,
-                )
+    game = Game.query.filter_by(csv_filename=filename).first()
+    if not game:
+        return {'target': 'game', 'game_id': None}
+
+    ctx.progress(85, "Updating records")
+    try:
+        evaluate_game_records(game.id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        invalidate_current_max()
+        current_app.logger.exception(
+            "Failed to update game records after parse for game %s",
+            game.id,
+        )
+    return {'target': 'game', 'game_id': game.id}
 
-            flash(
-                f"File '{filename}' parsed successfully! You can now edit the game.",
-                "success"
-            )
-            return redirect(url_for('admin.edit_game', game_id=game.id))
 
+def _run_parse_job(ctx):
+    uploaded_file = db.session.get(UploadedFile, ctx.job.file_id)
+    if uploaded_file is None:
+        raise LookupError(f"Uploaded file {ctx.job.file_id} no longer exists.")
+    upload_path = os.path.join(current_app.config['UPLOAD_FOLDER'], uploaded_file.filename)
+    try:
+        return _parse_uploaded_file(uploaded_file, upload_path, ctx)
     except Exception as e:
         # on error, record it and flip status
         current_app.logger.exception("Error parsing CSV")
-        uploaded_file.parse_status = 'Error'
-        uploaded_file.parse_error  = str(e)
-        db.session.commit()
+        db.session.rollback()
+        _mark_parse_error(ctx.job.file_id, e)
+        raise
+
 
-        flash(f"Parsing failed for '{filename}': {e}", "error")
+def _run_reparse_job(ctx):
+    uploaded_file = db.session.get(UploadedFile, ctx.job.file_id)
+    if uploaded_file is None:
+        raise LookupError(f"Uploaded file {ctx.job.file_id} no longer exists.")
+    ctx.progress(10, f"Reparsing {uploaded_file.filename}")
+    try:
+        result = reparse_uploaded_file(uploaded_file, force=bool(ctx.payload.get('force')))
+    except Exception as e:
+        current_app.logger.exception('Error re-parsing CSV')
+        db.session.rollback()
+        _mark_parse_error(ctx.job.file_id, e)
+        raise
+    return {'file_id': ctx.job.file_id, 'skipped': bool(result and result.get('skipped'))}
+
+
+def _run_bulk_reparse_job(ctx):
+    file_ids = [int(fid) for fid in ctx.payload.get('file_ids', [])]
+    files = UploadedFile.query.filter(UploadedFile.id.in_(file_ids)).order_by(UploadedFile.id).all()
+    success_count = 0
+    skipped_count = 0
+    failure_reasons: list[str] = []
+    for index, file in enumerate(files):
+        # Each file commits on its own, so stopping between files is safe.
+        ctx.raise_if_cancelled()
+        ctx.progress(index * 100 // len(files), f"Reparsing {file.filename} ({index + 1}/{len(files)})")
+        try:
+            result = reparse_uploaded_file(file, force=bool(ctx.payload.get('force')))
+            if result and result.get('skipped'):
+                skipped_count += 1
+            else:
+                success_count += 1
+        except Exception as e:
+            current_app.logger.exception('Error re-parsing CSV')
+            db.session.rollback()
+            _mark_parse_error(file.id, e)
+            failure_reasons.append(str(e))
+    return {'succeeded': success_count, 'skipped': skipped_count, 'failures': failure_reasons}
+
+
+register_job_handler('parse', _run_parse_job)
+register_job_handler('reparse', _run_reparse_job)
+register_job_handler('bulk_reparse', _run_bulk_reparse_job)
+
+
+def _flash_job_queued(job, what):
+    if job.status == 'cancelled':
+        flash(f"{what} was cancelled.", 'warning')
+    else:
+        flash(f"{what} is running in the background (job #{job.id}).", 'info')
+
+
+@admin_bp.route('/parse/<int:file_id>', methods=['POST'])
+@admin_required
+def parse_file(file_id):
+    uploaded_file = UploadedFile.query.get_or_404(file_id)
+    filename      = uploaded_file.filename
+    upload_path   = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+
+    # 1) Ensure file exists
+    if not os.path.exists(upload_path):
+        flash(f"File '{filename}' not found on server.", "error")
+        return redirect(url_for('admin.files_view_unique'))
+
+    job = enqueue_job('parse', file_id=file_id, created_by=current_user.id)
+    if job.status == 'failed':
+        flash(f"Parsing failed for '{filename}': {job.error}", "error")
+        return redirect(url_for('admin.files_view_unique'))
+    if job.status != 'succeeded':
+        _flash_job_queued(job, f"Parsing '{filename}'")
         return redirect(url_for('admin.files_view_unique'))
 
+    result = json.loads(job.result)
+    if result['target'] == 'practice':
+        flash("Practice parsed successfully! You can now edit it.", "success")
+        return redirect(
+            url_for('admin.edit_practice',
+                    practice_id=result['practice_id'],
+                    season_id=result['season_id'])
+        )
+    if result['target'] == 'recruit':
+        flash('Recruit file parsed successfully!', 'success')
+        return redirect(url_for('recruits.detail_recruit', id=result['recruit_id']))
+
+    # 4) redirect into your game editor
+    if not result['game_id']:
+        flash(
+            f"Parsed OK but couldn’t find Game record for '{filename}'",
+            "warning"
+        )
+        return redirect(url_for('admin.dashboard'))
+    flash(
+        f"File '{filename}' parsed successfully! You can now edit the game.",
+        "success"
+    )
+    return redirect(url_for('admin.edit_game', game_id=result['game_id']))
+
 
 def _reparse_uploaded_game(uploaded_file, upload_path):
     """Helper to re-parse a game file and refresh derived data."""
@@ -6566,6 +6819,7 @@ def _reparse_uploaded_game(uploaded_file, upload_path):
     # END Playcall Report
 
     TeamStats.query.filter_by(game_id=game.id).delete()
+    delete_player_shot_details(PlayerStats.game_id == game.id)
     PlayerStats.query.filter_by(game_id=game.id).delete()
     BlueCollarStats.query.filter_by(game_id=game.id).delete()
     OpponentBlueCollarStats.query.filter_by(game_id=game.id).delete()
@@ -6584,10 +6838,13 @@ def _reparse_uploaded_game(uploaded_file, upload_path):
     db.session.commit()
 
     parse_csv_params = inspect.signature(parse_csv).parameters
+    parse_kwargs = (
+        {"app": current_app._get_current_object()} if "app" in parse_csv_params else {}
+    )
     if "file_date" in parse_csv_params:
-        results = parse_csv(upload_path, None, season_id, uploaded_file.file_date)
+        results = parse_csv(upload_path, None, season_id, uploaded_file.file_date, **parse_kwargs)
     else:
-        results = parse_csv(upload_path, None, season_id)
+        results = parse_csv(upload_path, None, season_id, **parse_kwargs)
 
     raw_lineups = results.get("lineup_efficiencies", {})
     json_lineups = format_lineup_efficiencies(raw_lineups)
@@ -6616,11 +6873,11 @@ def _reparse_uploaded_game(uploaded_file, upload_path):
     db.session.commit()
 
     try:
-        candidates = build_game_candidates(game.id)
-        evaluate_candidates(game.id, candidates)
+        evaluate_game_records(game.id)
         db.session.commit()
     except Exception:
         db.session.rollback()
+        invalidate_current_max()
         current_app.logger.exception(
             "Failed to update game records after reparse for game %s",
             game.id,
@@ -6665,6 +6922,7 @@ def _reparse_uploaded_practice(uploaded_file, upload_path):
         # END Advanced Possession
         if practice.category != category:
             practice.category = category
+        delete_player_shot_details(PlayerStats.practice_id == practice.id)
         PlayerStats.query.filter_by(practice_id=practice.id).delete()
         BlueCollarStats.query.filter_by(practice_id=practice.id).delete()
         poss_ids = [p.id for p in Possession.query.filter_by(practice_id=practice.id).all()]
@@ -6707,22 +6965,53 @@ def reparse_file(file_id):
     """Re-parse a previously uploaded CSV without removing the file."""
     uploaded_file = UploadedFile.query.get_or_404(file_id)
 
-    try:
-        reparse_uploaded_file(uploaded_file)
+    job = enqueue_job(
+        'reparse',
+        file_id=file_id,
+        payload={'force': True} if request.form.get('force') else None,
+        created_by=current_user.id,
+    )
+    if job.status == 'succeeded' and json.loads(job.result).get('skipped'):
+        flash("File is unchanged since its last parse; nothing to re-parse.", "info")
+    elif job.status == 'succeeded':
         flash("File re-parsed successfully!", "success")
-    except Exception as e:
-        current_app.logger.exception('Error re-parsing CSV')
-        uploaded_file.parse_status = 'Error'
-        uploaded_file.parse_error = str(e)
-        db.session.commit()
+    elif job.status == 'failed':
         flash(
-            f"Re-parsing failed for '{uploaded_file.filename}': {e}",
+            f"Re-parsing failed for '{uploaded_file.filename}': {job.error}",
             'error',
         )
+    else:
+        _flash_job_queued(job, f"Re-parsing '{uploaded_file.filename}'")
 
     return redirect(url_for('admin.files_view_unique'))
 
 
+@admin_bp.route('/jobs', methods=['GET'])
+@admin_required
+def ingest_jobs_status():
+    """JSON list of queued/running ingest jobs for polling."""
+    jobs = active_jobs()
+    return jsonify([job_payload(job, get_progress(job.progress_key)) for job in jobs])
+
+
+@admin_bp.route('/jobs/<int:job_id>', methods=['GET'])
+@admin_required
+def ingest_job_status(job_id):
+    job = db.session.get(IngestJob, job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job_payload(job, get_progress(job.progress_key)))
+
+
+@admin_bp.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+@admin_required
+def cancel_ingest_job(job_id):
+    job = cancel_job(job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job_payload(job, get_progress(job.progress_key)))
+
+
 
 @admin_bp.route('/logs/<int:file_id>', methods=['GET'])
 @admin_required
@@ -6778,6 +7067,7 @@ def delete_data(file_id):
             if practice.category != category:
                 practice.category = category
             TeamStats.query.filter_by(practice_id=practice.id).delete()
+            delete_player_shot_details(PlayerStats.practice_id == practice.id)
             PlayerStats.query.filter_by(practice_id=practice.id).delete()
             BlueCollarStats.query.filter_by(practice_id=practice.id).delete()
             OpponentBlueCollarStats.query.filter_by(practice_id=practice.id).delete()
@@ -6785,6 +7075,7 @@ def delete_data(file_id):
             if poss_ids:
                 PlayerPossession.query.filter(PlayerPossession.possession_id.in_(poss_ids)).delete(synchronize_session=False)
             Possession.query.filter_by(practice_id=practice.id).delete()
+            refresh_practice_rollups(practice)
             db.session.delete(practice)
     elif is_recruit:
         RecruitShotTypeStat.query.filter_by(recruit_id=uploaded_file.recruit_id).delete()
@@ -6798,6 +7089,7 @@ def delete_data(file_id):
             invalidate_playcall_report(game.id)
             # END Playcall Report
             TeamStats.query.filter_by(game_id=game.id).delete()
+            delete_player_shot_details(PlayerStats.game_id == game.id)
             PlayerStats.query.filter_by(game_id=game.id).delete()
             BlueCollarStats.query.filter_by(game_id=game.id).delete()
             OpponentBlueCollarStats.query.filter_by(game_id=game.id).delete()
@@ -6805,6 +7097,7 @@ def delete_data(file_id):
             if poss_ids:
                 PlayerPossession.query.filter(PlayerPossession.possession_id.in_(poss_ids)).delete(synchronize_session=False)
             Possession.query.filter_by(game_id=game.id).delete()
+            refresh_game_rollups(game)
             db.session.delete(game)
 
     # Remove the upload record
@@ -6848,27 +7141,30 @@ def bulk_action_view():
         memory_file.seek(0)
         return send_file(memory_file, download_name="downloaded_files.zip", as_attachment=True)
     elif action == 'reparse':
-        success_count = 0
-        failure_reasons: list[str] = []
-        for file in files:
-            try:
-                reparse_uploaded_file(file)
-                success_count += 1
-            except Exception as e:
-                current_app.logger.exception('Error re-parsing CSV')
-                file.parse_status = 'Error'
-                file.parse_error = str(e)
-                db.session.commit()
-                failure_reasons.append(str(e))
-
+        job = enqueue_job(
+            'bulk_reparse',
+            payload={'file_ids': [file.id for file in files], 'force': bool(request.form.get('force'))},
+            created_by=current_user.id,
+        )
+        if job.status == 'failed':
+            flash(f"Bulk reparse failed: {job.error}", "error")
+            return redirect(url_for('admin.files_view_unique'))
+        if job.status != 'succeeded':
+            _flash_job_queued(job, f"Reparsing {len(files)} files")
+            return redirect(url_for('admin.files_view_unique'))
+
+        result = json.loads(job.result)
+        success_count = result['succeeded']
+        failure_reasons = result['failures']
+        skipped_text = f", {result['skipped']} unchanged" if result.get('skipped') else ""
         if failure_reasons:
             reason_text = "; ".join(sorted(set(failure_reasons)))
             flash(
-                f"Reparsed {success_count} files, {len(failure_reasons)} failed ({reason_text}).",
+                f"Reparsed {success_count} files{skipped_text}, {len(failure_reasons)} failed ({reason_text}).",
                 "error",
             )
         else:
-            flash(f"Reparsed {success_count} files.", "success")
+            flash(f"Reparsed {success_count} files{skipped_text}.", "success")
 
     return redirect(url_for('admin.files_view_unique'))
 
@@ -7326,42 +7622,8 @@ def game_stats(game_id):
         lineup_min_poss = 0
     most_used_lineups_offense = {size: [] for size in lineup_group_sizes}
     most_used_lineups_defense = {size: [] for size in lineup_group_sizes}
-    lineup_possessions_query = (
-        db.session.query(
-            Possession.id.label('possession_id'),
-            Possession.points_scored,
-            Possession.time_segment,
-            Possession.possession_side,
-            Roster.player_name,
-        )
-        .join(PlayerPossession, PlayerPossession.possession_id == Possession.id)
-        .join(Roster, Roster.id == PlayerPossession.player_id)
-        .filter(Possession.game_id == game_id)
-    )
-    lineup_possession_map: dict[int, dict[str, Any]] = {}
-    for row in lineup_possessions_query.all():
-        entry = lineup_possession_map.setdefault(
-            row.possession_id,
-            {
-                "side": row.time_segment or row.possession_side or "",
-                "points_scored": row.points_scored or 0,
-                "players_on_floor": set(),
-            },
-        )
-        entry["players_on_floor"].add(row.player_name)
-    lineup_possession_data = [
-        {
-            "side": entry["side"],
-            "points_scored": entry["points_scored"],
-            "players_on_floor": sorted(entry["players_on_floor"]),
-        }
-        for entry in lineup_possession_map.values()
-    ]
-    lineup_player_set = {
-        player
-        for entry in lineup_possession_data
-        for player in entry["players_on_floor"]
-    }
+    lineup_accumulator = game_lineup_accumulator([game_id], group_sizes=lineup_group_sizes)
+    lineup_player_set = set(lineup_accumulator.players)
     if not lineup_player_set:
         lineup_player_set.update(
             player.player_name
@@ -7371,10 +7633,7 @@ def game_stats(game_id):
     lineup_player_lookup = {player.casefold(): player for player in lineup_players}
     lineup_player_raw = (request.args.get('lineup_player') or '').strip()
     lineup_player = lineup_player_lookup.get(lineup_player_raw.casefold())
-    lineup_totals = compute_lineup_totals(
-        lineup_possession_data,
-        group_sizes=lineup_group_sizes,
-    )
+    lineup_totals = lineup_accumulator.totals()
     for size in lineup_group_sizes:
         sides = lineup_totals.get(size, {})
         offense_entries = [
@@ -7625,6 +7884,7 @@ def edit_game(game_id):
     game = Game.query.get_or_404(game_id)  # load the game record
     if request.method == 'POST':
         try:
+            previous_date = game.game_date
             date_str = request.form.get('game_date')
             if date_str:
                 from datetime import datetime
@@ -7653,6 +7913,13 @@ def edit_game(game_id):
             ordered_types = [option for option in GAME_TYPE_OPTIONS if option in selected_types]
             game.game_types = ordered_types
 
+            if game.game_date != previous_date:
+                # The per-day rollups are keyed by date; move the game's rows.
+                db.session.flush()
+                refresh_rollups(game.season_id, "game", previous_date)
+                refresh_rollups(game.season_id, "game", game.game_date)
+                invalidate_possession_index(game.season_id)
+
             db.session.commit()
             flash("Game updated successfully!", "success")
             return redirect(url_for('admin.game_reports'))
@@ -9390,7 +9657,11 @@ def rename_roster(roster_id):
             {User.player_name: new_name}, synchronize_session=False
         )
 
+        rebuild_season_rollups(season_id)
+
         db.session.commit()
+        # Cached lineup partials carry player names, not roster ids.
+        invalidate_lineup_partials()
     except IntegrityError:
         db.session.rollback()
         return redirect(
@@ -10297,40 +10568,10 @@ def team_totals():
             season_id, start_dt, end_dt, selected_game_types
         )
 
-        lineup_possessions_query = (
-            db.session.query(
-                Possession.id.label('possession_id'),
-                Possession.points_scored,
-                Possession.time_segment,
-                Possession.possession_side,
-                Roster.player_name,
-            )
-            .join(PlayerPossession, PlayerPossession.possession_id == Possession.id)
-            .join(Roster, Roster.id == PlayerPossession.player_id)
-            .filter(Possession.game_id != None)
-            .filter(Possession.game_id.in_(game_ids_for_totals))
-        )
-        if season_id:
-            lineup_possessions_query = lineup_possessions_query.filter(Possession.season_id == season_id)
-
-        lineup_possession_map: dict[int, dict[str, Any]] = {}
-        lineup_players_set: set[str] = set()
-        for row in lineup_possessions_query.all():
-            entry = lineup_possession_map.setdefault(
-                row.possession_id,
-                {
-                    "side": row.time_segment or row.possession_side or "",
-                    "points_scored": row.points_scored or 0,
-                    "players_on_floor": set(),
-                },
-            )
-            if row.player_name:
-                player_name = str(row.player_name).strip()
-                if player_name:
-                    entry["players_on_floor"].add(player_name)
-                    lineup_players_set.add(player_name)
+        lineup_game_ids = [gid for (gid,) in game_ids_for_totals.all()]
+        lineup_accumulator = game_lineup_accumulator(lineup_game_ids, group_sizes=lineup_group_sizes)
 
-        lineup_players = sorted(lineup_players_set, key=lambda name: name.lower())
+        lineup_players = sorted(lineup_accumulator.players, key=lambda name: name.lower())
         normalized_lineup_players = {
             _normalize_lineup_player_name(name): name for name in lineup_players
         }
@@ -10339,18 +10580,7 @@ def team_totals():
             lineup_player_normalized = requested_lineup_player
             lineup_player = normalized_lineup_players[requested_lineup_player]
 
-        lineup_possession_data = [
-            {
-                "side": entry["side"],
-                "points_scored": entry["points_scored"],
-                "players_on_floor": sorted(entry["players_on_floor"]),
-            }
-            for entry in lineup_possession_map.values()
-        ]
-        lineup_totals = compute_lineup_totals(
-            lineup_possession_data,
-            group_sizes=lineup_group_sizes,
-        )
+        lineup_totals = lineup_accumulator.totals()
 
         def _lineup_has_player(lineup: Sequence[str]) -> bool:
             if not lineup_player_normalized:
@@ -12324,6 +12554,18 @@ def leaderboard():
     )
 
 
+def _page_view_daily_query(start, end):
+    """``PageViewDaily`` rows between two inclusive ISO dates (either optional)."""
+    query = PageViewDaily.query
+    start_day = _parse_iso_date(start)
+    end_day = _parse_iso_date(end)
+    if start_day:
+        query = query.filter(PageViewDaily.day >= start_day)
+    if end_day:
+        query = query.filter(PageViewDaily.day <= end_day)
+    return query
+
+
 @admin_bp.route('/usage')
 @login_required
 @admin_required
@@ -12332,20 +12574,17 @@ def usage_report():
         abort(403)
     start = request.args.get('start_date')
     end = request.args.get('end_date')
-    query = PageView.query
-    if start:
-        query = query.filter(PageView.timestamp >= start)
-    if end:
-        query = query.filter(PageView.timestamp <= end)
+    get_page_view_writer().flush()
+    query = _page_view_daily_query(start, end)
     user_stats = (
-        query.outerjoin(User, PageView.user_id == User.id)
-        .with_entities(User.id, User.username, db.func.count(PageView.id))
+        query.outerjoin(User, PageViewDaily.user_id == User.id)
+        .with_entities(User.id, User.username, db.func.sum(PageViewDaily.views))
         .group_by(User.id, User.username)
         .all()
     )
     page_stats = (
-        query.with_entities(PageView.endpoint, db.func.count(PageView.id))
-        .group_by(PageView.endpoint)
+        query.with_entities(PageViewDaily.endpoint, db.func.sum(PageViewDaily.views))
+        .group_by(PageViewDaily.endpoint)
         .all()
     )
     return render_template(
@@ -12367,15 +12606,20 @@ def user_usage_report(user_id):
     start = request.args.get('start_date')
     end = request.args.get('end_date')
     user = User.query.get_or_404(user_id)
+    get_page_view_writer().flush()
+    start_day = _parse_iso_date(start)
+    end_day = _parse_iso_date(end)
     query = PageView.query.filter(PageView.user_id == user_id)
-    if start:
-        query = query.filter(PageView.timestamp >= start)
-    if end:
-        query = query.filter(PageView.timestamp <= end)
+    if start_day:
+        query = query.filter(PageView.timestamp >= start_day)
+    if end_day:
+        query = query.filter(PageView.timestamp < end_day + timedelta(days=1))
     logs = query.order_by(PageView.timestamp.desc()).all()
     page_counts = (
-        query.with_entities(PageView.endpoint, db.func.count(PageView.id))
-        .group_by(PageView.endpoint)
+        _page_view_daily_query(start, end)
+        .filter(PageViewDaily.user_id == user_id)
+        .with_entities(PageViewDaily.endpoint, db.func.sum(PageViewDaily.views))
+        .group_by(PageViewDaily.endpoint)
         .all()
     )
     return render_template(
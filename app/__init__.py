@@ -3,24 +3,23 @@ import json
 from flask import Flask, redirect, url_for, render_template, request, flash
 from flask.json.provider import DefaultJSONProvider
 from types import SimpleNamespace
-from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, current_user
-from flask_migrate import Migrate
-from flask_apscheduler import APScheduler
 from flask.cli import with_appcontext
 from sqlalchemy import inspect
-import pdfkit
 
 from datetime import datetime, date
 from typing import Optional
-from models.database import db, PageView, SavedStatProfile
+from models.database import db, SavedStatProfile
 from models.user import User
-from admin.routes import admin_bp
 from utils.auth import PLAYER_ALLOWED_ENDPOINTS
 from app.utils.schema import ensure_columns
 from app.utils.formatting import fmt_money, posneg_class
 from app.grades import grade_scale, grade_token
-from app.csv_pipeline.routes import csv_pipeline_bp
+from services.page_views import record_page_view
+
+# Blueprints (admin.routes alone is ~13k lines), pdfkit, APScheduler and
+# Flask-Migrate are imported inside ``create_app`` or on first use so that
+# ``create_app(lightweight=True)`` for CLI/ingest work never loads them.
 
 # Allow JSON serialization of SimpleNamespace values across all Flask apps
 _orig_json_default = DefaultJSONProvider.default
@@ -30,12 +29,8 @@ def _ns_default(self, obj):
     return _orig_json_default(self, obj)
 DefaultJSONProvider.default = _ns_default
 
-scheduler = APScheduler()
+scheduler = None
 
-try:
-    PDFKIT_CONFIG = pdfkit.configuration()
-except OSError:
-    PDFKIT_CONFIG = None
 PDF_OPTIONS = {
     'page-size': 'Letter',
     'margin-top': '0.75in',
@@ -47,6 +42,35 @@ PDF_OPTIONS = {
 }
 
 
+def _pdfkit_configuration():
+    import pdfkit
+
+    try:
+        return pdfkit.configuration()
+    except OSError:
+        return None
+
+
+def __getattr__(name):
+    # ``PDFKIT_CONFIG`` probes for the wkhtmltopdf binary; only do that when
+    # something actually renders a PDF.
+    if name == 'PDFKIT_CONFIG':
+        value = _pdfkit_configuration()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _start_scheduler(app):
+    global scheduler
+    if scheduler is None:
+        from flask_apscheduler import APScheduler
+        scheduler = APScheduler()
+    if scheduler.state == 0:
+        scheduler.init_app(app)
+        scheduler.start()
+
+
 def ensure_saved_stat_profile_table(app):
     with app.app_context():
         insp = inspect(db.engine)
@@ -65,15 +89,22 @@ def ensure_saved_stat_profile_table(app):
         )
 
 
-# Optional: Import auth blueprint if it exists
-try:
-    from auth.routes import auth_bp
-    AUTH_EXISTS = True
-except ImportError:
-    AUTH_EXISTS = False
+def _auth_blueprint():
+    # Optional: the auth blueprint only exists in some deployments.
+    try:
+        from auth.routes import auth_bp
+    except ImportError:
+        return None
+    return auth_bp
+
 
+def create_app(lightweight=False):
+    """Build the Flask app.
 
-def create_app():
+    ``lightweight=True`` is for CLI and ingest work that only needs the
+    config and a database session: it skips blueprints, routes, the
+    scheduler, Flask-Migrate and the schema probes/``create_all``.
+    """
     repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     app = Flask(
         __name__,
@@ -137,17 +168,6 @@ def create_app():
 
     # --- Initialize Extensions ---
     db.init_app(app)
-    ensure_saved_stat_profile_table(app)
-    Migrate(app, db)
-    login_manager = LoginManager()
-    login_manager.init_app(app)
-    login_manager.login_view = 'auth.login' if AUTH_EXISTS else 'admin.login'
-
-    @login_manager.user_loader
-    def load_user(user_id):
-        return db.session.get(User, int(user_id))
-    
-
 
     # --- Jinja helpers for percentage grading ---
     def _grade_filter(metric_key, value, attempts):
@@ -230,6 +250,22 @@ def create_app():
 
     app.jinja_env.filters['display_pick'] = display_pick
 
+    if lightweight:
+        return app
+
+    from flask_migrate import Migrate
+
+    ensure_saved_stat_profile_table(app)
+    Migrate(app, db)
+    auth_bp = _auth_blueprint()
+    login_manager = LoginManager()
+    login_manager.init_app(app)
+    login_manager.login_view = 'auth.login' if auth_bp is not None else 'admin.login'
+
+    @login_manager.user_loader
+    def load_user(user_id):
+        return db.session.get(User, int(user_id))
+
     # --- Register Blueprints ---
     from public.routes import public_bp
     app.register_blueprint(public_bp)
@@ -237,11 +273,13 @@ def create_app():
     from recruits import recruits_bp
     app.register_blueprint(recruits_bp, url_prefix='/recruits')
 
+    from admin.routes import admin_bp
     app.register_blueprint(admin_bp, url_prefix='/admin')
 
     from recruits.admin_logo import bp_logo
     app.register_blueprint(bp_logo)
 
+    from app.csv_pipeline.routes import csv_pipeline_bp
     app.register_blueprint(csv_pipeline_bp, url_prefix="/management")
 
     from scout import scout_bp
@@ -256,11 +294,9 @@ def create_app():
     except Exception as e:
         print("PDF routes disabled at startup:", e)
 
-    if scheduler.state == 0:
-        scheduler.init_app(app)
-        scheduler.start()
+    _start_scheduler(app)
 
-    if AUTH_EXISTS:
+    if auth_bp is not None:
         app.register_blueprint(auth_bp, url_prefix='/auth')
 
     # Ensure all tables exist when the application starts unless skipped
@@ -295,15 +331,12 @@ def create_app():
     def log_page_view():
         if request.endpoint in ('static', None):
             return
-        pv = PageView(
-            user_id=current_user.get_id() if current_user.is_authenticated else None,
-            endpoint=request.endpoint,
-            path=request.path,
-            timestamp=datetime.utcnow(),
-            user_agent=request.user_agent.string,
+        record_page_view(
+            current_user.get_id() if current_user.is_authenticated else None,
+            request.endpoint,
+            request.path,
+            request.user_agent.string,
         )
-        db.session.add(pv)
-        db.session.commit()
 
     # BEGIN Playcall Report
     @app.context_processor
@@ -331,6 +364,9 @@ def create_app():
     from app.cli.import_draft_stock import import_draft_stock
     app.cli.add_command(import_draft_stock)
 
+    from app.cli.verify_stat_rollups import verify_stat_rollups
+    app.cli.add_command(verify_stat_rollups)
+
     @app.cli.command("seed-presets")
     @with_appcontext
     def seed_presets_command():
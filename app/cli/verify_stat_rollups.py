@@ -0,0 +1,16 @@
+import click
+from flask.cli import with_appcontext
+
+from services.stat_rollups import verify_season_rollups
+
+
+@click.command("verify_stat_rollups")
+@click.option("--season-id", "season_ids", type=int, multiple=True, help="Limit to these seasons.")
+@with_appcontext
+def verify_stat_rollups(season_ids) -> None:
+    """Rebuild player stat rollups that no longer match the raw PlayerStats rows."""
+    rebuilt = verify_season_rollups(season_ids or None)
+    if rebuilt:
+        click.echo(f"Rebuilt rollups for seasons: {', '.join(map(str, rebuilt))}")
+    else:
+        click.echo("All checked seasons match their raw rows.")
@@ -1,8 +1,22 @@
 import os
 import math, re
+import pickle
+import threading
 import pandas as pd
 from flask import current_app
 
+# The Money Board views used to re-read every sheet of money_board.xlsx on each
+# request. The workbook is now converted once into a pickled, already
+# normalized frame next to it (``money_board.snapshot.pkl``); each process
+# memoizes that frame keyed on the workbook's mtime and size, so a new upload
+# (or a workbook copied in by hand) is picked up on the next request.
+WORKBOOK_FILENAME = 'money_board.xlsx'
+SNAPSHOT_FILENAME = 'money_board.snapshot.pkl'
+_SNAPSHOT_VERSION = 1
+_snapshot_lock = threading.Lock()
+_snapshot_memo = {}
+_cube_memo = {}
+
 
 def _to_int_money(series: pd.Series) -> pd.Series:
     # Accept numeric or strings with $, commas, or blanks → int (missing → 0)
@@ -81,30 +95,121 @@ def parse_pick(cell):
         return (int(m.group(1)), s) if m else (None, s)
 
 
+def add_money_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply normalize_money_columns and add the lookup columns the views filter
+    on: 'Coach_norm' (normalize_name, None without a coach) and 'Year_int'.
+    """
+    out = normalize_money_columns(df)
+    if 'Coach' not in out.columns:
+        out['Coach'] = None
+    if 'Year' not in out.columns:
+        out['Year'] = None
+    out['Coach_norm'] = out['Coach'].map(lambda c: normalize_name(c) if isinstance(c, str) else None)
+    out['Year_int'] = out['Year'].map(to_int_or_none)
+    return out
+
+
+def _money_board_dir():
+    return os.path.join(current_app.instance_path, 'money_board')
+
+
+def _workbook_key(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_workbook(path) -> pd.DataFrame:
+    df_dict = pd.read_excel(path, sheet_name=None)
+    frames = []
+    for sheet, frame in df_dict.items():
+        f = frame.copy()
+        f['__sheet'] = sheet
+        frames.append(f)
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    df.columns = [str(c).strip() for c in df.columns]
+    return df
+
+
+def build_money_snapshot(path=None) -> pd.DataFrame:
+    """
+    Convert the workbook at ``path`` (default: the Workbook Manager file) into
+    the normalized snapshot and memoize it. Called on upload; the views also
+    fall back to it when the snapshot is missing or older than the workbook.
+    """
+    path = path or os.path.join(_money_board_dir(), WORKBOOK_FILENAME)
+    key = _workbook_key(path)
+    df = add_money_keys(_read_workbook(path))
+
+    snap = os.path.join(os.path.dirname(path), SNAPSHOT_FILENAME)
+    tmp = snap + '.tmp'
+    with open(tmp, 'wb') as fh:
+        pickle.dump({'version': _SNAPSHOT_VERSION, 'source': key, 'df': df}, fh,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, snap)
+
+    with _snapshot_lock:
+        _snapshot_memo[path] = (key, df)
+    return df
+
+
+def _load_snapshot(path, key):
+    snap = os.path.join(os.path.dirname(path), SNAPSHOT_FILENAME)
+    try:
+        with open(snap, 'rb') as fh:
+            data = pickle.load(fh)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if data.get('version') != _SNAPSHOT_VERSION or tuple(data.get('source') or ()) != key:
+        return None
+    return data['df']
+
+
+def discard_money_snapshot(path=None):
+    """Remove the snapshot and this process's memo (workbook deleted)."""
+    path = path or os.path.join(_money_board_dir(), WORKBOOK_FILENAME)
+    with _snapshot_lock:
+        _snapshot_memo.pop(path, None)
+        _cube_memo.pop(path, None)
+    snap = os.path.join(os.path.dirname(path), SNAPSHOT_FILENAME)
+    if os.path.exists(snap):
+        os.remove(snap)
+
+
+def workbook_snapshot_df(path) -> pd.DataFrame:
+    """Return the memoized snapshot for ``path``, loading or rebuilding it if stale."""
+    key = _workbook_key(path)
+    with _snapshot_lock:
+        memo = _snapshot_memo.get(path)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    df = _load_snapshot(path, key)
+    if df is None:
+        current_app.logger.info("[Workbook] Rebuilding money board snapshot for %s", path)
+        return build_money_snapshot(path)
+    with _snapshot_lock:
+        _snapshot_memo[path] = (key, df)
+    return df
+
+
 def active_workbook_df():
     """
     Return a single normalized DataFrame containing at least:
-    ['Coach','Player','Team','Year','Projected $','Actual $',
-     'Projected Pick','Actual Pick'].
-    Use your existing Workbook Manager path/logic.
+    ['Coach','Player','Team','Year','Projected $','Actual $','NET $',
+     'Projected Pick','Actual Pick','Coach_norm','Year_int','__sheet'].
+    Served from the workbook snapshot when a workbook is on file. The frame
+    is shared between requests: callers must not modify it in place.
     """
-    path = os.path.join(current_app.instance_path, 'money_board', 'money_board.xlsx')
+    path = os.path.join(_money_board_dir(), WORKBOOK_FILENAME)
     if os.path.exists(path):
-        df_dict = pd.read_excel(path, sheet_name=None)
-        frames = []
-        for sheet, frame in df_dict.items():
-            f = frame.copy()
-            f['__sheet'] = sheet
-            frames.append(f)
-        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
-        df.columns = [str(c).strip() for c in df.columns]
-        return df
+        return workbook_snapshot_df(path)
 
     # Fallback: build DataFrame from Prospect table if no workbook is present
     try:
         from app.models.prospect import Prospect
     except Exception:
-        return pd.DataFrame()
+        return add_money_keys(pd.DataFrame())
 
     rows = []
     for p in Prospect.query.all():
@@ -125,4 +230,162 @@ def active_workbook_df():
             'Coach Conf': p.coach_current_conference,
             '__sheet': p.sheet,
         })
-    return pd.DataFrame(rows)
+    return add_money_keys(pd.DataFrame(rows))
+
+
+def _col(df: pd.DataFrame, name):
+    if name in df.columns:
+        return df[name]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _first_present(df: pd.DataFrame, options):
+    for c in options:
+        if c in df.columns:
+            return c
+    return None
+
+
+def _filter_mask(frame: pd.DataFrame, conf_field, year_min=None, year_max=None, sheet=None, conf=None):
+    mask = pd.Series(True, index=frame.index)
+    if year_min is not None:
+        mask &= frame['Year_int'].ge(year_min)
+    if year_max is not None:
+        mask &= frame['Year_int'].le(year_max)
+    if sheet:
+        mask &= _col(frame, '__sheet') == sheet
+    if conf and conf_field:
+        mask &= _col(frame, conf_field) == conf
+    return mask
+
+
+class MoneyCube:
+    """
+    Partial money aggregates per (Coach, Coach_norm, Year_int, __sheet, Conf)
+    cell, built once per workbook version. A filtered view only sums the cells
+    that match instead of regrouping every player row; recruit counts come
+    from the de-duplicated (cell, Player) pairs so a player listed in two
+    cells is still counted once.
+
+    Only rows with a Coach take part, as in the Money Board views. 'Conf' is
+    the coach conference column ('Coach Current Conference', else 'Coach
+    Conf'); 'Team' is the coach team column, kept per cell with the row it
+    came from so the first value per coach matches a row-order scan.
+    """
+
+    DIMS = ['Coach', 'Coach_norm', 'Year_int', '__sheet', 'Conf']
+
+    def __init__(self, df: pd.DataFrame):
+        self.has_rows = not df.empty
+        self.conf_col = _first_present(df, ['Coach Current Conference', 'Coach Conf'])
+        self.team_col = _first_present(df, ['Coach Current Team', 'Coach Team'])
+        self.df = df[_col(df, 'Coach').notna()]
+
+        src = self.df
+        rows = pd.DataFrame({
+            'Coach': _col(src, 'Coach'),
+            'Coach_norm': _col(src, 'Coach_norm'),
+            'Year_int': _col(src, 'Year_int'),
+            '__sheet': _col(src, '__sheet'),
+            'Conf': _col(src, self.conf_col) if self.conf_col else None,
+            'Team': _col(src, self.team_col) if self.team_col else None,
+            'Player': _col(src, 'Player'),
+        }).reset_index(drop=True)
+        rows['row'] = range(len(rows))
+        has_player = rows['Player'].notna()
+        # Per-player NET $ as the views define it (Actual - Projected), not the
+        # workbook's NET $ column.
+        proj = _col(src, 'Projected $').reset_index(drop=True).where(has_player, 0)
+        act = _col(src, 'Actual $').reset_index(drop=True).where(has_player, 0)
+        rows['proj'] = proj
+        rows['act'] = act
+        rows['net'] = act - proj
+        rows['players'] = has_player.astype(int)
+        rows['team_row'] = rows['row'].where(rows['Team'].notna())
+
+        cells = (rows.groupby(self.DIMS, dropna=False, sort=True)
+                     .agg(first_row=('row', 'min'),
+                          team_row=('team_row', 'min'),
+                          players=('players', 'sum'),
+                          proj_sum=('proj', 'sum'),
+                          act_sum=('act', 'sum'),
+                          net_sum=('net', 'sum'))
+                     .reset_index())
+        cells['Team'] = rows['Team'].reindex(cells['team_row'].fillna(-1).astype(int)).to_numpy()
+        self.cells = cells
+        self.players = rows.loc[has_player, self.DIMS + ['Player']].drop_duplicates()
+
+    def years(self):
+        return sorted(y for y in self.cells['Year_int'].dropna().unique())
+
+    def sheets(self):
+        return sorted(s for s in self.cells['__sheet'].dropna().unique())
+
+    def confs(self):
+        return sorted(self.cells['Conf'].dropna().unique()) if self.conf_col else []
+
+    def select(self, year_min=None, year_max=None, sheet=None, conf=None) -> 'MoneyCubeSlice':
+        filters = dict(year_min=year_min, year_max=year_max, sheet=sheet,
+                       conf=conf if self.conf_col else None)
+        return MoneyCubeSlice(
+            self,
+            self.cells[_filter_mask(self.cells, 'Conf', **filters)],
+            self.players[_filter_mask(self.players, 'Conf', **filters)],
+            filters,
+        )
+
+
+class MoneyCubeSlice:
+    """The cells of a :class:`MoneyCube` matching one set of filters."""
+
+    def __init__(self, cube: MoneyCube, cells: pd.DataFrame, players: pd.DataFrame, filters: dict):
+        self.cube = cube
+        self.cells = cells
+        self.players = players
+        self.filters = filters
+
+    def totals(self, keys=('Coach', 'Coach_norm')) -> pd.DataFrame:
+        """recruits/proj_sum/act_sum/net_sum per ``keys``, for coaches with players."""
+        keys = list(keys)
+        played = self.cells[self.cells['players'] > 0]
+        agg = played.groupby(keys, dropna=False)[['proj_sum', 'act_sum', 'net_sum']].sum()
+        recruits = self.players.groupby(keys, dropna=False)['Player'].nunique()
+        agg.insert(0, 'recruits', recruits.reindex(agg.index).fillna(0).astype(int))
+        return agg.reset_index()
+
+    def coaches(self):
+        """[{'Coach', 'Coach_norm'}] using each coach's first spelling, sorted by name."""
+        first = self.cells.sort_values('first_row', kind='mergesort').drop_duplicates('Coach_norm')
+        return first[['Coach', 'Coach_norm']].sort_values('Coach').to_dict('records')
+
+    def first_by_coach(self, field) -> dict:
+        """Coach_norm -> first non-null 'Team' or 'Conf' in row order."""
+        row_col = 'team_row' if field == 'Team' else 'first_row'
+        hit = self.cells[self.cells[field].notna() & self.cells['Coach_norm'].notna()]
+        hit = hit.sort_values(row_col, kind='mergesort').drop_duplicates('Coach_norm')
+        return hit.set_index('Coach_norm')[field].to_dict()
+
+    def rows_for(self, coach_norm) -> pd.DataFrame:
+        """The workbook rows behind one coach's cells (for rosters)."""
+        df = self.cube.df
+        rows = df[df['Coach_norm'] == coach_norm]
+        return rows[_filter_mask(rows, self.cube.conf_col, **self.filters)]
+
+
+def active_money_cube() -> MoneyCube:
+    """
+    MoneyCube for active_workbook_df(). Memoized per workbook snapshot; the
+    Prospect-table fallback is rebuilt per call since the table can change.
+    """
+    path = os.path.join(_money_board_dir(), WORKBOOK_FILENAME)
+    df = active_workbook_df()
+    if not os.path.exists(path):
+        return MoneyCube(df)
+    with _snapshot_lock:
+        memo = _cube_memo.get(path)
+    if memo is not None and memo[0] is df:
+        return memo[1]
+    cube = MoneyCube(df)
+    with _snapshot_lock:
+        _cube_memo[path] = (df, cube)
+    return cube
@@ -7,14 +7,13 @@ from io import BytesIO
 
 import logging
 
-from flask import Blueprint, current_app, jsonify, send_file
-from reportlab.lib.units import inch
-from reportlab.platypus import PageBreak, SimpleDocTemplate
+from flask import Blueprint, current_app, jsonify, request, send_file
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.utils.pdf_data_compiler import compile_player_shot_data
+from app.utils.pdf_data_compiler import compile_player_shot_data, compile_team_shot_data
 from app.utils.pdf_generator import ShotTypeReportGenerator
-from models.database import Roster, db
+from app.utils.team_pdf import render_team_pdf
+from models.database import Roster, Season, db
 
 pdf_bp = Blueprint("pdf", __name__)
 logger = logging.getLogger(__name__)
@@ -46,35 +45,24 @@ def generate_player_pdf(player_id: int):
 @pdf_bp.route("/pdf/team/generate")
 def generate_team_pdf():
     try:
-        players = Roster.query.all()
+        season_id = request.args.get("season_id", type=int)
+        if season_id is None:
+            latest = Season.query.order_by(Season.start_date.desc()).first()
+            season_id = latest.id if latest else None
+        # Only the rendered season's roster; other seasons' rows would each
+        # add a player section built from the wrong season's stats.
+        players = Roster.query.filter_by(season_id=season_id).order_by(Roster.id).all()
         if not players:
             return jsonify({"error": "No players found to generate team report."}), 404
 
-        total_players = len(players)
-        logger.info("Generating team PDF for %s players.", total_players)
-        output_buffer = BytesIO()
-        story = []
-        for idx, player in enumerate(players, start=1):
-            if idx > 1:
-                story.append(PageBreak())
-            logger.info("Generating PDF for %s (%s/%s).", player.player_name, idx, total_players)
-            player_data = compile_player_shot_data(player, db.session)
-            generator = ShotTypeReportGenerator(player_data)
-            story.extend(generator.get_story_elements())
-
-        doc = SimpleDocTemplate(
-            output_buffer,
-            pagesize=generator.pagesize,
-            rightMargin=0.5 * inch,
-            leftMargin=0.5 * inch,
-            topMargin=0.5 * inch,
-            bottomMargin=0.5 * inch,
+        logger.info("Generating team PDF for %s players.", len(players))
+        compiled = compile_team_shot_data(players, db.session)
+        pdf_bytes, _counts = render_team_pdf(
+            compiled, workers=current_app.config.get("PDF_RENDER_WORKERS")
         )
-        doc.build(story)
-        output_buffer.seek(0)
         filename = f"Team_Shot_Reports_{date.today().isoformat()}.pdf"
         return send_file(
-            output_buffer,
+            BytesIO(pdf_bytes),
             mimetype="application/pdf",
             as_attachment=True,
             download_name=filename,
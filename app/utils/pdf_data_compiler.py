@@ -3,39 +3,33 @@ These helpers reuse the Shot Type tab data pipeline without recomputing stats.
 """
 from __future__ import annotations
 import re
+from collections import defaultdict
+
+from sqlalchemy.orm import joinedload
+
 from admin.routes import compute_team_shot_details
-from models.database import PlayerStats, Season
+from models.database import Game, PlayerStats, Season
 
 
-def compile_player_shot_data(player, db_session):
-    """Return full player shot report payload based on Shot Type tab data."""
-    player_name = getattr(player, "player_name", None) or "Unknown"
-    resolved_season_id = getattr(player, "season_id", None)
-    if not resolved_season_id:
-        latest_season = db_session.query(Season).order_by(Season.start_date.desc()).first()
-        if latest_season:
-            resolved_season_id = latest_season.id
-    season_name = None
-    if resolved_season_id:
-        season_name = (
-            db_session.query(Season.season_name)
-            .filter(Season.id == resolved_season_id)
-            .scalar()
-        )
-    stats_query = db_session.query(PlayerStats).filter(PlayerStats.player_name == player_name)
-    if resolved_season_id:
-        stats_query = stats_query.filter(PlayerStats.season_id == resolved_season_id)
-    stats_rows = stats_query.all()
+_DEFAULT_GAME_TYPES = ("Non-Conference", "Conference", "Postseason")
+
+
+def _latest_season_id(db_session):
+    latest_season = db_session.query(Season).order_by(Season.start_date.desc()).first()
+    return latest_season.id if latest_season else None
 
+
+def _is_default_game_row(row) -> bool:
     # Mirror the website's game-type filtering:
     # 1) keep only game records (not practice)
     # 2) exclude Exhibition by default (same as DEFAULT_GAME_TYPE_SELECTION)
-    default_game_types = ["Non-Conference", "Conference", "Postseason"]
-    stats_rows = [
-        r for r in stats_rows
-        if r.game_id and r.game and any(tag in default_game_types for tag in r.game.game_types)
-    ]
+    return bool(
+        row.game_id and row.game and any(tag in _DEFAULT_GAME_TYPES for tag in row.game.game_types)
+    )
+
 
+def _build_player_payload(player_name, season_name, stats_rows):
+    stats_rows = [r for r in stats_rows if _is_default_game_row(r)]
     shot_type_totals, shot_summaries = compute_team_shot_details(stats_rows, label_set=None)
     season_stats = _build_season_stats(stats_rows)
     # Strip leading #<number> from the raw DB name so the renderer can
@@ -51,6 +45,63 @@ def compile_player_shot_data(player, db_session):
     }
 
 
+def compile_player_shot_data(player, db_session):
+    """Return full player shot report payload based on Shot Type tab data."""
+    player_name = getattr(player, "player_name", None) or "Unknown"
+    resolved_season_id = getattr(player, "season_id", None) or _latest_season_id(db_session)
+    season_name = None
+    if resolved_season_id:
+        season_name = (
+            db_session.query(Season.season_name)
+            .filter(Season.id == resolved_season_id)
+            .scalar()
+        )
+    stats_query = db_session.query(PlayerStats).filter(PlayerStats.player_name == player_name)
+    if resolved_season_id:
+        stats_query = stats_query.filter(PlayerStats.season_id == resolved_season_id)
+    return _build_player_payload(player_name, season_name, stats_query.all())
+
+
+def compile_team_shot_data(players, db_session):
+    """Return ``[(player, payload)]`` like :func:`compile_player_shot_data` per player.
+
+    All stat rows (with their games and game-type tags) are fetched in one
+    query instead of one query plus a lazy game load per row.
+    """
+    players = list(players)
+    fallback_season_id = None
+    if any(not getattr(p, "season_id", None) for p in players):
+        fallback_season_id = _latest_season_id(db_session)
+    keys = [
+        (getattr(p, "player_name", None) or "Unknown", getattr(p, "season_id", None) or fallback_season_id)
+        for p in players
+    ]
+    season_ids = {season_id for _, season_id in keys if season_id}
+    season_names = dict(
+        db_session.query(Season.id, Season.season_name).filter(Season.id.in_(season_ids))
+    ) if season_ids else {}
+
+    rows_by_key = defaultdict(list)
+    names = {name for name, _ in keys}
+    if names:
+        stats_rows = (
+            db_session.query(PlayerStats)
+            .options(joinedload(PlayerStats.game).selectinload(Game.type_tags))
+            .filter(PlayerStats.player_name.in_(names), PlayerStats.game_id.isnot(None))
+        )
+        if all(season_id for _, season_id in keys):
+            stats_rows = stats_rows.filter(PlayerStats.season_id.in_(season_ids))
+        stats_rows = stats_rows.order_by(PlayerStats.id)
+        for row in stats_rows:
+            rows_by_key[(row.player_name, row.season_id)].append(row)
+            rows_by_key[(row.player_name, None)].append(row)
+
+    return [
+        (player, _build_player_payload(name, season_names.get(season_id), rows_by_key[(name, season_id)]))
+        for player, (name, season_id) in zip(players, keys)
+    ]
+
+
 def _extract_jersey_number(player_name: str | None) -> str:
     if not player_name:
         return ""
@@ -231,8 +231,16 @@ class ShotTypeReportGenerator:
 
     def generate(self) -> bytes:
         """Build all four pages and return PDF bytes."""
-        self._validate_layout()
         pdf_canvas = canvas.Canvas(self.buffer, pagesize=self.pagesize)
+        self.draw_pages(pdf_canvas)
+        pdf_canvas.save()
+        pdf_content = self.buffer.getvalue()
+        self.buffer.close()
+        return pdf_content
+
+    def draw_pages(self, pdf_canvas: canvas.Canvas) -> None:
+        """Draw the four report pages onto ``pdf_canvas``, ending the last one."""
+        self._validate_layout()
         self._render_cover_page(pdf_canvas)
         pdf_canvas.showPage()
         self._render_atr_page(pdf_canvas)
@@ -240,10 +248,7 @@ class ShotTypeReportGenerator:
         self._render_2fg_page(pdf_canvas)
         pdf_canvas.showPage()
         self._render_3fg_page(pdf_canvas)
-        pdf_canvas.save()
-        pdf_content = self.buffer.getvalue()
-        self.buffer.close()
-        return pdf_content
+        pdf_canvas.showPage()
 
     def get_story_elements(self):
         """Return the report's page elements without building a PDF."""
@@ -1396,3 +1401,8 @@ class ShotTypeReportGenerator:
             if required_height <= col_height:
                 return SimpleNamespace(**variant)
         raise ValueError("atr column content exceeds available height.")
+
+
+def render_player_pdf(player_data: Mapping[str, object]) -> bytes:
+    """Render one player's report; module level so it can run in a worker process."""
+    return ShotTypeReportGenerator(player_data).generate()
@@ -0,0 +1,126 @@
+"""Team shot-report book: per-player pages rendered in parallel and cached.
+
+Each player's pages are rendered to their own PDF (in a process pool when
+more than one player needs rendering) and stored in the report cache under
+a hash of the player's payload, so rebuilding the book after a new game
+only re-renders the players whose numbers changed. The per-player PDFs are
+then concatenated with pypdf (or PyPDF2). Without either library every
+player is drawn onto one canvas in-process and nothing is cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.utils.pdf_generator import ShotTypeReportGenerator, render_player_pdf
+from services.report_cache import get_report_cache
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # pragma: no cover - depends on the installed PDF library
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+    except ImportError:
+        PdfReader = PdfWriter = None
+
+_LOGGER = logging.getLogger(__name__)
+_RENDER_VERSION = "1"
+_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def _json_default(value):
+    if isinstance(value, SimpleNamespace):
+        return vars(value)
+    return str(value)
+
+
+def payload_version(payload: Mapping[str, object]) -> str:
+    """Hash of everything the renderer reads for one player."""
+    blob = json.dumps(payload, sort_keys=True, default=_json_default)
+    return hashlib.sha1(f"{_RENDER_VERSION}:{blob}".encode("utf-8")).hexdigest()
+
+
+def _cache_key(player) -> str:
+    return f"team-pdf:player:{player.id}"
+
+
+def _render_all(payloads: Sequence[Mapping[str, object]], workers: int) -> List[bytes]:
+    if workers <= 1 or len(payloads) <= 1:
+        return [render_player_pdf(payload) for payload in payloads]
+    # Spawn rather than fork: the parent already runs the app's scheduler threads.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(payloads)), mp_context=context) as pool:
+        return list(pool.map(render_player_pdf, payloads))
+
+
+def _merge(chunks: Sequence[bytes]) -> bytes:
+    writer = PdfWriter()
+    for chunk in chunks:
+        for page in PdfReader(BytesIO(chunk)).pages:
+            writer.add_page(page)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _build_single_document(payloads: Sequence[Mapping[str, object]]) -> bytes:
+    output_buffer = BytesIO()
+    pdf_canvas = canvas.Canvas(output_buffer, pagesize=letter)
+    for payload in payloads:
+        ShotTypeReportGenerator(payload).draw_pages(pdf_canvas)
+    pdf_canvas.save()
+    return output_buffer.getvalue()
+
+
+def default_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def render_team_pdf(
+    compiled: Sequence[Tuple[object, Mapping[str, object]]],
+    workers: Optional[int] = None,
+) -> Tuple[bytes, Dict[str, int]]:
+    """Return the team book for ``[(player, payload)]`` plus render counts."""
+    payloads = [payload for _, payload in compiled]
+    if PdfWriter is None:
+        return _build_single_document(payloads), {"rendered": len(payloads), "cached": 0}
+
+    cache = get_report_cache()
+    chunks: List[Optional[bytes]] = [None] * len(compiled)
+    versions = [payload_version(payload) for payload in payloads]
+    missing = []
+    for idx, (player, _payload) in enumerate(compiled):
+        if cache is not None:
+            chunks[idx] = cache.get(_cache_key(player), versions[idx])
+        if chunks[idx] is None:
+            missing.append(idx)
+
+    rendered = _render_all([payloads[idx] for idx in missing], workers or default_workers())
+    for idx, pdf_bytes in zip(missing, rendered):
+        chunks[idx] = pdf_bytes
+        if cache is not None:
+            player = compiled[idx][0]
+            season_id = getattr(player, "season_id", None)
+            cache.set(
+                _cache_key(player),
+                pdf_bytes,
+                version=versions[idx],
+                tags=(f"season:{season_id}",) if season_id else (),
+                timeout=_CACHE_TTL_SECONDS,
+            )
+    _LOGGER.info("Team PDF: rendered %s players, reused %s.", len(missing), len(compiled) - len(missing))
+    return _merge(chunks), {"rendered": len(missing), "cached": len(compiled) - len(missing)}
+
+
+__all__ = ["default_workers", "payload_version", "render_team_pdf"]
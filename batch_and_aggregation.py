@@ -1,47 +1,126 @@
 # batch_and_aggregation.py
 
+import argparse
 import os
 import shutil
 import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from models.database import db, Season, Game, PlayerStats, TeamStats
-from test_parse import parse_csv  # Ensure this path is correct for your project
-from app import app  # Import the Flask app for the application context
+from test_parse import read_game_csv, store_parsed_game  # Ensure this path is correct for your project
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def process_multiple_csvs(directory_path, season_id, archive_path):
+
+def _parse_worker(file_path, season_id):
+    """Parse one CSV in a worker process; returns (df, parsed, seconds)."""
+    start = time.perf_counter()
+    df, parsed = read_game_csv(file_path, season_id)
+    return df, parsed, time.perf_counter() - start
+
+
+def _parse_inline(csv_files, season_id):
+    for file_path in csv_files:
+        try:
+            yield file_path, _parse_worker(file_path, season_id), None
+        except Exception as exc:
+            yield file_path, None, exc
+
+
+def _parse_pool(csv_files, season_id, workers):
+    # Spawn rather than fork: the parent already runs the app's scheduler threads.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {
+            pool.submit(_parse_worker, file_path, season_id): file_path
+            for file_path in csv_files
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as exc:
+                yield futures[future], None, exc
+
+
+def process_multiple_csvs(directory_path, season_id, archive_path, workers=1, app=None):
     """
     Process all CSV files in the given directory for a specified season.
-    Each CSV file is processed by calling the parse_csv() function from test_parse.py.
+    Files are parsed by ``workers`` processes (in-process when 1) and every
+    result is written by this process, so SQLite only ever sees one writer.
+    The Flask app is built once for the whole batch. A file that fails to
+    parse or write is logged and left in place; the rest carry on.
     After successful processing, the file is moved to the archive folder.
+
+    Returns one dict per file with ``file``, ``ok``, ``parse_s``, ``write_s``
+    and ``error``.
     """
     if not os.path.isdir(directory_path):
         logger.error(f"Directory {directory_path} does not exist.")
-        return
+        return []
 
     # Ensure archive folder exists
     if not os.path.isdir(archive_path):
         os.makedirs(archive_path)
 
-    csv_files = [os.path.join(directory_path, filename)
-                 for filename in os.listdir(directory_path)
-                 if filename.lower().endswith('.csv')]
+    csv_files = sorted(os.path.join(directory_path, filename)
+                       for filename in os.listdir(directory_path)
+                       if filename.lower().endswith('.csv'))
     logger.info(f"Found {len(csv_files)} CSV files in {directory_path}")
+    if not csv_files:
+        return []
 
-    for file_path in csv_files:
+    if app is None:
+        from app import create_app
+        app = create_app(lightweight=True)
+
+    if workers > 1 and len(csv_files) > 1:
+        results = _parse_pool(csv_files, season_id, min(workers, len(csv_files)))
+    else:
+        results = _parse_inline(csv_files, season_id)
+
+    report = []
+    batch_start = time.perf_counter()
+    for file_path, result, error in results:
+        entry = {"file": os.path.basename(file_path), "ok": False,
+                 "parse_s": None, "write_s": None, "error": None}
+        report.append(entry)
+        if error is not None:
+            entry["error"] = str(error)
+            logger.error(f"Error parsing file {file_path}: {error}")
+            continue
+
+        df, parsed, entry["parse_s"] = result
+        write_start = time.perf_counter()
         try:
-            logger.info(f"Processing {file_path}...")
-            # Process the CSV file. The parse_csv function checks for an existing Game record.
-            parse_csv(file_path, game_id=None, season_id=season_id)
-            # If processing is successful, move the file to the archive folder.
-            archive_file = os.path.join(archive_path, os.path.basename(file_path))
-            shutil.move(file_path, archive_file)
-            logger.info(f"Moved {file_path} to archive folder: {archive_file}")
+            # The writer checks for an existing Game record.
+            store_parsed_game(file_path, season_id, df, parsed, app=app)
         except Exception as e:
+            entry["error"] = str(e)
             logger.exception(f"Error processing file {file_path}: {e}")
-    logger.info("Batch processing complete.")
+            continue
+        finally:
+            entry["write_s"] = time.perf_counter() - write_start
+
+        entry["ok"] = True
+        # If processing is successful, move the file to the archive folder.
+        archive_file = os.path.join(archive_path, os.path.basename(file_path))
+        shutil.move(file_path, archive_file)
+        logger.info(
+            f"{entry['file']}: parsed in {entry['parse_s']:.2f}s, "
+            f"written in {entry['write_s']:.2f}s, moved to {archive_file}"
+        )
+
+    failed = [entry["file"] for entry in report if not entry["ok"]]
+    logger.info(
+        f"Batch processing complete: {len(report) - len(failed)}/{len(report)} files "
+        f"in {time.perf_counter() - batch_start:.2f}s"
+    )
+    if failed:
+        logger.warning(f"Failed files: {', '.join(failed)}")
+    return report
 
 def aggregate_player_stats(season_id):
     """
@@ -103,18 +182,28 @@ def aggregate_team_stats(season_id):
     return aggregated
 
 if __name__ == "__main__":
-    season_id = 1  # Set your season_id accordingly
+    parser = argparse.ArgumentParser(description="Batch ingest game CSVs for a season.")
+    parser.add_argument("directory", nargs="?", default="data/uploads/")
+    parser.add_argument("--season-id", type=int, default=1)
+    parser.add_argument("--archive", default="data/processed/")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="parse processes (1 parses in-process)")
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app(lightweight=True)
 
     # Run batch processing on CSV files from the uploads folder
-    process_multiple_csvs("data/uploads/", season_id, "data/processed/")
-    
+    process_multiple_csvs(args.directory, args.season_id, args.archive,
+                          workers=args.workers, app=app)
+
     # Use an application context for aggregation queries
     with app.app_context():
         # Aggregate player stats and print the results
-        player_stats = aggregate_player_stats(season_id)
+        player_stats = aggregate_player_stats(args.season_id)
         for ps in player_stats:
             logger.info(ps)
-    
+
         # Aggregate team stats and print the results
-        team_totals = aggregate_team_stats(season_id)
+        team_totals = aggregate_team_stats(args.season_id)
         logger.info(team_totals)
@@ -0,0 +1,21 @@
+"""Record content hash and parser version on uploaded_files."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a3d7e9f1c5b2'
+down_revision = 'f2a9c3e6b8d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('uploaded_files') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('parser_version', sa.String(length=32), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('uploaded_files') as batch_op:
+        batch_op.drop_column('parser_version')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,116 @@
+"""Add player_stats_rollup table for leaderboard totals."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e1f9b2d4'
+down_revision = 'f4c2a1b0d9e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are filled lazily by services.stat_rollups.ensure_season_rollups.
+    op.create_table(
+        'player_stats_rollup',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('season_id', sa.Integer(), nullable=False),
+        sa.Column('player_name', sa.String(length=100), nullable=False),
+        sa.Column('source', sa.String(length=16), nullable=False),
+        sa.Column('session_date', sa.Date(), nullable=True),
+        sa.Column('session_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('jersey_number', sa.Integer(), nullable=True),
+        sa.Column('atr_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('points', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('assists', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('turnovers', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('second_assists', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pot_assists', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fta', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ftm', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('foul_by', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('contest_front', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('contest_side', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('contest_behind', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('contest_late', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('contest_no', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('contest_early', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_late_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_late_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_no_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_no_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_late_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_late_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_no_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_no_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_late_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_late_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_no_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_no_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pass_contest_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pass_contest_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bump_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('bump_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('crash_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('crash_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('back_man_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('back_man_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('box_out_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('box_out_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('off_reb_given_up', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('collision_gap_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('collision_gap_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pnr_gap_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pnr_gap_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('low_help_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('low_help_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('close_window_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('close_window_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shut_door_positive', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shut_door_missed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('blowby_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('blowby_triple_threat', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('blowby_closeout', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('blowby_isolation', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('atr_fouled', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg2_fouled', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fg3_fouled', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('practice_wins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('practice_losses', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sprint_wins', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sprint_losses', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_att', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_shrink_att', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_shrink_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_nonshrink_att', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_nonshrink_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_late_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_late_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_no_contest_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_fg3_no_contest_makes', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['season_id'], ['season.id']),
+    )
+    op.create_index(
+        'ix_player_stats_rollup_key',
+        'player_stats_rollup',
+        ['season_id', 'source', 'session_date', 'player_name'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_player_stats_rollup_key', table_name='player_stats_rollup')
+    op.drop_table('player_stats_rollup')
@@ -0,0 +1,59 @@
+"""Add player_shot_detail and player_shot_label tables."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b3d8f0a6c5e1'
+down_revision = 'a7c3e1f9b2d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are filled by scripts/backfill_player_shot_details.py;
+    # until then readers fall back to the shot_type_details JSON.
+    op.create_table(
+        'player_shot_detail',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('player_stats_id', sa.Integer(), sa.ForeignKey('player_stats.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('season_id', sa.Integer(), sa.ForeignKey('season.id'), nullable=False),
+        sa.Column('game_id', sa.Integer(), sa.ForeignKey('game.id'), nullable=True),
+        sa.Column('practice_id', sa.Integer(), sa.ForeignKey('practice.id'), nullable=True),
+        sa.Column('player_name', sa.String(length=100), nullable=False),
+        sa.Column('shot_index', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('shot_class', sa.String(length=8), nullable=True),
+        sa.Column('made', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('shrink', sa.Boolean(), nullable=True),
+        sa.Column('contest_level', sa.String(length=16), nullable=True),
+        sa.Column('assisted', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('shot_location', sa.String(length=64), nullable=True),
+        sa.Column('possession_type', sa.String(length=64), nullable=True),
+    )
+    op.create_index('ix_player_shot_detail_player_stats_id', 'player_shot_detail', ['player_stats_id'])
+    op.create_index('ix_player_shot_detail_game_id', 'player_shot_detail', ['game_id'])
+    op.create_index('ix_player_shot_detail_practice_id', 'player_shot_detail', ['practice_id'])
+    op.create_index(
+        'ix_player_shot_detail_season_player',
+        'player_shot_detail',
+        ['season_id', 'player_name', 'shot_class'],
+    )
+
+    op.create_table(
+        'player_shot_label',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('shot_detail_id', sa.Integer(), sa.ForeignKey('player_shot_detail.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('label', sa.String(length=128), nullable=False),
+    )
+    op.create_index('ix_player_shot_label_shot_detail_id', 'player_shot_label', ['shot_detail_id'])
+    op.create_index('ix_player_shot_label_label', 'player_shot_label', ['label'])
+
+
+def downgrade():
+    op.drop_index('ix_player_shot_label_label', table_name='player_shot_label')
+    op.drop_index('ix_player_shot_label_shot_detail_id', table_name='player_shot_label')
+    op.drop_table('player_shot_label')
+    op.drop_index('ix_player_shot_detail_season_player', table_name='player_shot_detail')
+    op.drop_index('ix_player_shot_detail_practice_id', table_name='player_shot_detail')
+    op.drop_index('ix_player_shot_detail_game_id', table_name='player_shot_detail')
+    op.drop_index('ix_player_shot_detail_player_stats_id', table_name='player_shot_detail')
+    op.drop_table('player_shot_detail')
@@ -0,0 +1,19 @@
+"""Record the season roster fingerprint on uploaded_files."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b5f1d8e3a9c4'
+down_revision = 'a3d7e9f1c5b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('uploaded_files') as batch_op:
+        batch_op.add_column(sa.Column('roster_fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('uploaded_files') as batch_op:
+        batch_op.drop_column('roster_fingerprint')
@@ -0,0 +1,106 @@
+"""Add player_stats_label table and backfill it from the JSON blobs."""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c6e4b9a1d2f7'
+down_revision = 'b3d8f0a6c5e1'
+branch_labels = None
+depends_on = None
+
+CHUNK_SIZE = 1000
+
+
+def upgrade():
+    op.create_table(
+        'player_stats_label',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('player_stats_id', sa.Integer(), sa.ForeignKey('player_stats.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('label', sa.String(length=128), nullable=False),
+    )
+    op.create_index('ix_player_stats_label_player_stats_id', 'player_stats_label', ['player_stats_id'])
+    op.create_index('ix_player_stats_label_label', 'player_stats_label', ['label', 'player_stats_id'])
+    _backfill_labels()
+
+
+def _backfill_labels():
+    # Label filters are an exact lookup on this table, so existing rows must
+    # be labelled before the new code reads it.
+    player_stats = sa.table(
+        'player_stats',
+        sa.column('id', sa.Integer),
+        sa.column('shot_type_details', sa.Text),
+        sa.column('stat_details', sa.Text),
+    )
+    label_table = sa.table(
+        'player_stats_label',
+        sa.column('player_stats_id', sa.Integer),
+        sa.column('label', sa.String),
+    )
+    bind = op.get_bind()
+    query = (
+        sa.select(player_stats.c.id, player_stats.c.shot_type_details, player_stats.c.stat_details)
+        .where(player_stats.c.shot_type_details.isnot(None) | player_stats.c.stat_details.isnot(None))
+        .order_by(player_stats.c.id)
+        .limit(CHUNK_SIZE)
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(query.where(player_stats.c.id > last_id)).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        labels = [
+            {'player_stats_id': stat_id, 'label': label}
+            for stat_id, shot_blob, stat_blob in rows
+            for label in player_stats_labels(shot_blob, stat_blob)
+        ]
+        if labels:
+            bind.execute(label_table.insert(), labels)
+
+
+# Frozen copy of utils.shottype.player_stats_labels as of this revision, so
+# later edits to the app helper cannot change what this migration backfills.
+def _load_blob(blob):
+    if not blob:
+        return []
+    try:
+        data = json.loads(blob) if isinstance(blob, str) else blob
+    except (TypeError, ValueError):
+        return []
+    if isinstance(data, list):
+        return [item for item in data if isinstance(item, dict)]
+    if isinstance(data, dict):
+        return [data]
+    return []
+
+
+def _drill_labels(entry):
+    value = entry.get('drill_labels')
+    if not value:
+        return []
+    items = [value] if isinstance(value, str) or not isinstance(value, (list, tuple)) else value
+    labels = []
+    for item in items:
+        if item is None:
+            continue
+        labels.extend(lbl.strip() for lbl in str(item).split(',') if lbl.strip())
+    return labels
+
+
+def player_stats_labels(shot_type_details, stat_details):
+    labels = set()
+    for shot in _load_blob(shot_type_details):
+        labels.update(str(shot.get('possession_type') or '').split(','))
+        labels.update(_drill_labels(shot))
+    for event in _load_blob(stat_details):
+        labels.update(_drill_labels(event))
+    return sorted({label.strip().upper() for label in labels if label.strip()})
+
+
+def downgrade():
+    op.drop_index('ix_player_stats_label_label', table_name='player_stats_label')
+    op.drop_index('ix_player_stats_label_player_stats_id', table_name='player_stats_label')
+    op.drop_table('player_stats_label')
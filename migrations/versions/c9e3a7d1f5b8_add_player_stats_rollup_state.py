@@ -0,0 +1,23 @@
+"""Add player_stats_rollup_state watermark table."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c9e3a7d1f5b8'
+down_revision = 'b5f1d8e3a9c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Seasons without a row are rebuilt on their next leaderboard read.
+    op.create_table(
+        'player_stats_rollup_state',
+        sa.Column('season_id', sa.Integer(), sa.ForeignKey('season.id'), primary_key=True),
+        sa.Column('raw_rows', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('raw_max_id', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade():
+    op.drop_table('player_stats_rollup_state')
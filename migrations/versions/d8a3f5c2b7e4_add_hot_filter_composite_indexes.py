@@ -0,0 +1,52 @@
+"""Add composite indexes for leaderboard, on/off and team-totals filters."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3f5c2b7e4'
+down_revision = 'c6e4b9a1d2f7'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    # Leaderboard sums: season + roster name, split by practice vs game rows.
+    ('ix_player_stats_season_player_practice', 'player_stats', ['season_id', 'player_name', 'practice_id']),
+    ('ix_player_stats_season_player_game', 'player_stats', ['season_id', 'player_name', 'game_id']),
+    ('ix_blue_collar_stats_season_player', 'blue_collar_stats', ['season_id', 'player_id']),
+    # Team totals: season + our side / opponent, optionally narrowed to games.
+    ('ix_team_stats_season_opponent', 'team_stats', ['season_id', 'is_opponent', 'game_id']),
+    # On/off and possession index: season + side/segment, then covering
+    # lookups from players to possessions and possessions to events.
+    ('ix_possession_season_side_segment', 'possession', ['season_id', 'possession_side', 'time_segment']),
+    ('ix_player_possession_player_possession', 'player_possession', ['player_id', 'possession_id']),
+    ('ix_shot_detail_possession_event', 'shot_detail', ['possession_id', 'event_type']),
+)
+
+# Single-column indexes that the composites above now lead with.
+REDUNDANT_INDEXES = (
+    ('ix_player_possession_player_id', 'player_possession', ['player_id']),
+    ('ix_shot_detail_possession_id', 'shot_detail', ['possession_id']),
+)
+
+
+def _index_names(table_name: str) -> set[str]:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    return {index["name"] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _columns in REDUNDANT_INDEXES:
+        if name in _index_names(table):
+            op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    for name, table, columns in REDUNDANT_INDEXES:
+        if name not in _index_names(table):
+            op.create_index(name, table, columns)
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""Add page_view_daily rollup and index page_view by user."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e7c1b4d9a2f3'
+down_revision = 'd8a3f5c2b7e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'page_view_daily',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('endpoint', sa.String(length=128), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_page_view_daily_key', 'page_view_daily', ['day', 'user_id', 'endpoint'])
+    op.create_index('ix_page_view_user_timestamp', 'page_view', ['user_id', 'timestamp'])
+    op.execute(
+        """
+        INSERT INTO page_view_daily (day, user_id, endpoint, views)
+        SELECT date(timestamp), user_id, endpoint, COUNT(*)
+        FROM page_view
+        GROUP BY date(timestamp), user_id, endpoint
+        """
+    )
+
+
+def downgrade():
+    op.drop_index('ix_page_view_user_timestamp', table_name='page_view')
+    op.drop_index('ix_page_view_daily_key', table_name='page_view_daily')
+    op.drop_table('page_view_daily')
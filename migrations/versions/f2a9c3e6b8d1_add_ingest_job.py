@@ -0,0 +1,35 @@
+"""Add ingest_job table for background parse/reparse jobs."""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f2a9c3e6b8d1'
+down_revision = 'e7c1b4d9a2f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ingest_job',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('file_id', sa.Integer(), sa.ForeignKey('uploaded_files.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('payload', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False, server_default='queued'),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('users.id'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_ingest_job_status', 'ingest_job', ['status', 'id'])
+    op.create_index('ix_ingest_job_file_status', 'ingest_job', ['file_id', 'status'])
+
+
+def downgrade():
+    op.drop_index('ix_ingest_job_file_status', table_name='ingest_job')
+    op.drop_index('ix_ingest_job_status', table_name='ingest_job')
+    op.drop_table('ingest_job')
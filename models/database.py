@@ -149,6 +149,10 @@ class TeamStats(db.Model):
     wins                 = db.Column(db.Integer, nullable=False, default=0)
     losses               = db.Column(db.Integer, nullable=False, default=0)
 
+    __table_args__ = (
+        db.Index('ix_team_stats_season_opponent', 'season_id', 'is_opponent', 'game_id'),
+    )
+
 
 class SkillEntry(db.Model):
     __tablename__ = 'skill_entries'
@@ -271,6 +275,201 @@ class PlayerStats(db.Model):
     sprint_wins     = db.Column(db.Integer, default=0)
     sprint_losses   = db.Column(db.Integer, default=0)
 
+    player_shot_details = db.relationship(
+        'PlayerShotDetail',
+        backref='player_stat',
+        cascade='all, delete-orphan',
+        order_by='PlayerShotDetail.shot_index',
+        lazy=True,
+    )
+    labels = db.relationship(
+        'PlayerStatsLabel',
+        backref='player_stat',
+        cascade='all, delete-orphan',
+        lazy=True,
+    )
+
+    __table_args__ = (
+        db.Index('ix_player_stats_season_player_practice', 'season_id', 'player_name', 'practice_id'),
+        db.Index('ix_player_stats_season_player_game', 'season_id', 'player_name', 'game_id'),
+    )
+
+
+class PlayerShotDetail(db.Model):
+    """One shot from ``PlayerStats.shot_type_details``, normalized at ingest.
+
+    The session and player columns are copied from the parent stat row so
+    shrink/contest/label breakdowns are plain GROUP BYs.
+    """
+    __tablename__ = 'player_shot_detail'
+
+    id              = db.Column(db.Integer, primary_key=True)
+    player_stats_id = db.Column(db.Integer, db.ForeignKey('player_stats.id', ondelete='CASCADE'), nullable=False, index=True)
+    season_id       = db.Column(db.Integer, db.ForeignKey('season.id'), nullable=False)
+    game_id         = db.Column(db.Integer, db.ForeignKey('game.id'), nullable=True, index=True)
+    practice_id     = db.Column(db.Integer, db.ForeignKey('practice.id'), nullable=True, index=True)
+    player_name     = db.Column(db.String(100), nullable=False)
+    shot_index      = db.Column(db.Integer, nullable=False, default=0)  # position in the JSON list
+    shot_class      = db.Column(db.String(8))      # 'atr' | '2fg' | '3fg' | 'ft'
+    made            = db.Column(db.Boolean, nullable=False, default=False)
+    shrink          = db.Column(db.Boolean)        # True Shrink, False Non-Shrink, None untagged
+    contest_level   = db.Column(db.String(16))     # 'contest' | 'late' | 'no_contest'
+    assisted        = db.Column(db.Boolean, nullable=False, default=False)
+    shot_location   = db.Column(db.String(64))
+    possession_type = db.Column(db.String(64))
+
+    labels = db.relationship(
+        'PlayerShotLabel',
+        backref='shot',
+        cascade='all, delete-orphan',
+        lazy=True,
+    )
+
+    __table_args__ = (
+        db.Index('ix_player_shot_detail_season_player', 'season_id', 'player_name', 'shot_class'),
+    )
+
+
+class PlayerShotLabel(db.Model):
+    """A label attached to one ``PlayerShotDetail`` (shot tags and drill labels)."""
+    __tablename__ = 'player_shot_label'
+
+    id             = db.Column(db.Integer, primary_key=True)
+    shot_detail_id = db.Column(db.Integer, db.ForeignKey('player_shot_detail.id', ondelete='CASCADE'), nullable=False, index=True)
+    label          = db.Column(db.String(128), nullable=False, index=True)
+
+
+class PlayerStatsLabel(db.Model):
+    """A drill/possession label carried by one ``PlayerStats`` row.
+
+    Built at ingest from both JSON blobs so label filters are an indexed
+    lookup instead of ``ilike`` scans over ``shot_type_details``/``stat_details``.
+    """
+    __tablename__ = 'player_stats_label'
+
+    id              = db.Column(db.Integer, primary_key=True)
+    player_stats_id = db.Column(db.Integer, db.ForeignKey('player_stats.id', ondelete='CASCADE'), nullable=False, index=True)
+    label           = db.Column(db.String(128), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_player_stats_label_label', 'label', 'player_stats_id'),
+    )
+
+
+class PlayerStatsRollup(db.Model):
+    """Summed ``PlayerStats`` per (season, player, source, session date).
+
+    Maintained by ``services.stat_rollups`` so leaderboards can total a
+    season without re-reading every stat row and shot-detail blob.
+    """
+    __tablename__ = 'player_stats_rollup'
+
+    id                           = db.Column(db.Integer, primary_key=True)
+    season_id                    = db.Column(db.Integer, db.ForeignKey('season.id'), nullable=False)
+    player_name                  = db.Column(db.String(100), nullable=False)
+    source                       = db.Column(db.String(16), nullable=False)  # 'game' | 'practice' | 'other'
+    session_date                 = db.Column(db.Date, nullable=True)
+    session_count                = db.Column(db.Integer, nullable=False, default=0)
+    jersey_number                = db.Column(db.Integer)
+
+    # --- Summed PlayerStats columns ---
+    atr_makes                    = db.Column(db.Integer, nullable=False, default=0)
+    atr_attempts                 = db.Column(db.Integer, nullable=False, default=0)
+    fg2_makes                    = db.Column(db.Integer, nullable=False, default=0)
+    fg2_attempts                 = db.Column(db.Integer, nullable=False, default=0)
+    fg3_makes                    = db.Column(db.Integer, nullable=False, default=0)
+    fg3_attempts                 = db.Column(db.Integer, nullable=False, default=0)
+    points                       = db.Column(db.Integer, nullable=False, default=0)
+    assists                      = db.Column(db.Integer, nullable=False, default=0)
+    turnovers                    = db.Column(db.Integer, nullable=False, default=0)
+    second_assists               = db.Column(db.Integer, nullable=False, default=0)
+    pot_assists                  = db.Column(db.Integer, nullable=False, default=0)
+    fta                          = db.Column(db.Integer, nullable=False, default=0)
+    ftm                          = db.Column(db.Integer, nullable=False, default=0)
+    foul_by                      = db.Column(db.Integer, nullable=False, default=0)
+    contest_front                = db.Column(db.Integer, nullable=False, default=0)
+    contest_side                 = db.Column(db.Integer, nullable=False, default=0)
+    contest_behind               = db.Column(db.Integer, nullable=False, default=0)
+    contest_late                 = db.Column(db.Integer, nullable=False, default=0)
+    contest_no                   = db.Column(db.Integer, nullable=False, default=0)
+    contest_early                = db.Column(db.Integer, nullable=False, default=0)
+    atr_contest_attempts         = db.Column(db.Integer, nullable=False, default=0)
+    atr_contest_makes            = db.Column(db.Integer, nullable=False, default=0)
+    atr_late_attempts            = db.Column(db.Integer, nullable=False, default=0)
+    atr_late_makes               = db.Column(db.Integer, nullable=False, default=0)
+    atr_no_contest_attempts      = db.Column(db.Integer, nullable=False, default=0)
+    atr_no_contest_makes         = db.Column(db.Integer, nullable=False, default=0)
+    fg2_contest_attempts         = db.Column(db.Integer, nullable=False, default=0)
+    fg2_contest_makes            = db.Column(db.Integer, nullable=False, default=0)
+    fg2_late_attempts            = db.Column(db.Integer, nullable=False, default=0)
+    fg2_late_makes               = db.Column(db.Integer, nullable=False, default=0)
+    fg2_no_contest_attempts      = db.Column(db.Integer, nullable=False, default=0)
+    fg2_no_contest_makes         = db.Column(db.Integer, nullable=False, default=0)
+    fg3_contest_attempts         = db.Column(db.Integer, nullable=False, default=0)
+    fg3_contest_makes            = db.Column(db.Integer, nullable=False, default=0)
+    fg3_late_attempts            = db.Column(db.Integer, nullable=False, default=0)
+    fg3_late_makes               = db.Column(db.Integer, nullable=False, default=0)
+    fg3_no_contest_attempts      = db.Column(db.Integer, nullable=False, default=0)
+    fg3_no_contest_makes         = db.Column(db.Integer, nullable=False, default=0)
+    pass_contest_positive        = db.Column(db.Integer, nullable=False, default=0)
+    pass_contest_missed          = db.Column(db.Integer, nullable=False, default=0)
+    bump_positive                = db.Column(db.Integer, nullable=False, default=0)
+    bump_missed                  = db.Column(db.Integer, nullable=False, default=0)
+    crash_positive               = db.Column(db.Integer, nullable=False, default=0)
+    crash_missed                 = db.Column(db.Integer, nullable=False, default=0)
+    back_man_positive            = db.Column(db.Integer, nullable=False, default=0)
+    back_man_missed              = db.Column(db.Integer, nullable=False, default=0)
+    box_out_positive             = db.Column(db.Integer, nullable=False, default=0)
+    box_out_missed               = db.Column(db.Integer, nullable=False, default=0)
+    off_reb_given_up             = db.Column(db.Integer, nullable=False, default=0)
+    collision_gap_positive       = db.Column(db.Integer, nullable=False, default=0)
+    collision_gap_missed         = db.Column(db.Integer, nullable=False, default=0)
+    pnr_gap_positive             = db.Column(db.Integer, nullable=False, default=0)
+    pnr_gap_missed               = db.Column(db.Integer, nullable=False, default=0)
+    low_help_positive            = db.Column(db.Integer, nullable=False, default=0)
+    low_help_missed              = db.Column(db.Integer, nullable=False, default=0)
+    close_window_positive        = db.Column(db.Integer, nullable=False, default=0)
+    close_window_missed          = db.Column(db.Integer, nullable=False, default=0)
+    shut_door_positive           = db.Column(db.Integer, nullable=False, default=0)
+    shut_door_missed             = db.Column(db.Integer, nullable=False, default=0)
+    blowby_total                 = db.Column(db.Integer, nullable=False, default=0)
+    blowby_triple_threat         = db.Column(db.Integer, nullable=False, default=0)
+    blowby_closeout              = db.Column(db.Integer, nullable=False, default=0)
+    blowby_isolation             = db.Column(db.Integer, nullable=False, default=0)
+    atr_fouled                   = db.Column(db.Integer, nullable=False, default=0)
+    fg2_fouled                   = db.Column(db.Integer, nullable=False, default=0)
+    fg3_fouled                   = db.Column(db.Integer, nullable=False, default=0)
+    practice_wins                = db.Column(db.Integer, nullable=False, default=0)
+    practice_losses              = db.Column(db.Integer, nullable=False, default=0)
+    sprint_wins                  = db.Column(db.Integer, nullable=False, default=0)
+    sprint_losses                = db.Column(db.Integer, nullable=False, default=0)
+
+    # --- 3FG shot-detail breakdown counts (from shot_type_details) ---
+    shot_fg3_att                 = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_makes               = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_shrink_att          = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_shrink_makes        = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_nonshrink_att       = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_nonshrink_makes     = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_contest_attempts    = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_contest_makes       = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_late_attempts       = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_late_makes          = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_no_contest_attempts = db.Column(db.Integer, nullable=False, default=0)
+    shot_fg3_no_contest_makes    = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_player_stats_rollup_key', 'season_id', 'source', 'session_date', 'player_name'),
+    )
+
+
+class PlayerStatsRollupState(db.Model):
+    """Raw ``PlayerStats`` watermark the season's rollups were last built from."""
+    __tablename__ = 'player_stats_rollup_state'
+
+    season_id  = db.Column(db.Integer, db.ForeignKey('season.id'), primary_key=True)
+    raw_rows   = db.Column(db.Integer, nullable=False, default=0)
+    raw_max_id = db.Column(db.Integer, nullable=False, default=0)
 
 
 class BlueCollarStats(db.Model):
@@ -290,6 +489,10 @@ class BlueCollarStats(db.Model):
     reb_tip           = db.Column(db.Integer)
     total_blue_collar = db.Column(db.Integer)
 
+    __table_args__ = (
+        db.Index('ix_blue_collar_stats_season_player', 'season_id', 'player_id'),
+    )
+
 
 class OpponentBlueCollarStats(db.Model):
     id                = db.Column(db.Integer, primary_key=True)
@@ -325,19 +528,31 @@ class Possession(db.Model):
     points_scored       = db.Column(db.Integer, default=0)
     drill_labels       = db.Column(db.String(255))
 
+    __table_args__ = (
+        db.Index('ix_possession_season_side_segment', 'season_id', 'possession_side', 'time_segment'),
+    )
+
 
 class PlayerPossession(db.Model):
     id             = db.Column(db.Integer, primary_key=True)
     possession_id  = db.Column(db.Integer, db.ForeignKey('possession.id'), nullable=False, index=True)
-    player_id      = db.Column(db.Integer, db.ForeignKey('roster.id'), nullable=False, index=True)
+    player_id      = db.Column(db.Integer, db.ForeignKey('roster.id'), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_player_possession_player_possession', 'player_id', 'possession_id'),
+    )
 
 
 class ShotDetail(db.Model):
     """Detailed event or shot occurring within a possession."""
     id            = db.Column(db.Integer, primary_key=True)
-    possession_id = db.Column(db.Integer, db.ForeignKey('possession.id'), nullable=False, index=True)
+    possession_id = db.Column(db.Integer, db.ForeignKey('possession.id'), nullable=False)
     event_type    = db.Column(db.String(64), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_shot_detail_possession_event', 'possession_id', 'event_type'),
+    )
+
 
 class PnRStats(db.Model):
     __tablename__ = 'pnr_stats'
@@ -386,6 +601,58 @@ class PageView(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     user_agent = db.Column(db.String(256), nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_page_view_user_timestamp', 'user_id', 'timestamp'),
+    )
+
+
+class PageViewDaily(db.Model):
+    """Per-day view counts by user and endpoint, kept by the page-view writer.
+
+    Rows are incremented in place; concurrent writers may leave more than one
+    row per key, so readers always ``SUM(views)``.
+    """
+    __tablename__ = 'page_view_daily'
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    endpoint = db.Column(db.String(128), nullable=False)
+    views = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_page_view_daily_key', 'day', 'user_id', 'endpoint'),
+    )
+
+
+class IngestJob(db.Model):
+    """Parse/reparse work queued by the admin file routes.
+
+    ``services.ingest_jobs`` claims queued rows, runs them on its worker pool
+    and reports progress under ``progress_key``.
+    """
+    __tablename__ = 'ingest_job'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    file_id = db.Column(db.Integer, db.ForeignKey('uploaded_files.id', ondelete='SET NULL'), nullable=True)
+    payload = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_ingest_job_status', 'status', 'id'),
+        db.Index('ix_ingest_job_file_status', 'file_id', 'status'),
+    )
+
+    @property
+    def progress_key(self):
+        return f"ingest_job:{self.id}"
+
 
 class Setting(db.Model):
     __tablename__ = 'setting'
@@ -32,3 +32,10 @@ class UploadedFile(db.Model):
 
     # ✅ Category filter
     category       = db.Column(db.String(50), nullable=True)
+
+    # What the stored rows were parsed from: sha256 of the CSV, of the
+    # season roster, and the utils.bulk_persist.PARSER_VERSION at the time.
+    # Reparse skips a file whose fingerprints all still match.
+    content_hash   = db.Column(db.String(64), nullable=True)
+    roster_fingerprint = db.Column(db.String(64), nullable=True)
+    parser_version = db.Column(db.String(32), nullable=True)
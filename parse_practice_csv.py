@@ -9,13 +9,12 @@ import pandas as pd
 from flask import current_app
 from utils.lineup import compute_lineup_efficiencies, compute_player_on_off_by_team
 from models.database import (
-    db,
-    Roster,
-    PlayerStats,
     BlueCollarStats,
     Practice,
 )
-from models import Possession, PossessionPlayer, ShotDetail
+from utils.bulk_persist import IngestBatch, ingest_transaction
+from utils.roster_resolver import RosterResolver
+from services.stat_rollups import refresh_practice_rollups
 
 
 def safe_str(value):
@@ -79,13 +78,6 @@ SHOT_PREFIX_LOOKUP = {
 
 
 
-def get_roster_id(name, season_id):
-    """Lookup Roster.id by exact player_name & season."""
-    clean_name = name.strip() if isinstance(name, str) else name
-    row = Roster.query.filter_by(player_name=clean_name, season_id=season_id).first()
-    return row.id if row else None
-
-
 def extract_tokens(val):
     """Return list of comma-separated tokens from the cell value."""
     if pd.isna(val) or not isinstance(val, str):
@@ -271,7 +263,9 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
     player_detail_list  = defaultdict(list)
     possession_data     = []
     events              = defaultdict(lambda: defaultdict(int))
-    last_offense_possession = {}  # map team name → (Possession, [player names])
+    last_offense_possession = {}  # map team name → (possession row, [player names])
+    batch = IngestBatch()
+    roster = RosterResolver(season_id)  # one roster query for the whole file
     # ── Find all columns beginning with "#" to use for player tokens
     player_columns = [c for c in df.columns if _is_player_column(c)]
     # ─────────────────────────────────────────────────────────────────────
@@ -301,7 +295,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
             low_plus, low_minus = count_low_man_tokens_in_cells([cell_value])
             if not (plus or minus or low_plus or low_minus):
                 continue
-            roster_id = get_roster_id(col, season_id)
+            roster_id = roster.id_for(col)
             if roster_id is None:
                 continue
             stats = player_stats_dict[roster_id]
@@ -381,7 +375,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
             def_events = []
 
             if not skip_possession:
-                poss_off = Possession(
+                poss_off = batch.add_possession(
                     practice_id     = current_practice.id,
                     season_id       = season_id,
                     game_id         = 0,
@@ -395,21 +389,19 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                     points_scored   = points_scored,
                     drill_labels    = ",".join(labels) if labels else None,
                 )
-                db.session.add(poss_off)
-                db.session.flush()
 
                 for cell in str(row.get(off_col, '') or '').split(','):
                     name = cell.strip()
                     if not name:
                         continue
-                    pid = get_roster_id(name, season_id)
+                    pid = roster.id_for(name)
                     if pid is not None:
-                        db.session.add(PossessionPlayer(possession_id=poss_off.id, player_id=pid))
+                        batch.add_possession_player(poss_off, pid)
                         off_players.append(name)
 
                 last_offense_possession[offense_team] = (poss_off, off_players.copy())
 
-                def persist_events(poss_id, text):
+                def persist_events(poss, text):
                     hudl_labels = [
                         'ATR+', 'ATR-', '2FG+', '2FG-', '3FG+', '3FG-',
                         'FT+', 'Turnover', 'Foul'
@@ -418,22 +410,17 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                     for label in hudl_labels:
                         count = text.count(label)
                         for _ in range(count):
-                            db.session.add(ShotDetail(possession_id=poss_id, event_type=label))
+                            batch.add_shot_detail(poss, label)
 
                     fp1 = f"{offense_team} Fouled +1"
                     if fp1 in text:
-                        db.session.add(ShotDetail(possession_id=poss_id, event_type='FT+'))
+                        batch.add_shot_detail(poss, 'FT+')
 
                 # capture team offensive rebounds from the TEAM column
                 team_cell = row.get('TEAM', '')
                 for token in extract_tokens(team_cell):
                     if token == 'Off Reb':
-                        db.session.add(
-                            ShotDetail(
-                                possession_id=poss_off.id,
-                                event_type='TEAM Off Reb'
-                            )
-                        )
+                        batch.add_shot_detail(poss_off, 'TEAM Off Reb')
                         for player in off_players:
                             events[player]['team_off_reb_on'] = (
                                 events[player].get('team_off_reb_on', 0) + 1
@@ -447,9 +434,9 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                             events[p].get('team_misses_on', 0) + 1
                         )
 
-                persist_events(poss_off.id, row_text)
+                persist_events(poss_off, row_text)
 
-                poss_def = Possession(
+                poss_def = batch.add_possession(
                     practice_id     = current_practice.id,
                     season_id       = season_id,
                     game_id         = 0,
@@ -463,19 +450,17 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                     points_scored   = points_scored,
                     drill_labels    = ",".join(labels) if labels else None,
                 )
-                db.session.add(poss_def)
-                db.session.flush()
 
                 for cell in str(row.get(def_col, '') or '').split(','):
                     name = cell.strip()
                     if not name:
                         continue
-                    pid = get_roster_id(name, season_id)
+                    pid = roster.id_for(name)
                     if pid is not None:
-                        db.session.add(PossessionPlayer(possession_id=poss_def.id, player_id=pid))
+                        batch.add_possession_player(poss_def, pid)
                         def_players.append(name)
 
-                persist_events(poss_def.id, row_text)
+                persist_events(poss_def, row_text)
 
                 base = {
                     'possession_start': safe_str(p_start),
@@ -510,17 +495,17 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
             else:
                 poss_off, prev_off_players = last_offense_possession.get(offense_team, (None, []))
                 if poss_off is not None:
-                    poss_off.points_scored = (poss_off.points_scored or 0) + points_scored
+                    poss_off["points_scored"] = (poss_off["points_scored"] or 0) + points_scored
                     for label in ['ATR+','ATR-','2FG+','2FG-','3FG+','3FG-','FT+','Turnover','Foul']:
                         count = row_text.count(label)
                         for _ in range(count):
-                            db.session.add(ShotDetail(possession_id=poss_off.id, event_type=label))
+                            batch.add_shot_detail(poss_off, label)
                     if f"{offense_team} Fouled +1" in row_text:
-                        db.session.add(ShotDetail(possession_id=poss_off.id, event_type='FT+'))
+                        batch.add_shot_detail(poss_off, 'FT+')
                     team_cell = row.get('TEAM', '')
                     for token in extract_tokens(team_cell):
                         if token == 'Off Reb':
-                            db.session.add(ShotDetail(possession_id=poss_off.id, event_type='TEAM Off Reb'))
+                            batch.add_shot_detail(poss_off, 'TEAM Off Reb')
                             if not off_reb_row:
                                 for player in prev_off_players:
                                     events[player]['team_off_reb_on'] += 1
@@ -539,7 +524,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                 tokens = split_tokens(row.get(col, ""))
                 if not tokens:
                     continue
-                roster_id = get_roster_id(col, season_id)
+                roster_id = roster.id_for(col)
                 if roster_id is None:
                     continue
                 slot = player_stats_dict[roster_id]
@@ -569,7 +554,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                 tokens = split_tokens(row.get(col, ""))
                 if not tokens:
                     continue
-                roster_id = get_roster_id(col, season_id)
+                roster_id = roster.id_for(col)
                 if roster_id is None:
                     continue
                 slot = player_stats_dict[roster_id]
@@ -593,7 +578,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                 tokens = split_tokens(row.get(col, ""))
                 if not tokens:
                     continue
-                roster_id = get_roster_id(col, season_id)
+                roster_id = roster.id_for(col)
                 if roster_id is None:
                     continue
                 slot = player_stats_dict[roster_id]
@@ -619,7 +604,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                 tokens = split_tokens(row.get(col, ""))
                 if not tokens:
                     continue
-                roster_id = get_roster_id(col, season_id)
+                roster_id = roster.id_for(col)
                 if roster_id is None:
                     continue
                 slot = player_stats_dict[roster_id]
@@ -662,7 +647,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                 if not tokens:
                     continue
 
-                roster_id = get_roster_id(col, season_id)
+                roster_id = roster.id_for(col)
                 if roster_id is None:
                     continue
 
@@ -721,7 +706,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                     player_token = token[token.index("#") :]
                     clean_name = player_token.split("#")[-1].strip()
                     clean_name = "#" + clean_name
-                    roster_id = get_roster_id(clean_name, season_id)
+                    roster_id = roster.id_for(clean_name)
                     if roster_id is None:
                         continue
 
@@ -750,7 +735,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                 if not tokens:
                     continue
 
-                roster_id = get_roster_id(col, season_id)
+                roster_id = roster.id_for(col)
                 if roster_id is None:
                     continue
 
@@ -802,7 +787,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
                 if not tokens:
                     continue
 
-                roster_id = get_roster_id(col, season_id)
+                roster_id = roster.id_for(col)
                 if roster_id is None:
                     continue
 
@@ -983,7 +968,7 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
             cell = str(row.get(row_type.strip(), "") or "").strip()
             if cell:
                 tokens = [t.strip() for t in cell.split(",") if t.strip()]
-                roster_id = get_roster_id(row_type, season_id)
+                roster_id = roster.id_for(row_type)
                 if roster_id is not None:
                     blue_collar_mapping = {
                         "Reb Tip":      "reb_tip",
@@ -1030,113 +1015,115 @@ def parse_practice_csv(practice_csv_path, season_id=None, category=None, file_da
         shots = player_shot_list.get(roster_id, [])
         details = player_detail_list.get(roster_id, [])
         
-        # 1) Insert PlayerStats
-        db.session.add(
-            PlayerStats(
-                player_name       = db.session.get(Roster, roster_id).player_name,
-                season_id         = season_id,
-                practice_id       = practice_id,
-                game_id           = None,
-                
-                points            = stats.get("points", 0),
-                assists           = stats.get("assists", 0),
-                pot_assists       = stats.get("pot_assists", 0),
-                second_assists    = stats.get("second_assists", 0),
-                turnovers         = stats.get("turnovers", 0),
-                
-                atr_makes         = stats.get("atr_makes", 0),
-                atr_attempts      = stats.get("atr_attempts", 0),
-                fg2_makes         = stats.get("fg2_makes", 0),
-                fg2_attempts      = stats.get("fg2_attempts", 0),
-                fg3_makes         = stats.get("fg3_makes", 0),
-                fg3_attempts      = stats.get("fg3_attempts", 0),
-
-                ftm               = stats.get("ftm", 0),
-                fta               = stats.get("fta", 0),
-                foul_by           = stats.get("foul_by", 0),
-                contest_front     = stats.get("contest_front", 0),
-                contest_side      = stats.get("contest_side", 0),
-                contest_behind    = stats.get("contest_behind", 0),
-                contest_late      = stats.get("contest_late", 0),
-                contest_no        = stats.get("contest_no", 0),
-                contest_early     = stats.get("contest_early", 0),
-                atr_contest_attempts    = stats.get("atr_contest_attempts", 0),
-                atr_contest_makes       = stats.get("atr_contest_makes", 0),
-                atr_late_attempts       = stats.get("atr_late_attempts", 0),
-                atr_late_makes          = stats.get("atr_late_makes", 0),
-                atr_no_contest_attempts = stats.get("atr_no_contest_attempts", 0),
-                atr_no_contest_makes    = stats.get("atr_no_contest_makes", 0),
-                fg2_contest_attempts    = stats.get("fg2_contest_attempts", 0),
-                fg2_contest_makes       = stats.get("fg2_contest_makes", 0),
-                fg2_late_attempts       = stats.get("fg2_late_attempts", 0),
-                fg2_late_makes          = stats.get("fg2_late_makes", 0),
-                fg2_no_contest_attempts = stats.get("fg2_no_contest_attempts", 0),
-                fg2_no_contest_makes    = stats.get("fg2_no_contest_makes", 0),
-                fg3_contest_attempts    = stats.get("fg3_contest_attempts", 0),
-                fg3_contest_makes       = stats.get("fg3_contest_makes", 0),
-                fg3_late_attempts       = stats.get("fg3_late_attempts", 0),
-                fg3_late_makes          = stats.get("fg3_late_makes", 0),
-                fg3_no_contest_attempts = stats.get("fg3_no_contest_attempts", 0),
-                fg3_no_contest_makes    = stats.get("fg3_no_contest_makes", 0),
-                pass_contest_positive = stats.get("pass_contest_positive", 0),
-                pass_contest_missed   = stats.get("pass_contest_missed", 0),
-                bump_positive     = stats.get("bump_positive", 0),
-                bump_missed       = stats.get("bump_missed", 0),
-                blowby_total      = stats.get("blowby_total", 0),
-                blowby_triple_threat = stats.get("blowby_triple_threat", 0),
-                blowby_closeout    = stats.get("blowby_closeout", 0),
-                blowby_isolation   = stats.get("blowby_isolation", 0),
-
-                # --- Practice rebounding & gap metrics ---
-                crash_positive        = stats.get("crash_positive", 0),
-                crash_missed          = stats.get("crash_missed", 0),
-                back_man_positive     = stats.get("back_man_positive", 0),
-                back_man_missed       = stats.get("back_man_missed", 0),
-                box_out_positive      = stats.get("box_out_positive", 0),
-                box_out_missed        = stats.get("box_out_missed", 0),
-                off_reb_given_up      = stats.get("off_reb_given_up", 0),
-                collision_gap_positive = stats.get("collision_gap_positive", 0),
-                collision_gap_missed   = stats.get("collision_gap_missed", 0),
-                pnr_gap_positive      = stats.get("pnr_gap_positive", 0),
-                pnr_gap_missed        = stats.get("pnr_gap_missed", 0),
-                low_help_positive     = stats.get("low_help_positive", 0),
-                low_help_missed       = stats.get("low_help_missed", 0),
-                close_window_positive = stats.get("close_window_positive", 0),
-                close_window_missed   = stats.get("close_window_missed", 0),
-                shut_door_positive    = stats.get("shut_door_positive", 0),
-                shut_door_missed      = stats.get("shut_door_missed", 0),
-
-                practice_wins     = stats.get("practice_wins", 0),
-                practice_losses   = stats.get("practice_losses", 0),
-                sprint_wins       = stats.get("sprint_wins", 0),
-                sprint_losses     = stats.get("sprint_losses", 0),
-
-                shot_type_details = json.dumps(shots) if shots else None,
-                stat_details      = json.dumps(details) if details else None
-            )
+        # 1) Insert PlayerStats (and one PlayerShotDetail per shot)
+        batch.add_player_stats(
+            shots,
+            player_name       = roster.name_for(roster_id),
+            season_id         = season_id,
+            practice_id       = practice_id,
+            game_id           = None,
+            
+            points            = stats.get("points", 0),
+            assists           = stats.get("assists", 0),
+            pot_assists       = stats.get("pot_assists", 0),
+            second_assists    = stats.get("second_assists", 0),
+            turnovers         = stats.get("turnovers", 0),
+            
+            atr_makes         = stats.get("atr_makes", 0),
+            atr_attempts      = stats.get("atr_attempts", 0),
+            fg2_makes         = stats.get("fg2_makes", 0),
+            fg2_attempts      = stats.get("fg2_attempts", 0),
+            fg3_makes         = stats.get("fg3_makes", 0),
+            fg3_attempts      = stats.get("fg3_attempts", 0),
+
+            ftm               = stats.get("ftm", 0),
+            fta               = stats.get("fta", 0),
+            foul_by           = stats.get("foul_by", 0),
+            contest_front     = stats.get("contest_front", 0),
+            contest_side      = stats.get("contest_side", 0),
+            contest_behind    = stats.get("contest_behind", 0),
+            contest_late      = stats.get("contest_late", 0),
+            contest_no        = stats.get("contest_no", 0),
+            contest_early     = stats.get("contest_early", 0),
+            atr_contest_attempts    = stats.get("atr_contest_attempts", 0),
+            atr_contest_makes       = stats.get("atr_contest_makes", 0),
+            atr_late_attempts       = stats.get("atr_late_attempts", 0),
+            atr_late_makes          = stats.get("atr_late_makes", 0),
+            atr_no_contest_attempts = stats.get("atr_no_contest_attempts", 0),
+            atr_no_contest_makes    = stats.get("atr_no_contest_makes", 0),
+            fg2_contest_attempts    = stats.get("fg2_contest_attempts", 0),
+            fg2_contest_makes       = stats.get("fg2_contest_makes", 0),
+            fg2_late_attempts       = stats.get("fg2_late_attempts", 0),
+            fg2_late_makes          = stats.get("fg2_late_makes", 0),
+            fg2_no_contest_attempts = stats.get("fg2_no_contest_attempts", 0),
+            fg2_no_contest_makes    = stats.get("fg2_no_contest_makes", 0),
+            fg3_contest_attempts    = stats.get("fg3_contest_attempts", 0),
+            fg3_contest_makes       = stats.get("fg3_contest_makes", 0),
+            fg3_late_attempts       = stats.get("fg3_late_attempts", 0),
+            fg3_late_makes          = stats.get("fg3_late_makes", 0),
+            fg3_no_contest_attempts = stats.get("fg3_no_contest_attempts", 0),
+            fg3_no_contest_makes    = stats.get("fg3_no_contest_makes", 0),
+            pass_contest_positive = stats.get("pass_contest_positive", 0),
+            pass_contest_missed   = stats.get("pass_contest_missed", 0),
+            bump_positive     = stats.get("bump_positive", 0),
+            bump_missed       = stats.get("bump_missed", 0),
+            blowby_total      = stats.get("blowby_total", 0),
+            blowby_triple_threat = stats.get("blowby_triple_threat", 0),
+            blowby_closeout    = stats.get("blowby_closeout", 0),
+            blowby_isolation   = stats.get("blowby_isolation", 0),
+
+            # --- Practice rebounding & gap metrics ---
+            crash_positive        = stats.get("crash_positive", 0),
+            crash_missed          = stats.get("crash_missed", 0),
+            back_man_positive     = stats.get("back_man_positive", 0),
+            back_man_missed       = stats.get("back_man_missed", 0),
+            box_out_positive      = stats.get("box_out_positive", 0),
+            box_out_missed        = stats.get("box_out_missed", 0),
+            off_reb_given_up      = stats.get("off_reb_given_up", 0),
+            collision_gap_positive = stats.get("collision_gap_positive", 0),
+            collision_gap_missed   = stats.get("collision_gap_missed", 0),
+            pnr_gap_positive      = stats.get("pnr_gap_positive", 0),
+            pnr_gap_missed        = stats.get("pnr_gap_missed", 0),
+            low_help_positive     = stats.get("low_help_positive", 0),
+            low_help_missed       = stats.get("low_help_missed", 0),
+            close_window_positive = stats.get("close_window_positive", 0),
+            close_window_missed   = stats.get("close_window_missed", 0),
+            shut_door_positive    = stats.get("shut_door_positive", 0),
+            shut_door_missed      = stats.get("shut_door_missed", 0),
+
+            practice_wins     = stats.get("practice_wins", 0),
+            practice_losses   = stats.get("practice_losses", 0),
+            sprint_wins       = stats.get("sprint_wins", 0),
+            sprint_losses     = stats.get("sprint_losses", 0),
+
+            shot_type_details = json.dumps(shots) if shots else None,
+            stat_details      = json.dumps(details) if details else None
         )
         
         # 2) Insert BlueCollarStats
         total_bcp = sum(blues.get(k, 0) * blue_collar_values[k] for k in blues)
-        db.session.add(
-            BlueCollarStats(
-                season_id         = season_id,
-                practice_id       = practice_id,
-                player_id         = roster_id,
-                total_blue_collar = total_bcp,
-                
-                reb_tip       = blues.get("reb_tip", 0),
-                def_reb       = blues.get("def_reb", 0),
-                misc          = blues.get("misc", 0),
-                deflection    = blues.get("deflection", 0),
-                steal         = blues.get("steal", 0),
-                block         = blues.get("block", 0),
-                off_reb       = blues.get("off_reb", 0),
-                floor_dive    = blues.get("floor_dive", 0),
-                charge_taken  = blues.get("charge_taken", 0),
-            )
+        batch.add(
+            BlueCollarStats,
+            season_id         = season_id,
+            practice_id       = practice_id,
+            player_id         = roster_id,
+            total_blue_collar = total_bcp,
+            
+            reb_tip       = blues.get("reb_tip", 0),
+            def_reb       = blues.get("def_reb", 0),
+            misc          = blues.get("misc", 0),
+            deflection    = blues.get("deflection", 0),
+            steal         = blues.get("steal", 0),
+            block         = blues.get("block", 0),
+            off_reb       = blues.get("off_reb", 0),
+            floor_dive    = blues.get("floor_dive", 0),
+            charge_taken  = blues.get("charge_taken", 0),
         )
-    db.session.commit()
+
+    # Possessions, their children and the player rows land together.
+    with ingest_transaction():
+        batch.write()
+        refresh_practice_rollups(current_practice)
 
     # ─── Compute lineup and on/off metrics ───────────────────────────
     lineup_efficiencies = compute_lineup_efficiencies(
@@ -1162,7 +1149,8 @@ if __name__ == "__main__":
     season_id = int(season_id_str)
 
     # ── Import `app` only now, to avoid circular imports ────────────────
-    from app import app
+    from app import create_app
+    app = create_app(lightweight=True)
     # ─────────────────────────────────────────────────────────────────
 
     # Push the Flask context so `db.session.add(...)` works
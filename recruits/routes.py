@@ -29,7 +29,8 @@ import importlib.util
 from pathlib import Path
 from app.utils.coach_names import normalize_coach_name, get_alias_variants
 from app.recruits.workbook_utils import active_workbook_df, normalize_name, parse_pick, to_int_or_none
-from app.recruits.workbook_utils import normalize_money_columns
+from app.recruits.workbook_utils import add_money_keys, build_money_snapshot, discard_money_snapshot
+from app.recruits.workbook_utils import MoneyCube, active_money_cube
 from app.models import Coach
 
 # --- START PATCH: imports for workbook manager ---
@@ -510,60 +511,27 @@ def money_board():
     sort = request.args.get('sort', default='net_desc')
 
     try:
-        df = active_workbook_df()
+        cube = active_money_cube()
     except Exception:
-        df = pd.DataFrame(columns=['Coach','Player','Team','Year','Projected $','Actual $','Projected Pick','Actual Pick','__sheet'])
+        cube = MoneyCube(add_money_keys(pd.DataFrame(columns=['Coach','Player','Team','Year','Projected $','Actual $','Projected Pick','Actual Pick','__sheet'])))
 
-    df = normalize_money_columns(df)
-
-    has_data = not df.empty
-    if df.empty:
+    has_data = cube.has_rows
+    if not has_data:
         years = []
         sheets = []
         confs = []
     else:
-        df = df[df['Coach'].notna()].copy()
-        df['Coach_norm'] = df['Coach'].map(normalize_name)
-        df['Year_int'] = df['Year'].map(to_int_or_none)
-        years = sorted([y for y in df['Year_int'].dropna().unique()])
-        sheets = sorted([s for s in df['__sheet'].dropna().unique()])
-
-        # Determine which column represents the coach's conference. Older
-        # workbooks used ``Coach Conf`` while newer ones store
-        # ``Coach Current Conference``.  We want to support either so the
-        # Money Board shows conference information regardless of the workbook
-        # version.
-        conf_col = None
-        if 'Coach Current Conference' in df.columns:
-            conf_col = 'Coach Current Conference'
-        elif 'Coach Conf' in df.columns:
-            conf_col = 'Coach Conf'
-
-        confs = sorted(df[conf_col].dropna().unique()) if conf_col else []
-
-        if year_min is not None:
-            df = df[df['Year_int'].ge(year_min)]
-        if year_max is not None:
-            df = df[df['Year_int'].le(year_max)]
-        if sheet:
-            df = df[df['__sheet'] == sheet]
-        if conf and conf_col:
-            df = df[df[conf_col] == conf]
-
-        player_df = df[df['Player'].notna()].copy()
-        player_df['NET $'] = player_df['Actual $'] - player_df['Projected $']
-
-        agg = (player_df.groupby(['Coach','Coach_norm'], dropna=False)
-                       .agg(recruits=('Player','nunique'),
-                            proj_sum=('Projected $','sum'),
-                            act_sum=('Actual $','sum'),
-                            net_sum=('NET $','sum'))
-                       .reset_index())
-
-        all_coaches = (df[['Coach','Coach_norm']]
-                         .drop_duplicates('Coach_norm')
-                         .sort_values('Coach')
-                         .to_dict('records'))
+        # Years/sheets/conferences and the per-coach sums come from the
+        # precomputed cube; only the cells matching the filters are summed.
+        # The cube resolves the conference column (``Coach Current
+        # Conference`` on newer workbooks, ``Coach Conf`` on older ones).
+        years = cube.years()
+        sheets = cube.sheets()
+        confs = cube.confs()
+
+        picked = cube.select(year_min=year_min, year_max=year_max, sheet=sheet, conf=conf)
+        agg = picked.totals()
+        all_coaches = picked.coaches()
 
         have = set(agg['Coach_norm'])
         missing = [c for c in all_coaches if c['Coach_norm'] not in have]
@@ -579,29 +547,10 @@ def money_board():
             } for m in missing])
             agg = pd.concat([agg, filler], ignore_index=True)
 
-        # Determine the appropriate team and conference columns. Similar to the
-        # conference handling above, we support both the legacy and current
-        # column names so that the Team and Conf values appear on the Money
-        # Board regardless of the workbook schema.
-        team_col = None
-        if 'Coach Current Team' in df.columns:
-            team_col = 'Coach Current Team'
-        elif 'Coach Team' in df.columns:
-            team_col = 'Coach Team'
-
-        team_map = {}
-        if team_col:
-            team_map = (df[['Coach_norm', team_col]]
-                          .dropna()
-                          .drop_duplicates('Coach_norm')
-                          .set_index('Coach_norm')[team_col].to_dict())
-
-        conf_map = {}
-        if conf_col:
-            conf_map = (df[['Coach_norm', conf_col]]
-                         .dropna()
-                         .drop_duplicates('Coach_norm')
-                         .set_index('Coach_norm')[conf_col].to_dict())
+        # Team and Conf shown per coach: the first value in workbook row
+        # order, for either the legacy or current column names.
+        team_map = picked.first_by_coach('Team') if cube.team_col else {}
+        conf_map = picked.first_by_coach('Conf') if cube.conf_col else {}
 
         agg['coach_team'] = agg['Coach_norm'].map(team_map).fillna('')
         agg['coach_conf'] = agg['Coach_norm'].map(conf_map).fillna('')
@@ -823,13 +772,11 @@ def money_compare():
     sort     = request.args.get("sort") or ""
 
     try:
-        df = active_workbook_df()
+        cube = active_money_cube()
     except Exception:
-        df = pd.DataFrame(columns=['Coach','Player','Team','Year','Projected $','Actual $','Projected Pick','Actual Pick','__sheet'])
-
-    df = normalize_money_columns(df)
+        cube = MoneyCube(add_money_keys(pd.DataFrame(columns=['Coach','Player','Team','Year','Projected $','Actual $','Projected Pick','Actual Pick','__sheet'])))
 
-    if df.empty:
+    if not cube.has_rows:
         coach_list = _get_coach_names()
         coach_options = [{'Coach': name, 'Coach_norm': normalize_name(name)} for name in coach_list]
         comps: list[dict] = []
@@ -845,31 +792,17 @@ def money_compare():
             not_enough=not_enough,
         )
 
-    df = df[df['Coach'].notna()].copy()
-    df['Coach_norm'] = df['Coach'].map(normalize_name)
-    df['Year_int'] = df['Year'].map(to_int_or_none)
-
-    if year_min is not None:
-        df = df[df['Year_int'].ge(year_min)]
-    if year_max is not None:
-        df = df[df['Year_int'].le(year_max)]
-    if sheet:
-        df = df[df['__sheet'] == sheet]
-    if conf and 'Coach Conf' in df.columns:
-        df = df[df['Coach Conf'] == conf]
-
-    coach_options = (df[['Coach','Coach_norm']]
-                     .drop_duplicates('Coach_norm')
-                     .sort_values('Coach')
-                     .to_dict('records'))
+    picked = cube.select(year_min=year_min, year_max=year_max, sheet=sheet, conf=conf)
+    coach_options = picked.coaches()
+    totals = picked.totals(keys=['Coach_norm']).set_index('Coach_norm')
 
     comps: list[dict] = []
     players_by_coach: dict[str, list[dict]] = {}
 
     for disp in selected_display:
         key = normalize_name(disp)
-        slice_df = df[df['Coach_norm'] == key].copy()
-        player_df = slice_df[slice_df['Player'].notna()].copy()
+        player_df = picked.rows_for(key)
+        player_df = player_df[player_df['Player'].notna()]
 
         if not player_df.empty and 'Year' in player_df.columns:
             _year = pd.to_numeric(player_df['Year'], errors='coerce')
@@ -895,10 +828,14 @@ def money_compare():
 
         roster = [row_to_item(r) for _, r in player_df.iterrows()] if not player_df.empty else []
 
-        proj_sum = float(player_df['Projected $'].sum()) if not player_df.empty else 0.0
-        act_sum  = float(player_df['Actual $'].sum()) if not player_df.empty else 0.0
+        if key in totals.index:
+            proj_sum = float(totals.at[key, 'proj_sum'])
+            act_sum  = float(totals.at[key, 'act_sum'])
+            recruits = int(totals.at[key, 'recruits'])
+        else:
+            proj_sum = act_sum = 0.0
+            recruits = 0
         net_sum  = act_sum - proj_sum
-        recruits = int(player_df['Player'].nunique()) if not player_df.empty else 0
         avg_net  = (net_sum / recruits) if recruits else 0.0
 
         comps.append({
@@ -1033,9 +970,8 @@ def _compare_df(by: str = "coach"):
     Build an aggregated table for comparison by coach or team.
     Returns (df, display_col) where display_col is 'Coach' or 'Team'.
     """
-    # Load and normalize workbook
+    # Normalized workbook snapshot (money columns already coerced)
     df = active_workbook_df()
-    df = normalize_money_columns(df)
 
     # Keep rows that represent actual players
     df = df[df['Player'].astype(str).str.strip().ne('')]
@@ -1137,6 +1073,12 @@ def money_workbook_upload():
     f.save(tmp)
     os.replace(tmp, dest)
 
+    # Convert once into the normalized snapshot the Money Board views read
+    try:
+        build_money_snapshot(dest)
+    except Exception as e:
+        current_app.logger.exception(f"[Workbook] Snapshot build failed: {e}")
+
     # Update manifest
     _save_manifest({
         "original_filename": filename,
@@ -1169,7 +1111,11 @@ def money_workbook_delete():
             current_app.logger.exception(f"[Workbook] Delete failed: {e}")
             flash(f"Could not delete file: {e}", "danger")
             return redirect(url_for("recruits.money_workbook"))
-    # clear manifest too
+    # clear snapshot and manifest too
+    try:
+        discard_money_snapshot(_wb_path())
+    except Exception:
+        pass
     try:
         if os.path.exists(_manifest_path()):
             os.remove(_manifest_path())
@@ -27,7 +27,7 @@ def _load_shots(blob) -> list[Mapping]:
 
 
 def main() -> None:
-    app = create_app()
+    app = create_app(lightweight=True)
     with app.app_context():
         stats: Iterable[PlayerStats] = PlayerStats.query.options(
             selectinload(PlayerStats.player_shot_details)
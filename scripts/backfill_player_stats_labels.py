@@ -0,0 +1,39 @@
+"""Backfill player_stats_label rows from the serialized JSON blobs."""
+
+from sqlalchemy import insert, select
+
+from app import create_app
+from models.database import PlayerStats, PlayerStatsLabel, db
+from utils.shottype import player_stats_labels
+
+CHUNK_SIZE = 1000
+
+
+def main() -> None:
+    app = create_app(lightweight=True)
+    with app.app_context():
+        labelled = select(PlayerStatsLabel.player_stats_id)
+        rows = (
+            db.session.query(PlayerStats.id, PlayerStats.shot_type_details, PlayerStats.stat_details)
+            .filter(PlayerStats.id.notin_(labelled))
+            .filter((PlayerStats.shot_type_details.isnot(None)) | (PlayerStats.stat_details.isnot(None)))
+            .all()
+        )
+        pending = []
+        updated = 0
+        for stat_id, shot_blob, stat_blob in rows:
+            labels = player_stats_labels(shot_blob, stat_blob)
+            if labels:
+                updated += 1
+            pending.extend({"player_stats_id": stat_id, "label": label} for label in labels)
+        for start in range(0, len(pending), CHUNK_SIZE):
+            db.session.execute(insert(PlayerStatsLabel), pending[start:start + CHUNK_SIZE])
+        db.session.commit()
+        print(
+            f"✅ Backfill complete. Labelled {updated} PlayerStats rows with "
+            f"{len(pending)} PlayerStatsLabel records."
+        )
+
+
+if __name__ == "__main__":
+    main()
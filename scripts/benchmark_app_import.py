@@ -0,0 +1,57 @@
+"""Compare import/startup cost of the full and lightweight Flask app factories.
+
+Usage: python scripts/benchmark_app_import.py [--top N]
+
+Runs each factory in a fresh interpreter under ``python -X importtime`` and
+prints wall time plus the slowest top-level imports by cumulative time.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "full": "import app; app.create_app()",
+    "lightweight": "import app; app.create_app(lightweight=True)",
+}
+
+
+def _run(snippet):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT), SKIP_CREATE_ALL="1")
+    env.pop("FLASK_CREATE_APP", None)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, raw_name = line[len("import time:"):].split("|")
+        # Nested imports are indented under their importer; keep top-level ones.
+        if cum.strip().isdigit() and not raw_name[1:].startswith(" "):
+            rows.append((int(cum), raw_name.strip()))
+    return proc.returncode, elapsed, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for mode, snippet in MODES.items():
+        code, elapsed, rows = _run(snippet)
+        print(f"{mode}: {elapsed * 1000:.0f} ms wall, {len(rows)} modules (exit {code})")
+        for cum, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"  {cum / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
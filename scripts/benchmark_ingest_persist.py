@@ -0,0 +1,121 @@
+"""Benchmark the ingest persistence stage: per-row ORM adds vs bulk executemany.
+
+Usage: python scripts/benchmark_ingest_persist.py [game.csv ...] [--repeat N]
+
+Each run parses the CSV once, then writes the same rows into a fresh SQLite
+file twice -- once the way ``parse_csv`` used to (``db.session.add`` per row,
+flush per possession) and once through ``persist_game_rows`` -- and reports
+rows/sec for both.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+from flask import Flask
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.database import (  # noqa: E402
+    db,
+    Season,
+    Game,
+    Roster,
+    PlayerStats,
+    Possession,
+    PlayerPossession,
+    ShotDetail,
+)
+from models.user import User  # noqa: E402,F401  (page_view.user_id FK target)
+from test_parse import parse_game_dataframe, persist_game_rows  # noqa: E402
+from utils.bulk_persist import ingest_transaction  # noqa: E402
+from utils.shottype import serialize_shot_details  # noqa: E402
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "sample_game_csv"
+
+
+def _fresh_app(db_path, players):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="bench", start_date=date(2025, 1, 1)))
+        db.session.add(Game(id=1, season_id=1, game_date=date(2025, 1, 1), opponent_name="Bench"))
+        db.session.add_all(Roster(season_id=1, player_name=name) for name in players)
+        db.session.commit()
+    return app
+
+
+def _legacy_write(parsed):
+    """Per-row adds with a flush per possession, as parse_csv used to do."""
+    valid_cols = {c.name for c in PlayerStats.__table__.columns}
+    rows = 0
+    for name, stats in parsed["player_stats"].items():
+        values = {k: v for k, v in stats.items() if k in valid_cols and not isinstance(v, (dict, list))}
+        values.update(game_id=1, season_id=1, player_name=name,
+                      shot_type_details=serialize_shot_details(stats.get("shot_type_details")))
+        db.session.add(PlayerStats(**values))
+        rows += 1
+    db.session.commit()
+    roster = {r.player_name: r.id for r in Roster.query}
+    for poss in parsed["possessions"]:
+        new_poss = Possession(game_id=1, season_id=1, possession_side=poss.get("side", ""),
+                              points_scored=poss.get("points_scored", 0))
+        db.session.add(new_poss)
+        db.session.flush()
+        rows += 1
+        for pid in {roster[p.strip()] for p in poss.get("players_on_floor", []) if p.strip() in roster}:
+            db.session.add(PlayerPossession(possession_id=new_poss.id, player_id=pid))
+            rows += 1
+        for tok in poss.get("events", []):
+            db.session.add(ShotDetail(possession_id=new_poss.id, event_type=tok))
+            rows += 1
+    db.session.commit()
+    return rows
+
+
+def _bulk_write(parsed):
+    with ingest_transaction():
+        written = persist_game_rows(parsed, 1, 1)
+    return sum(written.values())
+
+
+def _time_writer(writer, parsed, players, repeat):
+    best, rows = None, 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = _fresh_app(os.path.join(tmp, "bench.db"), players)
+            with app.app_context():
+                start = time.perf_counter()
+                rows = writer(parsed)
+                elapsed = time.perf_counter() - start
+                db.session.remove()
+                db.engine.dispose()
+        best = elapsed if best is None else min(best, elapsed)
+    return rows, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for csv_path in args.csv or sorted(DEFAULT_DIR.glob("*.csv")):
+        df = pd.read_csv(csv_path)
+        players = [c for c in df.columns if str(c).startswith("#")]
+        parsed = parse_game_dataframe(df, 1, 1)
+        print(csv_path.name)
+        for label, writer in (("before (per-row)", _legacy_write), ("after (bulk)", _bulk_write)):
+            rows, elapsed = _time_writer(writer, parsed, players, args.repeat)
+            print(f"  {label:<17} {rows:>6} rows  {elapsed * 1000:8.1f} ms  {rows / elapsed:10.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
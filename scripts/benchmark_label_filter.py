@@ -0,0 +1,120 @@
+"""Benchmark labelled leaderboard queries: ilike over JSON blobs vs player_stats_label.
+
+Usage: python scripts/benchmark_label_filter.py [--sizes 2000 20000 100000] [--repeat N]
+
+Each size builds a fresh SQLite season with that many practice ``PlayerStats``
+rows (random drill labels on shots and stat events), then times the per-player
+points sum behind a labelled leaderboard with the old OR'd ``ilike`` clauses
+and with :func:`utils.shottype.player_stats_label_filter`.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from flask import Flask
+from sqlalchemy import func, insert, or_
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.database import db, Season, Practice, PlayerStats, PlayerStatsLabel  # noqa: E402
+from models.user import User  # noqa: E402,F401  (page_view.user_id FK target)
+from utils.shottype import player_stats_label_filter, player_stats_labels  # noqa: E402
+
+LABELS = ["SCRIMMAGE", "4V4 DRILLS", "3V3", "SHELL", "TRANSITION", "SPECIAL SITUATIONS", "BLOCK", "POST"]
+PLAYERS = [f"#{n} Player" for n in range(15)]
+QUERY_LABELS = {"4V4 DRILLS", "SHELL"}
+
+
+def _fresh_app(db_path, size, rng):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="bench", start_date=date(2025, 1, 1)))
+        practices = max(1, size // len(PLAYERS))
+        db.session.execute(
+            insert(Practice),
+            [
+                {"id": pid, "season_id": 1, "date": date(2025, 1, 1) + timedelta(days=pid), "category": "Official"}
+                for pid in range(1, practices + 1)
+            ],
+        )
+        stats, labels = [], []
+        for stat_id in range(1, size + 1):
+            shots = [
+                {"shot_class": rng.choice(["atr", "2fg", "3fg"]), "result": "made",
+                 "drill_labels": [rng.choice(LABELS)]}
+                for _ in range(rng.randint(0, 6))
+            ]
+            events = [{"event": "assists", "drill_labels": [rng.choice(LABELS)]} for _ in range(rng.randint(0, 3))]
+            shot_blob = json.dumps(shots) if shots else None
+            stat_blob = json.dumps(events) if events else None
+            stats.append({
+                "id": stat_id, "season_id": 1, "practice_id": (stat_id - 1) // len(PLAYERS) % practices + 1,
+                "player_name": PLAYERS[stat_id % len(PLAYERS)], "points": rng.randint(0, 20),
+                "shot_type_details": shot_blob, "stat_details": stat_blob,
+            })
+            labels.extend({"player_stats_id": stat_id, "label": lbl} for lbl in player_stats_labels(shot_blob, stat_blob))
+        db.session.execute(insert(PlayerStats), stats)
+        db.session.execute(insert(PlayerStatsLabel), labels)
+        db.session.commit()
+    return app
+
+
+def _ilike_filter(label_set):
+    clauses = []
+    for lbl in label_set:
+        pattern = f"%{lbl}%"
+        clauses.append(PlayerStats.shot_type_details.ilike(pattern))
+        clauses.append(PlayerStats.stat_details.ilike(pattern))
+    return or_(*clauses)
+
+
+def _leaderboard(criterion):
+    return (
+        db.session.query(PlayerStats.player_name, func.sum(PlayerStats.points))
+        .filter(PlayerStats.season_id == 1, PlayerStats.practice_id.isnot(None), criterion)
+        .group_by(PlayerStats.player_name)
+        .all()
+    )
+
+
+def _best(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="*", type=int, default=[2000, 20000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    print(f"{'rows':>8}  {'ilike':>10}  {'label index':>12}  speedup")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = _fresh_app(os.path.join(tmp, "bench.db"), size, rng)
+            with app.app_context():
+                before = _best(lambda: _leaderboard(_ilike_filter(QUERY_LABELS)), args.repeat)
+                after = _best(lambda: _leaderboard(player_stats_label_filter(QUERY_LABELS)), args.repeat)
+                db.session.remove()
+                db.engine.dispose()
+        print(f"{size:>8}  {before * 1000:8.1f} ms  {after * 1000:10.1f} ms  {before / after:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,21 @@ transformation logic.
 
 from __future__ import annotations
 
+import hashlib
 import math
+import operator
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum
+from functools import reduce
 from typing import Any, Callable, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence
 
+import numpy as np
 import pandas as pd
+from flask import current_app, has_app_context
 from sqlalchemy import and_, func
 from sqlalchemy.orm import aliased
 
@@ -58,7 +66,6 @@ class StudyDefinition:
     label: Optional[str] = None
 
 
-@dataclass(frozen=True)
 class Grouping(str, Enum):
     """Supported scatter point grouping modes."""
 
@@ -393,335 +400,6 @@ def _format_game_session_label(session_date: Optional[date], opponent: Optional[
     return "Game"
 
 
-def _load_practice_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    if scope.group_by is Grouping.PRACTICE:
-        return _load_practice_session_rows(scope)
-    if scope.group_by is Grouping.TEAM:
-        return _load_practice_team_rows(scope)
-    return _load_practice_player_rows(scope)
-
-
-def _load_practice_team_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    base_query = db.session.query(
-        func.count(func.distinct(PlayerStats.practice_id)).label("practice_count"),
-        *[
-            func.coalesce(func.sum(getattr(PlayerStats, field)), 0).label(field)
-            for field in _PRACTICE_PLAYER_FIELDS
-        ],
-    ).filter(PlayerStats.practice_id.isnot(None))
-
-    if scope.start_date or scope.end_date:
-        base_query = base_query.join(Practice, PlayerStats.practice_id == Practice.id)
-        if scope.start_date:
-            base_query = base_query.filter(Practice.date >= scope.start_date)
-        if scope.end_date:
-            base_query = base_query.filter(Practice.date <= scope.end_date)
-
-    base_query = base_query.filter(PlayerStats.season_id == scope.season_id)
-
-    if scope.roster_ids:
-        base_query = base_query.join(
-            Roster,
-            and_(
-                PlayerStats.player_name == Roster.player_name,
-                PlayerStats.season_id == Roster.season_id,
-            ),
-        ).filter(Roster.id.in_(scope.roster_ids))
-
-    base_result = base_query.one_or_none()
-
-    blue_query = db.session.query(
-        *[
-            func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0).label(field)
-            for field in _PRACTICE_BLUE_FIELDS
-        ]
-    ).filter(BlueCollarStats.practice_id.isnot(None))
-
-    if scope.start_date or scope.end_date:
-        blue_query = blue_query.join(Practice, BlueCollarStats.practice_id == Practice.id)
-        if scope.start_date:
-            blue_query = blue_query.filter(Practice.date >= scope.start_date)
-        if scope.end_date:
-            blue_query = blue_query.filter(Practice.date <= scope.end_date)
-
-    blue_query = blue_query.filter(BlueCollarStats.season_id == scope.season_id)
-
-    if scope.roster_ids:
-        blue_query = blue_query.filter(BlueCollarStats.player_id.in_(scope.roster_ids))
-
-    blue_result = blue_query.one_or_none()
-
-    if base_result is None and blue_result is None:
-        return {}
-
-    row: Dict[str, Any] = {
-        "label": "Team Total",
-        "grouping": Grouping.TEAM.value,
-        "group_label": None,
-        "row_key": "team",
-    }
-
-    if base_result:
-        row["practice_count"] = int(base_result.practice_count or 0)
-        for field in _PRACTICE_PLAYER_FIELDS:
-            row[field] = _as_float(getattr(base_result, field))
-
-    if blue_result:
-        for field in _PRACTICE_BLUE_FIELDS:
-            row[field] = _as_float(getattr(blue_result, field))
-
-    numeric_values = [row.get(field, 0.0) for field in _PRACTICE_PLAYER_FIELDS]
-    blue_values = [row.get(field, 0.0) for field in _PRACTICE_BLUE_FIELDS]
-    if not any(value not in (0.0, None) for value in numeric_values + blue_values):
-        return {}
-
-    if scope.include_team_total:
-        return {"team": row}
-
-    return {}
-
-
-def _load_practice_player_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    roster_query = Roster.query.filter(Roster.season_id == scope.season_id)
-    if scope.roster_ids:
-        roster_query = roster_query.filter(Roster.id.in_(scope.roster_ids))
-
-    roster_entries = roster_query.all()
-    if not roster_entries:
-        return {}
-
-    rows: Dict[int, Dict[str, Any]] = {
-        entry.id: {"player": entry.player_name, "roster_id": entry.id}
-        for entry in roster_entries
-    }
-
-    base_query = (
-        db.session.query(
-            Roster.id.label("roster_id"),
-            func.count(func.distinct(PlayerStats.practice_id)).label("practice_count"),
-            *[
-                func.coalesce(func.sum(getattr(PlayerStats, field)), 0).label(field)
-                for field in _PRACTICE_PLAYER_FIELDS
-            ],
-        )
-        .join(
-            PlayerStats,
-            and_(
-                PlayerStats.player_name == Roster.player_name,
-                PlayerStats.season_id == Roster.season_id,
-            ),
-        )
-        .filter(PlayerStats.practice_id.isnot(None))
-        .filter(PlayerStats.season_id == scope.season_id)
-    )
-
-    if scope.roster_ids:
-        base_query = base_query.filter(Roster.id.in_(scope.roster_ids))
-
-    if scope.start_date or scope.end_date:
-        base_query = base_query.join(Practice, PlayerStats.practice_id == Practice.id)
-        if scope.start_date:
-            base_query = base_query.filter(Practice.date >= scope.start_date)
-        if scope.end_date:
-            base_query = base_query.filter(Practice.date <= scope.end_date)
-
-    base_query = base_query.group_by(Roster.id)
-
-    for result in base_query.all():
-        row = rows.get(result.roster_id)
-        if not row:
-            continue
-        row["practice_count"] = int(result.practice_count or 0)
-        for field in _PRACTICE_PLAYER_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-
-    blue_query = (
-        db.session.query(
-            Roster.id.label("roster_id"),
-            *[
-                func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0).label(field)
-                for field in _PRACTICE_BLUE_FIELDS
-            ],
-        )
-        .join(BlueCollarStats, BlueCollarStats.player_id == Roster.id)
-        .filter(Roster.season_id == scope.season_id)
-        .filter(BlueCollarStats.practice_id.isnot(None))
-        .filter(BlueCollarStats.season_id == scope.season_id)
-    )
-
-    if scope.roster_ids:
-        blue_query = blue_query.filter(Roster.id.in_(scope.roster_ids))
-
-    if scope.start_date or scope.end_date:
-        blue_query = blue_query.join(Practice, BlueCollarStats.practice_id == Practice.id)
-        if scope.start_date:
-            blue_query = blue_query.filter(Practice.date >= scope.start_date)
-        if scope.end_date:
-            blue_query = blue_query.filter(Practice.date <= scope.end_date)
-
-    blue_query = blue_query.group_by(Roster.id)
-
-    for result in blue_query.all():
-        row = rows.get(result.roster_id)
-        if not row:
-            continue
-        for field in _PRACTICE_BLUE_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-
-    final: Dict[str, Dict[str, Any]] = {}
-    for row in rows.values():
-        numeric_values = [row.get(field, 0.0) for field in _PRACTICE_PLAYER_FIELDS]
-        blue_values = [row.get(field, 0.0) for field in _PRACTICE_BLUE_FIELDS]
-        if not any(value not in (0.0, None) for value in numeric_values + blue_values):
-            continue
-        key = row["player"]
-        row["player_name"] = row["player"]
-        row["label"] = row["player"]
-        row["group_label"] = None
-        row["grouping"] = Grouping.PLAYER.value
-        row["row_key"] = key
-        final[key] = row
-    return final
-
-
-def _load_practice_session_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    roster_query = Roster.query.filter(Roster.season_id == scope.season_id)
-    if scope.roster_ids:
-        roster_query = roster_query.filter(Roster.id.in_(scope.roster_ids))
-
-    roster_entries = roster_query.all()
-    if not roster_entries:
-        return {}
-
-    roster_lookup: Dict[int, Roster] = {entry.id: entry for entry in roster_entries}
-
-    base_query = (
-        db.session.query(
-            PlayerStats.practice_id.label("practice_id"),
-            Roster.id.label("roster_id"),
-            Roster.player_name.label("player_name"),
-            Practice.date.label("practice_date"),
-            Practice.category.label("practice_category"),
-            *[
-                func.coalesce(func.sum(getattr(PlayerStats, field)), 0).label(field)
-                for field in _PRACTICE_PLAYER_FIELDS
-            ],
-        )
-        .join(
-            Roster,
-            and_(
-                PlayerStats.player_name == Roster.player_name,
-                PlayerStats.season_id == Roster.season_id,
-            ),
-        )
-        .join(Practice, PlayerStats.practice_id == Practice.id)
-        .filter(PlayerStats.practice_id.isnot(None))
-        .filter(PlayerStats.season_id == scope.season_id)
-    )
-
-    if scope.roster_ids:
-        base_query = base_query.filter(Roster.id.in_(scope.roster_ids))
-
-    if scope.start_date:
-        base_query = base_query.filter(Practice.date >= scope.start_date)
-    if scope.end_date:
-        base_query = base_query.filter(Practice.date <= scope.end_date)
-
-    base_query = base_query.group_by(
-        PlayerStats.practice_id,
-        Roster.id,
-        Roster.player_name,
-        Practice.date,
-        Practice.category,
-    )
-
-    rows: Dict[tuple[int, int], Dict[str, Any]] = {}
-
-    for result in base_query.all():
-        practice_id = int(result.practice_id)
-        roster_id = int(result.roster_id)
-        key = (practice_id, roster_id)
-        row = rows.setdefault(
-            key,
-            {
-                "practice_id": practice_id,
-                "roster_id": roster_id,
-                "player": result.player_name,
-                "player_name": result.player_name,
-                "practice_date": result.practice_date,
-                "practice_category": result.practice_category,
-                "practice_count": 1,
-            },
-        )
-        for field in _PRACTICE_PLAYER_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-
-    blue_query = (
-        db.session.query(
-            BlueCollarStats.practice_id.label("practice_id"),
-            BlueCollarStats.player_id.label("roster_id"),
-            *[
-                func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0).label(field)
-                for field in _PRACTICE_BLUE_FIELDS
-            ],
-        )
-        .join(Roster, Roster.id == BlueCollarStats.player_id)
-        .join(Practice, BlueCollarStats.practice_id == Practice.id)
-        .filter(BlueCollarStats.practice_id.isnot(None))
-        .filter(BlueCollarStats.season_id == scope.season_id)
-    )
-
-    if scope.roster_ids:
-        blue_query = blue_query.filter(BlueCollarStats.player_id.in_(scope.roster_ids))
-
-    if scope.start_date:
-        blue_query = blue_query.filter(Practice.date >= scope.start_date)
-    if scope.end_date:
-        blue_query = blue_query.filter(Practice.date <= scope.end_date)
-
-    blue_query = blue_query.group_by(BlueCollarStats.practice_id, BlueCollarStats.player_id)
-
-    for result in blue_query.all():
-        practice_id = int(result.practice_id)
-        roster_id = int(result.roster_id)
-        key = (practice_id, roster_id)
-        row = rows.get(key)
-        if not row:
-            roster_entry = roster_lookup.get(roster_id)
-            if not roster_entry:
-                continue
-            row = rows.setdefault(
-                key,
-                {
-                    "practice_id": practice_id,
-                    "roster_id": roster_id,
-                    "player": roster_entry.player_name,
-                    "player_name": roster_entry.player_name,
-                    "practice_date": None,
-                    "practice_category": None,
-                    "practice_count": 1,
-                },
-            )
-        for field in _PRACTICE_BLUE_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-
-    final: Dict[str, Dict[str, Any]] = {}
-    for key, row in rows.items():
-        numeric_values = [row.get(field, 0.0) for field in _PRACTICE_PLAYER_FIELDS]
-        blue_values = [row.get(field, 0.0) for field in _PRACTICE_BLUE_FIELDS]
-        if not any(value not in (0.0, None) for value in numeric_values + blue_values):
-            continue
-        practice_label = _format_practice_session_label(row.get("practice_date"), row.get("practice_category"))
-        display_label = f"{row['player_name']} – {practice_label}"
-        point_key = f"practice:{row['practice_id']}:{row['roster_id']}"
-        row["label"] = display_label
-        row["group_label"] = practice_label
-        row["grouping"] = Grouping.PRACTICE.value
-        row["row_key"] = point_key
-        final[point_key] = row
-    return final
-
-
 # -- Game metric computation -------------------------------------------------
 
 
@@ -788,138 +466,192 @@ _GAME_METRICS = _game_metric_specs()
 SUPPORTED_GAME_METRICS: FrozenSet[str] = frozenset(_GAME_METRICS)
 
 
-def _load_game_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    if scope.group_by is Grouping.GAME:
-        return _load_game_session_rows(scope)
-    if scope.group_by is Grouping.TEAM:
-        return _load_game_team_rows(scope)
-    return _load_game_player_rows(scope)
+# -- Frame loading -----------------------------------------------------------
 
 
-def _load_game_team_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    base_query = db.session.query(
-        func.count(func.distinct(PlayerStats.game_id)).label("game_count"),
-        *[
-            func.coalesce(func.sum(getattr(PlayerStats, field)), 0).label(field)
-            for field in _GAME_PLAYER_FIELDS
-        ],
-    ).filter(PlayerStats.game_id.isnot(None))
+@dataclass(frozen=True)
+class _SourceTables:
+    """Columns that differ between the practice and game variants of a query."""
 
-    if scope.start_date or scope.end_date:
-        base_query = base_query.join(Game, PlayerStats.game_id == Game.id)
-        if scope.start_date:
-            base_query = base_query.filter(Game.game_date >= scope.start_date)
-        if scope.end_date:
-            base_query = base_query.filter(Game.game_date <= scope.end_date)
+    source: MetricSource
+    session: Any
+    session_date: Any
+    session_detail: Any
+    stat_session: Any
+    blue_session: Any
+    count_label: str
+    detail_label: str
+    stat_fields: Sequence[str]
+    extra_fields: Sequence[str]
+    metrics: Mapping[str, _MetricSpec]
+
+
+_PRACTICE_TABLES = _SourceTables(
+    source=MetricSource.PRACTICE,
+    session=Practice,
+    session_date=Practice.date,
+    session_detail=Practice.category,
+    stat_session=PlayerStats.practice_id,
+    blue_session=BlueCollarStats.practice_id,
+    count_label="practice_count",
+    detail_label="session_category",
+    stat_fields=_PRACTICE_PLAYER_FIELDS,
+    extra_fields=(),
+    metrics=_PRACTICE_METRICS,
+)
 
-    base_query = base_query.filter(PlayerStats.season_id == scope.season_id)
+_GAME_TABLES = _SourceTables(
+    source=MetricSource.GAME,
+    session=Game,
+    session_date=Game.game_date,
+    session_detail=Game.opponent_name,
+    stat_session=PlayerStats.game_id,
+    blue_session=BlueCollarStats.game_id,
+    count_label="game_count",
+    detail_label="opponent",
+    stat_fields=_GAME_PLAYER_FIELDS,
+    extra_fields=_GAME_ADDITIONAL_FIELDS,
+    metrics=_GAME_METRICS,
+)
 
-    if scope.roster_ids:
-        base_query = base_query.join(
-            Roster,
-            and_(
-                PlayerStats.player_name == Roster.player_name,
-                PlayerStats.season_id == Roster.season_id,
-            ),
-        ).filter(Roster.id.in_(scope.roster_ids))
+_TABLES: Dict[MetricSource, _SourceTables] = {
+    MetricSource.PRACTICE: _PRACTICE_TABLES,
+    MetricSource.GAME: _GAME_TABLES,
+}
 
-    base_result = base_query.one_or_none()
+_META_COLUMNS: Sequence[str] = (
+    "player_name",
+    "label",
+    "group_label",
+    "grouping",
+    "roster_id",
+    "session_id",
+    "session_type",
+    "session_category",
+    "opponent",
+    "session_date",
+)
 
-    opponent_query = db.session.query(
-        func.count(func.distinct(TeamStats.game_id)).label("game_count"),
-        func.coalesce(func.sum(TeamStats.total_turnovers), 0).label("opponent_turnovers"),
-    ).filter(
-        TeamStats.game_id.isnot(None),
-        TeamStats.season_id == scope.season_id,
-        TeamStats.is_opponent.is_(True),
-    )
+# Per-point activity columns, summed in SQL over every stat field so the
+# zero-activity filter does not depend on which fields were loaded.
+_STAT_ACTIVITY = "_stat_activity"
+_BLUE_ACTIVITY = "_blue_activity"
 
-    if scope.start_date or scope.end_date:
-        opponent_query = opponent_query.join(Game, TeamStats.game_id == Game.id)
-        if scope.start_date:
-            opponent_query = opponent_query.filter(Game.game_date >= scope.start_date)
-        if scope.end_date:
-            opponent_query = opponent_query.filter(Game.game_date <= scope.end_date)
+_FRAME_CACHE_KEY = "correlation_frames"
+_DEFAULT_FRAME_CACHE_SIZE = 32
+_DEFAULT_FRAME_CACHE_TTL = 5 * 60
+_FRAME_CACHE_LOCK = threading.Lock()
 
-    opponent_result = opponent_query.one_or_none()
 
-    blue_query = db.session.query(
-        *[
-            func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0).label(field)
-            for field in _PRACTICE_BLUE_FIELDS
-        ]
-    ).filter(BlueCollarStats.game_id.isnot(None))
+@dataclass(frozen=True)
+class _CachedFrame:
+    fields: FrozenSet[str]
+    frame: pd.DataFrame
+    loaded_at: float
 
-    if scope.start_date or scope.end_date:
-        blue_query = blue_query.join(Game, BlueCollarStats.game_id == Game.id)
-        if scope.start_date:
-            blue_query = blue_query.filter(Game.game_date >= scope.start_date)
-        if scope.end_date:
-            blue_query = blue_query.filter(Game.game_date <= scope.end_date)
 
-    blue_query = blue_query.filter(BlueCollarStats.season_id == scope.season_id)
+def _metric_spec(metric: MetricDefinition) -> _MetricSpec:
+    tables = _TABLES.get(metric.source)
+    if tables is None:
+        raise ValueError(f"Unsupported metric source '{metric.source}'")
+    spec = tables.metrics.get(metric.key)
+    if spec is None:
+        raise ValueError(f"Unsupported {metric.source.value} metric '{metric.key}'")
+    return spec
 
-    if scope.roster_ids:
-        blue_query = blue_query.filter(BlueCollarStats.player_id.in_(scope.roster_ids))
 
-    blue_result = blue_query.one_or_none()
+def _value_fields(tables: _SourceTables) -> Sequence[str]:
+    return (*tables.stat_fields, *_PRACTICE_BLUE_FIELDS, *tables.extra_fields)
 
-    rows: Dict[str, Dict[str, Any]] = {}
 
-    if scope.include_team_total and (base_result or blue_result):
-        row: Dict[str, Any] = {
-            "label": "Team Total",
-            "grouping": Grouping.TEAM.value,
-            "group_label": None,
-            "row_key": "team",
-            "player": "Team",
-        }
+def _frame(query) -> pd.DataFrame:
+    columns = [column["name"] for column in query.column_descriptions]
+    return pd.DataFrame.from_records(query.all(), columns=columns)
 
-        if base_result:
-            row["game_count"] = int(base_result.game_count or 0)
-            for field in _GAME_PLAYER_FIELDS:
-                row[field] = _as_float(getattr(base_result, field))
 
-        if opponent_result:
-            existing_count = int(row.get("game_count", 0) or 0)
-            opponent_count = int(opponent_result.game_count or 0)
-            row["game_count"] = opponent_count or existing_count
-            row["opponent_turnovers"] = _as_float(getattr(opponent_result, "opponent_turnovers"))
+def _sums(model, fields: Iterable[str]) -> list:
+    return [func.coalesce(func.sum(getattr(model, field)), 0).label(field) for field in fields]
 
-        row.setdefault("opponent_turnovers", 0.0)
 
-        if blue_result:
-            for field in _PRACTICE_BLUE_FIELDS:
-                row[field] = _as_float(getattr(blue_result, field))
+def _activity(aggregates: Iterable[Any], label: str):
+    """Sum of ``abs`` over ``aggregates``: non-zero iff any of them is non-zero."""
+    terms = [func.abs(func.coalesce(aggregate, 0)) for aggregate in aggregates]
+    return reduce(operator.add, terms).label(label)
 
-        numeric_values = [row.get(field, 0.0) for field in _GAME_PLAYER_FIELDS]
-        blue_values = [row.get(field, 0.0) for field in _PRACTICE_BLUE_FIELDS]
-        extra_values = [row.get(field, 0.0) for field in _GAME_ADDITIONAL_FIELDS]
-        if any(value not in (0.0, None) for value in numeric_values + blue_values + extra_values):
-            rows["team"] = row
 
-    opponent_stats = aliased(TeamStats)
+def _in_scope(query, tables: _SourceTables, scope: StudyScope):
+    if scope.start_date:
+        query = query.filter(tables.session_date >= scope.start_date)
+    if scope.end_date:
+        query = query.filter(tables.session_date <= scope.end_date)
+    if tables.source is MetricSource.GAME:
+        query = query.filter(Game.season_id == scope.season_id)
+    return query
+
+
+def _key_columns(tables: _SourceTables, by_session: bool, by_player: bool, roster_id) -> list:
+    keys = []
+    if by_session:
+        keys += [
+            (tables.session.id, "session_id"),
+            (tables.session_date, "session_date"),
+            (tables.session_detail, tables.detail_label),
+        ]
+    if by_player:
+        keys += [(roster_id, "roster_id"), (Roster.player_name, "player_name")]
+    return keys
+
+
+def _stat_frame(
+    tables: _SourceTables,
+    scope: StudyScope,
+    fields: Sequence[str],
+    *,
+    by_session: bool = False,
+    by_player: bool = False,
+    roster_only: bool = False,
+    opponent: Optional[Callable] = None,
+) -> pd.DataFrame:
+    """Sum ``PlayerStats`` columns for the scope, grouped by session and/or player.
+
+    Rows are limited to roster players when grouping by player, when
+    ``roster_only`` is set or when the scope narrows the roster. ``opponent``
+    is the aggregate (sum/max) applied to the opponent's ``TeamStats``
+    turnovers.
+    """
+
+    keys = _key_columns(tables, by_session, by_player, Roster.id)
+    columns = [column.label(name) for column, name in keys]
+    columns.append(func.count(func.distinct(tables.stat_session)).label(tables.count_label))
+    columns += _sums(PlayerStats, fields)
 
-    per_game_query = (
-        db.session.query(
-            PlayerStats.game_id.label("game_id"),
-            Game.game_date.label("game_date"),
-            Game.opponent_name.label("opponent"),
-            *[
-                func.coalesce(func.sum(getattr(PlayerStats, field)), 0).label(field)
-                for field in _GAME_PLAYER_FIELDS
-            ],
-            func.coalesce(func.sum(opponent_stats.total_turnovers), 0).label("opponent_turnovers"),
-        )
-        .join(
+    opponent_stats = aliased(TeamStats)
+    activity = [func.sum(getattr(PlayerStats, field)) for field in tables.stat_fields]
+    if opponent is not None:
+        opponent_turnovers = opponent(opponent_stats.total_turnovers)
+        columns.append(func.coalesce(opponent_turnovers, 0).label("opponent_turnovers"))
+        activity.append(opponent_turnovers)
+    columns.append(_activity(activity, _STAT_ACTIVITY))
+
+    query = (
+        db.session.query(*columns)
+        .select_from(PlayerStats)
+        .join(tables.session, tables.stat_session == tables.session.id)
+        .filter(tables.stat_session.isnot(None))
+        .filter(PlayerStats.season_id == scope.season_id)
+    )
+    if by_player or roster_only or scope.roster_ids:
+        query = query.join(
             Roster,
             and_(
                 PlayerStats.player_name == Roster.player_name,
                 PlayerStats.season_id == Roster.season_id,
             ),
         )
-        .join(Game, PlayerStats.game_id == Game.id)
-        .outerjoin(
+    if scope.roster_ids:
+        query = query.filter(Roster.id.in_(scope.roster_ids))
+    if opponent is not None:
+        query = query.outerjoin(
             opponent_stats,
             and_(
                 opponent_stats.game_id == PlayerStats.game_id,
@@ -927,407 +659,328 @@ def _load_game_team_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
                 opponent_stats.is_opponent.is_(True),
             ),
         )
-        .filter(PlayerStats.game_id.isnot(None))
-        .filter(PlayerStats.season_id == scope.season_id)
-        .filter(Game.season_id == scope.season_id)
-    )
-
-    if scope.roster_ids:
-        per_game_query = per_game_query.filter(Roster.id.in_(scope.roster_ids))
-
-    if scope.start_date:
-        per_game_query = per_game_query.filter(Game.game_date >= scope.start_date)
-    if scope.end_date:
-        per_game_query = per_game_query.filter(Game.game_date <= scope.end_date)
 
-    per_game_query = per_game_query.group_by(
-        PlayerStats.game_id,
-        Game.game_date,
-        Game.opponent_name,
+    query = _in_scope(query, tables, scope)
+    if keys:
+        query = query.group_by(*[column for column, _name in keys])
+    return _frame(query)
+
+
+def _blue_frame(
+    tables: _SourceTables,
+    scope: StudyScope,
+    fields: Sequence[str],
+    *,
+    by_session: bool = False,
+    by_player: bool = False,
+) -> pd.DataFrame:
+    """Sum ``BlueCollarStats`` columns, keyed like :func:`_stat_frame`."""
+
+    keys = _key_columns(tables, by_session, by_player, BlueCollarStats.player_id)
+    columns = [column.label(name) for column, name in keys] + _sums(BlueCollarStats, fields)
+    columns.append(
+        _activity(
+            (func.sum(getattr(BlueCollarStats, field)) for field in _PRACTICE_BLUE_FIELDS),
+            _BLUE_ACTIVITY,
+        )
     )
 
-    per_game_rows: Dict[int, Dict[str, Any]] = {}
-    for result in per_game_query.all():
-        game_id = int(result.game_id)
-        row = per_game_rows.setdefault(
-            game_id,
-            {
-                "game_id": game_id,
-                "player": "Team",
-                "player_name": "Team",
-                "game_date": result.game_date,
-                "opponent": result.opponent,
-                "game_count": 1,
-                "grouping": Grouping.TEAM.value,
-            },
-        )
-        for field in _GAME_PLAYER_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-        row["opponent_turnovers"] = _as_float(getattr(result, "opponent_turnovers"))
-
-    blue_per_game_query = (
-        db.session.query(
-            BlueCollarStats.game_id.label("game_id"),
-            *[
-                func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0).label(field)
-                for field in _PRACTICE_BLUE_FIELDS
-            ],
-        )
-        .join(Game, BlueCollarStats.game_id == Game.id)
-        .filter(BlueCollarStats.game_id.isnot(None))
+    query = (
+        db.session.query(*columns)
+        .select_from(BlueCollarStats)
+        .join(tables.session, tables.blue_session == tables.session.id)
+        .filter(tables.blue_session.isnot(None))
         .filter(BlueCollarStats.season_id == scope.season_id)
-        .filter(Game.season_id == scope.season_id)
     )
-
+    if by_player:
+        query = query.join(Roster, Roster.id == BlueCollarStats.player_id).filter(
+            Roster.season_id == scope.season_id
+        )
     if scope.roster_ids:
-        blue_per_game_query = blue_per_game_query.filter(BlueCollarStats.player_id.in_(scope.roster_ids))
+        query = query.filter(BlueCollarStats.player_id.in_(scope.roster_ids))
+
+    query = _in_scope(query, tables, scope)
+    if keys:
+        query = query.group_by(*[column for column, _name in keys])
+    return _frame(query)
+
+
+def _combine(stats: pd.DataFrame, blue: Optional[pd.DataFrame], keys: Sequence[str]) -> pd.DataFrame:
+    if blue is None or blue.empty:
+        return stats
+    if not keys:
+        return pd.concat([stats, blue], axis=1)
+    if stats.empty:
+        return blue
+    return stats.merge(blue, how="outer", on=list(keys))
+
+
+def _fill_values(frame: pd.DataFrame, tables: _SourceTables, fields: FrozenSet[str]) -> pd.DataFrame:
+    """Cast the loaded value columns to float, adding any requested one a side lacked.
+
+    A point with no ``PlayerStats`` (or no ``BlueCollarStats``) row keeps NaN
+    in that side's fields, so metrics built on them drop the point instead of
+    reading a zero. Counts and activity columns are zero-filled.
+    """
+    for column in _value_fields(tables):
+        if column in frame.columns:
+            frame[column] = frame[column].astype(float)
+        elif column in fields:
+            frame[column] = float("nan")
+    for column in (tables.count_label, _STAT_ACTIVITY, _BLUE_ACTIVITY):
+        if column in frame.columns:
+            frame[column] = frame[column].fillna(0).astype(float)
+        else:
+            frame[column] = 0.0
+    return frame
 
-    if scope.start_date:
-        blue_per_game_query = blue_per_game_query.filter(Game.game_date >= scope.start_date)
-    if scope.end_date:
-        blue_per_game_query = blue_per_game_query.filter(Game.game_date <= scope.end_date)
-
-    blue_per_game_query = blue_per_game_query.group_by(BlueCollarStats.game_id)
-
-    for result in blue_per_game_query.all():
-        game_id = int(result.game_id)
-        row = per_game_rows.get(game_id)
-        if not row:
-            row = per_game_rows.setdefault(
-                game_id,
-                {
-                    "game_id": game_id,
-                    "player": "Team",
-                    "player_name": "Team",
-                    "game_date": None,
-                    "opponent": None,
-                    "game_count": 1,
-                    "grouping": Grouping.TEAM.value,
-                },
-            )
-        for field in _PRACTICE_BLUE_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-
-    for row in per_game_rows.values():
-        numeric_values = [row.get(field, 0.0) for field in _GAME_PLAYER_FIELDS]
-        blue_values = [row.get(field, 0.0) for field in _PRACTICE_BLUE_FIELDS]
-        extra_values = [row.get(field, 0.0) for field in _GAME_ADDITIONAL_FIELDS]
-        if not any(value not in (0.0, None) for value in numeric_values + blue_values + extra_values):
-            continue
-        game_label = _format_game_session_label(row.get("game_date"), row.get("opponent"))
-        point_key = f"team-game:{row['game_id']}"
-        row["label"] = f"Team – {game_label}"
-        row["group_label"] = game_label
-        row["row_key"] = point_key
-        rows[point_key] = row
 
-    return rows
+def _split_fields(tables: _SourceTables, fields: FrozenSet[str]) -> tuple[list, list]:
+    stat_fields = [field for field in tables.stat_fields if field in fields]
+    blue_fields = [field for field in _PRACTICE_BLUE_FIELDS if field in fields]
+    return stat_fields, blue_fields
 
 
-def _load_game_player_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    roster_query = Roster.query.filter(Roster.season_id == scope.season_id)
-    if scope.roster_ids:
-        roster_query = roster_query.filter(Roster.id.in_(scope.roster_ids))
+def _load_player_frame(tables: _SourceTables, scope: StudyScope, fields: FrozenSet[str]) -> pd.DataFrame:
+    stat_fields, blue_fields = _split_fields(tables, fields)
+    keys = ("roster_id", "player_name")
+    stats = _stat_frame(
+        tables,
+        scope,
+        stat_fields,
+        by_player=True,
+        opponent=func.sum if tables.source is MetricSource.GAME else None,
+    )
+    blue = _blue_frame(tables, scope, blue_fields, by_player=True)
+    frame = _fill_values(_combine(stats, blue, keys), tables, fields)
+
+    frame["label"] = frame["player_name"]
+    frame["grouping"] = Grouping.PLAYER.value
+    frame = frame.drop_duplicates("player_name", keep="last")
+    return frame.set_index(frame["player_name"].rename(None))
+
+
+def _load_session_frame(tables: _SourceTables, scope: StudyScope, fields: FrozenSet[str]) -> pd.DataFrame:
+    stat_fields, blue_fields = _split_fields(tables, fields)
+    keys = ("session_id", "session_date", tables.detail_label, "roster_id", "player_name")
+    stats = _stat_frame(
+        tables,
+        scope,
+        stat_fields,
+        by_session=True,
+        by_player=True,
+        opponent=func.max if tables.source is MetricSource.GAME else None,
+    )
+    blue = _blue_frame(tables, scope, blue_fields, by_session=True, by_player=True)
+    frame = _fill_values(_combine(stats, blue, keys), tables, fields)
+
+    if tables.source is MetricSource.PRACTICE:
+        grouping = Grouping.PRACTICE
+        session_labels = [
+            _format_practice_session_label(when, category)
+            for when, category in zip(frame["session_date"], frame["session_category"])
+        ]
+    else:
+        grouping = Grouping.GAME
+        session_labels = [
+            _format_game_session_label(when, opponent)
+            for when, opponent in zip(frame["session_date"], frame["opponent"])
+        ]
 
-    roster_entries = roster_query.all()
-    if not roster_entries:
-        return {}
+    frame["group_label"] = session_labels
+    frame["label"] = [f"{name} – {label}" for name, label in zip(frame["player_name"], session_labels)]
+    frame["grouping"] = grouping.value
+    frame["session_type"] = tables.source.value
+    frame[tables.count_label] = 1.0
+    point_keys = [
+        f"{grouping.value}:{int(session_id)}:{int(roster_id)}"
+        for session_id, roster_id in zip(frame["session_id"], frame["roster_id"])
+    ]
+    return frame.set_index(pd.Index(point_keys, dtype=object))
 
-    rows: Dict[int, Dict[str, Any]] = {
-        entry.id: {"player": entry.player_name, "roster_id": entry.id}
-        for entry in roster_entries
-    }
 
-    opponent_stats = aliased(TeamStats)
+def _load_team_frame(tables: _SourceTables, scope: StudyScope, fields: FrozenSet[str]) -> pd.DataFrame:
+    stat_fields, blue_fields = _split_fields(tables, fields)
+    parts = []
 
-    game_query = (
-        db.session.query(
-            Roster.id.label("roster_id"),
-            func.count(func.distinct(PlayerStats.game_id)).label("game_count"),
-            *[
-                func.coalesce(func.sum(getattr(PlayerStats, field)), 0).label(field)
-                for field in _GAME_PLAYER_FIELDS
-            ],
-            func.coalesce(func.sum(opponent_stats.total_turnovers), 0).label("opponent_turnovers"),
-        )
-        .join(
-            PlayerStats,
-            and_(
-                PlayerStats.player_name == Roster.player_name,
-                PlayerStats.season_id == Roster.season_id,
-            ),
+    if scope.include_team_total:
+        total = _combine(
+            _stat_frame(tables, scope, stat_fields),
+            _blue_frame(tables, scope, blue_fields),
+            (),
         )
-        .join(Game, PlayerStats.game_id == Game.id)
-        .outerjoin(
-            opponent_stats,
-            and_(
-                opponent_stats.game_id == PlayerStats.game_id,
-                opponent_stats.season_id == scope.season_id,
-                opponent_stats.is_opponent.is_(True),
+        if tables.source is MetricSource.GAME:
+            opponent_query = _in_scope(
+                db.session.query(
+                    func.count(func.distinct(TeamStats.game_id)).label("opponent_games"),
+                    func.coalesce(func.sum(TeamStats.total_turnovers), 0).label("opponent_turnovers"),
+                )
+                .join(Game, TeamStats.game_id == Game.id)
+                .filter(
+                    TeamStats.game_id.isnot(None),
+                    TeamStats.season_id == scope.season_id,
+                    TeamStats.is_opponent.is_(True),
+                ),
+                tables,
+                scope,
+            )
+            opponent = opponent_query.one()
+            if opponent.opponent_games:
+                total["game_count"] = int(opponent.opponent_games)
+            total["opponent_turnovers"] = _as_float(opponent.opponent_turnovers)
+            total[_STAT_ACTIVITY] += abs(total["opponent_turnovers"])
+            total["player_name"] = "Team"
+        total["label"] = "Team Total"
+        total["grouping"] = Grouping.TEAM.value
+        parts.append(total.set_index(pd.Index(["team"], dtype=object)))
+
+    if tables.source is MetricSource.GAME:
+        # Opponent turnovers are a per-game figure: take the max across the
+        # player rows the join fans out to rather than summing them.
+        per_game = _combine(
+            _stat_frame(
+                tables,
+                scope,
+                stat_fields,
+                by_session=True,
+                roster_only=True,
+                opponent=func.max,
             ),
+            _blue_frame(tables, scope, blue_fields, by_session=True),
+            ("session_id", "session_date", tables.detail_label),
         )
-        .filter(PlayerStats.game_id.isnot(None))
-        .filter(PlayerStats.season_id == scope.season_id)
-        .filter(Game.season_id == scope.season_id)
-    )
+        game_labels = [
+            _format_game_session_label(when, opponent)
+            for when, opponent in zip(per_game["session_date"], per_game["opponent"])
+        ]
+        per_game["group_label"] = game_labels
+        per_game["label"] = [f"Team – {label}" for label in game_labels]
+        per_game["player_name"] = "Team"
+        per_game["grouping"] = Grouping.TEAM.value
+        per_game["session_type"] = MetricSource.GAME.value
+        per_game["game_count"] = 1.0
+        point_keys = [f"team-game:{int(game_id)}" for game_id in per_game["session_id"]]
+        parts.append(per_game.set_index(pd.Index(point_keys, dtype=object)))
 
-    if scope.roster_ids:
-        game_query = game_query.filter(Roster.id.in_(scope.roster_ids))
+    if not parts:
+        return pd.DataFrame()
+    return _fill_values(pd.concat(parts), tables, fields)
 
-    if scope.start_date:
-        game_query = game_query.filter(Game.game_date >= scope.start_date)
-    if scope.end_date:
-        game_query = game_query.filter(Game.game_date <= scope.end_date)
 
-    game_query = game_query.group_by(Roster.id)
+def _build_frame(scope: StudyScope, source: MetricSource, fields: FrozenSet[str]) -> pd.DataFrame:
+    """Load one row per scatter point for ``source``, summing only ``fields``."""
 
-    for result in game_query.all():
-        row = rows.get(result.roster_id)
-        if not row:
-            continue
-        row["game_count"] = int(result.game_count or 0)
-        for field in _GAME_PLAYER_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-        row["opponent_turnovers"] = _as_float(getattr(result, "opponent_turnovers"))
-
-    blue_query = (
-        db.session.query(
-            Roster.id.label("roster_id"),
-            *[
-                func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0).label(field)
-                for field in _PRACTICE_BLUE_FIELDS
-            ],
+    tables = _TABLES[source]
+    if scope.group_by is Grouping.TEAM:
+        frame = _load_team_frame(tables, scope, fields)
+    elif scope.group_by is Grouping.PRACTICE or scope.group_by is Grouping.GAME:
+        frame = _load_session_frame(tables, scope, fields)
+    else:
+        frame = _load_player_frame(tables, scope, fields)
+    return frame.reindex(columns=[*frame.columns, *[c for c in _META_COLUMNS if c not in frame.columns]])
+
+
+def _scope_hash(scope: StudyScope, source: MetricSource) -> str:
+    payload = repr(
+        (
+            source.value,
+            scope.season_id,
+            tuple(sorted(scope.roster_ids or ())),
+            scope.start_date,
+            scope.end_date,
+            scope.group_by.value,
+            scope.include_team_total,
         )
-        .join(BlueCollarStats, BlueCollarStats.player_id == Roster.id)
-        .filter(Roster.season_id == scope.season_id)
-        .filter(BlueCollarStats.game_id.isnot(None))
-        .filter(BlueCollarStats.season_id == scope.season_id)
     )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-    if scope.roster_ids:
-        blue_query = blue_query.filter(Roster.id.in_(scope.roster_ids))
 
-    if scope.start_date or scope.end_date:
-        blue_query = blue_query.join(Game, BlueCollarStats.game_id == Game.id)
-        if scope.start_date:
-            blue_query = blue_query.filter(Game.game_date >= scope.start_date)
-        if scope.end_date:
-            blue_query = blue_query.filter(Game.game_date <= scope.end_date)
+def _frame_cache() -> "OrderedDict[str, _CachedFrame]":
+    return current_app.extensions.setdefault(_FRAME_CACHE_KEY, OrderedDict())
 
-    blue_query = blue_query.group_by(Roster.id)
 
-    for result in blue_query.all():
-        row = rows.get(result.roster_id)
-        if not row:
-            continue
-        for field in _PRACTICE_BLUE_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-
-    final: Dict[str, Dict[str, Any]] = {}
-    for row in rows.values():
-        numeric_values = [row.get(field, 0.0) for field in _GAME_PLAYER_FIELDS]
-        blue_values = [row.get(field, 0.0) for field in _PRACTICE_BLUE_FIELDS]
-        extra_values = [row.get(field, 0.0) for field in _GAME_ADDITIONAL_FIELDS]
-        if not any(value not in (0.0, None) for value in numeric_values + blue_values + extra_values):
-            continue
-        key = row["player"]
-        row["player_name"] = row["player"]
-        row["label"] = row["player"]
-        row["group_label"] = None
-        row["grouping"] = Grouping.PLAYER.value
-        row["row_key"] = key
-        final[key] = row
-    return final
-
-
-def _load_game_session_rows(scope: StudyScope) -> Dict[str, Dict[str, Any]]:
-    roster_query = Roster.query.filter(Roster.season_id == scope.season_id)
-    if scope.roster_ids:
-        roster_query = roster_query.filter(Roster.id.in_(scope.roster_ids))
+def _load_frame(scope: StudyScope, source: MetricSource, fields: FrozenSet[str]) -> pd.DataFrame:
+    """Return the (memoized) point frame for ``source`` covering ``fields``.
 
-    roster_entries = roster_query.all()
-    if not roster_entries:
-        return {}
+    Frames are kept in a per-app LRU keyed by the scope hash. A cached frame
+    is reused whenever it already holds every requested field; otherwise the
+    union of both field sets is loaded so switching back stays a hit.
+    ``CORRELATION_FRAME_CACHE_SIZE`` bounds the LRU and
+    ``CORRELATION_FRAME_CACHE_TTL`` caps how long a frame is trusted for
+    edits that bypass :func:`invalidate_correlation_frames`.
+    """
 
-    roster_lookup: Dict[int, Roster] = {entry.id: entry for entry in roster_entries}
-
-    opponent_stats = aliased(TeamStats)
+    config = current_app.config
+    max_entries = int(config.get("CORRELATION_FRAME_CACHE_SIZE", _DEFAULT_FRAME_CACHE_SIZE))
+    ttl = float(config.get("CORRELATION_FRAME_CACHE_TTL", _DEFAULT_FRAME_CACHE_TTL))
+    key = _scope_hash(scope, source)
+    now = time.monotonic()
 
-    game_query = (
-        db.session.query(
-            PlayerStats.game_id.label("game_id"),
-            Roster.id.label("roster_id"),
-            Roster.player_name.label("player_name"),
-            Game.game_date.label("game_date"),
-            Game.opponent_name.label("opponent"),
-            *[
-                func.coalesce(func.sum(getattr(PlayerStats, field)), 0).label(field)
-                for field in _GAME_PLAYER_FIELDS
-            ],
-            func.coalesce(func.max(opponent_stats.total_turnovers), 0).label("opponent_turnovers"),
-        )
-        .join(
-            Roster,
-            and_(
-                PlayerStats.player_name == Roster.player_name,
-                PlayerStats.season_id == Roster.season_id,
-            ),
-        )
-        .join(Game, PlayerStats.game_id == Game.id)
-        .outerjoin(
-            opponent_stats,
-            and_(
-                opponent_stats.game_id == PlayerStats.game_id,
-                opponent_stats.season_id == scope.season_id,
-                opponent_stats.is_opponent.is_(True),
-            ),
-        )
-        .filter(PlayerStats.game_id.isnot(None))
-        .filter(PlayerStats.season_id == scope.season_id)
-        .filter(Game.season_id == scope.season_id)
-    )
+    with _FRAME_CACHE_LOCK:
+        cache = _frame_cache()
+        entry = cache.get(key)
+        if entry is not None and now - entry.loaded_at > ttl:
+            cache.pop(key, None)
+            entry = None
+        if entry is not None and fields <= entry.fields:
+            cache.move_to_end(key)
+            return entry.frame
+        wanted = fields | entry.fields if entry is not None else fields
 
-    if scope.roster_ids:
-        game_query = game_query.filter(Roster.id.in_(scope.roster_ids))
+    frame = _build_frame(scope, source, wanted)
 
-    if scope.start_date:
-        game_query = game_query.filter(Game.game_date >= scope.start_date)
-    if scope.end_date:
-        game_query = game_query.filter(Game.game_date <= scope.end_date)
-
-    game_query = game_query.group_by(
-        PlayerStats.game_id,
-        Roster.id,
-        Roster.player_name,
-        Game.game_date,
-        Game.opponent_name,
-    )
+    with _FRAME_CACHE_LOCK:
+        cache = _frame_cache()
+        cache[key] = _CachedFrame(fields=wanted, frame=frame, loaded_at=now)
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+    return frame
 
-    rows: Dict[tuple[int, int], Dict[str, Any]] = {}
 
-    for result in game_query.all():
-        game_id = int(result.game_id)
-        roster_id = int(result.roster_id)
-        key = (game_id, roster_id)
-        row = rows.setdefault(
-            key,
-            {
-                "game_id": game_id,
-                "roster_id": roster_id,
-                "player": result.player_name,
-                "player_name": result.player_name,
-                "game_date": result.game_date,
-                "opponent": result.opponent,
-                "game_count": 1,
-            },
-        )
-        for field in _GAME_PLAYER_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-        row["opponent_turnovers"] = _as_float(getattr(result, "opponent_turnovers"))
-
-    blue_query = (
-        db.session.query(
-            BlueCollarStats.game_id.label("game_id"),
-            BlueCollarStats.player_id.label("roster_id"),
-            *[
-                func.coalesce(func.sum(getattr(BlueCollarStats, field)), 0).label(field)
-                for field in _PRACTICE_BLUE_FIELDS
-            ],
-        )
-        .join(Roster, Roster.id == BlueCollarStats.player_id)
-        .join(Game, BlueCollarStats.game_id == Game.id)
-        .filter(BlueCollarStats.game_id.isnot(None))
-        .filter(BlueCollarStats.season_id == scope.season_id)
-        .filter(Game.season_id == scope.season_id)
-    )
+def invalidate_correlation_frames() -> None:
+    """Drop every memoized correlation frame for the current app."""
+    if not has_app_context():
+        return
+    with _FRAME_CACHE_LOCK:
+        current_app.extensions.pop(_FRAME_CACHE_KEY, None)
 
-    if scope.roster_ids:
-        blue_query = blue_query.filter(BlueCollarStats.player_id.in_(scope.roster_ids))
 
-    if scope.start_date:
-        blue_query = blue_query.filter(Game.game_date >= scope.start_date)
-    if scope.end_date:
-        blue_query = blue_query.filter(Game.game_date <= scope.end_date)
-
-    blue_query = blue_query.group_by(BlueCollarStats.game_id, BlueCollarStats.player_id)
-
-    for result in blue_query.all():
-        game_id = int(result.game_id)
-        roster_id = int(result.roster_id)
-        key = (game_id, roster_id)
-        row = rows.get(key)
-        if not row:
-            roster_entry = roster_lookup.get(roster_id)
-            if not roster_entry:
-                continue
-            row = rows.setdefault(
-                key,
-                {
-                    "game_id": game_id,
-                    "roster_id": roster_id,
-                    "player": roster_entry.player_name,
-                    "player_name": roster_entry.player_name,
-                    "game_date": None,
-                    "opponent": None,
-                    "game_count": 1,
-                },
-            )
-        for field in _PRACTICE_BLUE_FIELDS:
-            row[field] = _as_float(getattr(result, field))
-
-    final: Dict[str, Dict[str, Any]] = {}
-    for key, row in rows.items():
-        numeric_values = [row.get(field, 0.0) for field in _GAME_PLAYER_FIELDS]
-        blue_values = [row.get(field, 0.0) for field in _PRACTICE_BLUE_FIELDS]
-        extra_values = [row.get(field, 0.0) for field in _GAME_ADDITIONAL_FIELDS]
-        if not any(value not in (0.0, None) for value in numeric_values + blue_values + extra_values):
-            continue
-        game_label = _format_game_session_label(row.get("game_date"), row.get("opponent"))
-        display_label = f"{row['player_name']} – {game_label}"
-        point_key = f"game:{row['game_id']}:{row['roster_id']}"
-        row["label"] = display_label
-        row["group_label"] = game_label
-        row["grouping"] = Grouping.GAME.value
-        row["row_key"] = point_key
-        final[point_key] = row
-    return final
+def _active_points(frame: pd.DataFrame) -> pd.DataFrame:
+    """Drop points with no activity in any stat field, studied or not."""
+    if frame.empty:
+        return frame
+    return frame[frame[[_STAT_ACTIVITY, _BLUE_ACTIVITY]].ne(0).any(axis=1)]
 
 
 # -- Metric extraction -------------------------------------------------------
 
 
-def _metric_series(
-    metric: MetricDefinition,
-    practice_rows: Mapping[str, Mapping[str, Any]],
-    game_rows: Mapping[str, Mapping[str, Any]],
-) -> pd.Series:
-    if metric.source is MetricSource.PRACTICE:
-        spec = _PRACTICE_METRICS.get(metric.key)
-        if spec is None:
-            raise ValueError(f"Unsupported practice metric '{metric.key}'")
-        return _series_from_rows(practice_rows, spec)
-
-    if metric.source is MetricSource.GAME:
-        spec = _GAME_METRICS.get(metric.key)
-        if spec is None:
-            raise ValueError(f"Unsupported game metric '{metric.key}'")
-        return _series_from_rows(game_rows, spec)
-
-    raise ValueError(f"Unsupported metric source '{metric.source}'")
-
-
-def _series_from_rows(rows: Mapping[str, Mapping[str, Any]], spec: _MetricSpec) -> pd.Series:
-    if not rows:
+def _series_from_frame(frame: pd.DataFrame, spec: _MetricSpec) -> pd.Series:
+    if frame.empty:
         return pd.Series(dtype=float)
 
-    values: Dict[str, float] = {}
-    for player, data in rows.items():
+    # Missing fields read as ``None`` so the spec helpers treat them as absent.
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    values = []
+    for data in records:
         value = spec.compute(data)
-        if value is None:
-            values[player] = float("nan")
-        else:
-            values[player] = float(value)
-    return pd.Series(values, dtype=float)
+        values.append(float("nan") if value is None else float(value))
+    return pd.Series(values, index=frame.index, dtype=float)
+
+
+def _register_points(point_meta: Dict[str, Dict[str, Any]], frame: pd.DataFrame) -> None:
+    for key, data in frame[list(_META_COLUMNS)].to_dict("index").items():
+        meta = point_meta.setdefault(key, {})
+        for column, value in data.items():
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            if column in ("roster_id", "session_id"):
+                value = int(value)
+            if column in ("session_id", "session_type"):
+                meta[column] = value
+            else:
+                meta.setdefault(column, value)
 
 
 def _coerce_metric(defn: Mapping[str, Any] | MetricDefinition) -> MetricDefinition:
@@ -1416,6 +1069,40 @@ def _coerce_scope(scope: StudyScope | Mapping[str, Any]) -> StudyScope:
     )
 
 
+def _check_grouping(scope: StudyScope, metrics: Iterable[MetricDefinition]) -> None:
+    sources = {metric.source for metric in metrics}
+    if scope.group_by is Grouping.PRACTICE and sources - {MetricSource.PRACTICE}:
+        raise ValueError("Practice grouping can only be used with practice metrics")
+    if scope.group_by is Grouping.GAME and sources - {MetricSource.GAME}:
+        raise ValueError("Game grouping can only be used with game metrics")
+
+
+def _load_metric_frames(
+    scope: StudyScope, metrics: Sequence[MetricDefinition]
+) -> Dict[MetricSource, pd.DataFrame]:
+    """Load the active points of every source ``metrics`` reference.
+
+    The metrics are validated before the database is touched; each source is
+    loaded once with the union of the fields its metrics need. Points are kept
+    when any stat field is non-zero, so a study's sample does not depend on
+    which other studies share the request.
+    """
+
+    _check_grouping(scope, metrics)
+    fields_by_source: Dict[MetricSource, set] = {}
+    for metric in metrics:
+        spec = _metric_spec(metric)
+        fields_by_source.setdefault(metric.source, set()).update(spec.required_fields)
+
+    frames: Dict[MetricSource, pd.DataFrame] = {}
+    for source in (MetricSource.PRACTICE, MetricSource.GAME):
+        if source not in fields_by_source:
+            continue
+        fields = frozenset(fields_by_source[source])
+        frames[source] = _active_points(_load_frame(scope, source, fields))
+    return frames
+
+
 # -- Public entry point ------------------------------------------------------
 
 
@@ -1423,70 +1110,29 @@ def run_studies(
     studies: Sequence[StudyDefinition | Mapping[str, Any]],
     scope: StudyScope | Mapping[str, Any],
 ) -> Dict[str, Any]:
-    """Execute correlation studies for the supplied scope."""
+    """Execute correlation studies for the supplied scope.
+
+    Only the sources and fields referenced by ``studies`` are loaded, and the
+    loaded frames are memoized per scope (see :func:`_load_frame`).
+    """
 
     normalized_scope = _coerce_scope(scope)
-    practice_rows = _load_practice_rows(normalized_scope)
-    game_rows = _load_game_rows(normalized_scope)
+    study_defs = [_coerce_study(study) for study in studies]
+    frames = _load_metric_frames(
+        normalized_scope,
+        [metric for study_def in study_defs for metric in (study_def.x, study_def.y)],
+    )
 
     # Build metadata for every scatter point key (player or session).
     point_meta: Dict[str, Dict[str, Any]] = {}
-
-    def register_rows(rows: Mapping[str, Mapping[str, Any]]) -> None:
-        for key, data in rows.items():
-            meta = point_meta.setdefault(key, {})
-            player_name = data.get("player_name") or data.get("player")
-            if player_name and not meta.get("player_name"):
-                meta["player_name"] = player_name
-            label = data.get("label") or data.get("player_name") or data.get("player")
-            if label and not meta.get("label"):
-                meta["label"] = label
-            group_label = data.get("group_label")
-            if group_label and not meta.get("group_label"):
-                meta["group_label"] = group_label
-            grouping = data.get("grouping")
-            if grouping and not meta.get("grouping"):
-                meta["grouping"] = grouping
-            roster_id = data.get("roster_id")
-            if roster_id is not None and meta.get("roster_id") is None:
-                meta["roster_id"] = roster_id
-            if data.get("practice_id") is not None:
-                meta["session_id"] = data.get("practice_id")
-                meta["session_type"] = "practice"
-                if data.get("practice_category") and not meta.get("session_category"):
-                    meta["session_category"] = data.get("practice_category")
-                if data.get("practice_date") is not None and not meta.get("session_date"):
-                    meta["session_date"] = data.get("practice_date")
-            if data.get("game_id") is not None:
-                meta["session_id"] = data.get("game_id")
-                meta["session_type"] = "game"
-                if data.get("opponent") and not meta.get("opponent"):
-                    meta["opponent"] = data.get("opponent")
-                if data.get("game_date") is not None and not meta.get("session_date"):
-                    meta["session_date"] = data.get("game_date")
-
-    register_rows(practice_rows)
-    register_rows(game_rows)
+    for frame in frames.values():
+        _register_points(point_meta, frame)
 
     results = []
 
-    for index, study in enumerate(studies):
-        study_def = _coerce_study(study)
-
-        if (
-            normalized_scope.group_by is Grouping.PRACTICE
-            and (study_def.x.source is not MetricSource.PRACTICE or study_def.y.source is not MetricSource.PRACTICE)
-        ):
-            raise ValueError("Practice grouping can only be used with practice metrics")
-
-        if (
-            normalized_scope.group_by is Grouping.GAME
-            and (study_def.x.source is not MetricSource.GAME or study_def.y.source is not MetricSource.GAME)
-        ):
-            raise ValueError("Game grouping can only be used with game metrics")
-
-        x_series = _metric_series(study_def.x, practice_rows, game_rows)
-        y_series = _metric_series(study_def.y, practice_rows, game_rows)
+    for index, study_def in enumerate(study_defs):
+        x_series = _series_from_frame(frames[study_def.x.source], _metric_spec(study_def.x))
+        y_series = _series_from_frame(frames[study_def.y.source], _metric_spec(study_def.y))
 
         combined = pd.concat([x_series.rename("x"), y_series.rename("y")], axis=1, join="inner")
         combined = combined.dropna()
@@ -1564,11 +1210,173 @@ def run_studies(
     return {"studies": results}
 
 
+def _default_metrics(source: MetricSource) -> list[MetricDefinition]:
+    """Every workbench catalog metric ``source`` can compute, in catalog order."""
+    if source is MetricSource.PRACTICE:
+        keys = [key for key in _PRACTICE_CATALOG if key in _PRACTICE_METRICS]
+    else:
+        keys = [key for key in _PRACTICE_CATALOG if key in _GAME_METRICS]
+        keys += [key for key in _LEADERBOARD_CATALOG if key in _GAME_METRICS and key not in keys]
+    return [_coerce_metric({"source": source.value, "key": key}) for key in keys]
+
+
+def _metric_matrix(
+    frames: Mapping[MetricSource, pd.DataFrame],
+    metrics: Sequence[MetricDefinition],
+    index: pd.Index,
+) -> np.ndarray:
+    """Return a points × metrics array (NaN where a point has no value)."""
+    columns = [
+        _series_from_frame(frames[metric.source], _metric_spec(metric)).reindex(index).to_numpy(dtype=float)
+        for metric in metrics
+    ]
+    if not columns:
+        return np.empty((len(index), 0))
+    return np.column_stack(columns)
+
+
+def _masked_corr(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pearson-correlate column ``k`` of ``a`` with column ``k`` of ``b``.
+
+    Both arrays carry NaN at the same positions; those rows are skipped.
+    """
+
+    present = ~np.isnan(a)
+    n = present.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_a = np.where(present, a, 0.0).sum(axis=0) / n
+        mean_b = np.where(present, b, 0.0).sum(axis=0) / n
+        da = np.where(present, a - mean_a, 0.0)
+        db = np.where(present, b - mean_b, 0.0)
+        var_a = (da * da).sum(axis=0)
+        var_b = (db * db).sum(axis=0)
+        r = (da * db).sum(axis=0) / np.sqrt(var_a * var_b)
+    r[(n < 2) | (var_a <= 1e-12) | (var_b <= 1e-12)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def _pairwise_spearman(x: np.ndarray, y: np.ndarray, masks: tuple[np.ndarray, ...]) -> np.ndarray:
+    """Spearman for every ``(x, y)`` column pair over that pair's own points.
+
+    Each pair is ranked only over the points it keeps (see
+    :func:`_pair_masks`), as :func:`run_studies` does. One block per ``x``
+    column ranks the masked copies of that column and of every ``y`` column
+    at once.
+    """
+
+    present_x, present_y, nonpos_x, nonpos_y = (mask.astype(bool) for mask in masks)
+    result = np.full((x.shape[1], y.shape[1]), np.nan)
+    for i in range(x.shape[1]):
+        keep = (present_x[:, [i]] & present_y) & ~(nonpos_x[:, [i]] & nonpos_y)
+        x_block = np.where(keep, x[:, [i]], np.nan)
+        y_block = np.where(keep, y, np.nan)
+        x_ranks = pd.DataFrame(x_block).rank(method="average").to_numpy(dtype=float)
+        y_ranks = pd.DataFrame(y_block).rank(method="average").to_numpy(dtype=float)
+        result[i] = _masked_corr(x_ranks, y_ranks)
+    return result
+
+
+def _pair_masks(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Presence and non-positive masks used to weight every metric pair.
+
+    A point counts towards pair ``(i, j)`` when both values are present and at
+    least one is positive, matching the per-study filter in
+    :func:`run_studies`. That weight is ``present_x·present_y −
+    nonpos_x·nonpos_y``, which keeps every pairwise moment a difference of two
+    matrix products.
+    """
+
+    present_x = ~np.isnan(x)
+    present_y = ~np.isnan(y)
+    nonpos_x = present_x & (np.nan_to_num(x) <= 0)
+    nonpos_y = present_y & (np.nan_to_num(y) <= 0)
+    return tuple(mask.astype(float) for mask in (present_x, present_y, nonpos_x, nonpos_y))
+
+
+def _pairwise_corr(x: np.ndarray, y: np.ndarray, masks: tuple[np.ndarray, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """Pearson-correlate every column of ``x`` with every column of ``y``.
+
+    Returns ``(r, samples)``; ``r`` is NaN where fewer than two points or no
+    variance remain.
+    """
+
+    present_x, present_y, nonpos_x, nonpos_y = masks
+    x0 = np.nan_to_num(x)
+    y0 = np.nan_to_num(y)
+
+    def moment(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return (a * present_x).T @ (b * present_y) - (a * nonpos_x).T @ (b * nonpos_y)
+
+    ones_x = np.ones_like(x0)
+    ones_y = np.ones_like(y0)
+    n = moment(ones_x, ones_y)
+    sx = moment(x0, ones_y)
+    sy = moment(ones_x, y0)
+    sxx = moment(x0 * x0, ones_y)
+    syy = moment(ones_x, y0 * y0)
+    sxy = moment(x0, y0)
+
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    # Treat round-off from constant columns as zero variance.
+    flat = (var_x <= 1e-12 * n * sxx) | (var_y <= 1e-12 * n * syy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+    r[(n < 2) | flat] = np.nan
+    return np.clip(r, -1.0, 1.0), np.rint(n).astype(int)
+
+
+def _matrix_payload(values: np.ndarray) -> list[list[Optional[float]]]:
+    return [[None if math.isnan(value) else float(value) for value in row] for row in values]
+
+
+def run_correlation_matrix(
+    scope: StudyScope | Mapping[str, Any],
+    x_metrics: Optional[Sequence[MetricDefinition | Mapping[str, Any]]] = None,
+    y_metrics: Optional[Sequence[MetricDefinition | Mapping[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Correlate every ``x_metrics`` entry with every ``y_metrics`` entry.
+
+    Missing metric lists default to every practice metric (x) and every game
+    metric (y) in the workbench catalogs. The metric matrix is built once and
+    the Pearson and sample count matrices are computed in a single vectorized
+    pass. Spearman re-ranks each pair over that pair's own points, one block
+    per x metric, so every cell matches :func:`run_studies` for the same pair.
+    """
+
+    normalized_scope = _coerce_scope(scope)
+    xs = [_coerce_metric(metric) for metric in x_metrics] if x_metrics else _default_metrics(MetricSource.PRACTICE)
+    ys = [_coerce_metric(metric) for metric in y_metrics] if y_metrics else _default_metrics(MetricSource.GAME)
+
+    frames = _load_metric_frames(normalized_scope, [*xs, *ys])
+    index = pd.Index(sorted({key for frame in frames.values() for key in frame.index}), dtype=object)
+    x_values = _metric_matrix(frames, xs, index)
+    y_values = _metric_matrix(frames, ys, index)
+
+    masks = _pair_masks(x_values, y_values)
+    pearson, samples = _pairwise_corr(x_values, y_values, masks)
+    spearman = _pairwise_spearman(x_values, y_values, masks)
+
+    def describe(metric: MetricDefinition) -> Dict[str, Any]:
+        return {"key": metric.key, "label": metric.label, "source": metric.source.value}
+
+    return {
+        "mode": "matrix",
+        "x_metrics": [describe(metric) for metric in xs],
+        "y_metrics": [describe(metric) for metric in ys],
+        "samples": samples.tolist(),
+        "pearson": _matrix_payload(pearson),
+        "spearman": _matrix_payload(spearman),
+    }
+
+
 __all__ = [
     "MetricDefinition",
     "MetricSource",
     "StudyDefinition",
     "StudyScope",
     "Grouping",
+    "invalidate_correlation_frames",
+    "run_correlation_matrix",
     "run_studies",
 ]
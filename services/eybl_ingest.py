@@ -2,12 +2,14 @@ import os
 import csv
 import hashlib
 import logging
+from datetime import datetime
 from typing import Optional, List, Dict
 
 import pandas as pd
 import click
 from flask import current_app
 from flask.cli import with_appcontext
+from sqlalchemy import and_, insert, or_, update
 
 from models.database import db
 from models.recruit import Recruit
@@ -166,6 +168,29 @@ def deterministic_external_key(player: str, team: str, season_year: Optional[int
     base = f"{player}|{team}|{season_year or ''}|{circuit}"
     return hashlib.sha1(base.encode("utf-8")).hexdigest()
 
+
+def external_keys(players, teams, season_years, circuits) -> List[str]:
+    """``deterministic_external_key`` for parallel columns."""
+    return [
+        deterministic_external_key(p, t, y, c)
+        for p, t, y, c in zip(players, teams, season_years, circuits)
+    ]
+
+
+def _plain_year(value) -> Optional[int]:
+    return None if value is None or pd.isna(value) else int(value)
+
+
+def _circuit_season_filter(model, pairs):
+    """OR of (circuit, season_year) equality for the pairs an import covers."""
+    return or_(*[
+        and_(
+            model.circuit == circuit,
+            model.season_year.is_(None) if year is None else model.season_year == year,
+        )
+        for circuit, year in pairs
+    ])
+
 # ---------------------------------------------------------------------------
 # Normalize & merge
 # ---------------------------------------------------------------------------
@@ -310,14 +335,60 @@ def normalize_and_merge(overall_df: pd.DataFrame, assists_df: pd.DataFrame, fg_a
 # Auto-matching to recruits
 # ---------------------------------------------------------------------------
 
+# Recruit match tiers, best first: (import columns, recruit columns, confidence).
+# Raw names/teams come first, then the cleaned + synonym-mapped import values
+# against cleaned recruit values. A confidence of 0.9 or more auto-verifies.
+MATCH_TIERS = (
+    (("player", "team"), ("name", "team_raw"), 1.0),
+    (("player",), ("name",), 0.9),
+    (("player_norm", "team_norm"), ("name_clean", "team_clean"), 0.9),
+    (("player_norm",), ("name_clean",), 0.8),
+)
+
+
+def match_recruit_ids(players: pd.DataFrame, recruits: pd.DataFrame):
+    """Return ``(recruit_id, confidence)`` Series aligned with ``players``.
+
+    ``players`` has player/team/player_norm/team_norm columns and
+    ``recruits`` has id/name/team_raw/name_clean/team_clean. Each tier is
+    one left merge against recruits de-duplicated on the tier's key (the
+    last recruit wins, as the old dict lookups did); rows keep the first
+    tier that matches.
+    """
+    recruit_id = pd.Series(None, index=players.index, dtype=object)
+    confidence = pd.Series(0.0, index=players.index)
+    for row_cols, recruit_cols, tier_confidence in MATCH_TIERS:
+        row_cols, recruit_cols = list(row_cols), list(recruit_cols)
+        lookup = (
+            recruits.drop_duplicates(recruit_cols, keep="last")[recruit_cols + ["id"]]
+            .rename(columns=dict(zip(recruit_cols, row_cols)))
+            .astype({c: object for c in row_cols})
+        )
+        hit = players[row_cols].astype(object).merge(lookup, on=row_cols, how="left")["id"]
+        hit.index = players.index
+        take = recruit_id.isna() & hit.notna()
+        recruit_id[take] = hit[take].astype(int)
+        confidence[take] = tier_confidence
+    return recruit_id, confidence
+
+
+def _recruit_frame() -> pd.DataFrame:
+    rows = db.session.query(Recruit.id, Recruit.name, Recruit.aau_team).all()
+    recruits = pd.DataFrame(rows, columns=["id", "name", "aau_team"])
+    recruits["team_raw"] = [t or "" for t in recruits["aau_team"]]
+    recruits["name_clean"] = recruits["name"].map(clean_name)
+    recruits["team_clean"] = recruits["aau_team"].map(clean_team)
+    return recruits
+
+
 def auto_match_to_recruits(df: pd.DataFrame) -> List[Dict]:
-    recruits = db.session.query(Recruit.id, Recruit.name, Recruit.aau_team).all()
-    name_exact = {r.name: r for r in recruits}
-    name_team_exact = {(r.name, r.aau_team or ""): r for r in recruits}
-    name_norm = {clean_name(r.name): r for r in recruits}
-    name_team_norm = {(clean_name(r.name), clean_team(r.aau_team)): r for r in recruits}
+    """Match import rows to recruits and upsert their ``ExternalIdentityMap`` rows.
 
-    # Load synonyms for normalized matching
+    Recruits, synonyms and the existing maps for the import's circuit/season
+    are each loaded with one query; new maps go out as one batched insert
+    and improved matches as one batched update. An existing map is only
+    overwritten by a strictly more confident match.
+    """
     name_syns = {
         clean_name(s.source_value): clean_name(s.normalized_value)
         for s in IdentitySynonym.query.filter_by(kind="name")
@@ -326,70 +397,77 @@ def auto_match_to_recruits(df: pd.DataFrame) -> List[Dict]:
         clean_team(s.source_value): clean_team(s.normalized_value)
         for s in IdentitySynonym.query.filter_by(kind="team")
     }
+    if df.empty:
+        return []
+
+    players = pd.DataFrame(index=df.index)
+    players["player"] = [p or "" for p in df["player"]]
+    players["team"] = [t or "" for t in df["team"]]
+    player_clean = players["player"].map(clean_name)
+    team_clean = players["team"].map(clean_team)
+    players["player_norm"] = player_clean.map(lambda v: name_syns.get(v, v))
+    players["team_norm"] = team_clean.map(lambda v: team_syns.get(v, v))
+    players["external_key"] = external_keys(
+        players["player"], players["team"], df["season_year"], df["circuit"]
+    )
+
+    recruit_id, confidence = match_recruit_ids(players, _recruit_frame())
 
     results: List[Dict] = []
-    for _, row in df.iterrows():
-        player = row["player"] or ""
-        team = row["team"] or ""
-        player_clean = clean_name(player)
-        team_clean = clean_team(team)
-        player_norm = name_syns.get(player_clean, player_clean)
-        team_norm = team_syns.get(team_clean, team_clean)
-        ext_key = deterministic_external_key(player, team, row["season_year"], row["circuit"])
-        recruit_id = None
-        confidence = 0.0
-        is_verified = False
-
-        r = name_team_exact.get((player, team))
-        if r:
-            recruit_id = r.id
-            confidence = 1.0
-            is_verified = True
-        else:
-            r = name_exact.get(player)
-            if r:
-                recruit_id = r.id
-                confidence = 0.9
-                is_verified = True
-            else:
-                r = name_team_norm.get((player_norm, team_norm))
-                if r:
-                    recruit_id = r.id
-                    confidence = 0.9
-                    is_verified = True
-                else:
-                    r = name_norm.get(player_norm)
-                    if r:
-                        recruit_id = r.id
-                        confidence = 0.8
-
-        data = {
-            "external_key": ext_key,
+    for key, player, team, circuit, season_year, season_type, rid, conf in zip(
+        players["external_key"], players["player"], players["team"], df["circuit"],
+        df["season_year"], df["season_type"], recruit_id, confidence,
+    ):
+        conf = float(conf)
+        results.append({
+            "external_key": key,
             "player_name_external": player,
             "team_external": team,
-            "circuit": row["circuit"],
-            "season_year": row["season_year"],
-            "season_type": row["season_type"],
-            "recruit_id": recruit_id,
-            "match_confidence": confidence,
-            "is_verified": confidence >= 0.9,
+            "circuit": circuit,
+            "season_year": _plain_year(season_year),
+            "season_type": season_type,
+            "recruit_id": None if rid is None or pd.isna(rid) else int(rid),
+            "match_confidence": conf,
+            "is_verified": conf >= 0.9,
+        })
+
+    pairs = {(r["circuit"], r["season_year"]) for r in results}
+    existing = {}
+    if pairs:
+        existing = {
+            m.external_key: {"id": m.id, "match_confidence": m.match_confidence}
+            for m in db.session.query(
+                ExternalIdentityMap.id,
+                ExternalIdentityMap.external_key,
+                ExternalIdentityMap.match_confidence,
+            ).filter(_circuit_season_filter(ExternalIdentityMap, pairs))
         }
-        results.append(data)
-
-        existing = ExternalIdentityMap.query.filter_by(external_key=ext_key).one_or_none()
-        if existing:
-            if confidence > (existing.match_confidence or 0):
-                existing.recruit_id = recruit_id
-                existing.match_confidence = confidence
-                existing.is_verified = confidence >= 0.9
-                existing.player_name_external = player
-                existing.team_external = team
-                existing.circuit = row["circuit"]
-                existing.season_year = row["season_year"]
-                existing.season_type = row["season_type"]
+
+    new_maps: Dict[str, Dict] = {}
+    changed: Dict[int, Dict] = {}
+    now = datetime.utcnow()
+    for data in results:
+        key = data["external_key"]
+        current = new_maps.get(key) or existing.get(key)
+        if current is None:
+            new_maps[key] = dict(data)
+            continue
+        if data["match_confidence"] <= (current["match_confidence"] or 0):
+            continue
+        if key in new_maps:
+            new_maps[key] = dict(data)
         else:
-            entry = ExternalIdentityMap(**data)
-            db.session.add(entry)
+            current["match_confidence"] = data["match_confidence"]
+            changed[current["id"]] = {
+                **{k: v for k, v in data.items() if k != "external_key"},
+                "id": current["id"],
+                "updated_at": now,
+            }
+
+    if new_maps:
+        db.session.execute(insert(ExternalIdentityMap), list(new_maps.values()))
+    if changed:
+        db.session.execute(update(ExternalIdentityMap), list(changed.values()))
     db.session.flush()
     return results
 
@@ -399,31 +477,47 @@ def auto_match_to_recruits(df: pd.DataFrame) -> List[Dict]:
 
 def promote_verified_stats(merged_df: pd.DataFrame, *, circuit: str, season_year: Optional[int],
                            season_type: str, original_filenames: List[str]) -> Dict:
-    keys = [deterministic_external_key(r.player, r.team, season_year, circuit) for r in merged_df.itertuples()]
-    verified_maps = ExternalIdentityMap.query.filter(
-        ExternalIdentityMap.external_key.in_(keys),
-        ExternalIdentityMap.is_verified.is_(True)
-    ).all()
-    mapping = {m.external_key: m for m in verified_maps}
+    """Upsert ``UnifiedStats`` for rows whose identity map is verified.
+
+    Verified maps and the existing stats for the circuit/season/type are
+    loaded with one query each; inserts and updates are batched.
+    """
+    season_year = _plain_year(season_year)
+    if merged_df.empty:
+        return {"inserted": 0, "updated": 0, "skipped": 0, "anomalies": []}
+    keys = external_keys(
+        merged_df["player"], merged_df["team"],
+        [season_year] * len(merged_df), [circuit] * len(merged_df),
+    )
+    mapping = {
+        m.external_key: m.recruit_id
+        for m in db.session.query(ExternalIdentityMap.external_key, ExternalIdentityMap.recruit_id)
+        .filter(
+            _circuit_season_filter(ExternalIdentityMap, [(circuit, season_year)]),
+            ExternalIdentityMap.is_verified.is_(True),
+        )
+    }
+    stored = {
+        (s.recruit_id, s.team_name): s.id
+        for s in db.session.query(UnifiedStats.id, UnifiedStats.recruit_id, UnifiedStats.team_name)
+        .filter(
+            _circuit_season_filter(UnifiedStats, [(circuit, season_year)]),
+            UnifiedStats.season_type == season_type,
+        )
+    }
 
     inserted = updated = skipped = 0
     anomalies: List[str] = []
+    new_rows: Dict[tuple, Dict] = {}
+    changed: Dict[int, Dict] = {}
+    now = datetime.utcnow()
 
-    for row in merged_df.itertuples():
-        key = deterministic_external_key(row.player, row.team, season_year, circuit)
-        mapping_row = mapping.get(key)
-        if not mapping_row or not mapping_row.recruit_id:
+    for key, row in zip(keys, merged_df.itertuples()):
+        recruit_id = mapping.get(key)
+        if not recruit_id:
             skipped += 1
             continue
-        recruit_id = mapping_row.recruit_id
-        unique_filter = dict(
-            recruit_id=recruit_id,
-            circuit=circuit,
-            season_year=season_year,
-            season_type=season_type,
-            team_name=row.team,
-        )
-        existing = UnifiedStats.query.filter_by(**unique_filter).one_or_none()
+        team = None if pd.isna(row.team) else row.team
         values = dict(
             gp=row.gp,
             ppg=row.ppg,
@@ -438,40 +532,41 @@ def promote_verified_stats(merged_df: pd.DataFrame, *, circuit: str, season_year
             source_system="synergy_portal_csv",
             original_filenames=",".join(original_filenames),
         )
-        try:
-            if existing:
-                for k, v in values.items():
-                    setattr(existing, k, v)
-                existing.ingested_at = db.func.now()
-                updated += 1
-            else:
-                stats = UnifiedStats(**unique_filter, **values)
-                db.session.add(stats)
-                inserted += 1
-        except Exception:
-            logger.exception(
-                "unified_stats upsert failed",
-                extra={
-                    'recruit_id': recruit_id,
-                    'circuit': circuit,
-                    'season_year': season_year,
-                    'season_type': season_type,
-                    'team': row.team,
-                    'fields': {
-                        'gp': row.gp,
-                        'ppg': row.ppg,
-                        'ast': row.ast,
-                        'tov': row.tov,
-                        'fg_pct': row.fg_pct,
-                        'ppp': row.ppp,
-                        'pnr_poss': row.pnr_poss,
-                        'pnr_ppp': row.pnr_ppp,
-                        'pnr_to_pct': row.pnr_to_pct,
-                        'pnr_score_pct': row.pnr_score_pct,
-                    },
-                },
+        stat_key = (recruit_id, team)
+        if stat_key in stored:
+            changed[stored[stat_key]] = {"id": stored[stat_key], **values, "ingested_at": now}
+            updated += 1
+        elif stat_key in new_rows:
+            new_rows[stat_key].update(values)
+            updated += 1
+        else:
+            new_rows[stat_key] = dict(
+                recruit_id=recruit_id,
+                circuit=circuit,
+                season_year=season_year,
+                season_type=season_type,
+                team_name=team,
+                **values,
             )
-            raise
+            inserted += 1
+
+    try:
+        if new_rows:
+            db.session.execute(insert(UnifiedStats), list(new_rows.values()))
+        if changed:
+            db.session.execute(update(UnifiedStats), list(changed.values()))
+    except Exception:
+        logger.exception(
+            "unified_stats upsert failed",
+            extra={
+                'circuit': circuit,
+                'season_year': season_year,
+                'season_type': season_type,
+                'inserts': len(new_rows),
+                'updates': len(changed),
+            },
+        )
+        raise
     db.session.flush()
     return {"inserted": inserted, "updated": updated, "skipped": skipped, "anomalies": anomalies}
 
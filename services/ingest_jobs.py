@@ -0,0 +1,338 @@
+"""Local job queue for parse, reparse and bulk ingest actions.
+
+The admin file routes used to run a whole ingest inside the HTTP request, so
+a bulk reparse of a season tied up a web worker until it finished or timed
+out. They now call :func:`enqueue_job`, which records an ``IngestJob`` row and
+hands its id to the app's :class:`JobRunner`: a thread pool of
+``INGEST_JOB_WORKERS`` threads (default 1; SQLite serialises the writes
+anyway). A worker claims the row with a conditional ``UPDATE`` so a job runs
+once even when several processes share the database, then calls the handler
+registered for the job's ``kind`` with a :class:`JobContext`.
+
+Handlers report progress through :func:`services.progress.set_progress`
+under ``IngestJob.progress_key`` and poll :meth:`JobContext.cancelled` at
+points where stopping leaves the data consistent (between files of a bulk
+reparse). :func:`cancel_job` cancels queued jobs outright and flags running
+ones. When ``INGEST_JOBS_ASYNC`` is false (the default under ``TESTING``) jobs
+run inline in the request that queued them.
+
+A job whose process died mid-run would stay ``running`` forever and block
+its file. Jobs running longer than ``INGEST_JOB_STALE_SECONDS`` (default six
+hours) are failed by :func:`fail_stale_jobs` when the runner starts and
+before :func:`enqueue_job` looks for an active job to reuse.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import current_app
+
+from models.database import db, IngestJob
+from services.progress import set_progress
+
+_LOGGER = logging.getLogger(__name__)
+_EXTENSION_KEY = "ingest_jobs"
+_DEFAULT_WORKERS = 1
+_DEFAULT_STALE_SECONDS = 6 * 60 * 60
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+_HANDLERS: Dict[str, Callable[["JobContext"], Any]] = {}
+
+
+class JobCancelled(Exception):
+    """Raised by a handler to stop at a safe point after a cancel request."""
+
+
+def register_job_handler(kind: str, handler: Callable[["JobContext"], Any]) -> None:
+    """Run ``handler(ctx)`` for jobs of ``kind``; its return value is the job result."""
+    _HANDLERS[kind] = handler
+
+
+class JobContext:
+    """What a handler gets: the job, its payload and progress/cancel hooks."""
+
+    def __init__(self, job: IngestJob, *, report_progress: bool = True):
+        self.job = job
+        # The app the worker runs under, for parsers that take ``app=``.
+        self.app = current_app._get_current_object()
+        self.payload = json.loads(job.payload) if job.payload else {}
+        self.report_progress = report_progress
+
+    def progress(self, percent: int, message: str) -> None:
+        if self.report_progress:
+            set_progress(self.job.progress_key, percent, message)
+
+    def cancelled(self) -> bool:
+        flag = (
+            db.session.query(IngestJob.cancel_requested)
+            .filter(IngestJob.id == self.job.id)
+            .scalar()
+        )
+        return bool(flag)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled():
+            raise JobCancelled()
+
+
+def _claim(job_id: int) -> bool:
+    claimed = (
+        IngestJob.query
+        .filter(
+            IngestJob.id == job_id,
+            IngestJob.status == "queued",
+            IngestJob.cancel_requested.is_(False),
+        )
+        .update({"status": "running", "started_at": datetime.utcnow()}, synchronize_session=False)
+    )
+    db.session.commit()
+    return bool(claimed)
+
+
+def _finish(job_id: int, status: str, *, result: Any = None, error: Optional[str] = None,
+            report_progress: bool = True) -> None:
+    job = db.session.get(IngestJob, job_id)
+    job.status = status
+    job.finished_at = datetime.utcnow()
+    job.result = json.dumps(result) if result is not None else None
+    job.error = error
+    db.session.commit()
+    if not report_progress:
+        return
+    if status == "succeeded":
+        set_progress(job.progress_key, 100, "Done", done=True)
+    elif status == "cancelled":
+        set_progress(job.progress_key, 100, "Cancelled", done=True)
+    else:
+        set_progress(job.progress_key, 100, "Failed", done=True, error=error)
+
+
+def run_job(job_id: int, *, report_progress: bool = True) -> Optional[IngestJob]:
+    """Claim and run one queued job in the current app context.
+
+    Returns the finished job, or ``None`` when it was already claimed or
+    cancelled before it started. Inline runs skip progress reporting since
+    nothing can poll the request that is doing the work.
+    """
+    if not _claim(job_id):
+        return None
+    job = db.session.get(IngestJob, job_id)
+    handler = _HANDLERS.get(job.kind)
+    if handler is None:
+        _finish(job_id, "failed", error=f"No handler registered for job kind '{job.kind}'.",
+                report_progress=report_progress)
+        return db.session.get(IngestJob, job_id)
+
+    ctx = JobContext(job, report_progress=report_progress)
+    ctx.progress(0, "Starting")
+    try:
+        result = handler(ctx)
+    except JobCancelled:
+        db.session.rollback()
+        _finish(job_id, "cancelled", report_progress=report_progress)
+    except Exception as exc:
+        db.session.rollback()
+        _LOGGER.exception("Ingest job %s (%s) failed.", job_id, job.kind)
+        _finish(job_id, "failed", error=str(exc), report_progress=report_progress)
+    else:
+        _finish(job_id, "succeeded", result=result, report_progress=report_progress)
+    return db.session.get(IngestJob, job_id)
+
+
+def fail_stale_jobs(app=None) -> int:
+    """Fail ``running`` jobs started more than ``INGEST_JOB_STALE_SECONDS`` ago.
+
+    Returns how many jobs were failed.
+    """
+    app = app or current_app._get_current_object()
+    stale_after = app.config.get("INGEST_JOB_STALE_SECONDS", _DEFAULT_STALE_SECONDS)
+    now = datetime.utcnow()
+    failed = (
+        IngestJob.query
+        .filter(
+            IngestJob.status == "running",
+            IngestJob.started_at < now - timedelta(seconds=stale_after),
+        )
+        .update(
+            {
+                "status": "failed",
+                "finished_at": now,
+                "error": "Job stopped responding; its worker likely exited before it finished.",
+            },
+            synchronize_session=False,
+        )
+    )
+    db.session.commit()
+    if failed:
+        _LOGGER.warning("Marked %d stale ingest job(s) as failed.", failed)
+    return failed
+
+
+class JobRunner:
+    """Per-app worker pool that runs queued ``IngestJob`` rows."""
+
+    def __init__(self, app, *, workers: int = _DEFAULT_WORKERS):
+        self._app = app
+        self._workers = max(1, int(workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: int) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="ingest-job"
+                )
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: int) -> None:
+        with self._app.app_context():
+            try:
+                run_job(job_id)
+            except Exception:
+                _LOGGER.exception("Ingest job runner crashed on job %s.", job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def get_job_runner(app=None) -> JobRunner:
+    """Return the app's :class:`JobRunner`.
+
+    On first use, stale running jobs are failed and leftover queued jobs are
+    resubmitted.
+    """
+    app = app or current_app._get_current_object()
+    runner = app.extensions.get(_EXTENSION_KEY)
+    if runner is None:
+        runner = app.extensions[_EXTENSION_KEY] = JobRunner(
+            app, workers=app.config.get("INGEST_JOB_WORKERS", _DEFAULT_WORKERS)
+        )
+        fail_stale_jobs(app)
+        queued = [
+            job_id for (job_id,) in
+            db.session.query(IngestJob.id).filter(IngestJob.status == "queued").order_by(IngestJob.id)
+        ]
+        for job_id in queued:
+            runner.submit(job_id)
+    return runner
+
+
+def _runs_async(app) -> bool:
+    return bool(app.config.get("INGEST_JOBS_ASYNC", not app.testing))
+
+
+def enqueue_job(kind: str, *, file_id: Optional[int] = None,
+                payload: Optional[Dict[str, Any]] = None,
+                created_by: Optional[int] = None) -> IngestJob:
+    """Queue a job and start it; an active job for the same file is reused.
+
+    Without ``INGEST_JOBS_ASYNC`` the job has already finished on return.
+    """
+    if kind not in _HANDLERS:
+        raise ValueError(f"Unknown ingest job kind '{kind}'.")
+    app = current_app._get_current_object()
+    if file_id is not None:
+        fail_stale_jobs(app)
+        active = (
+            IngestJob.query
+            .filter(IngestJob.file_id == file_id, IngestJob.status.in_(ACTIVE_STATUSES))
+            .order_by(IngestJob.id)
+            .first()
+        )
+        if active is not None:
+            return active
+
+    runner = get_job_runner(app) if _runs_async(app) else None
+    job = IngestJob(
+        kind=kind,
+        file_id=file_id,
+        payload=json.dumps(payload) if payload else None,
+        status="queued",
+        created_by=created_by,
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    if runner is not None:
+        set_progress(job.progress_key, 0, "Queued")
+        runner.submit(job.id)
+        return job
+    return run_job(job.id, report_progress=False) or db.session.get(IngestJob, job.id)
+
+
+def run_pending(limit: Optional[int] = None) -> int:
+    """Run queued jobs inline (CLI, tests); returns how many were claimed."""
+    ran = 0
+    query = db.session.query(IngestJob.id).filter(IngestJob.status == "queued").order_by(IngestJob.id)
+    for (job_id,) in query.limit(limit).all():
+        if run_job(job_id, report_progress=False) is not None:
+            ran += 1
+    return ran
+
+
+def cancel_job(job_id: int) -> Optional[IngestJob]:
+    """Cancel a queued job, or ask a running one to stop at its next safe point."""
+    job = db.session.get(IngestJob, job_id)
+    if job is None or job.status in FINISHED_STATUSES:
+        return job
+    job.cancel_requested = True
+    if job.status == "queued":
+        job.status = "cancelled"
+        job.finished_at = datetime.utcnow()
+        set_progress(job.progress_key, 100, "Cancelled", done=True)
+    db.session.commit()
+    return job
+
+
+def job_payload(job: IngestJob, progress: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """JSON-ready view of ``job`` for the polling endpoints."""
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "file_id": job.file_id,
+        "status": job.status,
+        "cancel_requested": bool(job.cancel_requested),
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "progress": progress,
+    }
+
+
+def active_jobs(file_ids: Optional[Iterable[int]] = None):
+    query = IngestJob.query.filter(IngestJob.status.in_(ACTIVE_STATUSES))
+    if file_ids is not None:
+        query = query.filter(IngestJob.file_id.in_(list(file_ids)))
+    return query.order_by(IngestJob.id).all()
+
+
+__all__ = [
+    "ACTIVE_STATUSES",
+    "FINISHED_STATUSES",
+    "JobCancelled",
+    "JobContext",
+    "JobRunner",
+    "active_jobs",
+    "cancel_job",
+    "enqueue_job",
+    "fail_stale_jobs",
+    "get_job_runner",
+    "job_payload",
+    "register_job_handler",
+    "run_job",
+    "run_pending",
+]
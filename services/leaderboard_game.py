@@ -9,7 +9,6 @@ shape so it can be fed directly into ``build_dual_table``.
 from __future__ import annotations
 
 import inspect
-import json
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date
@@ -18,7 +17,8 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tupl
 from sqlalchemy.orm import Query
 
 from models.database import Game, GameTypeTag, PlayerStats, Season, Roster, db
-from utils.shottype import compute_3fg_breakdown_from_shots
+from services.stat_rollups import SHOT_FIELDS, SHOT_PREFIX, ensure_season_rollups, rollup_sum_query
+from utils.shottype import add_3fg_counts, count_3fg_shots_for_stats, fg3_breakdown_from_counts
 
 
 # --- Public data containers -------------------------------------------------
@@ -113,30 +113,14 @@ def _apply_date_window(query: Query, start_date: Optional[date], end_date: Optio
     return query
 
 
-def _parse_shot_details(blob: Optional[str]) -> List[Dict[str, Any]]:
-    if not blob:
-        return []
-    shots: List[Dict[str, Any]] = []
-    try:
-        parsed = json.loads(blob)
-    except (TypeError, ValueError):
-        return shots
-
-    if isinstance(parsed, list):
-        for item in parsed:
-            if isinstance(item, dict):
-                shots.append(item)
-    elif isinstance(parsed, dict):
-        shots.append(parsed)
-    return shots
-
-
 def _aggregate_rows(
     rows: Iterable[PlayerStats],
     roster_names: Optional[Set[str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
+    rows = list(rows)
+    shot_counts = count_3fg_shots_for_stats(rows)
     players: Dict[str, Dict[str, Any]] = {}
-    shot_events: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    player_counts: Dict[str, Dict[str, int]] = defaultdict(dict)
 
     for row in rows:
         raw_player = row.player_name
@@ -160,35 +144,75 @@ def _aggregate_rows(
         for field in _AGGREGATE_FIELDS:
             entry[field] = (entry.get(field) or 0) + (getattr(row, field) or 0)
 
-        shot_events[player].extend(_parse_shot_details(row.shot_type_details))
+        add_3fg_counts(player_counts[player], shot_counts.get(row.id, {}))
 
     # Attach shrink/non-shrink breakdowns once per player.
     for player, entry in players.items():
-        breakdown = compute_3fg_breakdown_from_shots(shot_events.get(player, []))
-        entry["fg3_shrink_makes"] = breakdown.get("fg3_shrink_makes", 0)
-        entry["fg3_shrink_att"] = breakdown.get("fg3_shrink_att", 0)
-        entry["fg3_shrink_pct"] = breakdown.get("fg3_shrink_pct")
-        entry["fg3_shrink_freq_pct"] = breakdown.get("fg3_shrink_freq_pct")
-        entry["fg3_nonshrink_makes"] = breakdown.get("fg3_nonshrink_makes", 0)
-        entry["fg3_nonshrink_att"] = breakdown.get("fg3_nonshrink_att", 0)
-        entry["fg3_nonshrink_pct"] = breakdown.get("fg3_nonshrink_pct")
-        entry["fg3_nonshrink_freq_pct"] = breakdown.get("fg3_nonshrink_freq_pct")
-        entry["fg3_contested_makes"] = breakdown.get("fg3_contest_makes", 0)
-        entry["fg3_contested_att"] = breakdown.get("fg3_contest_attempts", 0)
-        entry["fg3_contested_pct"] = breakdown.get("fg3_contest_pct")
-        entry["fg3_contested_freq_pct"] = breakdown.get("fg3_contest_freq_pct")
-        entry["fg3_late_makes"] = breakdown.get("fg3_late_makes", 0)
-        entry["fg3_late_att"] = breakdown.get("fg3_late_attempts", 0)
-        entry["fg3_late_pct"] = breakdown.get("fg3_late_pct")
-        entry["fg3_late_freq_pct"] = breakdown.get("fg3_late_freq_pct")
-        entry["fg3_uncontested_makes"] = breakdown.get("fg3_no_contest_makes", 0)
-        entry["fg3_uncontested_att"] = breakdown.get("fg3_no_contest_attempts", 0)
-        entry["fg3_uncontested_pct"] = breakdown.get("fg3_no_contest_pct")
-        entry["fg3_uncontested_freq_pct"] = breakdown.get("fg3_no_contest_freq_pct")
+        _attach_3fg_breakdown(entry, fg3_breakdown_from_counts(player_counts[player]))
 
     return players
 
 
+def _aggregate_rollups(
+    season_id: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    roster_names: Optional[Set[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Same result as ``_aggregate_rows`` for every game in the window, read from rollups."""
+
+    ensure_season_rollups(season_id)
+    fields = _AGGREGATE_FIELDS + SHOT_FIELDS
+    query = rollup_sum_query(
+        season_id,
+        fields,
+        source="game",
+        start_date=start_date,
+        end_date=end_date,
+        include_jersey=True,
+    )
+
+    players: Dict[str, Dict[str, Any]] = {}
+    for row in query.all():
+        player = str(row.player or "").strip()
+        if not player:
+            continue
+        if roster_names is not None and player not in roster_names:
+            continue
+        entry = players.setdefault(player, {"player": player, "jersey": row.jersey_number})
+        for field in fields:
+            entry[field] = (entry.get(field) or 0) + (getattr(row, field) or 0)
+
+    for entry in players.values():
+        counts = {field[len(SHOT_PREFIX):]: entry.pop(field) for field in SHOT_FIELDS}
+        _attach_3fg_breakdown(entry, fg3_breakdown_from_counts(counts))
+
+    return players
+
+
+def _attach_3fg_breakdown(entry: Dict[str, Any], breakdown: Dict[str, Any]) -> None:
+    entry["fg3_shrink_makes"] = breakdown.get("fg3_shrink_makes", 0)
+    entry["fg3_shrink_att"] = breakdown.get("fg3_shrink_att", 0)
+    entry["fg3_shrink_pct"] = breakdown.get("fg3_shrink_pct")
+    entry["fg3_shrink_freq_pct"] = breakdown.get("fg3_shrink_freq_pct")
+    entry["fg3_nonshrink_makes"] = breakdown.get("fg3_nonshrink_makes", 0)
+    entry["fg3_nonshrink_att"] = breakdown.get("fg3_nonshrink_att", 0)
+    entry["fg3_nonshrink_pct"] = breakdown.get("fg3_nonshrink_pct")
+    entry["fg3_nonshrink_freq_pct"] = breakdown.get("fg3_nonshrink_freq_pct")
+    entry["fg3_contested_makes"] = breakdown.get("fg3_contest_makes", 0)
+    entry["fg3_contested_att"] = breakdown.get("fg3_contest_attempts", 0)
+    entry["fg3_contested_pct"] = breakdown.get("fg3_contest_pct")
+    entry["fg3_contested_freq_pct"] = breakdown.get("fg3_contest_freq_pct")
+    entry["fg3_late_makes"] = breakdown.get("fg3_late_makes", 0)
+    entry["fg3_late_att"] = breakdown.get("fg3_late_attempts", 0)
+    entry["fg3_late_pct"] = breakdown.get("fg3_late_pct")
+    entry["fg3_late_freq_pct"] = breakdown.get("fg3_late_freq_pct")
+    entry["fg3_uncontested_makes"] = breakdown.get("fg3_no_contest_makes", 0)
+    entry["fg3_uncontested_att"] = breakdown.get("fg3_no_contest_attempts", 0)
+    entry["fg3_uncontested_pct"] = breakdown.get("fg3_no_contest_pct")
+    entry["fg3_uncontested_freq_pct"] = breakdown.get("fg3_no_contest_freq_pct")
+
+
 def _rows_for_players(
     players: Dict[str, Dict[str, Any]],
     row_builder: Callable[[str, Dict[str, Any]], Dict[str, Any]],
@@ -223,6 +247,9 @@ def _season_rows(
     end_date: Optional[date],
     game_types: Optional[Sequence[str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
+    if not game_types:
+        return _aggregate_rollups(season_id, start_date, end_date, _roster_names(season_id))
+    # Game-type tags are not part of the rollup key; fall back to the raw rows.
     query = _apply_date_window(
         _base_game_query(season_id, game_types), start_date, end_date
     )
@@ -0,0 +1,182 @@
+"""Buffered page-view logging.
+
+``log_page_view`` used to add a ``PageView`` row and commit inside every
+request, which took the SQLite write lock on each page load and contended with
+ingest. Requests now only enqueue a small tuple on the app's
+:class:`PageViewWriter`; a daemon thread drains the queue every
+``PAGE_VIEW_FLUSH_INTERVAL`` seconds and writes the batch in one transaction,
+inserting the raw ``PageView`` rows and bumping the matching
+``PageViewDaily`` counters that the usage reports read.
+
+The queue holds at most ``PAGE_VIEW_QUEUE_SIZE`` entries. When it is full, new
+views are dropped and counted rather than blocking the request; a failed
+flush counts its batch as dropped too. ``PAGE_VIEW_ASYNC = False`` restores a
+synchronous write inside the request.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import insert
+
+from models.database import db, PageView, PageViewDaily
+
+_LOGGER = logging.getLogger(__name__)
+_EXTENSION_KEY = "page_view_writer"
+_DEFAULT_QUEUE_SIZE = 10_000
+_DEFAULT_FLUSH_INTERVAL = 5.0
+
+# (user_id, endpoint, path, timestamp, user_agent)
+View = Tuple[Optional[int], str, str, datetime, Optional[str]]
+
+
+def _write_views(views: List[View]) -> None:
+    db.session.execute(
+        insert(PageView),
+        [
+            {"user_id": uid, "endpoint": endpoint, "path": path,
+             "timestamp": ts, "user_agent": agent}
+            for uid, endpoint, path, ts, agent in views
+        ],
+    )
+    counts = Counter((ts.date(), uid, endpoint) for uid, endpoint, _path, ts, _agent in views)
+    for (day, uid, endpoint), n in counts.items():
+        updated = (
+            PageViewDaily.query
+            .filter(
+                PageViewDaily.day == day,
+                PageViewDaily.user_id.is_(None) if uid is None else PageViewDaily.user_id == uid,
+                PageViewDaily.endpoint == endpoint,
+            )
+            .update({PageViewDaily.views: PageViewDaily.views + n}, synchronize_session=False)
+        )
+        if not updated:
+            db.session.add(PageViewDaily(day=day, user_id=uid, endpoint=endpoint, views=n))
+    db.session.commit()
+
+
+class PageViewWriter:
+    """Bounded in-process queue of page views flushed in batches."""
+
+    def __init__(self, app, *, max_queue: int = _DEFAULT_QUEUE_SIZE,
+                 flush_interval: float = _DEFAULT_FLUSH_INTERVAL):
+        self._app = app
+        self._queue: "queue.Queue[View]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._flush_interval = float(flush_interval)
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.counters = {"queued": 0, "written": 0, "dropped": 0, "flushes": 0}
+
+    def record(self, user_id, endpoint: str, path: str, user_agent: Optional[str],
+               timestamp: Optional[datetime] = None) -> bool:
+        """Queue one view; returns ``False`` when it was dropped."""
+        view = (user_id, endpoint, path, timestamp or datetime.utcnow(), user_agent)
+        try:
+            self._queue.put_nowait(view)
+        except queue.Full:
+            self.counters["dropped"] += 1
+            if self.counters["dropped"] == 1:
+                _LOGGER.warning("Page-view queue full; dropping views until the writer catches up.")
+            return False
+        self.counters["queued"] += 1
+        self._ensure_thread()
+        return True
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of views written."""
+        with self._flush_lock:
+            views: List[View] = []
+            while True:
+                try:
+                    views.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not views:
+                return 0
+            with self._context():
+                try:
+                    _write_views(views)
+                except Exception:
+                    db.session.rollback()
+                    self.counters["dropped"] += len(views)
+                    _LOGGER.exception("Failed to write %d page views.", len(views))
+                    return 0
+            self.counters["written"] += len(views)
+            self.counters["flushes"] += 1
+            return len(views)
+
+    def _context(self):
+        # Reuse the caller's session when flushing from inside this app (the
+        # usage reports flush before reading); the writer thread gets its own.
+        if has_app_context() and current_app._get_current_object() is self._app:
+            return nullcontext()
+        return self._app.app_context()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self._flush_interval + 1)
+        self.flush()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "pending": self.pending()}
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None or self._stop.is_set():
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="page-view-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+
+def get_page_view_writer(app=None) -> PageViewWriter:
+    """Return the app's :class:`PageViewWriter`, creating it on first use."""
+    app = app or current_app._get_current_object()
+    writer = app.extensions.get(_EXTENSION_KEY)
+    if writer is None:
+        writer = app.extensions[_EXTENSION_KEY] = PageViewWriter(
+            app,
+            max_queue=app.config.get("PAGE_VIEW_QUEUE_SIZE", _DEFAULT_QUEUE_SIZE),
+            flush_interval=app.config.get("PAGE_VIEW_FLUSH_INTERVAL", _DEFAULT_FLUSH_INTERVAL),
+        )
+    return writer
+
+
+def record_page_view(user_id, endpoint: str, path: str, user_agent: Optional[str]) -> bool:
+    """Log one request's page view without touching the database in-request."""
+    app = current_app._get_current_object()
+    user_id = int(user_id) if user_id is not None else None
+    if not app.config.get("PAGE_VIEW_ASYNC", True):
+        _write_views([(user_id, endpoint, path, datetime.utcnow(), user_agent)])
+        return True
+    return get_page_view_writer(app).record(user_id, endpoint, path, user_agent)
+
+
+__all__ = [
+    "PageViewWriter",
+    "get_page_view_writer",
+    "record_page_view",
+]
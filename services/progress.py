@@ -1,9 +1,10 @@
 """Helpers for tracking long-running background job progress.
 
-Progress is stored in Flask-Caching when available so the front end can poll a
-JSON endpoint and render a progress bar. When the cache backend is not
-configured, progress falls back to a JSON file within the application's
-instance folder so status survives across polling requests.
+Progress is stored in Flask-Caching when available, otherwise in the shared
+disk tier of :mod:`services.report_cache`, so the front end can poll a JSON
+endpoint and render a progress bar. When neither is available, progress falls
+back to a JSON file within the application's instance folder so status
+survives across polling requests.
 """
 
 from __future__ import annotations
@@ -17,10 +18,7 @@ from typing import Any, Dict, Optional
 
 from flask import current_app
 
-try:  # Reuse the leaderboard cache backend when possible.
-    from services.leaderboard_cache import cache as _leaderboard_cache_backend  # type: ignore
-except Exception:  # pragma: no cover - import-time failure only occurs in unusual setups
-    _leaderboard_cache_backend = None
+from services.report_cache import shared_store
 
 _LOGGER = logging.getLogger(__name__)
 _TTL_SECONDS = 60 * 60  # 1 hour
@@ -54,8 +52,10 @@ def _get_cache_backend() -> Any:
         if _is_real_cache(cache_ext):
             return cache_ext
 
-    if _is_real_cache(_leaderboard_cache_backend):
-        return _leaderboard_cache_backend
+    # Fall back to the report cache's cross-process tier when it is enabled.
+    store = shared_store()
+    if store is not None:
+        return store
 
     return None
 
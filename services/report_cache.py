@@ -0,0 +1,286 @@
+"""Two-tier cache shared by the report services.
+
+Tier one is a bounded in-process LRU; tier two is a SQLite file under the
+app's instance folder so payloads survive restarts and are shared between
+worker processes. Entries are stored under ``(key, version)`` where the
+version describes the inputs the payload was computed from (possession
+signature, CSV mtime, ...), so a reparse naturally misses instead of serving
+a stale payload. Entries also carry tags such as ``game:12`` or ``season:3``
+and :meth:`ReportCache.invalidate_tags` drops every entry with a tag in both
+tiers.
+
+The disk tier is disabled for in-memory databases (nothing to share) and when
+``REPORT_CACHE_DISK`` is false, which is its default under ``TESTING``.
+``REPORT_CACHE_MAX_ENTRIES`` bounds the memory tier and
+``REPORT_CACHE_MEMORY_TTL`` caps how long a worker trusts its own copy of an
+entry another worker may have invalidated.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+
+_LOGGER = logging.getLogger(__name__)
+_EXTENSION_KEY = "report_cache"
+_DEFAULT_TIMEOUT = 60 * 60  # 1 hour
+_DEFAULT_MAX_ENTRIES = 256
+_DEFAULT_MEMORY_TTL = 5 * 60
+_DISK_FILENAME = "report_cache.sqlite"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entry (
+        key TEXT NOT NULL,
+        version TEXT NOT NULL,
+        value BLOB NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (key, version)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cache_tag (
+        key TEXT NOT NULL,
+        version TEXT NOT NULL,
+        tag TEXT NOT NULL,
+        PRIMARY KEY (key, version, tag)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_cache_tag_tag ON cache_tag (tag)",
+)
+
+
+class DiskTier:
+    """SQLite-backed tier; every call opens its own short-lived connection."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key: str, version: str = "", *, with_tags: bool = False) -> Any:
+        """Stored value or ``None``; ``(value, tags)`` when ``with_tags``."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache_entry WHERE key = ? AND version = ?",
+                (key, version),
+            ).fetchone()
+            if row is None or row[1] < time.time():
+                return (None, ()) if with_tags else None
+            tags = ()
+            if with_tags:
+                tags = tuple(tag for (tag,) in conn.execute(
+                    "SELECT tag FROM cache_tag WHERE key = ? AND version = ?", (key, version)
+                ))
+        value = pickle.loads(row[0])
+        return (value, tags) if with_tags else value
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None, *,
+            version: str = "", tags: Iterable[str] = ()) -> None:
+        expires_at = time.time() + (timeout or _DEFAULT_TIMEOUT)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            # Only the newest version of a key is worth keeping.
+            conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+            conn.execute("DELETE FROM cache_tag WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO cache_entry (key, version, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, version, blob, expires_at),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO cache_tag (key, version, tag) VALUES (?, ?, ?)",
+                [(key, version, tag) for tag in tags],
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+            conn.execute("DELETE FROM cache_tag WHERE key = ?", (key,))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        if not tags:
+            return 0
+        marks = ",".join("?" for _ in tags)
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT key FROM cache_tag WHERE tag IN ({marks})", tags
+            )]
+            conn.executemany("DELETE FROM cache_entry WHERE key = ?", [(k,) for k in keys])
+            conn.executemany("DELETE FROM cache_tag WHERE key = ?", [(k,) for k in keys])
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entry")
+            conn.execute("DELETE FROM cache_tag")
+
+
+class ReportCache:
+    """Bounded LRU in front of an optional :class:`DiskTier`."""
+
+    def __init__(self, disk: Optional[DiskTier] = None, *,
+                 max_entries: int = _DEFAULT_MAX_ENTRIES,
+                 memory_ttl: float = _DEFAULT_MEMORY_TTL):
+        self.disk = disk
+        self.max_entries = max(1, int(max_entries))
+        self.memory_ttl = memory_ttl
+        self._entries: "OrderedDict[str, Tuple[str, Any, float, frozenset]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _remember(self, key: str, version: str, value: Any, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._entries[key] = (version, value, time.monotonic() + self.memory_ttl, frozenset(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def get(self, key: str, version: Any = "") -> Any:
+        version = str(version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] <= time.monotonic():
+                    del self._entries[key]
+                elif entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return entry[1]
+
+        value, tags = None, ()
+        if self.disk is not None:
+            try:
+                value, tags = self.disk.get(key, version, with_tags=True)
+            except (sqlite3.Error, pickle.PickleError, EOFError):
+                _LOGGER.exception("Failed to read %s from the report cache disk tier.", key)
+        if value is None:
+            self.counters["misses"] += 1
+            return None
+        self.counters["disk_hits"] += 1
+        # Keep the disk entry's tags so invalidate_tags drops the promoted copy.
+        self._remember(key, version, value, tags)
+        return value
+
+    def set(self, key: str, value: Any, *, version: Any = "",
+            tags: Iterable[str] = (), timeout: Optional[int] = None) -> None:
+        version = str(version)
+        tags = tuple(tags)
+        self._remember(key, version, value, tags)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, timeout, version=version, tags=tags)
+            except (sqlite3.Error, pickle.PickleError):
+                _LOGGER.exception("Failed to write %s to the report cache disk tier.", key)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], *, version: Any = "",
+                       tags: Iterable[str] = (), timeout: Optional[int] = None) -> Tuple[Any, bool]:
+        """Return ``(value, hit)``, computing and storing ``value`` on a miss."""
+        value = self.get(key, version)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.set(key, value, version=version, tags=tags, timeout=timeout)
+        return value, False
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.disk is not None:
+            try:
+                self.disk.delete(key)
+            except sqlite3.Error:
+                _LOGGER.exception("Failed to delete %s from the report cache disk tier.", key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of ``tags``; returns the disk entries removed."""
+        wanted = set(tags)
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[3] & wanted]:
+                del self._entries[key]
+        if self.disk is None:
+            return 0
+        try:
+            return self.disk.invalidate_tags(wanted)
+        except sqlite3.Error:
+            _LOGGER.exception("Failed to invalidate report cache tags %s.", sorted(wanted))
+            return 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, int]:
+        hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+        return {**self.counters, "hits": hits, "entries": len(self._entries)}
+
+
+def _disk_path(app) -> Optional[str]:
+    if not app.config.get("REPORT_CACHE_DISK", not app.testing):
+        return None
+    uri = str(app.config.get("SQLALCHEMY_DATABASE_URI") or "")
+    if not uri or ":memory:" in uri or uri.rstrip("/") == "sqlite:":
+        return None
+    directory = app.config.get("REPORT_CACHE_DIR") or app.instance_path
+    return os.path.join(directory, _DISK_FILENAME)
+
+
+def get_report_cache() -> Optional[ReportCache]:
+    """Return the current app's :class:`ReportCache`, or ``None`` outside an app."""
+    try:
+        app = current_app._get_current_object()
+    except RuntimeError:
+        return None
+    cache = app.extensions.get(_EXTENSION_KEY)
+    if cache is None:
+        disk = None
+        path = _disk_path(app)
+        if path:
+            try:
+                disk = DiskTier(path)
+            except (OSError, sqlite3.Error):
+                _LOGGER.exception("Report cache disk tier unavailable at %s.", path)
+        cache = app.extensions[_EXTENSION_KEY] = ReportCache(
+            disk,
+            max_entries=app.config.get("REPORT_CACHE_MAX_ENTRIES", _DEFAULT_MAX_ENTRIES),
+            memory_ttl=app.config.get("REPORT_CACHE_MEMORY_TTL", _DEFAULT_MEMORY_TTL),
+        )
+    return cache
+
+
+def shared_store() -> Optional[DiskTier]:
+    """Return the cross-process tier for callers that manage their own keys."""
+    cache = get_report_cache()
+    return cache.disk if cache is not None else None
+
+
+def invalidate_report_tags(*tags: str) -> int:
+    cache = get_report_cache()
+    return cache.invalidate_tags(*tags) if cache is not None else 0
+
+
+__all__ = [
+    "DiskTier",
+    "ReportCache",
+    "get_report_cache",
+    "invalidate_report_tags",
+    "shared_store",
+]
@@ -7,6 +7,7 @@ from .advanced_possession import (  # noqa: F401
     compute_advanced_possession_practice,
     invalidate_adv_poss_game,
     invalidate_adv_poss_practice,
+    invalidate_adv_poss_season,
 )
 # BEGIN Playcall Report
 from .playcall import (  # noqa: F401
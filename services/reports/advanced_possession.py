@@ -3,21 +3,19 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from contextlib import suppress
 from datetime import datetime, timezone
 import logging
 import re
 from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
 
-from flask import current_app
 from sqlalchemy import case, func
 
-from models.database import db, Possession, ShotDetail
+from models.database import db, Game, Possession, Practice, ShotDetail
+from services.report_cache import get_report_cache, invalidate_report_tags
 
 
 _LOGGER = logging.getLogger(__name__)
 _CACHE_TTL_SECONDS = 60 * 60  # 1 hour
-_IN_MEMORY_BACKEND = "_InMemoryCache"
 
 _PAINT_LABELS: List[str] = ["0", "1", "2", "3+"]
 _SHOT_CLOCK_BUCKETS = (
@@ -49,9 +47,6 @@ _POSSESSION_TYPE_LOOKUP.update(
 )
 _PRACTICE_TEAM_KEYS = ("crimson", "white")
 
-_PRACTICE_CACHE: Dict[int, Dict[str, object]] = {}
-_GAME_CACHE: Dict[int, Dict[str, object]] = {}
-
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -316,112 +311,77 @@ def compute_advanced_possession_game(game_id: int) -> Dict[str, object]:
     return {"offense": payload}
 
 
-def _get_cache_backend():
-    try:
-        app = current_app._get_current_object()
-    except RuntimeError:  # pragma: no cover - only when called outside app context
-        return None
-
-    backend = None
-    with suppress(AttributeError):
-        backend = app.extensions.get("cache")  # type: ignore[assignment]
-    if backend and backend.__class__.__name__ != _IN_MEMORY_BACKEND:
-        return backend
-    return None
-
-
-def _cache_key_practice(practice_id: int) -> str:
-    return f"adv_poss:practice:{practice_id}"
-
-
-def _cache_key_game(game_id: int) -> str:
-    return f"adv_poss:game:{game_id}"
-
+def _content_version(*criteria) -> str:
+    """Possession count and newest possession/event ids for the session."""
+    count, max_possession, max_event = (
+        db.session.query(
+            func.count(func.distinct(Possession.id)),
+            func.max(Possession.id),
+            func.max(ShotDetail.id),
+        )
+        .outerjoin(ShotDetail, ShotDetail.possession_id == Possession.id)
+        .filter(*criteria)
+        .one()
+    )
+    return f"{count}:{max_possession or 0}:{max_event or 0}"
 
-def _store_cache_value(key: str, payload: Dict[str, object]) -> None:
-    backend = _get_cache_backend()
-    if backend is not None:
-        try:
-            backend.set(key, payload, timeout=_CACHE_TTL_SECONDS)
-            return
-        except Exception:  # pragma: no cover - backend failures are logged
-            _LOGGER.exception("Failed to write advanced possession payload to cache backend.")
-    # fall back to in-process dicts handled by caller
 
+def _cached_payload(key: str, version: str, tags: Tuple[str, ...], compute, session_id: int):
+    def _build() -> Dict[str, object]:
+        meta = {"source": "compute", "updated_at": _utc_now_iso(), "id": session_id}
+        return {"data": compute(session_id), "meta": meta}
 
-def _read_cache_value(key: str) -> Optional[Dict[str, object]]:
-    backend = _get_cache_backend()
-    if backend is None:
-        return None
-    try:
-        value = backend.get(key)
-    except Exception:  # pragma: no cover - backend failures are logged
-        _LOGGER.exception("Failed to read advanced possession payload from cache backend.")
-        return None
-    if isinstance(value, dict):
-        return value
-    return None
+    cache = get_report_cache()
+    if cache is None:
+        payload, hit = _build(), False
+    else:
+        payload, hit = cache.get_or_compute(
+            key, _build, version=version, tags=tags, timeout=_CACHE_TTL_SECONDS
+        )
+    meta = dict(payload["meta"])
+    if hit:
+        meta["source"] = "cache"
+    return payload["data"], meta
 
 
-def _delete_cache_value(key: str) -> None:
-    backend = _get_cache_backend()
-    if backend is None:
-        return
-    try:
-        backend.delete(key)
-    except Exception:  # pragma: no cover - backend failures are logged
-        _LOGGER.exception("Failed to delete advanced possession payload from cache backend.")
+def _cache_tags(kind: str, session_id: int, model) -> Tuple[str, ...]:
+    tags = [f"{kind}:{session_id}"]
+    season_id = db.session.query(model.season_id).filter(model.id == session_id).scalar()
+    if season_id is not None:
+        tags.append(f"season:{season_id}")
+    return tuple(tags)
 
 
 def cache_get_or_compute_adv_poss_practice(practice_id: int):
-    key = _cache_key_practice(practice_id)
-    cached = _read_cache_value(key)
-    if cached:
-        meta = dict(cached.get("meta", {}))
-        meta["source"] = "cache"
-        return cached.get("data"), meta
-
-    entry = _PRACTICE_CACHE.get(practice_id)
-    if entry:
-        meta = dict(entry["meta"])
-        meta["source"] = "cache"
-        return entry["data"], meta
-
-    data = compute_advanced_possession_practice(practice_id)
-    meta = {"source": "compute", "updated_at": _utc_now_iso(), "id": practice_id}
-    payload = {"data": data, "meta": meta}
-    _store_cache_value(key, payload)
-    _PRACTICE_CACHE[practice_id] = payload
-    return data, dict(meta)
+    return _cached_payload(
+        f"adv_poss:practice:{practice_id}",
+        _content_version(Possession.practice_id == practice_id),
+        _cache_tags("practice", practice_id, Practice),
+        compute_advanced_possession_practice,
+        practice_id,
+    )
 
 
 def cache_get_or_compute_adv_poss_game(game_id: int):
-    key = _cache_key_game(game_id)
-    cached = _read_cache_value(key)
-    if cached:
-        meta = dict(cached.get("meta", {}))
-        meta["source"] = "cache"
-        return cached.get("data"), meta
-
-    entry = _GAME_CACHE.get(game_id)
-    if entry:
-        meta = dict(entry["meta"])
-        meta["source"] = "cache"
-        return entry["data"], meta
-
-    data = compute_advanced_possession_game(game_id)
-    meta = {"source": "compute", "updated_at": _utc_now_iso(), "id": game_id}
-    payload = {"data": data, "meta": meta}
-    _store_cache_value(key, payload)
-    _GAME_CACHE[game_id] = payload
-    return data, dict(meta)
+    return _cached_payload(
+        f"adv_poss:game:{game_id}",
+        _content_version(Possession.game_id == game_id),
+        _cache_tags("game", game_id, Game),
+        compute_advanced_possession_game,
+        game_id,
+    )
 
 
 def invalidate_adv_poss_practice(practice_id: int) -> None:
-    _PRACTICE_CACHE.pop(practice_id, None)
-    _delete_cache_value(_cache_key_practice(practice_id))
+    invalidate_report_tags(f"practice:{practice_id}")
 
 
 def invalidate_adv_poss_game(game_id: int) -> None:
-    _GAME_CACHE.pop(game_id, None)
-    _delete_cache_value(_cache_key_game(game_id))
+    invalidate_report_tags(f"game:{game_id}")
+
+
+def invalidate_adv_poss_season(season_id: int) -> None:
+    """Invalidate cached advanced possession entries for a season."""
+    if season_id is None:
+        return
+    invalidate_report_tags(f"season:{season_id}")
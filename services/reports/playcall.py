@@ -14,12 +14,15 @@ from typing import Dict, Iterable, Mapping, MutableMapping, Optional, Tuple
 import pandas as pd
 from flask import current_app
 
-from models.database import Game
+from models.database import Game, db
+from services.report_cache import get_report_cache, invalidate_report_tags
+from utils.game_frames import file_digest, load_game_frame, write_game_frame
+
 _LOGGER = logging.getLogger(__name__)
 _CACHE_TTL_SECONDS = 60 * 60  # 1 hour
-_IN_MEMORY_CACHE: Dict[int, Dict[str, object]] = {}
 
 
+_REPORT_COLUMNS = frozenset({"Row", "SERIES", "PLAYCALL", "TEAM"})
 _FLOW_PREFIX_PATTERN = re.compile(r"^\s*flow\s*[–-]\s*", flags=re.IGNORECASE)
 
 
@@ -39,50 +42,36 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def _get_cache_backend():
-    try:
-        app = current_app._get_current_object()
-    except RuntimeError:  # pragma: no cover - outside app context
-        return None
-    return app.extensions.get("cache") if app else None
-
-
 def _cache_key(game_id: int) -> str:
     return f"playcall-report:{game_id}"
 
 
-def _store_cache_value(key: str, payload: Dict[str, object]) -> None:
-    backend = _get_cache_backend()
-    if backend is None:
-        return
-    try:
-        backend.set(key, payload, timeout=_CACHE_TTL_SECONDS)
-    except Exception:  # pragma: no cover - backend failures are logged
-        _LOGGER.exception("Failed to store playcall report payload in cache backend.")
-
-
-def _read_cache_value(key: str) -> Optional[Dict[str, object]]:
-    backend = _get_cache_backend()
-    if backend is None:
+def _csv_path(game: Optional[Game]) -> Optional[str]:
+    if not game or not game.csv_filename:
         return None
-    try:
-        value = backend.get(key)
-    except Exception:  # pragma: no cover - backend failures are logged
-        _LOGGER.exception("Failed to read playcall report payload from cache backend.")
+    upload_folder = current_app.config.get("UPLOAD_FOLDER")
+    if not upload_folder:
         return None
-    if isinstance(value, dict):
-        return value
-    return None
+    return os.path.join(upload_folder, game.csv_filename)
 
 
-def _delete_cache_value(key: str) -> None:
-    backend = _get_cache_backend()
-    if backend is None:
-        return
+def _content_version(game: Optional[Game]) -> str:
+    """Identify the CSV a payload was computed from by name, size and mtime."""
+    path = _csv_path(game)
+    if not path:
+        return ""
     try:
-        backend.delete(key)
-    except Exception:  # pragma: no cover - backend failures are logged
-        _LOGGER.exception("Failed to delete playcall report payload from cache backend.")
+        stat = os.stat(path)
+    except OSError:
+        return game.csv_filename
+    return f"{game.csv_filename}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _cache_tags(game_id: int, game: Optional[Game]) -> Tuple[str, ...]:
+    tags = [f"game:{game_id}"]
+    if game is not None and game.season_id is not None:
+        tags.append(f"season:{game.season_id}")
+    return tuple(tags)
 
 
 def _normalize_string(value: object) -> str:
@@ -319,56 +308,66 @@ def _compute_from_dataframe(df: pd.DataFrame) -> Dict[str, object]:
     }
 
 
-def _persist_payload(game_id: int, data: Dict[str, object]):
+def _persist_payload(game_id: int, data: Dict[str, object], game: Optional[Game] = None):
     meta = {"source": "compute", "updated_at": _utc_now_iso(), "id": game_id}
-    payload = {"data": data, "meta": meta}
-    key = _cache_key(game_id)
-    _store_cache_value(key, payload)
-    _IN_MEMORY_CACHE[game_id] = payload
+    cache = get_report_cache()
+    if cache is not None:
+        game = game or db.session.get(Game, game_id)
+        cache.set(
+            _cache_key(game_id),
+            {"data": data, "meta": meta},
+            version=_content_version(game),
+            tags=_cache_tags(game_id, game),
+            timeout=_CACHE_TTL_SECONDS,
+        )
     return data, dict(meta)
 
 
 def compute_playcall_report_from_dataframe(game_id: int, df: pd.DataFrame):
     data = _compute_from_dataframe(df)
-    return _persist_payload(game_id, data)
+    game = db.session.get(Game, game_id)
+    path = _csv_path(game)
+    if path:
+        write_game_frame(game_id, df, file_digest(path))
+    return _persist_payload(game_id, data, game)
 
 
-def _load_dataframe_for_game(game_id: int) -> pd.DataFrame:
-    game = Game.query.get(game_id)
-    if not game or not game.csv_filename:
-        return pd.DataFrame()
-    upload_folder = current_app.config.get("UPLOAD_FOLDER")
-    if not upload_folder:
-        return pd.DataFrame()
-    csv_path = os.path.join(upload_folder, game.csv_filename)
-    if not os.path.exists(csv_path):
+def _report_column(name: str) -> bool:
+    return name in _REPORT_COLUMNS or name.startswith("#")
+
+
+def _load_dataframe_for_game(game: Optional[Game]) -> pd.DataFrame:
+    path = _csv_path(game)
+    if not path or not os.path.exists(path):
         return pd.DataFrame()
+    digest = file_digest(path)
+    snapshot = load_game_frame(game.id, digest, columns=_report_column)
+    if snapshot is not None:
+        return snapshot
     try:
-        return pd.read_csv(csv_path)
+        df = pd.read_csv(path)
     except Exception:  # pragma: no cover - pandas may raise
-        _LOGGER.exception("Failed to load game CSV for playcall report (game_id=%s)", game_id)
+        _LOGGER.exception("Failed to load game CSV for playcall report (game_id=%s)", game.id)
         return pd.DataFrame()
+    write_game_frame(game.id, df, digest)
+    return df
 
 
 def compute_playcall_report(game_id: int):
-    df = _load_dataframe_for_game(game_id)
-    data = _compute_from_dataframe(df)
-    return _persist_payload(game_id, data)
+    game = db.session.get(Game, game_id)
+    data = _compute_from_dataframe(_load_dataframe_for_game(game))
+    return _persist_payload(game_id, data, game)
 
 
 def cache_get_or_compute_playcall_report(game_id: int):
-    key = _cache_key(game_id)
-    cached = _read_cache_value(key)
-    if cached:
-        meta = dict(cached.get("meta", {}))
-        meta["source"] = "cache"
-        return cached.get("data"), meta
-
-    entry = _IN_MEMORY_CACHE.get(game_id)
-    if entry:
-        meta = dict(entry["meta"])
-        meta["source"] = "cache"
-        return entry["data"], meta
+    cache = get_report_cache()
+    if cache is not None:
+        game = db.session.get(Game, game_id)
+        cached = cache.get(_cache_key(game_id), _content_version(game))
+        if isinstance(cached, dict):
+            meta = dict(cached.get("meta", {}))
+            meta["source"] = "cache"
+            return cached.get("data"), meta
 
     data, meta = compute_playcall_report(game_id)
     return data, meta
@@ -656,16 +655,13 @@ def aggregate_playcall_reports(game_ids: Iterable[int]):
 
 
 def invalidate_playcall_report(game_id: int) -> None:
-    _IN_MEMORY_CACHE.pop(game_id, None)
-    _delete_cache_value(_cache_key(game_id))
+    invalidate_report_tags(f"game:{game_id}")
 
 
 def invalidate_playcall_report_season(season_id: int) -> None:
     """Invalidate cached playcall report entries for a season."""
     if season_id is None:
         return
-    games = Game.query.filter(Game.season_id == season_id).all()
-    for game in games:
-        invalidate_playcall_report(game.id)
+    invalidate_report_tags(f"season:{season_id}")
 
 # END Playcall Report
@@ -0,0 +1,271 @@
+"""Materialized ``PlayerStats`` rollups for leaderboards.
+
+``player_stats_rollup`` holds one row per (season, player, source, session
+date) with every integer ``PlayerStats`` column summed, plus the 3FG
+shot-detail counts that would otherwise require decoding each
+``shot_type_details`` blob. Date windows are whole days, so any leaderboard
+window maps exactly onto rollup rows and no raw stat rows are read.
+
+The ingest, reparse and delete paths call :func:`refresh_game_rollups` /
+:func:`refresh_practice_rollups` for the session they touched. In-place edits
+such as a roster rename call :func:`rebuild_season_rollups` directly. Each of
+these records the season's raw row count and max id in
+``player_stats_rollup_state``; readers call :func:`ensure_season_rollups`,
+which only compares that watermark against the season index and rebuilds on
+a mismatch (first use after the migration, or an insert/delete path that
+skipped the refresh). In-place edits that bypass the refresh are caught by
+:func:`verify_season_rollups`, run from the ``verify_stat_rollups`` command.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from models.database import Game, PlayerStats, PlayerStatsRollup, PlayerStatsRollupState, Practice, db
+from utils.shottype import count_3fg_shots_for_stats
+
+_LOGGER = logging.getLogger(__name__)
+
+_KEY_COLUMNS = {
+    "id",
+    "season_id",
+    "player_name",
+    "source",
+    "session_date",
+    "session_count",
+    "jersey_number",
+}
+SHOT_PREFIX = "shot_"
+
+SUM_FIELDS: Tuple[str, ...] = tuple(
+    c.name
+    for c in PlayerStatsRollup.__table__.columns
+    if c.name not in _KEY_COLUMNS and not c.name.startswith(SHOT_PREFIX)
+)
+SHOT_FIELDS: Tuple[str, ...] = tuple(
+    c.name for c in PlayerStatsRollup.__table__.columns if c.name.startswith(SHOT_PREFIX)
+)
+
+
+def _raw_rows_query() -> Query:
+    return (
+        db.session.query(PlayerStats, Game.id, Game.game_date, Practice.id, Practice.date)
+        .outerjoin(Game, PlayerStats.game_id == Game.id)
+        .outerjoin(Practice, PlayerStats.practice_id == Practice.id)
+        .order_by(PlayerStats.id)
+    )
+
+
+def _build_rollups(rows: Iterable[Tuple]) -> List[Dict[str, Any]]:
+    """Group ``_raw_rows_query`` results into rollup row dicts."""
+    rows = list(rows)
+    shot_counts = count_3fg_shots_for_stats(row[0] for row in rows)
+    groups: Dict[Tuple, Dict[str, Any]] = {}
+    for stat, game_id, game_date, practice_id, practice_date in rows:
+        # Mirror the leaderboard joins: a row only counts as a game/practice
+        # row when its session still exists.
+        if stat.game_id is not None and game_id is not None:
+            source, session_date = "game", game_date
+        elif stat.practice_id is not None and practice_id is not None:
+            source, session_date = "practice", practice_date
+        else:
+            source, session_date = "other", None
+
+        key = (stat.season_id, stat.player_name, source, session_date)
+        entry = groups.get(key)
+        if entry is None:
+            entry = groups[key] = {
+                "season_id": stat.season_id,
+                "player_name": stat.player_name,
+                "source": source,
+                "session_date": session_date,
+                "session_count": 0,
+                "jersey_number": stat.jersey_number,
+                **{field: 0 for field in SUM_FIELDS + SHOT_FIELDS},
+            }
+        entry["session_count"] += 1
+        if entry["jersey_number"] is None:
+            entry["jersey_number"] = stat.jersey_number
+        for field in SUM_FIELDS:
+            entry[field] += getattr(stat, field) or 0
+
+        counts = shot_counts.get(stat.id)
+        if counts:
+            for field in SHOT_FIELDS:
+                entry[field] += counts.get(field[len(SHOT_PREFIX):], 0)
+    return list(groups.values())
+
+
+def _write_rollups(rows: Sequence[Dict[str, Any]]) -> int:
+    if rows:
+        db.session.execute(PlayerStatsRollup.__table__.insert(), list(rows))
+    return len(rows)
+
+
+def _raw_watermark(season_id: int) -> Tuple[int, int]:
+    """``(row count, max id)`` of the season's raw rows, read off the season index."""
+    rows, max_id = (
+        db.session.query(func.count(PlayerStats.id), func.coalesce(func.max(PlayerStats.id), 0))
+        .filter(PlayerStats.season_id == season_id)
+        .one()
+    )
+    return int(rows), int(max_id)
+
+
+def _record_watermark(season_id: int) -> None:
+    rows, max_id = _raw_watermark(season_id)
+    db.session.merge(PlayerStatsRollupState(season_id=season_id, raw_rows=rows, raw_max_id=max_id))
+
+
+def rebuild_season_rollups(season_id: int) -> int:
+    """Recompute every rollup row for ``season_id``; the caller commits."""
+    PlayerStatsRollup.query.filter_by(season_id=season_id).delete(synchronize_session=False)
+    rows = _raw_rows_query().filter(PlayerStats.season_id == season_id)
+    written = _write_rollups(_build_rollups(rows))
+    _record_watermark(season_id)
+    return written
+
+
+def refresh_rollups(season_id: int, source: str, session_date: Optional[date]) -> int:
+    """Recompute the rollup rows for one (season, source, date) key."""
+    date_filter = (
+        PlayerStatsRollup.session_date.is_(None)
+        if session_date is None
+        else PlayerStatsRollup.session_date == session_date
+    )
+    PlayerStatsRollup.query.filter(
+        PlayerStatsRollup.season_id == season_id,
+        PlayerStatsRollup.source == source,
+        date_filter,
+    ).delete(synchronize_session=False)
+
+    query = _raw_rows_query().filter(PlayerStats.season_id == season_id)
+    if source == "game":
+        query = query.filter(Game.id.isnot(None), Game.game_date == session_date)
+    elif source == "practice":
+        query = query.filter(
+            PlayerStats.game_id.is_(None) | Game.id.is_(None),
+            Practice.id.isnot(None),
+            Practice.date == session_date,
+        )
+    else:
+        return rebuild_season_rollups(season_id)
+    rows = [row for row in _build_rollups(query) if row["source"] == source]
+    written = _write_rollups(rows)
+    _record_watermark(season_id)
+    return written
+
+
+def refresh_game_rollups(game: Game | int | None) -> int:
+    if not isinstance(game, Game):
+        game = db.session.get(Game, game) if game is not None else None
+    if game is None:
+        return 0
+    return refresh_rollups(game.season_id, "game", game.game_date)
+
+
+def refresh_practice_rollups(practice: Practice | int | None) -> int:
+    if not isinstance(practice, Practice):
+        practice = db.session.get(Practice, practice) if practice is not None else None
+    if practice is None:
+        return 0
+    return refresh_rollups(practice.season_id, "practice", practice.date)
+
+
+def ensure_season_rollups(season_id: int) -> bool:
+    """Rebuild ``season_id`` when the raw rows moved past its recorded watermark.
+
+    Only the season's raw row count and max id are read, so the check stays
+    cheap on every leaderboard render. Returns ``True`` when a rebuild happened.
+    """
+    state = db.session.get(PlayerStatsRollupState, season_id)
+    current = _raw_watermark(season_id)
+    if state is not None and (state.raw_rows, state.raw_max_id) == current:
+        return False
+    _LOGGER.info("Rebuilding player stat rollups for season %s (raw watermark %s)", season_id, current)
+    rebuild_season_rollups(season_id)
+    db.session.commit()
+    return True
+
+
+def _player_sums(query: Query, model) -> Dict[Any, Tuple[int, ...]]:
+    rows = query.with_entities(
+        model.player_name,
+        *[func.coalesce(func.sum(getattr(model, field)), 0) for field in SUM_FIELDS],
+    ).group_by(model.player_name)
+    return {row[0]: tuple(int(value) for value in row[1:]) for row in rows}
+
+
+def verify_season_rollups(season_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """Rebuild every season whose rollup sums differ from its raw rows.
+
+    This re-aggregates the raw table, so it belongs in maintenance (the
+    ``verify_stat_rollups`` command), not on a request path. It catches
+    in-place edits to any summed column that skipped the refresh. Returns the
+    rebuilt season ids.
+    """
+    if season_ids is None:
+        season_ids = [sid for (sid,) in db.session.query(PlayerStats.season_id).distinct()]
+    rebuilt = []
+    for season_id in season_ids:
+        raw = _player_sums(PlayerStats.query.filter(PlayerStats.season_id == season_id), PlayerStats)
+        rolled = _player_sums(
+            PlayerStatsRollup.query.filter(PlayerStatsRollup.season_id == season_id), PlayerStatsRollup
+        )
+        if raw != rolled:
+            _LOGGER.info("Rollups for season %s drifted from raw rows; rebuilding", season_id)
+            rebuild_season_rollups(season_id)
+            rebuilt.append(season_id)
+    db.session.commit()
+    return rebuilt
+
+
+def rollup_sum_query(
+    season_id: int,
+    fields: Sequence[str],
+    *,
+    source: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_jersey: bool = False,
+) -> Query:
+    """Return per-player sums of ``fields`` labelled like the raw leaderboard query.
+
+    Each result row exposes ``player`` (and ``jersey_number`` when asked for)
+    plus one attribute per field. A date bound drops rows without a session
+    date, matching the raw ``Game.game_date`` / ``Practice.date`` filters.
+    """
+    columns = [PlayerStatsRollup.player_name.label("player")]
+    if include_jersey:
+        columns.append(func.max(PlayerStatsRollup.jersey_number).label("jersey_number"))
+    columns.extend(
+        func.coalesce(func.sum(getattr(PlayerStatsRollup, field)), 0).label(field)
+        for field in fields
+    )
+    query = db.session.query(*columns).filter(PlayerStatsRollup.season_id == season_id)
+    if source:
+        query = query.filter(PlayerStatsRollup.source == source)
+    if start_date:
+        query = query.filter(PlayerStatsRollup.session_date >= start_date)
+    if end_date:
+        query = query.filter(PlayerStatsRollup.session_date <= end_date)
+    return query.group_by(PlayerStatsRollup.player_name)
+
+
+__all__ = [
+    "SHOT_FIELDS",
+    "SHOT_PREFIX",
+    "SUM_FIELDS",
+    "ensure_season_rollups",
+    "rebuild_season_rollups",
+    "refresh_game_rollups",
+    "refresh_practice_rollups",
+    "refresh_rollups",
+    "rollup_sum_query",
+    "verify_season_rollups",
+]
@@ -1,5 +1,4 @@
 import os
-import json
 try:
     import pandas as pd
 except ModuleNotFoundError:  # pragma: no cover - allow tests without pandas
@@ -15,9 +14,11 @@ except ModuleNotFoundError:  # pragma: no cover
     class _DummyNP:
         ndarray = type('ndarray', (), {})
     np = _DummyNP()
-import sqlite3
+from utils.bulk_persist import IngestBatch, ingest_transaction, replace_scope
 from utils.lineup import compute_lineup_efficiencies, get_players_on_floor
-from utils.shottype import persist_player_shot_details
+from utils.roster_resolver import RosterResolver
+from utils.shottype import delete_player_shot_details, serialize_shot_details
+from services.stat_rollups import refresh_game_rollups
 # BEGIN Advanced Possession
 from services.reports.advanced_possession import (
     cache_get_or_compute_adv_poss_game,
@@ -30,7 +31,7 @@ from services.reports.playcall import (
     invalidate_playcall_report,
 )
 # END Playcall Report
-from models.database import db, Game, PlayerStats, Possession, TeamStats, BlueCollarStats, OpponentBlueCollarStats, PlayerPossession, Roster, ShotDetail
+from models.database import db, Game, PlayerStats, TeamStats, BlueCollarStats, OpponentBlueCollarStats
 
 #print("🔥 parse_csv() function has started executing!")
 
@@ -49,37 +50,6 @@ def safe_str(val, default=""):
     return default if pd.isna(val) else str(val)
 
 
-def _find_roster_entry(player_name: str, season_id: int):
-    """Return the first roster entry matching the raw or normalized player token."""
-    if not player_name:
-        return None
-
-    candidates = []
-
-    raw = player_name.strip()
-    if raw:
-        candidates.append(raw)
-
-    no_hash = raw.lstrip("#").strip()
-    if no_hash and no_hash not in candidates:
-        candidates.append(no_hash)
-
-    parts = no_hash.split(None, 1)
-    if parts and parts[0].isdigit():
-        without_jersey = parts[1].strip() if len(parts) > 1 else ""
-        if without_jersey and without_jersey not in candidates:
-            candidates.append(without_jersey)
-
-    for candidate in candidates:
-        roster_entry = Roster.query.filter_by(
-            season_id=season_id,
-            player_name=candidate,
-        ).first()
-        if roster_entry:
-            return roster_entry
-
-    return None
-
 # --- Period Normalization Helper ---
 def normalize_period_label(value):
     """Return a canonical period label from assorted CSV variations."""
@@ -399,58 +369,63 @@ def process_offense_row(row, df_columns, player_stats_dict, game_id, season_id,
 
     # 5) Build and append one shot_detail object if we found shooter_type
     if shooter_col and shooter_type:
-        # Safely coerce possession type
-        poss_val = row.get("Shot Possession Type", "")
-        if pd.isna(poss_val) or not str(poss_val).strip():
-            poss_val = row.get("POSSESSION TYPE", "")
-        possession_str = "" if pd.isna(poss_val) else str(poss_val).strip()
-
-        shot_detail = {
-            "shot_class":      shooter_type,
-            "result":          shot_result,
-            "possession_type": possession_str,
-            "Assisted":        "Assisted"     if assisted_flag else "",
-            "Non-Assisted":    "" if assisted_flag else "Non-Assisted"
-        }
-        shot_location = safe_str(row.get("Shot Location", ""))
-        shot_detail["shot_location"] = shot_location
-        key_prefix = shooter_type.lower()  # → "atr" or "2fg" or "3fg"
-
-        # ─── Shared ATR & 2FG subcategories (pull from "2FG (…)” columns) ────────────
-        if shooter_type in ("ATR", "2FG"):
-            for suffix in ["Type", "Defenders", "Dribble", "Feet", "Hands", "Other", "PA", "RA"]:
-                col_name = f"2FG ({suffix})"
-                shot_detail[f"{key_prefix}_{suffix.lower().replace(' ', '_')}"] = safe_str(row.get(col_name, ""))
-
-            # 2FG Scheme (Attack) & (Pass)
-            for token2 in extract_tokens(row.get("2FG Scheme (Attack)", "")):
-                shot_detail[f"{key_prefix}_scheme_attack"] = token2
-
-            for token2 in extract_tokens(row.get("2FG Scheme (Drive)", "")):
-                shot_detail[f"{key_prefix}_scheme_drive"] = token2
-                
-            for token2 in extract_tokens(row.get("2FG Scheme (Pass)", "")):
-                shot_detail[f"{key_prefix}_scheme_pass"] = token2
-
-        # ─── 3FG-only subcategories (pull from "3FG (…)” columns) ───────────────
-        else:  # shooter_type == "3FG"
-            for suffix in ["Contest", "Footwork", "Good/Bad", "Line", "Move", "Pocket", "Shrink", "Type"]:
-                col_name = f"3FG ({suffix})"
-                json_key = f"{key_prefix}_{suffix.lower().replace('/', '_').replace(' ', '_')}"
-                shot_detail[json_key] = safe_str(row.get(col_name, ""))
-
-            # 3FG Scheme (Attack), (Drive), (Pass)
-            for token3 in extract_tokens(row.get("3FG Scheme (Attack)", "")):
-                shot_detail[f"{key_prefix}_scheme_attack"] = token3
-            for token3 in extract_tokens(row.get("3FG Scheme (Drive)", "")):
-                shot_detail[f"{key_prefix}_scheme_drive"] = token3
-            for token3 in extract_tokens(row.get("3FG Scheme (Pass)", "")):
-                shot_detail[f"{key_prefix}_scheme_pass"] = token3
+        shot_detail = build_shot_detail(row, shooter_type, shot_result, assisted_flag)
 
         # 6) Append this single shot_detail to the shooter’s shot_type_details list
         player_stats_dict[shooter_col]["shot_type_details"].append(shot_detail)
 
 
+def build_shot_detail(row, shooter_type, shot_result, assisted_flag):
+    """Return the per-shot JSON object recorded for one Offense row's shooter."""
+    # Safely coerce possession type
+    poss_val = row.get("Shot Possession Type", "")
+    if pd.isna(poss_val) or not str(poss_val).strip():
+        poss_val = row.get("POSSESSION TYPE", "")
+    possession_str = "" if pd.isna(poss_val) else str(poss_val).strip()
+
+    shot_detail = {
+        "shot_class":      shooter_type,
+        "result":          shot_result,
+        "possession_type": possession_str,
+        "Assisted":        "Assisted"     if assisted_flag else "",
+        "Non-Assisted":    "" if assisted_flag else "Non-Assisted"
+    }
+    shot_location = safe_str(row.get("Shot Location", ""))
+    shot_detail["shot_location"] = shot_location
+    key_prefix = shooter_type.lower()  # → "atr" or "2fg" or "3fg"
+
+    # ─── Shared ATR & 2FG subcategories (pull from "2FG (…)” columns) ────────────
+    if shooter_type in ("ATR", "2FG"):
+        for suffix in ["Type", "Defenders", "Dribble", "Feet", "Hands", "Other", "PA", "RA"]:
+            col_name = f"2FG ({suffix})"
+            shot_detail[f"{key_prefix}_{suffix.lower().replace(' ', '_')}"] = safe_str(row.get(col_name, ""))
+
+        # 2FG Scheme (Attack) & (Pass)
+        for token2 in extract_tokens(row.get("2FG Scheme (Attack)", "")):
+            shot_detail[f"{key_prefix}_scheme_attack"] = token2
+
+        for token2 in extract_tokens(row.get("2FG Scheme (Drive)", "")):
+            shot_detail[f"{key_prefix}_scheme_drive"] = token2
+            
+        for token2 in extract_tokens(row.get("2FG Scheme (Pass)", "")):
+            shot_detail[f"{key_prefix}_scheme_pass"] = token2
+
+    # ─── 3FG-only subcategories (pull from "3FG (…)” columns) ───────────────
+    else:  # shooter_type == "3FG"
+        for suffix in ["Contest", "Footwork", "Good/Bad", "Line", "Move", "Pocket", "Shrink", "Type"]:
+            col_name = f"3FG ({suffix})"
+            json_key = f"{key_prefix}_{suffix.lower().replace('/', '_').replace(' ', '_')}"
+            shot_detail[json_key] = safe_str(row.get(col_name, ""))
+
+        # 3FG Scheme (Attack), (Drive), (Pass)
+        for token3 in extract_tokens(row.get("3FG Scheme (Attack)", "")):
+            shot_detail[f"{key_prefix}_scheme_attack"] = token3
+        for token3 in extract_tokens(row.get("3FG Scheme (Drive)", "")):
+            shot_detail[f"{key_prefix}_scheme_drive"] = token3
+        for token3 in extract_tokens(row.get("3FG Scheme (Pass)", "")):
+            shot_detail[f"{key_prefix}_scheme_pass"] = token3
+
+    return shot_detail
 
 
 def process_defense_row(row, opponent_totals, stat_mapping):
@@ -540,25 +515,27 @@ def process_player_row(row, player_stats_dict, game_id, season_id, stat_mapping,
     player_stats_dict[player_name]["_blue_collar_total"] = blue_total
 
 # BEGIN contest_side_keyerror_fix
+defense_player_mapping = {
+    "Foul By": "foul_by",
+    "Front": "contest_front",
+    "Side": "contest_side",
+    "Behind": "contest_behind",
+    "Late": "contest_late",
+    "Contest": "contest_early",
+    "No Contest": "contest_no",
+    "None": "contest_no",
+    "Low Man +": "low_help_positive",
+    "Low Man -": "low_help_missed",
+    "Contest Pass +": "pass_contest_positive",
+    "Contest Pass -": "pass_contest_missed",
+    "Blowby": "blowby_total",
+    "Triple Threat": "blowby_triple_threat",
+    "Closeout": "blowby_closeout",
+    "Isolation": "blowby_isolation"
+}
+
 def process_defense_player_row(row, df_columns, player_stats_dict, game_id, season_id):
-    defense_mapping = {
-        "Foul By": "foul_by",
-        "Front": "contest_front",
-        "Side": "contest_side",
-        "Behind": "contest_behind",
-        "Late": "contest_late",
-        "Contest": "contest_early",
-        "No Contest": "contest_no",
-        "None": "contest_no",
-        "Low Man +": "low_help_positive",
-        "Low Man -": "low_help_missed",
-        "Contest Pass +": "pass_contest_positive",
-        "Contest Pass -": "pass_contest_missed",
-        "Blowby": "blowby_total",
-        "Triple Threat": "blowby_triple_threat",
-        "Closeout": "blowby_closeout",
-        "Isolation": "blowby_isolation"
-    }
+    defense_mapping = defense_player_mapping
     for col in df_columns:
         player_name = normalize_player_column_name(col)
         if not player_name.startswith("#"):
@@ -832,13 +809,6 @@ def process_possessions(df, game_id, season_id, subtract_off_reb=True):
     return possession_data, offensive_possessions, defensive_possessions
 
 
-
-def get_player_id(player_name, conn):
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM roster WHERE player_name = ?", (player_name,))
-    result = cursor.fetchone()
-    return result[0] if result else None
-
 def calculate_derived_metrics(player_stats):
     for player, stats in player_stats.items():
         stats["atr_fg_pct"] = stats["atr_makes"] / stats["atr_attempts"] if stats["atr_attempts"] > 0 else None
@@ -867,92 +837,42 @@ def calculate_derived_metrics(player_stats):
             stats["points_per_shot"] = None
     return player_stats
 
-def parse_csv(file_path, game_id, season_id, file_date=None):
-    #print("✅ Starting CSV Processing...")
-    #print(f"🔍 Checking file path: {os.path.abspath(file_path)}")
-    #print(f"🔍 File exists? {os.path.exists(file_path)}")
-
-    if not os.path.exists(file_path):
-        print("❌ Error: CSV file not found!")
-        return
-
-    #print(f"📚 Reading CSV: {file_path}")
-    df = pd.read_csv(file_path)
-
-    #print("🔍 Unique Row Names in CSV:")
-    #print(df['Row'].unique())
-    #print("📊 CSV Columns:", df.columns.tolist())
-
-    from app import create_app
-    app_instance = create_app()
-    with app_instance.app_context():
-        game_entry = Game.query.filter_by(csv_filename=os.path.basename(file_path)).first()
-        if not game_entry:
-            parsed_game_date = (
-                pd.to_datetime(file_date).date()
-                if file_date is not None
-                else pd.to_datetime("today").date()
-            )
-            game_entry = Game(
-                season_id=season_id,
-                game_date=parsed_game_date,
-                opponent_name="Unknown",
-                home_or_away="Home",
-                result="N/A",
-                csv_filename=os.path.basename(file_path)
-            )
-            db.session.add(game_entry)
-            db.session.commit()
-        game_id = game_entry.id
-        # BEGIN Advanced Possession
-        invalidate_adv_poss_game(game_id)
-        # END Advanced Possession
-        # BEGIN Playcall Report
-        invalidate_playcall_report(game_id)
-        # END Playcall Report
-        print(f"🎯 Assigned Game ID: {game_id}")
-
-    if df.empty:
-        print("❌ CSV is empty! No data to insert.")
-        return
-
-    #print(f"✅ CSV Loaded! {len(df)} rows detected.")
-    #print("⚙️ parse_csv() function is executing correctly!")
+# --- Game parse mappings ---
+GAME_STAT_MAPPING = {
+    "Assist": "assists",
+    "Turnover": "turnovers",
+    "Pot. Assist": "pot_assists",
+    "2nd Assist": "second_assists",
+    "Fouled": "foul_by"
+}
+GAME_BLUE_COLLAR_VALUES = {
+    "reb_tip": 0.5,
+    "def_reb": 1.0,
+    "misc": 1.0,
+    "deflection": 1.0,
+    "steal": 1.0,
+    "block": 1.0,
+    "off_reb": 1.5,
+    "floor_dive": 2.0,
+    "charge_taken": 4.0
+}
+OFFENSE_REB_ROWS = {
+    "rebound opportunities",
+    "offense rebounding opportunities",
+    "offense rebound opportunities",
+    "offensive rebounding opportunities",
+    "offensive rebound opportunities",
+}
+DEFENSE_REB_ROWS = {
+    "defense rebounding opportunities",
+    "defense rebound opportunities",
+    "defensive rebounding opportunities",
+    "defensive rebound opportunities",
+}
 
-    # --- Define Mappings ---
-    stat_mapping = {
-        "Assist": "assists",
-        "Turnover": "turnovers",
-        "Pot. Assist": "pot_assists",
-        "2nd Assist": "second_assists",
-        "Fouled": "foul_by"
-    }
-    blue_collar_values = {
-        "reb_tip": 0.5,
-        "def_reb": 1.0,
-        "misc": 1.0,
-        "deflection": 1.0,
-        "steal": 1.0,
-        "block": 1.0,
-        "off_reb": 1.5,
-        "floor_dive": 2.0,
-        "charge_taken": 4.0
-    }
-    global blue_collar_mapping
-    blue_collar_mapping = {
-        "Reb Tip": "reb_tip",
-        "Def Reb": "def_reb",
-        "Misc": "misc",
-        "Deflection": "deflection",
-        "LB / Steal": "steal",
-        "Block": "block",
-        "Off Reb": "off_reb",
-        "Floor Dive": "floor_dive",
-        "Charge Taken": "charge_taken"
-    }
 
-    player_stats_dict = {}
-    team_totals = {
+def _new_team_totals():
+    return {
         "total_points": 0,
         "total_assists": 0,
         "total_second_assists": 0,
@@ -978,7 +898,10 @@ def parse_csv(file_path, game_id, season_id, file_date=None):
         "charge_taken": 0,
         "reb_tip": 0
     }
-    opponent_totals = {
+
+
+def _new_opponent_totals():
+    return {
         "atr_makes": 0,
         "atr_attempts": 0,
         "fg2_makes": 0,
@@ -996,7 +919,9 @@ def parse_csv(file_path, game_id, season_id, file_date=None):
         "total_blue_collar": 0
     }
 
-    opponent_blue_collar_accum = {
+
+def _new_opponent_blue_collar():
+    return {
         "def_reb": 0,
         "off_reb": 0,
         "misc": 0,
@@ -1008,19 +933,18 @@ def parse_csv(file_path, game_id, season_id, file_date=None):
         "reb_tip": 0
     }
 
-    offense_reb_rows = {
-        "rebound opportunities",
-        "offense rebounding opportunities",
-        "offense rebound opportunities",
-        "offensive rebounding opportunities",
-        "offensive rebound opportunities",
-    }
-    defense_reb_rows = {
-        "defense rebounding opportunities",
-        "defense rebound opportunities",
-        "defensive rebounding opportunities",
-        "defensive rebound opportunities",
-    }
+
+def _accumulate_game_rows(df, game_id, season_id):
+    """Walk the game CSV row by row, dispatching to the ``process_*_row`` helpers."""
+    stat_mapping = GAME_STAT_MAPPING
+    blue_collar_values = GAME_BLUE_COLLAR_VALUES
+    offense_reb_rows = OFFENSE_REB_ROWS
+    defense_reb_rows = DEFENSE_REB_ROWS
+
+    player_stats_dict = {}
+    team_totals = _new_team_totals()
+    opponent_totals = _new_opponent_totals()
+    opponent_blue_collar_accum = _new_opponent_blue_collar()
 
     # --- Process Each Row ---
     for index, row in df.iterrows():
@@ -1124,428 +1048,1113 @@ def parse_csv(file_path, game_id, season_id, file_date=None):
         elif row_type.startswith("#"):
             process_player_row(row, player_stats_dict, game_id, season_id, stat_mapping, blue_collar_values, team_totals)
 
+    return player_stats_dict, team_totals, opponent_totals, opponent_blue_collar_accum
+
+
+def _row_token_counter(df):
+    """Return ``count_tokens(mask, tokens)`` that walks the masked rows one by one."""
+    def count_tokens(mask, tokens):
+        return sum(
+            1
+            for _, r in df[mask].iterrows()
+            for col in df.columns if col.startswith("#")
+            for tok in extract_tokens(r.get(col, ""))
+            if tok in tokens
+        )
+    return count_tokens
+
+
+def _finalize_game_totals(df, player_stats_dict, team_totals, opponent_totals,
+                          offensive_possessions, defensive_possessions, count_tokens):
+    """Roll player stats into team totals and derive the TeamStats percentages."""
     for player_stats in player_stats_dict.values():
         player_stats["atr_total_attempts"] = player_stats.get("atr_attempts", 0)
         player_stats["fg2_total_attempts"] = player_stats.get("fg2_attempts", 0)
         player_stats["fg3_total_attempts"] = player_stats.get("fg3_attempts", 0)
         player_stats["ft_total_attempts"]  = player_stats.get("fta", 0)
 
-    # --- Insert/Overwrite Player Stats into Database ---
-    with app_instance.app_context():
-        valid_cols = {c.name for c in PlayerStats.__table__.columns}
-
-        for player_name, player_stats in player_stats_dict.items():
-            # Remove any existing rows for this player & game to avoid duplicates
-            PlayerStats.query \
-                .filter_by(player_name=player_name, game_id=game_id) \
-                .delete()
-
-            # Prepare shot-detail JSON (if any)
-            json_details = None
-            if player_stats.get("shot_type_details"):
-                json_details = json.dumps(player_stats["shot_type_details"])
-
-            # Build a fresh dict of only valid columns (excluding array/dict fields)
-            clean_stats = {
-                k: safe_value(v)
-                for k, v in player_stats.items()
-                if k in valid_cols
-                and not isinstance(v, (dict, list, tuple, np.ndarray, pd.Series))
-            }
-
-            # Ensure game_id, season_id, and player_name are set correctly:
-            clean_stats["game_id"]     = game_id
-            clean_stats["season_id"]   = season_id
-            clean_stats["player_name"] = player_name
-            # A game row should never have a practice_id
-            clean_stats["practice_id"] = None
-
-            # Attach shot_type_details JSON if present
-            if json_details is not None:
-                clean_stats["shot_type_details"] = json_details
-
-            # Insert the new, non-duplicated PlayerStats row
-            player_stat = PlayerStats(**clean_stats)
-            db.session.add(player_stat)
-            persist_player_shot_details(
-                player_stat,
-                player_stats.get("shot_type_details") or [],
-                replace=True,
-            )
+    # Accumulate team totals from all player stats
+    for player_stats in player_stats_dict.values():
+        team_totals["total_points"]        += safe_value(player_stats.get("points", 0))
+        team_totals["total_assists"]       += safe_value(player_stats.get("assists", 0))
+        team_totals["total_second_assists"]+= safe_value(player_stats.get("second_assists", 0))
+        team_totals["total_pot_assists"]   += safe_value(player_stats.get("pot_assists", 0))
+        team_totals["total_turnovers"]     += safe_value(player_stats.get("turnovers", 0))
+        team_totals["total_atr_makes"]     += safe_value(player_stats.get("atr_makes", 0))
+        team_totals["total_atr_attempts"]  += safe_value(player_stats.get("atr_attempts", 0))
+        team_totals["total_fg2_makes"]     += safe_value(player_stats.get("fg2_makes", 0))
+        team_totals["total_fg2_attempts"]  += safe_value(player_stats.get("fg2_attempts", 0))
+        team_totals["total_fg3_makes"]     += safe_value(player_stats.get("fg3_makes", 0))
+        team_totals["total_fg3_attempts"]  += safe_value(player_stats.get("fg3_attempts", 0))
+        team_totals["total_ftm"]           += safe_value(player_stats.get("ftm", 0))
+        team_totals["total_fta"]           += safe_value(player_stats.get("fta", 0))
+        team_totals["foul_by"]             += safe_value(player_stats.get("foul_by", 0))
+
+    team_totals["total_points"] = (
+        2 * team_totals.get("total_atr_makes", 0)
+        + 2 * team_totals.get("total_fg2_makes", 0)
+        + 3 * team_totals.get("total_fg3_makes", 0)
+        + team_totals.get("total_ftm", 0)
+    )
 
-        # Commit once after processing all players
-        db.session.commit()
-
-        # Accumulate team totals from all player stats
-        for player_stats in player_stats_dict.values():
-            team_totals["total_points"]        += safe_value(player_stats.get("points", 0))
-            team_totals["total_assists"]       += safe_value(player_stats.get("assists", 0))
-            team_totals["total_second_assists"]+= safe_value(player_stats.get("second_assists", 0))
-            team_totals["total_pot_assists"]   += safe_value(player_stats.get("pot_assists", 0))
-            team_totals["total_turnovers"]     += safe_value(player_stats.get("turnovers", 0))
-            team_totals["total_atr_makes"]     += safe_value(player_stats.get("atr_makes", 0))
-            team_totals["total_atr_attempts"]  += safe_value(player_stats.get("atr_attempts", 0))
-            team_totals["total_fg2_makes"]     += safe_value(player_stats.get("fg2_makes", 0))
-            team_totals["total_fg2_attempts"]  += safe_value(player_stats.get("fg2_attempts", 0))
-            team_totals["total_fg3_makes"]     += safe_value(player_stats.get("fg3_makes", 0))
-            team_totals["total_fg3_attempts"]  += safe_value(player_stats.get("fg3_attempts", 0))
-            team_totals["total_ftm"]           += safe_value(player_stats.get("ftm", 0))
-            team_totals["total_fta"]           += safe_value(player_stats.get("fta", 0))
-            team_totals["foul_by"]             += safe_value(player_stats.get("foul_by", 0))
-
-        team_totals["total_points"] = (
-            2 * team_totals.get("total_atr_makes", 0)
-            + 2 * team_totals.get("total_fg2_makes", 0)
-            + 3 * team_totals.get("total_fg3_makes", 0)
-            + team_totals.get("total_ftm", 0)
-        )
+    team_totals["total_possessions"] = int(offensive_possessions)
+    opponent_totals["total_possessions"] = int(defensive_possessions)
 
+    # --- Derived metrics for TeamStats ---------------------------------------
+    # 1) Count actual Off. Rebounds
+    oreb_count = int(
+        df.loc[df['Row'] == "Offense", 'TEAM']
+        .fillna('')
+        .str.count("Off Reb")
+        .sum()
+    )
+    team_totals["total_off_reb"] = oreb_count
+
+    # 2) Sportscode possessions (exclude Neutral & Off Reb)
+    run = int(df['Row'].eq("Offense").sum())
+    neu = int(
+        df.loc[df['Row'] == "Offense", 'TEAM']
+        .fillna('')
+        .str.contains("Neutral")
+        .sum()
+    )
+    poss = run - neu - oreb_count
+    team_totals["poss_for_derived"] = poss
+
+    # 3) Assist %
+    fgm_total = (
+        team_totals["total_atr_makes"]
+    + team_totals["total_fg2_makes"]
+    + team_totals["total_fg3_makes"]
+    )
+    team_totals["assist_pct"] = (
+        round(team_totals["total_assists"] / fgm_total * 100, 1)
+        if fgm_total > 0 else 0.0
+    )
 
-        # Process possessions for bucket 2 (Team vs Opponent) with subtract_off_reb=True
-        _, offensive_possessions, defensive_possessions = process_possessions(df, game_id, season_id, subtract_off_reb=True)
-        team_totals["total_possessions"] = int(offensive_possessions)
-        opponent_totals["total_possessions"] = int(defensive_possessions)
+    # 4) OREB %
+    atr_miss = team_totals["total_atr_attempts"] - team_totals["total_atr_makes"]
+    fg2_miss = team_totals["total_fg2_attempts"] - team_totals["total_fg2_makes"]
+    fg3_miss = team_totals["total_fg3_attempts"] - team_totals["total_fg3_makes"]
+    reb_chance = atr_miss + fg2_miss + fg3_miss
+    team_totals["oreb_pct"] = (
+        round(oreb_count / reb_chance * 100, 0)
+        if reb_chance > 0 else 0.0
+    )
 
+    # 5) FT Rate (NBA formula: FTA ⁄ FGA)
+    offense_rows = df['Row'] == "Offense"
+    # Count free‐throw attempts (made + missed)
+    fta = count_tokens(offense_rows, ("FT+", "FT-"))
+    # Total field‐goal attempts = ATR + 2FG + 3FG attempts
+    fga = (
+        team_totals["total_atr_attempts"]
+      + team_totals["total_fg2_attempts"]
+      + team_totals["total_fg3_attempts"]
+    )
+    team_totals["ft_rate"] = (
+        round(fta / fga * 100, 1)
+        if fga > 0 else 0.0
+    )
 
-        # --- Derived metrics for TeamStats ---------------------------------------
-        # helper to count any label tokens in a set of rows
-        def count_tokens(rows, tokens):
-            return sum(
-                1
-                for _, r in rows.iterrows()
-                for col in df.columns if col.startswith("#")
-                for tok in extract_tokens(r.get(col, ""))
-                if tok in tokens
-            )
 
-        # 1) Count actual Off. Rebounds
-        oreb_count = int(
-            df.loc[df['Row'] == "Offense", 'TEAM']
-            .fillna('')
-            .str.count("Off Reb")
-            .sum()
-        )
-        team_totals["total_off_reb"] = oreb_count
-
-        # 2) Sportscode possessions (exclude Neutral & Off Reb)
-        run = int(df['Row'].eq("Offense").sum())
-        neu = int(
-            df.loc[df['Row'] == "Offense", 'TEAM']
-            .fillna('')
-            .str.contains("Neutral")
-            .sum()
-        )
-        poss = run - neu - oreb_count
-        team_totals["poss_for_derived"] = poss
-
-        # 3) Assist %
-        fgm_total = (
-            team_totals["total_atr_makes"]
-        + team_totals["total_fg2_makes"]
-        + team_totals["total_fg3_makes"]
-        )
-        team_totals["assist_pct"] = (
-            round(team_totals["total_assists"] / fgm_total * 100, 1)
-            if fgm_total > 0 else 0.0
-        )
+    # 6) Turnover %
+    turns = team_totals["total_turnovers"]
+    team_totals["turnover_pct"] = (
+        round(turns / poss * 100, 1)
+        if poss > 0 else 0.0
+    )
 
-        # 4) OREB %
-        atr_miss = team_totals["total_atr_attempts"] - team_totals["total_atr_makes"]
-        fg2_miss = team_totals["total_fg2_attempts"] - team_totals["total_fg2_makes"]
-        fg3_miss = team_totals["total_fg3_attempts"] - team_totals["total_fg3_makes"]
-        reb_chance = atr_miss + fg2_miss + fg3_miss
-        team_totals["oreb_pct"] = (
-            round(oreb_count / reb_chance * 100, 0)
-            if reb_chance > 0 else 0.0
-        )
+    # 7) Good Shot %
+    ftr = team_totals["total_fta"]
+    good = (
+        ftr
+    + team_totals["total_atr_makes"] + atr_miss
+    + team_totals["total_fg3_makes"] + fg3_miss
+    )
+    bad = team_totals["total_fg2_makes"] + fg2_miss
+    den = good + bad
+    team_totals["good_shot_pct"] = (
+        round(good / den * 100, 2)
+        if den > 0 else 0.0
+    )
 
-        # 5) FT Rate (NBA formula: FTA ⁄ FGA)
-        offense_rows = df[df['Row'] == "Offense"]
-        # Count free‐throw attempts (made + missed)
-        fta = count_tokens(offense_rows, ("FT+", "FT-"))
-        # Total field‐goal attempts = ATR + 2FG + 3FG attempts
-        fga = (
-            team_totals["total_atr_attempts"]
-          + team_totals["total_fg2_attempts"]
-          + team_totals["total_fg3_attempts"]
-        )
-        team_totals["ft_rate"] = (
-            round(fta / fga * 100, 1)
-            if fga > 0 else 0.0
-        )
+    # 8) TCR per Sportscode definition
+    # Denominator: made + missed FG + steals, minus neutrals
+    made      = count_tokens(offense_rows, ("ATR+", "2FG+", "3FG+"))
+    missed    = count_tokens(offense_rows, ("ATR-", "2FG-", "3FG-"))
+    steals    = count_tokens(offense_rows, ("Steal",))
+    neutrals  = offense_rows & df["TEAM"].fillna("").str.contains("Neutral", na=False)
+    madeneu   = count_tokens(neutrals, ("ATR+", "2FG+", "3FG+"))
+    missneu   = count_tokens(neutrals, ("ATR-", "2FG-", "3FG-"))
+    stealneu  = count_tokens(neutrals, ("Steal",))
+    trans_opps = (made + missed + steals) - (madeneu + missneu + stealneu)
+
+    #    Numerator: ATR± + 2FG± + 3FG± + Fouled (in Transition rows)
+    trans_rows = offense_rows & df["POSSESSION TYPE"].fillna("").str.contains("Transition", na=False)
+    conversions = count_tokens(trans_rows, (
+        "ATR+", "ATR-",
+        "2FG+", "2FG-",
+        "3FG+", "3FG-",
+        "Fouled"
+    ))
+    team_totals["tcr_pct"] = (
+        round(conversions / trans_opps * 100, 1)
+        if trans_opps > 0 else 0.0
+    )
+    # -------------------------------------------------------------------------
+
+    # Recount FT from CSV to fix missing free throws
+    team_totals["total_ftm"] = count_tokens(offense_rows, ("FT+",))
+    team_totals["total_fta"] = count_tokens(offense_rows, ("FT+","FT-"))
+
+
+# BEGIN Columnar Parse
+# The columnar engine tokenizes every ``#`` player column once into a long
+# (row, col, token) frame and derives the same buckets as the row walk above
+# with grouped pandas operations.  ``parse_game_dataframe(engine="rows")``
+# keeps the original path available for parity checks.
+_SHOT_TOKENS = ("ATR+", "ATR-", "2FG+", "2FG-", "3FG+", "3FG-")
+_POINT_VALUES = {"ATR+": 2, "2FG+": 2, "3FG+": 3, "FT+": 1}
+_SHOT_STATS = {
+    "ATR": ("atr_makes", "atr_attempts", 2),
+    "2FG": ("fg2_makes", "fg2_attempts", 2),
+    "3FG": ("fg3_makes", "fg3_attempts", 3),
+}
+_SHOT_DETAIL_COLUMNS = (
+    ["Shot Possession Type", "POSSESSION TYPE", "Shot Location"]
+    + [f"2FG ({s})" for s in ("Type", "Defenders", "Dribble", "Feet", "Hands", "Other", "PA", "RA")]
+    + [f"3FG ({s})" for s in ("Contest", "Footwork", "Good/Bad", "Line", "Move", "Pocket", "Shrink", "Type")]
+    + [f"{p} Scheme ({s})" for p in ("2FG", "3FG") for s in ("Attack", "Drive", "Pass")]
+)
+_OFFENSE_MISC_STATS = {
+    token: key for token, key in GAME_STAT_MAPPING.items()
+    if token not in ("Assist", "Pot. Assist")
+}
+_PNR_HELP_STATS = {
+    "Gap +": "pnr_gap_positive",
+    "Gap -": "pnr_gap_missed",
+    "Low +": "low_help_positive",
+    "Low -": "low_help_missed",
+}
+_PNR_WINDOW_STATS = {
+    "CW +": "close_window_positive",
+    "CW -": "close_window_missed",
+    "SD +": "shut_door_positive",
+    "SD -": "shut_door_missed",
+}
+_CRASH_STATS = {
+    "Off +": "crash_positive",
+    "Off -": "crash_missed",
+    "BM +": "back_man_positive",
+    "BM -": "back_man_missed",
+}
+_BOX_OUT_STATS = {
+    "Def +": "box_out_positive",
+    "Def -": "box_out_missed",
+    "Given Up": "off_reb_given_up",
+}
+_DEFENSE_TOKEN_STATS = {
+    "Bump +": ["bump_positive", "collision_gap_positive"],
+    "Bump -": ["bump_missed", "collision_gap_missed"],
+    **_PNR_HELP_STATS,
+    **defense_player_mapping,
+}
 
 
-        # 6) Turnover %
-        turns = team_totals["total_turnovers"]
-        team_totals["turnover_pct"] = (
-            round(turns / poss * 100, 1)
-            if poss > 0 else 0.0
-        )
+def _explode_cell_tokens(cells):
+    """Vectorized ``extract_tokens``: one entry per token, indexed by source cell."""
+    cells = cells[cells.notna()]
+    if cells.empty:
+        return pd.Series([], dtype=object)
+    text = cells.astype(str).str.replace("–", "-", regex=False)
+    for sep in (";", "\n", "\r", "\t"):
+        text = text.str.replace(sep, ",", regex=False)
+    tokens = text.str.split(",").explode().str.strip()
+    return tokens[tokens != ""]
+
+
+def _str_column(frame, name):
+    """``str(row.get(name, ""))`` for every row."""
+    if name not in frame.columns:
+        return pd.Series("", index=frame.index, dtype=object)
+    return frame[name].astype(str)
+
+
+def _safe_str_column(frame, name):
+    """``safe_str(row.get(name, ""))`` for every row."""
+    if name not in frame.columns:
+        return pd.Series("", index=frame.index, dtype=object)
+    column = frame[name]
+    return column.astype(str).where(column.notna(), "")
+
+
+def _column_tokens(frame, name):
+    if name not in frame.columns:
+        return pd.Series([], dtype=object)
+    return _explode_cell_tokens(frame[name])
+
+
+def _rows_with_token(tokens, value, size):
+    mask = np.zeros(size, dtype=bool)
+    mask[tokens.index[tokens.str.upper() == value].to_numpy(dtype=int)] = True
+    return mask
+
+
+def _token_points(tokens, size):
+    """Sum ``_POINT_VALUES`` per row for a token Series indexed by row."""
+    points = tokens.str.upper().map(_POINT_VALUES).dropna()
+    totals = np.zeros(size, dtype=int)
+    np.add.at(totals, points.index.to_numpy(dtype=int), points.to_numpy(dtype=int))
+    return totals
+
+
+def _object_array(items):
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+
+def _columnar_game_frame(df):
+    """Tokenize a game frame once; every columnar aggregate reads from this."""
+    frame = df.reset_index(drop=True)
+    size = len(frame)
+    columns = list(frame.columns)
+    positions = [
+        idx for idx, col in enumerate(columns)
+        if normalize_player_column_name(col).startswith("#")
+    ]
+    raw_names = _object_array([columns[idx] for idx in positions])
+    norm_names = _object_array([normalize_player_column_name(columns[idx]) for idx in positions])
+    raw_hash = np.array(
+        [isinstance(columns[idx], str) and columns[idx].startswith("#") for idx in positions],
+        dtype=bool,
+    )
+
+    values = frame.iloc[:, positions].to_numpy(dtype=object)
+    cell_rows, cell_cols = np.nonzero(pd.notna(values))
+    cells = pd.Series(values[cell_rows, cell_cols], dtype=object)
+    tokens = _explode_cell_tokens(cells)
+    cell_ids = tokens.index.to_numpy(dtype=int)
+    long = pd.DataFrame({
+        "row": cell_rows[cell_ids],
+        "col": cell_cols[cell_ids],
+        "token": tokens.to_numpy(dtype=object),
+    })
+    long["raw_key"] = raw_names[long["col"].to_numpy()]
+    long["norm_key"] = norm_names[long["col"].to_numpy()]
+    long["raw_hash"] = raw_hash[long["col"].to_numpy()]
+
+    row_type = _str_column(frame, "Row").str.strip()
+    raw_tokens = long[long["raw_hash"]]
+    opp_tokens = _column_tokens(frame, "OPP STATS")
+
+    return {
+        "frame": frame,
+        "size": size,
+        "row_type": row_type.to_numpy(dtype=object),
+        "row_lower": row_type.str.lower().to_numpy(dtype=object),
+        "tokens": long,
+        "raw_tokens": raw_tokens,
+        "opp_tokens": opp_tokens,
+        "norm_names": norm_names,
+        "raw_points": _token_points(raw_tokens.set_index("row")["token"], size),
+        "opp_points": _token_points(opp_tokens, size),
+    }
 
-        # 7) Good Shot %
-        ftr = team_totals["total_fta"]
-        good = (
-            ftr
-        + team_totals["total_atr_makes"] + atr_miss
-        + team_totals["total_fg3_makes"] + fg3_miss
-        )
-        bad = team_totals["total_fg2_makes"] + fg2_miss
-        den = good + bad
-        team_totals["good_shot_pct"] = (
-            round(good / den * 100, 2)
-            if den > 0 else 0.0
-        )
 
-        # 8) TCR per Sportscode definition
-        # Denominator: made + missed FG + steals, minus neutrals
-        made      = count_tokens(offense_rows, ("ATR+", "2FG+", "3FG+"))
-        missed    = count_tokens(offense_rows, ("ATR-", "2FG-", "3FG-"))
-        steals    = count_tokens(offense_rows, ("Steal",))
-        neutrals  = offense_rows[offense_rows['TEAM'].fillna('').str.contains("Neutral")]
-        madeneu   = count_tokens(neutrals, ("ATR+", "2FG+", "3FG+"))
-        missneu   = count_tokens(neutrals, ("ATR-", "2FG-", "3FG-"))
-        stealneu  = count_tokens(neutrals, ("Steal",))
-        trans_opps = (made + missed + steals) - (madeneu + missneu + stealneu)
-
-        #    Numerator: ATR± + 2FG± + 3FG± + Fouled (in Transition rows)
-        trans_rows = offense_rows[
-            offense_rows['POSSESSION TYPE'].fillna('').str.contains("Transition")
+def _group_lists(rows, values):
+    """``{row: [values...]}`` preserving the long frame's token order."""
+    grouped = {}
+    for row, value in zip(rows.tolist(), values.tolist()):
+        grouped.setdefault(row, []).append(value)
+    return grouped
+
+
+def _tally(tokens, key_col, mapping):
+    """Count mapped tokens per player as a (key, stat, n) frame."""
+    stats = tokens["token"].map(mapping)
+    hits = pd.DataFrame({"key": tokens[key_col], "stat": stats})[stats.notna()]
+    hits = hits.explode("stat")
+    return hits.groupby(["key", "stat"], sort=False).size().rename("n").reset_index()
+
+
+def _columnar_token_counter(ctx):
+    """Return ``count_tokens(mask, tokens)`` backed by the long token frame."""
+    raw_tokens = ctx["raw_tokens"]
+    rows = raw_tokens["row"].to_numpy()
+
+    def count_tokens(mask, tokens):
+        row_mask = np.asarray(mask, dtype=bool)[rows]
+        return int((row_mask & raw_tokens["token"].isin(tokens).to_numpy()).sum())
+    return count_tokens
+
+
+def _first_offense_touches(cells, shooter_col, assist_col, ft_cols, n_cols, row):
+    """Order in which ``process_offense_row`` first creates player entries."""
+    token_cols = sorted(cells)
+    step1 = [c for c in token_cols if shooter_col is None or c <= shooter_col]
+    step2 = []
+    if shooter_col is not None:
+        step2 = [c for c in token_cols if assist_col is None or c <= assist_col]
+    touches = []
+    for phase, cols in ((1, step1), (2, step2), (3, sorted(ft_cols)), (4, range(n_cols))):
+        touches.extend((row, phase, col) for col in cols)
+    return touches
+
+
+def _accumulate_game_columnar(ctx, game_id, season_id):
+    """Columnar counterpart of ``_accumulate_game_rows``."""
+    frame = ctx["frame"]
+    row_type = ctx["row_type"]
+    row_lower = ctx["row_lower"]
+    long = ctx["tokens"]
+    norm_names = ctx["norm_names"]
+
+    token_rows = long["row"].to_numpy()
+    long_type = row_type[token_rows]
+    long_lower = row_lower[token_rows]
+    raw_hash = long["raw_hash"].to_numpy()
+
+    team_totals = _new_team_totals()
+    opponent_totals = _new_opponent_totals()
+    opponent_blue_collar_accum = _new_opponent_blue_collar()
+    tallies = []
+    blue_tallies = []
+
+    # Rebound / PnR rows use the raw ``#`` column as the player key.
+    pnr = long[raw_hash & (long_lower == "pnr")]
+    tallies.append(_tally(pnr, "raw_key", _PNR_HELP_STATS))
+    pnr_file = long[raw_hash & np.isin(long_lower, ["pnr", "pnr file"])]
+    tallies.append(_tally(pnr_file, "raw_key", _PNR_WINDOW_STATS))
+    off_reb = long[raw_hash & np.isin(long_lower, list(OFFENSE_REB_ROWS))]
+    tallies.append(_tally(off_reb, "raw_key", _CRASH_STATS))
+    combined_reb = long[raw_hash & (long_lower == "rebound opportunities")]
+    tallies.append(_tally(combined_reb, "raw_key", _BOX_OUT_STATS))
+    def_reb = long[raw_hash & np.isin(long_lower, list(DEFENSE_REB_ROWS))]
+    tallies.append(_tally(def_reb, "raw_key", _BOX_OUT_STATS))
+
+    # --- Offense rows ---------------------------------------------------------
+    offense = long[long_type == "Offense"]
+    shot_tokens = offense[offense["token"].isin(_SHOT_TOKENS)]
+    shooters = pd.DataFrame(columns=["col", "shot_class", "made"])
+    assist_cols = pd.Series(dtype=int)
+    if not shot_tokens.empty:
+        shooter_col = shot_tokens.groupby("row")["col"].min()
+        cell = shot_tokens[
+            shot_tokens["col"].to_numpy() == shooter_col.reindex(shot_tokens["row"]).to_numpy()
         ]
-        conversions = count_tokens(trans_rows, (
-            "ATR+", "ATR-",
-            "2FG+", "2FG-",
-            "3FG+", "3FG-",
-            "Fouled"
-        ))
-        team_totals["tcr_pct"] = (
-            round(conversions / trans_opps * 100, 1)
-            if trans_opps > 0 else 0.0
+        flags = pd.crosstab(cell["row"], cell["token"]).reindex(
+            columns=list(_SHOT_TOKENS), fill_value=0
+        ) > 0
+        is_atr = (flags["ATR+"] | flags["ATR-"]).to_numpy()
+        is_fg2 = ~is_atr & (flags["2FG+"] | flags["2FG-"]).to_numpy()
+        shooters = pd.DataFrame({
+            "col": shooter_col.reindex(flags.index).to_numpy(),
+            "shot_class": np.where(is_atr, "ATR", np.where(is_fg2, "2FG", "3FG")),
+            "made": np.where(
+                is_atr, flags["ATR+"], np.where(is_fg2, flags["2FG+"], flags["3FG+"])
+            ),
+        }, index=flags.index)
+
+        assist_tokens = offense[
+            offense["token"].isin(("Assist", "Pot. Assist"))
+            & offense["row"].isin(shooters.index)
+        ]
+        assist_cols = assist_tokens.groupby("row")["col"].min()
+        assist_cell = assist_tokens[
+            assist_tokens["col"].to_numpy() == assist_cols.reindex(assist_tokens["row"]).to_numpy()
+        ]
+        direct = set(assist_cell.loc[assist_cell["token"] == "Assist", "row"])
+        tallies.append(pd.DataFrame({
+            "key": norm_names[assist_cols.to_numpy(dtype=int)],
+            "stat": ["assists" if row in direct else "pot_assists" for row in assist_cols.index],
+            "n": 1,
+        }))
+
+        shooter_keys = norm_names[shooters["col"].to_numpy(dtype=int)]
+        for shot_class, (makes_key, attempts_key, value) in _SHOT_STATS.items():
+            of_class = (shooters["shot_class"] == shot_class).to_numpy()
+            made = of_class & shooters["made"].to_numpy(dtype=bool)
+            tallies.append(pd.DataFrame({"key": shooter_keys[of_class], "stat": attempts_key, "n": 1}))
+            tallies.append(pd.DataFrame({"key": shooter_keys[made], "stat": makes_key, "n": 1}))
+            tallies.append(pd.DataFrame({"key": shooter_keys[made], "stat": "points", "n": value}))
+
+    tallies.append(_tally(offense, "norm_key", {"FT+": ["ftm", "fta", "points"], "FT-": "fta"}))
+    tallies.append(_tally(offense, "norm_key", _OFFENSE_MISC_STATS))
+
+    # --- Defense rows ---------------------------------------------------------
+    defense = long[long_type == "Defense"]
+    tallies.append(_tally(defense, "norm_key", _DEFENSE_TOKEN_STATS))
+
+    opp_tokens = ctx["opp_tokens"]
+    opp_type = row_type[opp_tokens.index.to_numpy(dtype=int)]
+    for token, n in opp_tokens[opp_type == "Defense"].value_counts(sort=False).items():
+        n = int(n)
+        if token in ("ATR+", "2FG+", "3FG+"):
+            prefix = {"ATR+": "atr", "2FG+": "fg2", "3FG+": "fg3"}[token]
+            opponent_totals[f"{prefix}_makes"] += n
+            opponent_totals[f"{prefix}_attempts"] += n
+            opponent_totals["total_points"] += _POINT_VALUES[token] * n
+        elif token in ("ATR-", "2FG-", "3FG-"):
+            prefix = {"ATR-": "atr", "2FG-": "fg2", "3FG-": "fg3"}[token]
+            opponent_totals[f"{prefix}_attempts"] += n
+        elif token == "FT+":
+            opponent_totals["ftm"] += n
+            opponent_totals["fta"] += n
+            opponent_totals["total_points"] += n
+        elif token == "FT-":
+            opponent_totals["fta"] += n
+        elif token in GAME_STAT_MAPPING:
+            opponent_totals[GAME_STAT_MAPPING[token]] += n
+
+    for token, n in opp_tokens[opp_type == "Opponent Blue Collar Plays"].value_counts(sort=False).items():
+        if token in blue_collar_mapping:
+            key = blue_collar_mapping[token]
+            opponent_totals["total_blue_collar"] += GAME_BLUE_COLLAR_VALUES[key] * int(n)
+            opponent_blue_collar_accum[key] += int(n)
+
+    # --- Blue collar rows (TEAM, DEF Note, per-player rows) -------------------
+    team_tokens = _column_tokens(frame, "TEAM")
+    team_type = row_type[team_tokens.index.to_numpy(dtype=int)]
+    blue_counts = team_tokens[team_type == "TEAM"].map(blue_collar_mapping).value_counts(sort=False)
+
+    def_note = long[long_type == "DEF Note"]
+    blue_tallies.append(_tally(def_note, "norm_key", blue_collar_mapping))
+
+    player_rows = np.flatnonzero(pd.Series(row_type, dtype=object).str.startswith("#").to_numpy(dtype=bool))
+    row_players = pd.Series(
+        _str_column(frame, "Row").iloc[player_rows].map(normalize_player_column_name).to_numpy(),
+        index=player_rows,
+        dtype=object,
+    )
+    own_column = long[
+        np.isin(token_rows, player_rows)
+        & (long["raw_key"].to_numpy() == row_players.reindex(token_rows).to_numpy())
+    ]
+    blue_tallies.append(_tally(own_column, "raw_key", blue_collar_mapping))
+
+    blue = pd.concat(blue_tallies, ignore_index=True)
+    blue_counts = blue_counts.add(blue.groupby("stat")["n"].sum(), fill_value=0)
+    for key, n in blue_counts.items():
+        n = int(n)
+        if n:
+            team_totals[key] = team_totals.get(key, 0) + n
+            team_totals["total_blue_collar"] += GAME_BLUE_COLLAR_VALUES[key] * n
+
+    # --- Player entries, in the order the row walk creates them ---------------
+    touches = []
+    raw_cells = long[raw_hash].drop_duplicates(["row", "col"])
+    touches.append(pd.DataFrame({
+        "row": raw_cells["row"], "phase": 0, "sub": raw_cells["col"],
+        "key": raw_cells["raw_key"], "kind": "standard",
+    }))
+    offense_rows = np.flatnonzero(row_type == "Offense")
+    if len(offense_rows):
+        first = int(offense_rows[0])
+        first_cells = offense[offense["row"] == first]
+        ft_cols = set(first_cells.loc[first_cells["token"].isin(("FT+", "FT-")), "col"])
+        first_touches = _first_offense_touches(
+            set(first_cells["col"]),
+            int(shooters.at[first, "col"]) if first in shooters.index else None,
+            int(assist_cols[first]) if first in assist_cols.index else None,
+            ft_cols,
+            len(norm_names),
+            first,
         )
-        # -------------------------------------------------------------------------
+        touches.append(pd.DataFrame({
+            "row": [t[0] for t in first_touches],
+            "phase": [t[1] for t in first_touches],
+            "sub": [t[2] for t in first_touches],
+            "key": norm_names[[t[2] for t in first_touches]] if first_touches else [],
+            "kind": "standard",
+        }))
+    for phase, cells, kind in (
+        (5, defense, "defense"),
+        (6, def_note, "standard"),
+    ):
+        cells = cells.drop_duplicates(["row", "col"])
+        touches.append(pd.DataFrame({
+            "row": cells["row"], "phase": phase, "sub": cells["col"],
+            "key": cells["norm_key"], "kind": kind,
+        }))
+    touches.append(pd.DataFrame({
+        "row": row_players.index, "phase": 7, "sub": 0,
+        "key": row_players.to_numpy(), "kind": "standard",
+    }))
+    ordered = (
+        pd.concat(touches, ignore_index=True)
+        .sort_values(["row", "phase", "sub"], kind="stable")
+        .drop_duplicates("key")
+    )
 
+    player_stats_dict = {}
+    for key, kind in zip(ordered["key"], ordered["kind"]):
+        if kind == "defense":
+            player_stats_dict[key] = initialize_player_stats(
+                key, game_id, season_id, defense_player_mapping, {"dummy": 0}
+            )
+        else:
+            player_stats_dict[key] = initialize_player_stats(
+                key, game_id, season_id, GAME_STAT_MAPPING, GAME_BLUE_COLLAR_VALUES
+            )
 
-        # Recount FT from CSV to fix missing free throws
-        offense_rows = df[df['Row'] == "Offense"]
-        team_totals["total_ftm"] = count_tokens(offense_rows, ("FT+",))
-        team_totals["total_fta"] = count_tokens(offense_rows, ("FT+","FT-"))
-    
-        # Insert Team Stats for your team
-        team_entry = TeamStats(
-            game_id=game_id,
-            season_id=season_id,
-            total_points=team_totals["total_points"],
-            total_assists=team_totals["total_assists"],
-            total_second_assists=team_totals["total_second_assists"],
-            total_pot_assists=team_totals["total_pot_assists"],
-            total_turnovers=team_totals["total_turnovers"],
-            total_atr_makes=team_totals["total_atr_makes"],
-            total_atr_attempts=team_totals["total_atr_attempts"],
-            total_fg2_makes=team_totals["total_fg2_makes"],
-            total_fg2_attempts=team_totals["total_fg2_attempts"],
-            total_fg3_makes=team_totals["total_fg3_makes"],
-            total_fg3_attempts=team_totals["total_fg3_attempts"],
-            total_ftm=team_totals["total_ftm"],
-            total_fta=team_totals["total_fta"],
-            total_blue_collar=team_totals["total_blue_collar"],
-            total_possessions=team_totals["total_possessions"],
-            total_fouls_drawn=team_totals["foul_by"],
-            assist_pct=team_totals["assist_pct"],
-            turnover_pct=team_totals["turnover_pct"],
-            tcr_pct=team_totals.get("tcr_pct", 0.0),
-            oreb_pct=team_totals["oreb_pct"],
-            ft_rate=team_totals["ft_rate"],
-            good_shot_pct=team_totals["good_shot_pct"],
-            is_opponent=False
+    counts = pd.concat(tallies, ignore_index=True).groupby(["key", "stat"], sort=False)["n"].sum()
+    for (key, stat), n in counts.items():
+        slot = player_stats_dict[key]
+        slot[stat] = slot.get(stat, 0) + int(n)
+
+    for key in set(row_players):
+        accum = player_stats_dict[key]["blue_collar_accum"]
+        for stat in GAME_BLUE_COLLAR_VALUES:
+            accum.setdefault(stat, 0)
+    for (key, stat), n in blue.groupby(["key", "stat"], sort=False)["n"].sum().items():
+        accum = player_stats_dict[key]["blue_collar_accum"]
+        accum[stat] = accum.get(stat, 0) + int(n)
+    for key in set(def_note["norm_key"]) | set(row_players):
+        accum = player_stats_dict[key]["blue_collar_accum"]
+        player_stats_dict[key]["_blue_collar_total"] = sum(
+            accum.get(stat, 0) * GAME_BLUE_COLLAR_VALUES.get(stat, 0)
+            for stat in GAME_BLUE_COLLAR_VALUES
         )
-        db.session.add(team_entry)
 
-        # Insert Opponent Stats as a separate record
-        opponent_entry = TeamStats(
-            game_id=game_id,
-            season_id=season_id,
-            total_points=opponent_totals["total_points"],
-            total_assists=opponent_totals["assists"],
-            total_second_assists=opponent_totals["second_assists"],
-            total_pot_assists=opponent_totals["pot_assists"],
-            total_turnovers=opponent_totals["turnovers"],
-            total_atr_makes=opponent_totals["atr_makes"],
-            total_atr_attempts=opponent_totals["atr_attempts"],
-            total_fg2_makes=opponent_totals["fg2_makes"],
-            total_fg2_attempts=opponent_totals["fg2_attempts"],
-            total_fg3_makes=opponent_totals["fg3_makes"],
-            total_fg3_attempts=opponent_totals["fg3_attempts"],
-            total_ftm=opponent_totals["ftm"],
-            total_fta=opponent_totals["fta"],
-            total_blue_collar=opponent_totals["total_blue_collar"],
-            total_possessions=opponent_totals["total_possessions"],
-            total_fouls_drawn=opponent_totals["foul_by"],
-            is_opponent=True
+    # --- Per-shot detail objects ------------------------------------------------
+    if not shooters.empty:
+        detail_columns = [c for c in _SHOT_DETAIL_COLUMNS if c in frame.columns]
+        records = frame.loc[shooters.index, detail_columns].to_dict("records")
+        shooter_keys = norm_names[shooters["col"].to_numpy(dtype=int)]
+        for record, row, key, shot_class, made in zip(
+            records, shooters.index, shooter_keys, shooters["shot_class"], shooters["made"]
+        ):
+            player_stats_dict[key]["shot_type_details"].append(
+                build_shot_detail(
+                    record,
+                    shot_class,
+                    "made" if made else "missed",
+                    row in assist_cols.index,
+                )
+            )
+
+    return player_stats_dict, team_totals, opponent_totals, opponent_blue_collar_accum
+
+
+def _columnar_possession_flags(ctx):
+    frame = ctx["frame"]
+    size = ctx["size"]
+    team_val = _str_column(frame, "TEAM")
+    opp_team_val = _str_column(frame, "OPP TEAM")
+    opp_tokens = ctx["opp_tokens"]
+    is_neutral = team_val.str.contains("Neutral", regex=False).to_numpy(dtype=bool)
+    is_off_reb = team_val.str.contains("Off Reb", regex=False).to_numpy(dtype=bool)
+    is_def_neutral = (
+        opp_team_val.str.contains("Neutral", regex=False).to_numpy(dtype=bool)
+        | is_neutral
+        | _rows_with_token(opp_tokens, "NEUTRAL", size)
+    )
+    is_def_off_reb = (
+        opp_team_val.str.contains("Off Reb", regex=False).to_numpy(dtype=bool)
+        | is_off_reb
+        | _rows_with_token(opp_tokens, "OFF REB", size)
+    )
+    return is_neutral, is_off_reb, is_def_neutral, is_def_off_reb
+
+
+def _columnar_possession_counts(ctx, subtract_off_reb=True):
+    """Offensive/defensive possession counts using TRUE possession rules."""
+    row_type = ctx["row_type"]
+    is_neutral, is_off_reb, is_def_neutral, is_def_off_reb = _columnar_possession_flags(ctx)
+    offensive_possessions = int(
+        ((row_type == "Offense") & ~is_neutral & ~(is_off_reb & subtract_off_reb)).sum()
+    )
+    defensive_possessions = int(
+        ((row_type == "Defense") & ~is_def_neutral & ~(is_def_off_reb & subtract_off_reb)).sum()
+    )
+    return offensive_possessions, defensive_possessions
+
+
+def process_possessions_columnar(df, game_id, season_id, subtract_off_reb=True, ctx=None):
+    """Columnar counterpart of ``process_possessions`` with identical output."""
+    if ctx is None:
+        ctx = _columnar_game_frame(df)
+    frame = ctx["frame"]
+    row_type = ctx["row_type"]
+    is_neutral, is_off_reb, is_def_neutral, is_def_off_reb = _columnar_possession_flags(ctx)
+    is_offense = row_type == "Offense"
+    is_defense = row_type == "Defense"
+    offensive_possessions, defensive_possessions = _columnar_possession_counts(
+        ctx, subtract_off_reb
+    )
+
+    raw_tokens = ctx["raw_tokens"]
+    raw_events = _group_lists(raw_tokens["row"].to_numpy(), raw_tokens["token"].to_numpy())
+    opp_tokens = ctx["opp_tokens"]
+    opp_events = _group_lists(opp_tokens.index.to_numpy(), opp_tokens.to_numpy())
+    on_floor = {}
+    if "PLAYER POSSESSIONS" in frame.columns:
+        floor_tokens = _column_tokens(frame, "PLAYER POSSESSIONS")
+        on_floor = _group_lists(floor_tokens.index.to_numpy(), floor_tokens.to_numpy())
+    text_columns = {
+        key: _safe_str_column(frame, name).to_numpy(dtype=object)
+        for key, name in (
+            ("possession_start", "POSSESSION START"),
+            ("possession_type", "POSSESSION TYPE"),
+            ("paint_touches", "PAINT TOUCHES"),
+            ("shot_clock", "SHOT CLOCK"),
+            ("shot_clock_pt", "SHOT CLOCK PT"),
         )
+    }
+    raw_points = ctx["raw_points"]
+    opp_points = ctx["opp_points"]
 
-        # Insert Blue Collar Stats for our team
-        blue_collar_stats_entry = BlueCollarStats(
-            game_id=game_id,
-            season_id=season_id,
-            total_blue_collar=team_totals["total_blue_collar"],
-            def_reb=team_totals.get("def_reb", 0),
-            off_reb=team_totals.get("off_reb", 0),
-            misc=team_totals.get("misc", 0),
-            deflection=team_totals.get("deflection", 0),
-            steal=team_totals.get("steal", 0),
-            block=team_totals.get("block", 0),
-            floor_dive=team_totals.get("floor_dive", 0),
-            charge_taken=team_totals.get("charge_taken", 0),
-            reb_tip=team_totals.get("reb_tip", 0)
+    possession_data = []
+    for idx in np.flatnonzero(is_offense | is_defense).tolist():
+        if is_offense[idx]:
+            events = list(raw_events.get(idx, []))
+            if is_neutral[idx]:
+                events.append("Neutral")
+            if is_off_reb[idx]:
+                events.append("TEAM Off Reb")
+            points_scored = int(raw_points[idx])
+            is_true_possession = not is_neutral[idx] and not is_off_reb[idx]
+        else:
+            events = list(opp_events.get(idx, []))
+            if is_def_neutral[idx]:
+                events.append("Neutral")
+            if is_def_off_reb[idx]:
+                events.append("Off Reb")
+            points_scored = int(opp_points[idx])
+            is_true_possession = (
+                not is_def_neutral[idx]
+                and not (is_def_off_reb[idx] and subtract_off_reb)
+            )
+        possession_data.append({
+            "game_id": game_id or 0,
+            "season_id": season_id,
+            "side": row_type[idx],
+            "possession_start": text_columns["possession_start"][idx],
+            "possession_type": text_columns["possession_type"][idx],
+            "paint_touches": text_columns["paint_touches"][idx],
+            "shot_clock": text_columns["shot_clock"][idx],
+            "shot_clock_pt": text_columns["shot_clock_pt"][idx],
+            "players_on_floor": list(on_floor.get(idx, [])),
+            "points_scored": points_scored,
+            "is_neutral": bool(is_neutral[idx]),
+            "events": events,
+            "is_true_possession": bool(is_true_possession),
+        })
+    return possession_data, offensive_possessions, defensive_possessions
+
+
+def get_possession_breakdown_detailed_columnar(df, ctx=None):
+    """Columnar counterpart of ``get_possession_breakdown_detailed``."""
+    if ctx is None:
+        ctx = _columnar_game_frame(df)
+    frame = ctx["frame"]
+    row_type = ctx["row_type"]
+    desired_tokens = ["Transition","Man","Zone","Press","UOB","SLOB","Garbage","OREB Putback"]
+
+    breakdown_offense = {t:{'count':0,'points':0} for t in desired_tokens}
+    breakdown_defense = {t:{'count':0,'points':0} for t in desired_tokens}
+    periodic_offense = {
+        "1st Half": {'count':0,'points':0},
+        "2nd Half": {'count':0,'points':0},
+        "Overtime": {'count':0,'points':0},
+    }
+    periodic_defense = {k:v.copy() for k,v in periodic_offense.items()}
+
+    is_offense = row_type == "Offense"
+    is_defense = row_type == "Defense"
+    team_val = _str_column(frame, "TEAM")
+    is_neutral = team_val.str.contains("Neutral", regex=False).to_numpy(dtype=bool)
+    is_off_reb = team_val.str.contains("Off Reb", regex=False).to_numpy(dtype=bool)
+    is_opp_off_reb = _str_column(frame, "OPP STATS").str.contains("Off Reb", regex=False).to_numpy(dtype=bool)
+    points = np.where(is_offense, ctx["raw_points"], ctx["opp_points"])
+
+    poss_types = _str_column(frame, "POSSESSION TYPE").str.split(",").explode().str.strip()
+    poss_types = poss_types[poss_types.isin(desired_tokens)]
+    type_rows = poss_types.index.to_numpy(dtype=int)
+    if "Period" in frame.columns:
+        split = frame["Period"].map(normalize_period_label).to_numpy(dtype=object)
+    else:
+        split = np.full(len(frame), "", dtype=object)
+
+    for side_mask, breakdown, periodic, excluded in (
+        (is_offense, breakdown_offense, periodic_offense, is_neutral | is_off_reb),
+        (is_defense, breakdown_defense, periodic_defense, is_neutral | is_opp_off_reb),
+    ):
+        on_side = side_mask[type_rows]
+        by_type = pd.DataFrame({
+            "token": poss_types.to_numpy()[on_side],
+            "count": (~is_neutral[type_rows][on_side]).astype(int),
+            "points": points[type_rows][on_side],
+        }).groupby("token")[["count", "points"]].sum()
+        for token, rec in by_type.iterrows():
+            breakdown[token]['count'] += int(rec["count"])
+            breakdown[token]['points'] += int(rec["points"])
+
+        by_split = pd.DataFrame({
+            "split": split[side_mask],
+            "count": (~excluded[side_mask]).astype(int),
+            "points": points[side_mask],
+        })
+        by_split = by_split[by_split["split"].isin(list(periodic))]
+        for label, rec in by_split.groupby("split")[["count", "points"]].sum().iterrows():
+            periodic[label]['count'] += int(rec["count"])
+            periodic[label]['points'] += int(rec["points"])
+
+    return breakdown_offense, breakdown_defense, periodic_offense, periodic_defense
+# END Columnar Parse
+
+
+def parse_game_dataframe(df, game_id, season_id, engine="columnar"):
+    """Parse a game CSV frame into the stat buckets ``parse_csv`` persists.
+
+    ``engine="columnar"`` tokenizes the player columns once and aggregates with
+    grouped operations; ``engine="rows"`` is the original row-by-row walk.
+    Both return the same structure and values.
+    """
+    if engine == "columnar":
+        ctx = _columnar_game_frame(df)
+        player_stats_dict, team_totals, opponent_totals, opponent_blue_collar_accum = (
+            _accumulate_game_columnar(ctx, game_id, season_id)
+        )
+        offensive_possessions, defensive_possessions = _columnar_possession_counts(
+            ctx, subtract_off_reb=True
         )
-        db.session.add(blue_collar_stats_entry)
-        db.session.add(opponent_entry)
-        db.session.commit()
+        possession_data, _, _ = process_possessions_columnar(
+            df, game_id, season_id, subtract_off_reb=False, ctx=ctx
+        )
+        breakdowns = get_possession_breakdown_detailed_columnar(df, ctx=ctx)
+        count_tokens = _columnar_token_counter(ctx)
+    elif engine == "rows":
+        player_stats_dict, team_totals, opponent_totals, opponent_blue_collar_accum = (
+            _accumulate_game_rows(df, game_id, season_id)
+        )
+        _, offensive_possessions, defensive_possessions = process_possessions(
+            df, game_id, season_id, subtract_off_reb=True
+        )
+        possession_data, _, _ = process_possessions(df, game_id, season_id, subtract_off_reb=False)
+        breakdowns = get_possession_breakdown_detailed(df)
+        count_tokens = _row_token_counter(df)
+    else:
+        raise ValueError(f"Unknown game parse engine: {engine!r}")
+
+    _finalize_game_totals(
+        df,
+        player_stats_dict,
+        team_totals,
+        opponent_totals,
+        offensive_possessions,
+        defensive_possessions,
+        count_tokens,
+    )
+    offensive_breakdown, defensive_breakdown, periodic_offense, periodic_defense = breakdowns
+    return {
+        "player_stats": player_stats_dict,
+        "team_totals": team_totals,
+        "opponent_totals": opponent_totals,
+        "opponent_blue_collar": opponent_blue_collar_accum,
+        "possessions": possession_data,
+        "offensive_breakdown": offensive_breakdown,
+        "defensive_breakdown": defensive_breakdown,
+        "periodic_offense": periodic_offense,
+        "periodic_defense": periodic_defense,
+    }
+
+
+def persist_game_rows(parsed, game_id, season_id):
+    """Replace the stored rows for ``game_id`` with ``parsed``; the caller commits."""
+    player_stats_dict = parsed["player_stats"]
+    team_totals = parsed["team_totals"]
+    opponent_totals = parsed["opponent_totals"]
+    opponent_blue_collar_accum = parsed["opponent_blue_collar"]
+    possession_data = parsed["possessions"]
+    blue_collar_values = GAME_BLUE_COLLAR_VALUES
+
+    batch = IngestBatch()
+    valid_cols = {c.name for c in PlayerStats.__table__.columns}
+
+    # Remove any existing rows for these players & game to avoid duplicates
+    # (a diffing reparse replaces changed rows in batch.write() instead)
+    if player_stats_dict and replace_scope() is None:
+        existing = (PlayerStats.game_id == game_id,
+                    PlayerStats.player_name.in_(list(player_stats_dict)))
+        delete_player_shot_details(*existing)
+        PlayerStats.query.filter(*existing).delete(synchronize_session=False)
+
+    for player_name, player_stats in player_stats_dict.items():
+        # Build a fresh dict of only valid columns (excluding array/dict fields)
+        clean_stats = {
+            k: safe_value(v)
+            for k, v in player_stats.items()
+            if k in valid_cols
+            and not isinstance(v, (dict, list, tuple, np.ndarray, pd.Series))
+        }
+
+        # Ensure game_id, season_id, and player_name are set correctly:
+        clean_stats["game_id"]     = game_id
+        clean_stats["season_id"]   = season_id
+        clean_stats["player_name"] = player_name
+        # A game row should never have a practice_id
+        clean_stats["practice_id"] = None
+        shots = player_stats.get("shot_type_details")
+        clean_stats["shot_type_details"] = serialize_shot_details(shots)
+
+        batch.add_player_stats(shots, **clean_stats)
+
+    # Insert Team Stats for your team
+    batch.add(
+        TeamStats,
+        game_id=game_id,
+        season_id=season_id,
+        total_points=team_totals["total_points"],
+        total_assists=team_totals["total_assists"],
+        total_second_assists=team_totals["total_second_assists"],
+        total_pot_assists=team_totals["total_pot_assists"],
+        total_turnovers=team_totals["total_turnovers"],
+        total_atr_makes=team_totals["total_atr_makes"],
+        total_atr_attempts=team_totals["total_atr_attempts"],
+        total_fg2_makes=team_totals["total_fg2_makes"],
+        total_fg2_attempts=team_totals["total_fg2_attempts"],
+        total_fg3_makes=team_totals["total_fg3_makes"],
+        total_fg3_attempts=team_totals["total_fg3_attempts"],
+        total_ftm=team_totals["total_ftm"],
+        total_fta=team_totals["total_fta"],
+        total_blue_collar=team_totals["total_blue_collar"],
+        total_possessions=team_totals["total_possessions"],
+        total_fouls_drawn=team_totals["foul_by"],
+        assist_pct=team_totals["assist_pct"],
+        turnover_pct=team_totals["turnover_pct"],
+        tcr_pct=team_totals.get("tcr_pct", 0.0),
+        oreb_pct=team_totals["oreb_pct"],
+        ft_rate=team_totals["ft_rate"],
+        good_shot_pct=team_totals["good_shot_pct"],
+        is_opponent=False
+    )
+
+    # Insert Opponent Stats as a separate record
+    batch.add(
+        TeamStats,
+        game_id=game_id,
+        season_id=season_id,
+        total_points=opponent_totals["total_points"],
+        total_assists=opponent_totals["assists"],
+        total_second_assists=opponent_totals["second_assists"],
+        total_pot_assists=opponent_totals["pot_assists"],
+        total_turnovers=opponent_totals["turnovers"],
+        total_atr_makes=opponent_totals["atr_makes"],
+        total_atr_attempts=opponent_totals["atr_attempts"],
+        total_fg2_makes=opponent_totals["fg2_makes"],
+        total_fg2_attempts=opponent_totals["fg2_attempts"],
+        total_fg3_makes=opponent_totals["fg3_makes"],
+        total_fg3_attempts=opponent_totals["fg3_attempts"],
+        total_ftm=opponent_totals["ftm"],
+        total_fta=opponent_totals["fta"],
+        total_blue_collar=opponent_totals["total_blue_collar"],
+        total_possessions=opponent_totals["total_possessions"],
+        total_fouls_drawn=opponent_totals["foul_by"],
+        is_opponent=True
+    )
+
+    # Insert Blue Collar Stats for our team
+    batch.add(
+        BlueCollarStats,
+        game_id=game_id,
+        season_id=season_id,
+        player_id=None,
+        total_blue_collar=team_totals["total_blue_collar"],
+        def_reb=team_totals.get("def_reb", 0),
+        off_reb=team_totals.get("off_reb", 0),
+        misc=team_totals.get("misc", 0),
+        deflection=team_totals.get("deflection", 0),
+        steal=team_totals.get("steal", 0),
+        block=team_totals.get("block", 0),
+        floor_dive=team_totals.get("floor_dive", 0),
+        charge_taken=team_totals.get("charge_taken", 0),
+        reb_tip=team_totals.get("reb_tip", 0)
+    )
 
     # --- Insert Blue Collar Stats for Players (TEAM) ---
-    db_path = "instance/database.db"
-    conn = sqlite3.connect(db_path)
+    roster = RosterResolver(season_id)
     for player_name, stats in player_stats_dict.items():
-        blue_total = stats.get("_blue_collar_total", 0)
-        player_id = get_player_id(player_name, conn)
+        player_id = roster.id_for(player_name)
         if player_id is None:
             continue
         accum = stats["blue_collar_accum"]
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO blue_collar_stats (
-                game_id,
-                season_id,
-                player_id,
-                total_blue_collar,
-                reb_tip,
-                def_reb,
-                misc,
-                deflection,
-                steal,
-                block,
-                off_reb,
-                floor_dive,
-                charge_taken
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                game_id,
-                season_id,
-                player_id,
-                blue_total,
-                accum.get("reb_tip", 0),
-                accum.get("def_reb", 0),
-                accum.get("misc", 0),
-                accum.get("deflection", 0),
-                accum.get("steal", 0),
-                accum.get("block", 0),
-                accum.get("off_reb", 0),
-                accum.get("floor_dive", 0),
-                accum.get("charge_taken", 0)
-            )
+        batch.add(
+            BlueCollarStats,
+            game_id=game_id,
+            season_id=season_id,
+            player_id=player_id,
+            total_blue_collar=stats.get("_blue_collar_total", 0),
+            reb_tip=accum.get("reb_tip", 0),
+            def_reb=accum.get("def_reb", 0),
+            misc=accum.get("misc", 0),
+            deflection=accum.get("deflection", 0),
+            steal=accum.get("steal", 0),
+            block=accum.get("block", 0),
+            off_reb=accum.get("off_reb", 0),
+            floor_dive=accum.get("floor_dive", 0),
+            charge_taken=accum.get("charge_taken", 0),
         )
-        conn.commit()
 
     # --- Insert Opponent Blue Collar Stats (ONE ROW) ---
     opponent_blue_total = sum(
         opponent_blue_collar_accum[cat] * blue_collar_values[cat]
         for cat in opponent_blue_collar_accum
     )
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO opponent_blue_collar_stats (
-            game_id,
-            season_id,
-            player_id,
-            total_blue_collar,
-            reb_tip,
-            def_reb,
-            misc,
-            deflection,
-            steal,
-            block,
-            off_reb,
-            floor_dive,
-            charge_taken
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            game_id,
-            season_id,
-            None,
-            opponent_blue_total,
-            opponent_blue_collar_accum["reb_tip"],
-            opponent_blue_collar_accum["def_reb"],
-            opponent_blue_collar_accum["misc"],
-            opponent_blue_collar_accum["deflection"],
-            opponent_blue_collar_accum["steal"],
-            opponent_blue_collar_accum["block"],
-            opponent_blue_collar_accum["off_reb"],
-            opponent_blue_collar_accum["floor_dive"],
-            opponent_blue_collar_accum["charge_taken"]
-        )
+    batch.add(
+        OpponentBlueCollarStats,
+        game_id=game_id,
+        season_id=season_id,
+        player_id=None,
+        total_blue_collar=opponent_blue_total,
+        reb_tip=opponent_blue_collar_accum["reb_tip"],
+        def_reb=opponent_blue_collar_accum["def_reb"],
+        misc=opponent_blue_collar_accum["misc"],
+        deflection=opponent_blue_collar_accum["deflection"],
+        steal=opponent_blue_collar_accum["steal"],
+        block=opponent_blue_collar_accum["block"],
+        off_reb=opponent_blue_collar_accum["off_reb"],
+        floor_dive=opponent_blue_collar_accum["floor_dive"],
+        charge_taken=opponent_blue_collar_accum["charge_taken"],
     )
-    conn.commit()
 
     # --- Insert Possession Records using TRUE data (subtract_off_reb=False) ---
-    possession_data, _, _ = process_possessions(df, game_id, season_id, subtract_off_reb=False)
+    for poss in possession_data:
+        possession_side = poss.get("side", "")
+        side_normalized = possession_side.strip().lower()
+        time_segment = (
+            "Offense"
+            if side_normalized in {"alabama", "offense", "team"}
+            else "Defense"
+        )
+
+        new_poss = batch.add_possession(
+            game_id=game_id,
+            practice_id=None,
+            season_id=season_id,
+            possession_side=possession_side,
+            possession_type=poss.get("possession_type", ""),
+            possession_start=poss.get("possession_start", ""),
+            paint_touches=poss.get("paint_touches", ""),
+            shot_clock=poss.get("shot_clock", ""),
+            shot_clock_pt=poss.get("shot_clock_pt", ""),
+            points_scored=poss.get("points_scored", 0),
+            time_segment=time_segment,
+        )
+        # Insert PlayerPossession entries
+        on_floor = set()
+        for jersey in poss.get("players_on_floor", []):
+            player_name = jersey.strip()
+            if not player_name:
+                continue
+
+            roster_id = roster.resolve(player_name)
+            if roster_id is not None:
+                on_floor.add(roster_id)
+
+        for pid in on_floor:
+            batch.add_possession_player(new_poss, pid)
+
+        for tok in poss.get("events", []):
+            batch.add_shot_detail(new_poss, tok)
+
+    written = batch.write()
+    refresh_game_rollups(game_id)
+    return written
+
+
+def read_game_csv(file_path, season_id, engine="columnar"):
+    """Read and parse a game CSV without touching the database.
+
+    Returns ``(df, parsed)``; ``parsed`` is ``None`` for an empty CSV. Safe to
+    run in a worker process -- the results are written by ``store_parsed_game``.
+    """
+    #print(f"📚 Reading CSV: {file_path}")
+    df = pd.read_csv(file_path)
+
+    #print("🔍 Unique Row Names in CSV:")
+    #print(df['Row'].unique())
+    #print("📊 CSV Columns:", df.columns.tolist())
+
+    if df.empty:
+        return df, None
+    # game_id is stamped onto every row by persist_game_rows, so it is not needed here.
+    return df, parse_game_dataframe(df, None, season_id, engine=engine)
+
+
+def parse_csv(file_path, game_id, season_id, file_date=None, engine="columnar", app=None):
+    #print("✅ Starting CSV Processing...")
+    #print(f"🔍 Checking file path: {os.path.abspath(file_path)}")
+    #print(f"🔍 File exists? {os.path.exists(file_path)}")
+
+    if not os.path.exists(file_path):
+        print("❌ Error: CSV file not found!")
+        return
+
+    df, parsed = read_game_csv(file_path, season_id, engine=engine)
+    return store_parsed_game(file_path, season_id, df, parsed, file_date=file_date, app=app)
+
+
+def store_parsed_game(file_path, season_id, df, parsed, file_date=None, app=None):
+    """Write the output of ``read_game_csv`` for ``file_path`` and build the report payload.
+
+    Pass ``app`` to reuse an already-built Flask app instead of calling
+    ``create_app()`` for every file.
+    """
+    app_instance = app
+    if app_instance is None:
+        from app import create_app
+        app_instance = create_app(lightweight=True)
     with app_instance.app_context():
-        for poss in possession_data:
-            possession_side = poss.get("side", "")
-            side_normalized = possession_side.strip().lower()
-            time_segment = (
-                "Offense"
-                if side_normalized in {"alabama", "offense", "team"}
-                else "Defense"
+        game_entry = Game.query.filter_by(csv_filename=os.path.basename(file_path)).first()
+        if not game_entry:
+            parsed_game_date = (
+                pd.to_datetime(file_date).date()
+                if file_date is not None
+                else pd.to_datetime("today").date()
             )
-
-            new_poss = Possession(
-                game_id=game_id,
+            game_entry = Game(
                 season_id=season_id,
-                possession_side=possession_side,
-                possession_type=poss.get("possession_type", ""),
-                possession_start=poss.get("possession_start", ""),
-                paint_touches=poss.get("paint_touches", ""),
-                shot_clock=poss.get("shot_clock", ""),
-                shot_clock_pt=poss.get("shot_clock_pt", ""),
-                points_scored=poss.get("points_scored", 0),
-                time_segment=time_segment,
+                game_date=parsed_game_date,
+                opponent_name="Unknown",
+                home_or_away="Home",
+                result="N/A",
+                csv_filename=os.path.basename(file_path)
             )
-            db.session.add(new_poss)
-            db.session.flush()
-            # Insert PlayerPossession entries
-            player_ids = set()
-            for jersey in poss.get("players_on_floor", []):
-                player_name = jersey.strip()
-                if not player_name:
-                    continue
-
-                roster_entry = _find_roster_entry(player_name, season_id)
-                if roster_entry:
-                    player_ids.add(roster_entry.id)
+            db.session.add(game_entry)
+            db.session.commit()
+        game_id = game_entry.id
+        # BEGIN Advanced Possession
+        invalidate_adv_poss_game(game_id)
+        # END Advanced Possession
+        # BEGIN Playcall Report
+        invalidate_playcall_report(game_id)
+        # END Playcall Report
+        print(f"🎯 Assigned Game ID: {game_id}")
 
-            for pid in player_ids:
-                db.session.add(PlayerPossession(
-                    possession_id=new_poss.id,
-                    player_id=pid
-                ))
+    if parsed is None:
+        print("❌ CSV is empty! No data to insert.")
+        return
 
-            for tok in poss.get("events", []):
-                db.session.add(ShotDetail(possession_id=new_poss.id, event_type=tok))
+    #print(f"✅ CSV Loaded! {len(df)} rows detected.")
+    #print("⚙️ parse_csv() function is executing correctly!")
 
-        db.session.commit()
+    player_stats_dict = parsed["player_stats"]
+    possession_data = parsed["possessions"]
 
-    conn.close()
+    # --- Persist the parsed game in one transaction ---
+    with app_instance.app_context(), ingest_transaction():
+        persist_game_rows(parsed, game_id, season_id)
 
     #print("✅ Player Stats Successfully Inserted!")
     calculate_derived_metrics(player_stats_dict)
     
     # --- Calculate Possession Type Breakdowns using the new detailed function ---
     # --- Calculate Possession Type & Split Breakdowns ---
-    offensive_breakdown, defensive_breakdown, periodic_offense, periodic_defense = \
-        get_possession_breakdown_detailed(df)
+    offensive_breakdown = parsed["offensive_breakdown"]
+    defensive_breakdown = parsed["defensive_breakdown"]
 
 
     # ● compute lineup efficiencies (2-5 man units, min 10 poss)
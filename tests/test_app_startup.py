@@ -0,0 +1,74 @@
+"""Import-time checks for ``create_app(lightweight=True)``.
+
+Runs the CLI/ingest factory under ``python -X importtime`` in a fresh
+interpreter and fails if any of the web-only modules get imported, or if the
+import of ``app`` exceeds ``APP_IMPORT_BUDGET_MS`` (generous by default; tighten
+it locally when profiling).
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = (
+    "admin.routes",
+    "public.routes",
+    "routes",
+    "scout",
+    "synergy",
+    "app.csv_pipeline.routes",
+    "app.routes.pdf_routes",
+    "pdfkit",
+    "flask_apscheduler",
+    "apscheduler",
+    "flask_migrate",
+    "alembic",
+)
+
+LIGHTWEIGHT_SNIPPET = (
+    "import app as app_module\n"
+    "flask_app = app_module.create_app(lightweight=True)\n"
+    "assert app_module.scheduler is None\n"
+    "assert not flask_app.blueprints, sorted(flask_app.blueprints)\n"
+    "assert 'sqlalchemy' in flask_app.extensions\n"
+)
+
+
+def _importtime(snippet):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    env.pop("FLASK_CREATE_APP", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cum.isdigit():
+            cumulative[name] = int(cum)
+    return cumulative
+
+
+def test_lightweight_factory_skips_web_only_imports():
+    cumulative = _importtime(LIGHTWEIGHT_SNIPPET)
+    assert "app" in cumulative
+
+    loaded = sorted(
+        name for name in cumulative
+        if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+    )
+    assert not loaded, f"lightweight create_app imported {loaded}"
+
+    budget_ms = float(os.environ.get("APP_IMPORT_BUDGET_MS", "4000"))
+    app_ms = cumulative["app"] / 1000
+    slowest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:10]
+    assert app_ms <= budget_ms, f"import app took {app_ms:.0f} ms; slowest: {slowest}"
@@ -0,0 +1,54 @@
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from batch_and_aggregation import process_multiple_csvs
+from models.database import db, Season, Game, PlayerStats, Possession
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample_game_csv"
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2025", start_date=date(2025, 11, 1)))
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_ingest_isolates_failures(app, tmp_path, workers):
+    uploads = tmp_path / "uploads"
+    archive = tmp_path / "processed"
+    uploads.mkdir()
+    for csv_path in SAMPLE_DIR.glob("*.csv"):
+        shutil.copy(csv_path, uploads / csv_path.name)
+    (uploads / "broken.csv").write_text("Row,#1 A\nOffense,ATR+\n")  # no TEAM column
+
+    report = process_multiple_csvs(str(uploads), 1, str(archive), workers=workers, app=app)
+
+    by_file = {entry["file"]: entry for entry in report}
+    assert len(by_file) == 3
+    assert not by_file["broken.csv"]["ok"]
+    assert by_file["broken.csv"]["error"]
+    assert (uploads / "broken.csv").exists()
+
+    good = [entry for name, entry in by_file.items() if name != "broken.csv"]
+    assert all(entry["ok"] and entry["parse_s"] >= 0 and entry["write_s"] >= 0 for entry in good)
+    assert sorted(p.name for p in archive.iterdir()) == sorted(entry["file"] for entry in good)
+
+    with app.app_context():
+        assert Game.query.count() == 2
+        assert PlayerStats.query.count() > 0
+        assert Possession.query.count() > 0
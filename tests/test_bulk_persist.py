@@ -0,0 +1,116 @@
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+import utils.bulk_persist as bulk_persist
+from models.database import (
+    db,
+    Season,
+    Game,
+    Roster,
+    PlayerStats,
+    TeamStats,
+    BlueCollarStats,
+    OpponentBlueCollarStats,
+    Possession,
+    PlayerPossession,
+    ShotDetail,
+)
+from test_parse import parse_game_dataframe, persist_game_rows
+from utils.bulk_persist import IngestBatch, ingest_transaction
+
+SAMPLE_CSV = sorted((Path(__file__).resolve().parent.parent / "sample_game_csv").glob("*.csv"))[0]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2025", start_date=date(2025, 11, 1)))
+        db.session.add(Game(id=1, season_id=1, game_date=date(2025, 11, 3), opponent_name="Opp"))
+        db.session.add(Possession(id=40, season_id=1, game_id=99, time_segment="Offense"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def parsed():
+    df = pd.read_csv(SAMPLE_CSV)
+    players = [c for c in df.columns if str(c).startswith("#")]
+    return players, parse_game_dataframe(df, 1, 1)
+
+
+def test_batch_links_children_to_ids_assigned_at_write(app):
+    batch = IngestBatch()
+    first = batch.add_possession(season_id=1, game_id=1, time_segment="Offense")
+    second = batch.add_possession(season_id=1, game_id=1, time_segment="Defense")
+    batch.add_shot_detail(second, "ATR+")
+
+    # Another writer lands a possession after the batch was queued.
+    db.session.add(Possession(id=41, season_id=1, game_id=99, time_segment="Defense"))
+    db.session.commit()
+
+    with ingest_transaction():
+        written = batch.write()
+
+    assert written == {"possession": 2, "shot_detail": 1}
+    stored = {p.time_segment: p.id for p in Possession.query.filter_by(game_id=1)}
+    assert stored == {"Offense": 42, "Defense": 43}
+    assert ShotDetail.query.one().possession_id == stored["Defense"]
+    assert (first["id"], second["id"]) == (1, 2)
+
+
+def test_persist_game_rows_links_children_without_flushes(app, parsed):
+    players, result = parsed
+    db.session.add_all(Roster(season_id=1, player_name=name) for name in players)
+    db.session.commit()
+
+    with ingest_transaction():
+        written = persist_game_rows(result, 1, 1)
+
+    possessions = result["possessions"]
+    assert written["possession"] == len(possessions)
+    assert Possession.query.filter_by(game_id=1).count() == len(possessions)
+    assert ShotDetail.query.count() == sum(len(p.get("events", [])) for p in possessions)
+    ids = {p.id for p in Possession.query.filter_by(game_id=1)}
+    assert min(ids) == 41
+    assert {d.possession_id for d in ShotDetail.query} <= ids
+    assert {pp.possession_id for pp in PlayerPossession.query} <= ids
+    assert PlayerPossession.query.count() > 0
+    assert PlayerStats.query.filter_by(game_id=1).count() == len(result["player_stats"])
+    assert TeamStats.query.filter_by(game_id=1).count() == 2
+    assert OpponentBlueCollarStats.query.filter_by(game_id=1).count() == 1
+    assert BlueCollarStats.query.filter(BlueCollarStats.player_id.isnot(None)).count() > 0
+
+
+def test_failed_ingest_leaves_nothing_behind(app, parsed, monkeypatch):
+    _players, result = parsed
+    name = next(iter(result["player_stats"]))
+    db.session.add(PlayerStats(game_id=1, season_id=1, player_name=name, points=99))
+    db.session.commit()
+
+    real_insert = bulk_persist.bulk_insert
+
+    def failing_insert(model, rows):
+        if model is ShotDetail:
+            raise RuntimeError("disk full")
+        return real_insert(model, rows)
+
+    monkeypatch.setattr(bulk_persist, "bulk_insert", failing_insert)
+
+    with pytest.raises(RuntimeError):
+        with ingest_transaction():
+            persist_game_rows(result, 1, 1)
+
+    assert Possession.query.filter_by(game_id=1).count() == 0
+    assert TeamStats.query.count() == 0
+    assert PlayerStats.query.one().points == 99
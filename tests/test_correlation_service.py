@@ -665,3 +665,207 @@ def test_unknown_metric_raises_value_error(app, season):
 
         with pytest.raises(ValueError):
             run_studies(studies, scope)
+
+
+def test_run_studies_memoizes_frames_per_scope(app, season, practice_and_game_data, monkeypatch):
+    import services.correlation as correlation
+
+    with app.app_context():
+        builds = []
+        original_build = correlation._build_frame
+
+        def counting_build(scope, source, fields):
+            builds.append((source, fields))
+            return original_build(scope, source, fields)
+
+        monkeypatch.setattr(correlation, "_build_frame", counting_build)
+
+        scope = StudyScope(season_id=season.id)
+        practice_only = [
+            StudyDefinition(
+                x=MetricDefinition(MetricSource.PRACTICE, "play_ast"),
+                y=MetricDefinition(MetricSource.PRACTICE, "play_to"),
+            )
+        ]
+
+        first = run_studies(practice_only, scope)
+        assert [source for source, _fields in builds] == [MetricSource.PRACTICE]
+        assert builds[0][1] == frozenset({"assists", "turnovers"})
+
+        # Flipping the axes only needs fields that are already loaded.
+        flipped = [
+            StudyDefinition(
+                x=MetricDefinition(MetricSource.PRACTICE, "play_to"),
+                y=MetricDefinition(MetricSource.PRACTICE, "play_ast"),
+            )
+        ]
+        second = run_studies(flipped, scope)
+        assert len(builds) == 1
+        assert second["studies"][0]["samples"] == first["studies"][0]["samples"]
+
+        # A new field widens the cached frame, after which both studies hit.
+        widened = [
+            StudyDefinition(
+                x=MetricDefinition(MetricSource.PRACTICE, "play_ast"),
+                y=MetricDefinition(MetricSource.PRACTICE, "shooting_fg3_pct"),
+            )
+        ]
+        run_studies(widened, scope)
+        assert len(builds) == 2
+        assert {"assists", "turnovers", "fg3_makes", "fg3_attempts"} <= builds[1][1]
+        run_studies(practice_only, scope)
+        assert len(builds) == 2
+
+        correlation.invalidate_correlation_frames()
+        run_studies(practice_only, scope)
+        assert len(builds) == 3
+
+
+def test_correlation_matrix_matches_individual_studies(app, season, practice_and_game_data):
+    from services.correlation import run_correlation_matrix
+
+    with app.app_context():
+        scope = StudyScope(season_id=season.id)
+        x_keys = ["shooting_fg3_pct", "play_ast"]
+        y_keys = ["points", "assists"]
+
+        payload = run_correlation_matrix(
+            scope,
+            x_metrics=[{"source": "practice", "key": key} for key in x_keys],
+            y_metrics=[{"source": "game", "key": key} for key in y_keys],
+        )
+
+        assert payload["mode"] == "matrix"
+        assert [metric["key"] for metric in payload["x_metrics"]] == x_keys
+        assert [metric["key"] for metric in payload["y_metrics"]] == y_keys
+
+        for i, x_key in enumerate(x_keys):
+            for j, y_key in enumerate(y_keys):
+                study = run_studies(
+                    [
+                        StudyDefinition(
+                            x=MetricDefinition(MetricSource.PRACTICE, x_key),
+                            y=MetricDefinition(MetricSource.GAME, y_key),
+                        )
+                    ],
+                    scope,
+                )["studies"][0]
+                assert payload["samples"][i][j] == study["samples"]
+                if study["pearson"] is None:
+                    assert payload["pearson"][i][j] is None
+                else:
+                    assert payload["pearson"][i][j] == pytest.approx(study["pearson"], abs=1e-9)
+
+
+def test_correlation_matrix_defaults_to_all_pairs(app, season, practice_and_game_data):
+    from services.correlation import (
+        SUPPORTED_GAME_METRICS,
+        SUPPORTED_PRACTICE_METRICS,
+        run_correlation_matrix,
+    )
+
+    with app.app_context():
+        payload = run_correlation_matrix(StudyScope(season_id=season.id))
+
+        x_keys = [metric["key"] for metric in payload["x_metrics"]]
+        y_keys = [metric["key"] for metric in payload["y_metrics"]]
+        assert x_keys and set(x_keys) <= SUPPORTED_PRACTICE_METRICS
+        assert y_keys and set(y_keys) <= SUPPORTED_GAME_METRICS
+        assert len(payload["pearson"]) == len(x_keys)
+        assert all(len(row) == len(y_keys) for row in payload["spearman"])
+        assert all(len(row) == len(y_keys) for row in payload["samples"])
+
+
+def test_correlation_matrix_uses_per_player_totals(app, season, practice_and_game_data):
+    from statistics import correlation
+
+    from services.correlation import run_correlation_matrix
+
+    with app.app_context():
+        _create_roster(season, ["Dana"])
+        _add_practice(season, date(2024, 10, 5), "Fall", {"Dana": {"assists": 2, "turnovers": 4}}, {}, {})
+        _add_game(season, date(2024, 11, 19), "Third Opponent", {"Dana": {"assists": 9, "points": 10}})
+
+        payload = run_correlation_matrix(
+            StudyScope(season_id=season.id),
+            x_metrics=[{"source": "practice", "key": key} for key in ("play_ast", "play_to")],
+            y_metrics=[{"source": "game", "key": key} for key in ("assists", "points")],
+        )
+
+        # Season totals per player (Alice, Bob, Dana); Charlie has no activity.
+        practice = {"play_ast": [9, 5, 2], "play_to": [3, 5, 4]}
+        game = {"assists": [11, 7, 9], "points": [30, 18, 10]}
+        assert payload["samples"] == [[3, 3], [3, 3]]
+        for i, x_values in enumerate(practice.values()):
+            for j, y_values in enumerate(game.values()):
+                assert payload["pearson"][i][j] == pytest.approx(correlation(x_values, y_values), abs=1e-9)
+
+
+def test_zero_valued_player_is_kept_regardless_of_batch(app, season, practice_and_game_data):
+    import services.correlation as correlation
+
+    with app.app_context():
+        roster = _create_roster(season, ["Dana"])
+        # Dana never turns it over in practice but is otherwise active.
+        _add_practice(season, date(2024, 10, 5), "Fall", {"Dana": {"assists": 2, "turnovers": 0}}, {}, roster)
+        _add_game(season, date(2024, 11, 19), "Third Opponent", {"Dana": {"points": 10}})
+
+        scope = StudyScope(season_id=season.id)
+        to_vs_points = StudyDefinition(
+            x=MetricDefinition(MetricSource.PRACTICE, "play_to"),
+            y=MetricDefinition(MetricSource.GAME, "points"),
+        )
+        ast_vs_ast = StudyDefinition(
+            x=MetricDefinition(MetricSource.PRACTICE, "play_ast"),
+            y=MetricDefinition(MetricSource.PRACTICE, "play_ast"),
+        )
+
+        alone = run_studies([to_vs_points], scope)["studies"][0]
+        correlation.invalidate_correlation_frames()
+        batched = run_studies([to_vs_points, ast_vs_ast], scope)["studies"][0]
+
+        scatter = {point["player"]: (point["x"], point["y"]) for point in alone["scatter"]}
+        assert scatter["Dana"] == (0.0, 10.0)
+        assert alone["samples"] == batched["samples"] == 3
+        assert alone["pearson"] == pytest.approx(batched["pearson"], abs=1e-12)
+
+
+def test_correlation_matrix_cells_match_single_studies(app, season, practice_and_game_data):
+    from services.correlation import run_correlation_matrix
+
+    with app.app_context():
+        roster = _create_roster(season, ["Dana", "Erin"])
+        _add_practice(
+            season,
+            date(2024, 10, 5),
+            "Fall",
+            {
+                "Dana": {"assists": 2, "turnovers": 0},
+                "Erin": {"assists": 1, "turnovers": 3, "fg3_attempts": 4, "fg3_makes": 1},
+            },
+            {"Erin": {"deflection": 2, "total_blue_collar": 4}},
+            roster,
+        )
+        _add_game(
+            season,
+            date(2024, 11, 19),
+            "Third Opponent",
+            {"Dana": {"points": 10}, "Erin": {"assists": 4, "turnovers": 1}},
+        )
+
+        # Each pair keeps a different subset of points, so Spearman must be
+        # ranked per pair rather than once per metric.
+        scope = StudyScope(season_id=season.id)
+        xs = [MetricDefinition(MetricSource.PRACTICE, key) for key in ("play_ast", "play_to", "shooting_fg3_pct", "bcp_total")]
+        ys = [MetricDefinition(MetricSource.GAME, key) for key in ("points", "assists", "turnovers", "bcp_total")]
+        payload = run_correlation_matrix(scope, x_metrics=xs, y_metrics=ys)
+
+        for i, x_metric in enumerate(xs):
+            for j, y_metric in enumerate(ys):
+                study = run_studies([StudyDefinition(x=x_metric, y=y_metric)], scope)["studies"][0]
+                assert payload["samples"][i][j] == study["samples"]
+                for key in ("pearson", "spearman"):
+                    if study[key] is None:
+                        assert payload[key][i][j] is None
+                    else:
+                        assert payload[key][i][j] == pytest.approx(study[key], abs=1e-9)
@@ -4,7 +4,9 @@ import csv
 import pytest
 from bs4 import BeautifulSoup
 
-from admin.routes import _build_game_table_dataset
+from sqlalchemy import event
+
+from admin.routes import _build_game_table_dataset, _collect_session_stats_for_players
 from models.database import (
     db,
     Season,
@@ -384,6 +386,47 @@ def test_custom_stats_csv_export_includes_source(client, sample_custom_stats):
     assert game_rows[1][2] == '3'
 
 
+def test_batched_session_stats_use_one_query_per_table(app, sample_custom_stats):
+    with app.app_context():
+        db.session.add(Roster(id=2, season_id=1, player_name='#2 Other'))
+        db.session.add(PlayerStats(practice_id=2, season_id=1, player_name='#2 Other', points=3, fta=2))
+        db.session.add(BlueCollarStats(practice_id=1, season_id=1, player_id=2, deflection=4, total_blue_collar=4))
+        db.session.commit()
+        roster = Roster.query.order_by(Roster.id).all()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            result = _collect_session_stats_for_players(
+                roster, source='practice', date_from=date(2024, 1, 1), date_to=date(2024, 1, 31)
+            )
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert len(statements) == 2
+        assert result[1]['totals']['points'] == 30
+        assert result[1]['blue']['total_blue_collar'] == 12
+        assert result[1]['session_ids'] == [1, 2]
+        assert result[2]['totals']['points'] == 3
+        assert result[2]['blue']['deflection'] == 4
+        assert result[2]['session_count'] == 2
+
+        games = _collect_session_stats_for_players(roster, source='game', game_ids=[2])
+        assert games[1]['totals']['points'] == 16
+        assert games[1]['blue']['def_reb'] == 5
+        assert games[2]['session_count'] == 0
+
+
+def test_custom_stats_parity_endpoint_reports_practice_totals(client, sample_custom_stats):
+    response = client.get('/admin/dev/custom-stats-parity?player_id=1&fields=play_ast,bc_tips')
+    assert response.status_code == 200
+    results = {r['field']: r for r in response.get_json()['results']}
+    assert results['play_ast']['expected'] == '10'
+    assert results['bc_tips']['expected'] == '2'
+    assert all(r['delta'] == 0 for r in results.values())
+
+
 def test_game_table_counts_off_possessions_for_dnp(app):
     with app.app_context():
         season = Season(id=1, season_name='DNP Season', start_date=date(2024, 1, 1))
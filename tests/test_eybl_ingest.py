@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+from flask import Flask
+
+from models.database import db
+from models.recruit import Recruit
+from models.eybl import ExternalIdentityMap, IdentitySynonym, UnifiedStats
+from models.user import User  # noqa: F401  (users table for recruit FKs)
+from services.eybl_ingest import (
+    auto_match_to_recruits,
+    deterministic_external_key,
+    promote_verified_stats,
+)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['TESTING'] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Recruit(id=1, name='Jay Smith', aau_team='Team A'),
+            Recruit(id=2, name='Al Jones', aau_team='Team B'),
+            Recruit(id=3, name='Bobby Ray', aau_team=None),
+            IdentitySynonym(kind='name', source_value='Rob Ray', normalized_value='bobby ray'),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _frame(rows):
+    return pd.DataFrame([
+        dict(player=p, team=t, gp=3.0, ppg=ppg, ast=None, tov=None, fg_pct=None, ppp=None,
+             pnr_poss=None, pnr_ppp=None, pnr_to_pct=None, pnr_score_pct=None,
+             circuit='EYBL', season_year=2024, season_type='AAU')
+        for p, t, ppg in rows
+    ])
+
+
+def test_match_tiers_and_map_upsert(app):
+    df = _frame([
+        ('Jay Smith', 'Team A', 10.0),    # exact name + team
+        ('Al Jones', 'Other', 11.0),      # exact name
+        ('ROB  RAY', 'Anyone', 12.0),     # synonym -> cleaned name
+        ('Nobody', 'Team A', 13.0),
+    ])
+    results = auto_match_to_recruits(df)
+    db.session.commit()
+
+    assert [(r['recruit_id'], r['match_confidence'], r['is_verified']) for r in results] == [
+        (1, 1.0, True), (2, 0.9, True), (3, 0.8, False), (None, 0.0, False),
+    ]
+    assert ExternalIdentityMap.query.count() == 4
+
+    # A later, weaker import does not downgrade a stored match; a stronger one upgrades it.
+    rob_key = deterministic_external_key('ROB  RAY', 'Anyone', 2024, 'EYBL')
+    db.session.add(Recruit(id=4, name='ROB  RAY', aau_team='Anyone'))
+    db.session.commit()
+    auto_match_to_recruits(df)
+    db.session.commit()
+
+    assert ExternalIdentityMap.query.count() == 4
+    upgraded = ExternalIdentityMap.query.filter_by(external_key=rob_key).one()
+    assert (upgraded.recruit_id, upgraded.match_confidence, upgraded.is_verified) == (4, 1.0, True)
+
+
+def test_promote_inserts_then_updates_verified_rows(app):
+    df = _frame([('Jay Smith', 'Team A', 10.0), ('Bobby Ray', 'Elsewhere', 8.0), ('Nobody', 'X', 1.0)])
+    auto_match_to_recruits(df)
+    db.session.commit()
+
+    summary = promote_verified_stats(df, circuit='EYBL', season_year=2024, season_type='AAU',
+                                     original_filenames=['overall.csv'])
+    db.session.commit()
+    assert (summary['inserted'], summary['updated'], summary['skipped']) == (2, 0, 1)
+
+    df.loc[0, 'ppg'] = 20.0
+    summary = promote_verified_stats(df, circuit='EYBL', season_year=2024, season_type='AAU',
+                                     original_filenames=['overall.csv'])
+    db.session.commit()
+    assert (summary['inserted'], summary['updated']) == (0, 2)
+    assert UnifiedStats.query.count() == 2
+    assert UnifiedStats.query.filter_by(recruit_id=1).one().ppg == 20.0
@@ -0,0 +1,77 @@
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+from models.database import db, Season, Game
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from services.reports import playcall as playcall_service
+from utils.game_frames import file_digest, load_game_frame, write_game_frame
+
+SAMPLE_CSVS = sorted((Path(__file__).resolve().parent.parent / "sample_game_csv").glob("*.csv"))
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["UPLOAD_FOLDER"] = str(tmp_path / "uploads")
+    app.config["GAME_FRAME_DIR"] = str(tmp_path / "frames")
+    app.config["REPORT_CACHE_DISK"] = False
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2025", start_date=date(2025, 6, 1)))
+        (tmp_path / "uploads").mkdir()
+        for game_id, csv in enumerate(SAMPLE_CSVS, start=1):
+            shutil.copy(csv, tmp_path / "uploads" / csv.name)
+            db.session.add(Game(id=game_id, season_id=1, game_date=date(2025, 11, game_id),
+                                opponent_name="Opp", csv_filename=csv.name))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.mark.parametrize("index", range(len(SAMPLE_CSVS)))
+def test_snapshot_report_matches_csv(app, index):
+    csv = SAMPLE_CSVS[index]
+    game_id = index + 1
+    df = pd.read_csv(csv)
+    digest = file_digest(str(csv))
+    path = write_game_frame(game_id, df, digest)
+    assert path
+    # Per-column codes stay well under the text CSV they were parsed from.
+    assert Path(path).stat().st_size < csv.stat().st_size / 2
+
+    snapshot = load_game_frame(game_id, digest)
+    assert list(snapshot.columns) == list(df.columns)
+    assert len(snapshot) == len(df)
+    assert playcall_service._compute_from_dataframe(snapshot) == playcall_service._compute_from_dataframe(df)
+
+
+def test_report_reads_snapshot_and_refreshes_when_csv_changes(app, tmp_path, monkeypatch):
+    game = db.session.get(Game, 1)
+    csv_path = tmp_path / "uploads" / game.csv_filename
+    expected = playcall_service._compute_from_dataframe(pd.read_csv(csv_path))
+    playcall_service.compute_playcall_report(1)
+    frames = list((tmp_path / "frames").glob("1-*.npz"))
+    assert len(frames) == 1
+
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError("CSV should not be re-read while the snapshot is fresh")
+
+    monkeypatch.setattr(playcall_service.pd, "read_csv", fail_read_csv)
+    data, _meta = playcall_service.compute_playcall_report(1)
+    assert data == expected
+    monkeypatch.undo()
+
+    with open(csv_path, "a", encoding="utf-8") as handle:
+        handle.write("\n")
+    playcall_service.compute_playcall_report(1)
+    refreshed = list((tmp_path / "frames").glob("1-*.npz"))
+    assert len(refreshed) == 1 and refreshed != frames
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from test_parse import parse_game_dataframe
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample_game_csv"
+SAMPLE_FILES = sorted(SAMPLE_DIR.glob("*.csv"))
+
+
+def _comparable(parsed):
+    """Flatten a parse result so dict equality also checks player order and shot JSON."""
+    result = dict(parsed)
+    result["player_order"] = list(parsed["player_stats"])
+    result["player_stats"] = {
+        name: {
+            key: json.dumps(value) if key == "shot_type_details" else value
+            for key, value in stats.items()
+        }
+        for name, stats in parsed["player_stats"].items()
+    }
+    return result
+
+
+def _assert_parity(df):
+    rows = parse_game_dataframe(df, 7, 3, engine="rows")
+    columnar = parse_game_dataframe(df, 7, 3, engine="columnar")
+    expected = _comparable(rows)
+    actual = _comparable(columnar)
+    for key in expected:
+        assert actual[key] == expected[key], key
+    return columnar
+
+
+@pytest.mark.parametrize("csv_path", SAMPLE_FILES, ids=lambda p: p.name)
+def test_columnar_matches_row_parser_on_sample_games(csv_path):
+    parsed = _assert_parity(pd.read_csv(csv_path))
+    assert parsed["possessions"]
+    assert any(stats["shot_type_details"] for stats in parsed["player_stats"].values())
+
+
+def test_columnar_matches_row_parser_on_mixed_rows():
+    columns = [
+        "Row", "TEAM", "OPP TEAM", "OPP STATS", "POSSESSION TYPE", "Shot Location",
+        "3FG (Shrink)", "2FG Scheme (Pass)", "PLAYER POSSESSIONS", "Period",
+        "#1 A", "#2 B", "#3 C\xa0",
+    ]
+    rows = [
+        ["Offense", "", "", "", "Man, Transition", "Arc", "Shrink", "", "#1 A, #2 B", "1st Half",
+         "3FG+", "Assist; Turnover", ""],
+        ["Offense", "Neutral", "", "", "Zone", "Paint", "", "Swing, Skip", "#1 A", "2nd Half",
+         "ATR-, FT+, FT-", "Pot. Assist", "2FG+"],
+        ["Offense", "Off Reb", "", "", "Transition", "", "", "", "#2 B", "OT",
+         "Fouled", "2FG+, ATR+", "Assist"],
+        ["Defense", "", "Neutral", "2FG+, Turnover", "Press", "", "", "", "#1 A", "1st Half",
+         "Bump +, Front", "Low Man -, Gap +", "Blowby"],
+        ["Defense", "", "", "3FG-, Off Reb", "Man", "", "", "", "", "2nd Half",
+         "", "Bump -", "Contest"],
+        ["TEAM", "Def Reb, Floor Dive", "", "", "", "", "", "", "", "", "", "", ""],
+        ["PnR", "", "", "", "", "", "", "", "", "", "Gap +, CW -", "SD +, Low -", ""],
+        ["Rebound Opportunities", "", "", "", "", "", "", "", "", "", "Off +, Def -", "Given Up", ""],
+        ["Defense Rebounding Opportunities", "", "", "", "", "", "", "", "", "", "Def +", "", ""],
+        ["DEF Note", "", "", "", "", "", "", "", "", "", "Deflection, Block", "", "Charge Taken"],
+        ["#2 B", "", "", "", "", "", "", "", "", "", "", "Reb Tip, Off Reb", ""],
+        ["Opponent Blue Collar Plays", "", "", "Def Reb, Misc", "", "", "", "", "", "", "", "", ""],
+    ]
+    df = pd.DataFrame(rows, columns=columns).replace("", float("nan"))
+
+    parsed = _assert_parity(df)
+
+    stats = parsed["player_stats"]
+    assert stats["#1 A"]["fg3_makes"] == 1
+    assert stats["#2 B"]["assists"] == 1
+    assert stats["#2 B"]["blue_collar_accum"]["off_reb"] == 1
+    assert parsed["team_totals"]["floor_dive"] == 1
+    assert parsed["opponent_totals"]["fg2_makes"] == 1
+    assert parsed["opponent_blue_collar"]["misc"] == 1
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        parse_game_dataframe(pd.DataFrame({"Row": ["Offense"]}), 1, 1, engine="bogus")
@@ -135,3 +135,27 @@ def test_game_reports_multiple_type_filter(client, app, season):
     assert "Bears" not in html
     assert 'value="Conference"' in html and 'checked' in html.split('value="Conference"', 1)[1]
     assert 'value="Postseason"' in html and 'checked' in html.split('value="Postseason"', 1)[1]
+
+
+def test_edit_game_date_moves_rollup_rows(client, app, season):
+    from models.database import PlayerStats, PlayerStatsRollup
+    from services.stat_rollups import ensure_season_rollups
+
+    with app.app_context():
+        game = _create_game(season_id=season.id, opponent_name="Movers", game_date=date(2024, 12, 1))
+        db.session.add(game)
+        db.session.flush()
+        db.session.add(PlayerStats(season_id=season.id, game_id=game.id, player_name="#1 A", points=9))
+        db.session.commit()
+        ensure_season_rollups(season.id)
+        game_id = game.id
+
+    response = client.post(
+        f"/admin/game/{game_id}/edit",
+        data={"game_date": "2024-12-08", "opponent_name": "Movers", "result": "W"},
+    )
+    assert response.status_code == 302
+
+    with app.app_context():
+        rows = PlayerStatsRollup.query.filter_by(season_id=season.id, source="game").all()
+        assert [(row.session_date, row.points) for row in rows] == [(date(2024, 12, 8), 9)]
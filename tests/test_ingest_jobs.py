@@ -0,0 +1,134 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from models.database import db, IngestJob, Season, UploadedFile
+from models.recruit import Recruit  # noqa: F401  (uploaded_files.recruit_id FK target)
+from models.user import User  # noqa: F401  (ingest_job.created_by FK target)
+from services.ingest_jobs import (
+    cancel_job,
+    enqueue_job,
+    fail_stale_jobs,
+    register_job_handler,
+    run_pending,
+)
+
+CALLS = []
+
+
+def _record(ctx):
+    CALLS.append(ctx.job.id)
+    return {"items": ctx.payload.get("items", [])}
+
+
+def _fail(ctx):
+    raise RuntimeError("bad csv")
+
+
+def _cancel_midway(ctx):
+    done = []
+    for index, item in enumerate(ctx.payload["items"]):
+        ctx.raise_if_cancelled()
+        done.append(item)
+        if index == 1:
+            cancel_job(ctx.job.id)
+    return done
+
+
+register_job_handler("test_record", _record)
+register_job_handler("test_fail", _fail)
+register_job_handler("test_cancel_midway", _cancel_midway)
+
+
+@pytest.fixture
+def app(tmp_path):
+    # Cancelling reports progress, which falls back to a file in the instance folder.
+    app = Flask(__name__, instance_path=str(tmp_path))
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2025", start_date=date(2025, 11, 1)))
+        db.session.add(UploadedFile(id=1, season_id=1, filename="g.csv", category="Game", file_date=date(2025, 11, 3)))
+        db.session.commit()
+        CALLS.clear()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_inline_jobs_run_on_enqueue_and_record_results(app):
+    job = enqueue_job("test_record", payload={"items": [1, 2]})
+    assert job.status == "succeeded"
+    assert job.result == '{"items": [1, 2]}'
+    assert CALLS == [job.id]
+
+    failed = enqueue_job("test_fail", file_id=1)
+    assert failed.status == "failed"
+    assert failed.error == "bad csv"
+
+    with pytest.raises(ValueError):
+        enqueue_job("no_such_kind")
+
+
+def test_queued_jobs_run_in_order_and_cancelled_ones_are_skipped(app):
+    jobs = [IngestJob(kind="test_record", status="queued") for _ in range(3)]
+    db.session.add_all(jobs)
+    db.session.commit()
+
+    assert cancel_job(jobs[1].id).status == "cancelled"
+    assert run_pending() == 2
+    assert CALLS == [jobs[0].id, jobs[2].id]
+    assert [db.session.get(IngestJob, j.id).status for j in jobs] == ["succeeded", "cancelled", "succeeded"]
+    assert run_pending() == 0
+
+
+def test_running_job_stops_at_next_safe_point_after_cancel(app):
+    job = enqueue_job("test_cancel_midway", payload={"items": ["a", "b", "c", "d"]})
+    assert job.status == "cancelled"
+    assert job.cancel_requested is True
+    assert job.result is None
+
+
+def test_active_job_for_a_file_is_reused(app):
+    queued = IngestJob(kind="test_record", file_id=1, status="queued")
+    db.session.add(queued)
+    db.session.commit()
+
+    assert enqueue_job("test_record", file_id=1).id == queued.id
+    assert IngestJob.query.count() == 1
+
+
+def test_stale_running_job_is_failed_and_not_reused(app):
+    stuck = IngestJob(kind="test_record", file_id=1, status="running",
+                      started_at=datetime.utcnow() - timedelta(days=1))
+    fresh = IngestJob(kind="test_record", status="running", started_at=datetime.utcnow())
+    db.session.add_all([stuck, fresh])
+    db.session.commit()
+
+    job = enqueue_job("test_record", file_id=1)
+    assert job.id != stuck.id
+    assert job.status == "succeeded"
+    assert db.session.get(IngestJob, stuck.id).status == "failed"
+    assert db.session.get(IngestJob, fresh.id).status == "running"
+    assert fail_stale_jobs() == 0
+
+
+def test_game_parse_job_hands_the_worker_app_to_the_parser(app, tmp_path, monkeypatch):
+    import admin.routes as routes
+
+    app.config["UPLOAD_FOLDER"] = str(tmp_path)
+    (tmp_path / "g.csv").write_text("Row\nOffense\n")
+    seen = []
+
+    def fake_parse_csv(file_path, game_id, season_id, file_date=None, app=None):
+        seen.append(app)
+        return {}
+
+    monkeypatch.setattr(routes, "parse_csv", fake_parse_csv)
+    job = enqueue_job("parse", file_id=1)
+
+    assert job.status == "succeeded"
+    assert seen == [app]
@@ -0,0 +1,119 @@
+from collections import defaultdict
+from datetime import date
+from itertools import combinations
+
+import pytest
+from flask import Flask
+
+from models.database import db, Season, Game, Roster, Possession, PlayerPossession
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from utils.bulk_persist import ingest_transaction
+from utils.lineup import (
+    LineupAccumulator,
+    compute_lineup_totals,
+    game_lineup_accumulator,
+    normalize_lineup_side,
+)
+
+POSSESSIONS = [
+    {"side": "Offense", "points_scored": 2, "players_on_floor": ["#1 A", "#2 B", "#3 C"]},
+    {"side": "offense ", "points_scored": 0, "players_on_floor": ["#3 C", "#1 A"]},
+    {"side": "Defense", "points_scored": 3, "players_on_floor": ["#2 B", "#3 C", "#4 D"]},
+    {"side": "Crimson", "points_scored": 1, "players_on_floor": ["#1 A", "#4 D"]},
+    {"side": "Offense", "points_scored": 3, "players_on_floor": ["#1 A", "#2 B"], "is_true_possession": False},
+    {"side": "", "points_scored": 2, "players_on_floor": ["#1 A", "#2 B"]},
+]
+
+
+def _reference_totals(possession_data, group_sizes=(2, 3, 4, 5)):
+    sides = {normalize_lineup_side(p.get("side")) for p in possession_data} - {""}
+    raw = {size: {side: defaultdict(lambda: {"poss": 0, "pts": 0}) for side in sides} for size in group_sizes}
+    for poss in possession_data:
+        side = normalize_lineup_side(poss.get("side"))
+        if not side or not poss.get("is_true_possession", True):
+            continue
+        for size in group_sizes:
+            for combo in combinations(poss["players_on_floor"], size):
+                raw[size][side][tuple(sorted(combo))]["poss"] += 1
+                raw[size][side][tuple(sorted(combo))]["pts"] += poss["points_scored"]
+    return {size: {side: dict(bucket) for side, bucket in by_side.items()} for size, by_side in raw.items()}
+
+
+def test_totals_match_reference():
+    assert compute_lineup_totals(POSSESSIONS) == _reference_totals(POSSESSIONS)
+    totals = compute_lineup_totals(POSSESSIONS, group_sizes=(2,))
+    assert totals[2]["offense"][("#1 A", "#3 C")] == {"poss": 2, "pts": 2}
+    assert ("#1 A", "#2 B") in totals[2]["offense"]
+    assert totals[2]["offense"][("#1 A", "#2 B")] == {"poss": 1, "pts": 2}
+
+
+def test_merged_partials_equal_one_pass():
+    first = LineupAccumulator().add_many(POSSESSIONS[:3])
+    second = LineupAccumulator().add_many(reversed(POSSESSIONS[3:]))
+    merged = LineupAccumulator().merge(first).merge(second)
+    assert merged.totals() == compute_lineup_totals(POSSESSIONS)
+    assert sorted(merged.players) == ["#1 A", "#2 B", "#3 C", "#4 D"]
+
+    incremental = LineupAccumulator()
+    for poss in POSSESSIONS:
+        incremental.add(poss)
+    assert incremental.totals() == merged.totals()
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2024-25", start_date=date(2024, 6, 1)))
+        db.session.add_all(Roster(id=i, season_id=1, player_name=f"#{i} P") for i in range(1, 5))
+        db.session.add_all(
+            Game(id=gid, season_id=1, game_date=date(2024, 11, gid), opponent_name="Opp")
+            for gid in (1, 2)
+        )
+        rows = [
+            (1, 1, "Offense", 2, [1, 2, 3]),
+            (2, 1, "Defense", 3, [1, 2]),
+            (3, 2, "Offense", 1, [1, 2, 4]),
+        ]
+        for pid, gid, side, points, players in rows:
+            db.session.add(Possession(id=pid, season_id=1, game_id=gid, possession_side=side,
+                                      time_segment=side, points_scored=points))
+            db.session.add_all(PlayerPossession(possession_id=pid, player_id=p) for p in players)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_game_partials_are_cached_and_refreshed(app):
+    season = game_lineup_accumulator([1, 2], group_sizes=(2,)).totals()
+    assert season[2]["offense"][("#1 P", "#2 P")] == {"poss": 2, "pts": 3}
+    assert season[2]["defense"][("#1 P", "#2 P")] == {"poss": 1, "pts": 3}
+
+    cache = app.extensions["lineup_partials"]
+    cached_game_one = cache[(1, (2,))][1]
+    game_lineup_accumulator([2], group_sizes=(2,))
+    assert cache[(1, (2,))][1] is cached_game_one
+
+    db.session.add(Possession(id=4, season_id=1, game_id=2, possession_side="Offense",
+                              time_segment="Offense", points_scored=3))
+    db.session.add_all(PlayerPossession(possession_id=4, player_id=p) for p in (1, 2))
+    db.session.commit()
+    season = game_lineup_accumulator([1, 2], group_sizes=(2,)).totals()
+    assert cache[(1, (2,))][1] is cached_game_one
+    assert season[2]["offense"][("#1 P", "#2 P")] == {"poss": 3, "pts": 6}
+
+
+def test_game_partials_drop_after_ingest(app):
+    game_lineup_accumulator([1], group_sizes=(2,))
+
+    # Renames keep the possession signature, so only the explicit drop helps.
+    with ingest_transaction():
+        db.session.get(Roster, 1).player_name = "#1 New"
+    season = game_lineup_accumulator([1], group_sizes=(2,)).totals()
+    assert ("#1 New", "#2 P") in season[2]["offense"]
+    assert ("#1 P", "#2 P") not in season[2]["offense"]
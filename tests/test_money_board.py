@@ -101,3 +101,73 @@ def test_money_board_no_redirect(client, app):
     link = soup.find('a', string=lambda s: s and 'Compare Coaches' in s)
     assert link is not None
 
+
+
+def test_workbook_snapshot_is_built_once_and_memoized(app, tmp_path, monkeypatch):
+    import pandas as pd
+    from app.recruits import workbook_utils
+
+    app.instance_path = str(tmp_path)
+    wb_dir = tmp_path / 'money_board'
+    wb_dir.mkdir()
+    wb_path = wb_dir / workbook_utils.WORKBOOK_FILENAME
+    with pd.ExcelWriter(wb_path) as writer:
+        pd.DataFrame([{'Coach': ' Nate  Oats ', 'Player': 'P1', 'Year': '2024',
+                       'Projected Money': '$1,000', 'Actual Money': '2500'}]).to_excel(writer, sheet_name='SEC', index=False)
+        pd.DataFrame([{'Coach': 'Other', 'Player': 'P2', 'Year': 2023,
+                       'Projected Money': 0, 'Actual Money': 0}]).to_excel(writer, sheet_name='ACC', index=False)
+
+    with app.app_context():
+        df = workbook_utils.active_workbook_df()
+        assert (wb_dir / workbook_utils.SNAPSHOT_FILENAME).exists()
+        row = df[df['Player'] == 'P1'].iloc[0]
+        assert row['Coach_norm'] == 'nate oats'
+        assert row['Year_int'] == 2024
+        assert row['NET $'] == 1500
+        assert sorted(df['__sheet'].unique()) == ['ACC', 'SEC']
+
+        # Later requests and other processes never re-read the workbook.
+        monkeypatch.setattr(pd, 'read_excel', lambda *a, **k: pytest.fail('workbook re-read'))
+        assert workbook_utils.active_workbook_df() is df
+        workbook_utils._snapshot_memo.clear()
+        assert workbook_utils.active_workbook_df()['Coach_norm'].tolist() == df['Coach_norm'].tolist()
+
+        workbook_utils.discard_money_snapshot(str(wb_path))
+        assert not (wb_dir / workbook_utils.SNAPSHOT_FILENAME).exists()
+
+
+def test_money_cube_matches_row_level_aggregation():
+    import pandas as pd
+    from app.recruits.workbook_utils import MoneyCube, add_money_keys
+
+    df = add_money_keys(pd.DataFrame([
+        {'Coach': 'Nate Oats', 'Player': 'P1', 'Year': 2023, 'Projected $': 100, 'Actual $': 300,
+         'Coach Team': None, 'Coach Conf': 'SEC', '__sheet': 'A'},
+        {'Coach': 'nate  oats', 'Player': 'P1', 'Year': 2024, 'Projected $': 50, 'Actual $': 0,
+         'Coach Team': 'Alabama', 'Coach Conf': 'SEC', '__sheet': 'B'},
+        {'Coach': 'Nate Oats', 'Player': 'P2', 'Year': 2024, 'Projected $': 0, 'Actual $': 10,
+         'Coach Team': 'Buffalo', 'Coach Conf': 'MAC', '__sheet': 'A'},
+        {'Coach': 'Empty', 'Player': None, 'Year': 2024, 'Projected $': 0, 'Actual $': 0,
+         'Coach Team': 'X', 'Coach Conf': 'ACC', '__sheet': 'A'},
+        {'Coach': None, 'Player': 'P9', 'Year': 2024, 'Projected $': 5, 'Actual $': 5,
+         'Coach Team': None, 'Coach Conf': None, '__sheet': 'A'},
+    ]))
+    cube = MoneyCube(df)
+    assert cube.years() == [2023, 2024]
+    assert cube.confs() == ['ACC', 'MAC', 'SEC']
+
+    everything = cube.select()
+    by_norm = everything.totals(keys=['Coach_norm']).set_index('Coach_norm')
+    assert by_norm.loc['nate oats', 'recruits'] == 2  # P1 counted once across sheets
+    assert by_norm.loc['nate oats', 'net_sum'] == 300 - 100 + 0 - 50 + 10
+    assert 'empty' not in by_norm.index
+    assert [c['Coach'] for c in everything.coaches()] == ['Empty', 'Nate Oats']
+    assert everything.first_by_coach('Team') == {'nate oats': 'Alabama', 'empty': 'X'}
+    assert everything.first_by_coach('Conf') == {'nate oats': 'SEC', 'empty': 'ACC'}
+
+    sec_2024 = cube.select(year_min=2024, conf='SEC')
+    totals = sec_2024.totals().set_index('Coach')
+    assert list(totals.index) == ['nate  oats']
+    assert totals.loc['nate  oats', 'act_sum'] == 0
+    assert sec_2024.rows_for('nate oats')['Player'].tolist() == ['P1']
+    assert sec_2024.coaches() == [{'Coach': 'nate  oats', 'Coach_norm': 'nate oats'}]
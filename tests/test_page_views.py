@@ -0,0 +1,71 @@
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy import func
+
+from models.database import db, PageView, PageViewDaily
+from models.user import User
+from services.page_views import get_page_view_writer
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    app.config["PAGE_VIEW_QUEUE_SIZE"] = 3
+    app.config["PAGE_VIEW_FLUSH_INTERVAL"] = 3600
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, username="coach", password_hash="x"))
+        db.session.commit()
+        yield app
+        get_page_view_writer(app).stop()
+        db.session.remove()
+        db.drop_all()
+
+
+def _daily():
+    rows = (
+        db.session.query(PageViewDaily.day, PageViewDaily.user_id, PageViewDaily.endpoint,
+                         func.sum(PageViewDaily.views))
+        .group_by(PageViewDaily.day, PageViewDaily.user_id, PageViewDaily.endpoint)
+        .all()
+    )
+    return {(day, uid, endpoint): views for day, uid, endpoint, views in rows}
+
+
+def test_views_are_buffered_then_written_with_daily_rollup(app):
+    writer = get_page_view_writer(app)
+    morning = datetime(2025, 11, 3, 9, 0)
+    writer.record(1, "admin.leaderboard", "/admin/leaderboard", "ua", timestamp=morning)
+    writer.record(1, "admin.leaderboard", "/admin/leaderboard", "ua", timestamp=morning)
+    writer.record(None, "public.home", "/", "ua", timestamp=morning)
+
+    assert PageView.query.count() == 0
+    assert writer.flush() == 3
+    assert PageView.query.count() == 3
+
+    writer.record(1, "admin.leaderboard", "/admin/leaderboard", "ua", timestamp=morning)
+    writer.record(None, "public.home", "/", "ua", timestamp=datetime(2025, 11, 4, 8, 0))
+    writer.flush()
+
+    assert _daily() == {
+        (date(2025, 11, 3), 1, "admin.leaderboard"): 3,
+        (date(2025, 11, 3), None, "public.home"): 1,
+        (date(2025, 11, 4), None, "public.home"): 1,
+    }
+    assert PageViewDaily.query.count() == 3
+    assert writer.stats()["written"] == 5
+
+
+def test_full_queue_drops_and_counts(app):
+    writer = get_page_view_writer(app)
+    accepted = [writer.record(None, "public.home", "/", None) for _ in range(5)]
+
+    assert accepted == [True, True, True, False, False]
+    assert writer.stats()["dropped"] == 2
+    assert writer.flush() == 3
+    assert writer.stats()["pending"] == 0
@@ -0,0 +1,140 @@
+import json
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+from models.database import (
+    db,
+    Season,
+    Game,
+    Roster,
+    PlayerStats,
+    PlayerShotDetail,
+    PlayerShotLabel,
+    PlayerStatsLabel,
+)
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from test_parse import parse_game_dataframe, persist_game_rows
+from utils.bulk_persist import ingest_transaction
+from utils.shottype import (
+    count_3fg_shots,
+    count_3fg_shots_by_stat,
+    delete_player_shot_details,
+    get_player_shottype_3fg_breakdown,
+    persist_player_shot_details,
+    player_stats_label_filter,
+)
+
+SAMPLE_CSV = sorted((Path(__file__).resolve().parent.parent / "sample_game_csv").glob("*.csv"))[0]
+
+SHOTS = [
+    {"shot_class": "3fg", "result": "made", "3fg_shrink": "Shrink", "3fg_contest": "Contest"},
+    {"shot_class": "3fg", "result": "miss", "3fg_shrink": "Non-Shrink", "3fg_contest": "Late Contest"},
+    {"shot_class": "3FG", "result": "made", "3fg_shrink": "non shrink", "contest_level": "uncontested"},
+    {"shot_class": "3fg", "result": "made", "3fg_contest": "No Contest"},
+    {"shot_class": "atr", "result": "made", "Assisted": "Assisted", "drill_labels": ["SHELL", "4V4"]},
+]
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2025", start_date=date(2025, 11, 1)))
+        db.session.add(Game(id=1, season_id=1, game_date=date(2025, 11, 3), opponent_name="Opp"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_persisted_details_count_like_the_json(app):
+    stat = PlayerStats(season_id=1, game_id=1, player_name="#1 A")
+    persist_player_shot_details(stat, SHOTS)
+    db.session.add(stat)
+    db.session.commit()
+
+    assert PlayerShotDetail.query.count() == len(SHOTS)
+    assert count_3fg_shots_by_stat([stat.id]) == {stat.id: count_3fg_shots(SHOTS)}
+
+    atr = PlayerShotDetail.query.filter_by(shot_class="atr").one()
+    assert atr.assisted is True
+    assert {lbl.label for lbl in atr.labels} >= {"Assisted", "SHELL", "4V4"}
+
+    persist_player_shot_details(stat, SHOTS[:1], replace=True)
+    db.session.commit()
+    assert PlayerShotDetail.query.count() == 1
+    assert PlayerShotLabel.query.filter_by(label="SHELL").count() == 0
+
+
+def test_game_ingest_writes_details_and_delete_clears_them(app):
+    df = pd.read_csv(SAMPLE_CSV)
+    players = [c for c in df.columns if str(c).startswith("#")]
+    db.session.add_all(Roster(season_id=1, player_name=name) for name in players)
+    db.session.commit()
+    parsed = parse_game_dataframe(df, 1, 1)
+
+    with ingest_transaction():
+        written = persist_game_rows(parsed, 1, 1)
+
+    stats = PlayerStats.query.filter_by(game_id=1).all()
+    total_shots = sum(len(json.loads(s.shot_type_details or "[]")) for s in stats)
+    assert total_shots > 0
+    assert written["player_shot_detail"] == total_shots
+    by_stat = count_3fg_shots_by_stat([s.id for s in stats])
+    for stat in stats:
+        shots = json.loads(stat.shot_type_details or "[]")
+        if shots:
+            assert by_stat[stat.id] == count_3fg_shots(shots)
+
+    delete_player_shot_details(PlayerStats.game_id == 1)
+    db.session.commit()
+    assert PlayerShotDetail.query.count() == 0
+    assert PlayerShotLabel.query.count() == 0
+
+
+def test_breakdown_mixes_detail_rows_and_legacy_json(app):
+    roster = Roster(season_id=1, player_name="#1 A")
+    db.session.add(roster)
+    db.session.add(Game(id=2, season_id=1, game_date=date(2025, 11, 5), opponent_name="B"))
+    with_details = PlayerStats(season_id=1, game_id=1, player_name="#1 A")
+    persist_player_shot_details(with_details, SHOTS[:2])
+    legacy = PlayerStats(season_id=1, game_id=2, player_name="#1 A", shot_type_details=json.dumps(SHOTS[2:]))
+    db.session.add_all([with_details, legacy])
+    db.session.commit()
+
+    result = get_player_shottype_3fg_breakdown(roster.id, season_id=1)
+    expected = count_3fg_shots(SHOTS)
+    for key, value in expected.items():
+        assert result[key] == value
+
+
+def test_stat_labels_index_both_blobs_and_drive_label_filters(app):
+    events = [{"event": "assists", "drill_labels": ["Transition"]}]
+    shooter = PlayerStats(season_id=1, game_id=1, player_name="#1 A", stat_details=json.dumps(events))
+    persist_player_shot_details(shooter, SHOTS)
+    other = PlayerStats(season_id=1, game_id=1, player_name="#2 B")
+    persist_player_shot_details(other, [{"shot_class": "2fg", "result": "miss", "possession_type": "Half Court, Zone"}])
+    db.session.add_all([shooter, other])
+    db.session.commit()
+
+    assert {lbl.label for lbl in shooter.labels} == {"SHELL", "4V4", "TRANSITION"}
+    assert {lbl.label for lbl in other.labels} == {"HALF COURT", "ZONE"}
+
+    def matching(*labels):
+        return {s.player_name for s in PlayerStats.query.filter(player_stats_label_filter(set(labels)))}
+
+    assert matching("shell") == {"#1 A"}
+    assert matching("TRANSITION", "ZONE") == {"#1 A", "#2 B"}
+    assert matching("4V") == set()
+
+    delete_player_shot_details(PlayerStats.game_id == 1)
+    db.session.commit()
+    assert PlayerStatsLabel.query.count() == 0
@@ -0,0 +1,208 @@
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import and_, func, or_
+
+from models.database import (
+    db,
+    Season,
+    Game,
+    Practice,
+    Roster,
+    Possession,
+    PlayerPossession,
+    ShotDetail,
+)
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from utils.bulk_persist import ingest_transaction
+from utils.leaderboard_helpers import (
+    OnOffSummary,
+    _coerce_date,
+    _normalize_labels,
+    get_on_off_summaries,
+    get_on_off_summary,
+)
+from utils.possession_index import get_possession_index
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2024-25", start_date=date(2024, 6, 1)))
+        db.session.add_all([
+            Roster(id=1, season_id=1, player_name="#1 A"),
+            Roster(id=2, season_id=1, player_name="#2 B"),
+            Game(id=1, season_id=1, game_date=date(2024, 11, 4), opponent_name="A"),
+            Practice(id=1, season_id=1, date=date(2024, 11, 9), category="Official Practice"),
+        ])
+        possessions = [
+            # id, game, practice, side, segment, points, labels, players, events
+            (1, 1, None, "Offense", "Offense", 2, None, [1, 2], ["2FG+"]),
+            (2, 1, None, "Offense", "Offense", 0, None, [1], ["Turnover"]),
+            (3, 1, None, "Defense", "Defense", 3, None, [2], ["3FG+"]),
+            (4, 0, 1, "", "offense", 1, "SHELL, 4V4", [1], ["Neutral"]),
+            (5, None, 1, "Offense", "Offense", 2, "Transition", [2], ["TEAM Off Reb"]),
+            (6, None, 1, "Defense", "Defense", 0, "shell", [1, 2], ["ATR-", "Def Reb"]),
+        ]
+        for pid, gid, prid, side, segment, points, labels, players, events in possessions:
+            db.session.add(Possession(
+                id=pid, season_id=1, game_id=gid, practice_id=prid, possession_side=side,
+                time_segment=segment, points_scored=points, drill_labels=labels,
+            ))
+            db.session.add_all(PlayerPossession(possession_id=pid, player_id=p) for p in players)
+            db.session.add_all(ShotDetail(possession_id=pid, event_type=e) for e in events)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_index_masks(app):
+    index = get_possession_index(1)
+    assert len(index) == 6
+    assert index.side_mask("Offense").tolist() == [True, True, False, True, True, False]
+    assert index.label_mask({"SHELL"}).tolist() == [False, False, False, True, False, True]
+    window = index.filter_mask(start_dt=date(2024, 11, 5))
+    assert window.tolist() == [False, False, False, True, True, True]
+    assert not index.filter_mask(game_ids=[]).any()
+    # Neutral and TEAM off-rebound possessions are not counted.
+    assert index.summarize(index.side_mask("Offense")) == (2, 5.0)
+
+
+def _sql_totals(season_id, side, start_dt, end_dt, label_set, player_id=None):
+    """The pre-index SQL possession count, kept as an independent reference."""
+    side = side.lower()
+    query = db.session.query(Possession.id).filter(
+        Possession.season_id == season_id,
+        or_(
+            func.lower(Possession.possession_side) == side,
+            and_(
+                or_(Possession.possession_side.is_(None), func.trim(Possession.possession_side) == ""),
+                func.lower(Possession.time_segment) == side,
+            ),
+        ),
+    )
+    if player_id is not None:
+        query = query.join(PlayerPossession, PlayerPossession.possession_id == Possession.id).filter(
+            PlayerPossession.player_id == player_id
+        )
+    if label_set:
+        query = query.filter(or_(*[Possession.drill_labels.ilike(f"%{lbl}%") for lbl in label_set]))
+    if start_dt or end_dt:
+        query = query.outerjoin(Game, Possession.game_id == Game.id).outerjoin(
+            Practice, Possession.practice_id == Practice.id
+        )
+        if start_dt:
+            query = query.filter(or_(
+                and_(Possession.game_id.isnot(None), Game.game_date >= start_dt),
+                and_(Possession.practice_id.isnot(None), Practice.date >= start_dt),
+            ))
+        if end_dt:
+            query = query.filter(or_(
+                and_(Possession.game_id.isnot(None), Game.game_date <= end_dt),
+                and_(Possession.practice_id.isnot(None), Practice.date <= end_dt),
+            ))
+    ids = [pid for (pid,) in query.distinct()]
+    if not ids:
+        return 0, 0.0
+    skipped = {
+        pid
+        for (pid,) in db.session.query(ShotDetail.possession_id).filter(
+            ShotDetail.possession_id.in_(ids),
+            or_(ShotDetail.event_type.ilike("%Neutral%"), ShotDetail.event_type == "TEAM Off Reb"),
+        )
+    }
+    points = db.session.query(func.coalesce(func.sum(Possession.points_scored), 0)).filter(
+        Possession.id.in_(ids)
+    ).scalar()
+    return len(ids) - len(skipped), float(points)
+
+
+def _sql_on_off_summary(player_id, date_from=None, date_to=None, labels=None):
+    roster = db.session.get(Roster, player_id)
+    if roster is None:
+        return OnOffSummary(0, 0, None, None, 0, 0, None, None)
+    args = (_coerce_date(date_from), _coerce_date(date_to), _normalize_labels(labels))
+    off_on, off_on_pts = _sql_totals(roster.season_id, "Offense", *args, player_id=player_id)
+    def_on, def_on_pts = _sql_totals(roster.season_id, "Defense", *args, player_id=player_id)
+    team_off, team_off_pts = _sql_totals(roster.season_id, "Offense", *args)
+    team_def, team_def_pts = _sql_totals(roster.season_id, "Defense", *args)
+    off_off, def_off = max(team_off - off_on, 0), max(team_def - def_on, 0)
+
+    def ppp(points, poss):
+        return round(points / poss, 2) if poss > 0 else None
+
+    return OnOffSummary(
+        offensive_possessions_on=off_on,
+        defensive_possessions_on=def_on,
+        ppp_on_offense=ppp(off_on_pts, off_on),
+        ppp_on_defense=ppp(def_on_pts, def_on),
+        offensive_possessions_off=off_off,
+        defensive_possessions_off=def_off,
+        ppp_off_offense=ppp(max(team_off_pts - off_on_pts, 0.0), off_off),
+        ppp_off_defense=ppp(max(team_def_pts - def_on_pts, 0.0), def_off),
+        team_offensive_possessions=team_off,
+        team_defensive_possessions=team_def,
+        offensive_possession_pct=(off_on / team_off) if team_off else None,
+        defensive_possession_pct=(def_on / team_def) if team_def else None,
+    )
+
+
+def test_on_off_matches_hand_counts(app):
+    # Offense on: possessions 1, 2 and 4; the neutral possession 4 drops out
+    # of the count but keeps its point. Defense on: possession 6 only.
+    summary = get_on_off_summary(1)
+    assert (summary.offensive_possessions_on, summary.ppp_on_offense) == (1 + 1, 1.5)
+    assert (summary.offensive_possessions_off, summary.ppp_off_offense) == (0, None)
+    assert (summary.defensive_possessions_on, summary.ppp_on_defense) == (1, 0.0)
+    assert (summary.defensive_possessions_off, summary.ppp_off_defense) == (1, 3.0)
+    assert summary.defensive_possession_pct == 0.5
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"labels": ["shell"]},
+    {"labels": ["transition", "4V4"]},
+    {"date_from": "2024-11-05"},
+    {"date_to": "2024-11-05"},
+    {"date_from": "2024-11-05", "labels": ["shell"]},
+])
+def test_summaries_match_sql_reference(app, kwargs):
+    batched = get_on_off_summaries([1, 2, 99], **kwargs)
+    for player_id in (1, 2, 99):
+        expected = _sql_on_off_summary(player_id, **kwargs)
+        assert get_on_off_summary(player_id, **kwargs) == expected
+        assert batched[player_id] == expected
+
+
+def test_index_rebuilds_after_writes(app):
+    first = get_possession_index(1)
+    assert get_possession_index(1) is first
+
+    with ingest_transaction():
+        db.session.add(Possession(id=7, season_id=1, game_id=1, possession_side="Offense",
+                                  time_segment="Offense", points_scored=3))
+        db.session.add(PlayerPossession(possession_id=7, player_id=1))
+    rebuilt = get_possession_index(1)
+    assert rebuilt is not first
+    assert len(rebuilt) == 7
+    assert get_on_off_summary(1).offensive_possessions_on == 3
+
+    # Writes outside ingest_transaction are caught by the signature check.
+    db.session.add(ShotDetail(possession_id=7, event_type="Turnover"))
+    db.session.commit()
+    assert get_possession_index(1) is not rebuilt
+
+    # Session dates are edited in place; the signature still notices.
+    current = get_possession_index(1)
+    db.session.get(Practice, 1).date = date(2024, 11, 2)
+    db.session.commit()
+    moved = get_possession_index(1)
+    assert moved is not current
+    assert moved.filter_mask(start_dt=date(2024, 11, 5)).tolist() == [False] * 7
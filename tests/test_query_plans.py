@@ -0,0 +1,143 @@
+"""EXPLAIN QUERY PLAN checks for the hot leaderboard, on/off and team-totals filters.
+
+Each case calls the real helper and records the SQL it sends to the engine
+through a ``before_cursor_execute`` listener; every captured statement that
+reads a fact table is then explained with its own parameters. A plan that
+reads one of the fact tables with a bare ``SCAN`` means an index the helper
+relied on was dropped or its filter stopped matching it.
+"""
+import re
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from models.database import db, Season, Roster
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from services.leaderboard_game import _base_game_query
+from utils.leaderboard_helpers import (
+    _fetch_personal_turnovers,
+    _get_player_stats_totals,
+    get_on_court_metrics,
+)
+from utils.possession_index import build_possession_index
+from utils.records.season_candidate_builder import _aggregate_totals
+
+FACT_TABLES = (
+    "player_stats",
+    "player_stats_label",
+    "blue_collar_stats",
+    "team_stats",
+    "possession",
+    "player_possession",
+    "shot_detail",
+)
+FULL_SCAN = re.compile(r"\bSCAN (?:TABLE )?(%s)\b" % "|".join(FACT_TABLES))
+READS_FACT_TABLE = re.compile(r"\b(?:FROM|JOIN)\s+(%s)\b" % "|".join(FACT_TABLES))
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2025", start_date=date(2025, 11, 1)))
+        db.session.add(Roster(id=1, season_id=1, player_name="#1 A"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@contextmanager
+def _captured_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def _plans(call):
+    with _captured_statements() as statements:
+        call()
+    plans = []
+    connection = db.session.connection()
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith("SELECT") or not READS_FACT_TABLE.search(statement):
+            continue
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+def _roster():
+    return db.session.get(Roster, 1)
+
+
+# (helper call, indexes the captured plans are expected to name)
+HOT_HELPERS = {
+    "player_stats_totals": (
+        lambda: _get_player_stats_totals(_roster(), None, None, set()),
+        ("ix_player_stats_season_player",),
+    ),
+    "player_stats_label_totals": (
+        lambda: _get_player_stats_totals(_roster(), None, None, {"SHELL", "4V4"}),
+        ("ix_player_stats_label_label",),
+    ),
+    "personal_turnovers_practice": (
+        lambda: _fetch_personal_turnovers(_roster(), [1, 2], []),
+        ("ix_player_stats_season_player_practice",),
+    ),
+    "personal_turnovers_game": (
+        lambda: _fetch_personal_turnovers(_roster(), [], [1, 2]),
+        ("ix_player_stats_season_player_game",),
+    ),
+    "game_leaderboard_rows": (
+        lambda: _base_game_query(1).all(),
+        (),
+    ),
+    "on_court_metrics": (
+        lambda: get_on_court_metrics(1),
+        ("ix_blue_collar_stats_season_player",),
+    ),
+    "possession_index": (
+        lambda: build_possession_index(1),
+        ("ix_shot_detail_possession_event",),
+    ),
+    "team_season_totals": (
+        # ``is_opponent IS 0 OR IS NULL`` only matches the leading season_id
+        # column, so either season index is an acceptable plan.
+        lambda: _aggregate_totals(season_id=1, is_opponent=False),
+        (),
+    ),
+    "opponent_season_totals": (
+        lambda: _aggregate_totals(season_id=1, is_opponent=True),
+        ("ix_team_stats_season_opponent",),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_HELPERS))
+def test_hot_helper_avoids_full_table_scans(app, name):
+    call, expected_indexes = HOT_HELPERS[name]
+    plans = _plans(call)
+    assert plans, f"{name} issued no fact-table reads"
+
+    for statement, plan in plans:
+        scans = [step for step in plan if FULL_SCAN.search(step)]
+        assert not scans, f"{name} falls back to a full scan:\n{statement}\n" + "\n".join(plan)
+
+    steps = [step for _statement, plan in plans for step in plan]
+    for index in expected_indexes:
+        assert any(index in step for step in steps), f"{name} never uses {index}:\n" + "\n".join(steps)
@@ -0,0 +1,139 @@
+from datetime import date
+
+import pytest
+
+from models.database import (
+    db,
+    BlueCollarStats,
+    Game,
+    OpponentBlueCollarStats,
+    PlayerStats,
+    RecordDefinition,
+    RecordEntry,
+    Roster,
+    Season,
+    TeamStats,
+)
+from utils.records.batch import build_candidates_frame, evaluate_candidates_frame
+from utils.records.candidate_builder import build_game_candidates
+from utils.records.evaluator import evaluate_candidates
+
+DEFINITIONS = [
+    ("Team points", "TEAM", "team.total_points", None, None),
+    ("Team FTM", "TEAM", "team.total_ftm", "team.total_fta", 10),
+    ("Opp points", "OPPONENT", "opp.total_points", None, None),
+    ("Player points", "PLAYER", "player.points", None, None),
+    ("Player FTM", "PLAYER", "player.ftm", "player.fta", 4),
+    ("Team steals", "TEAM", "bc.team.steal", None, None),
+    ("Player deflections", "PLAYER", "bc.player.deflection", None, None),
+    ("Opp rebounds", "OPPONENT", "bc.team.def_reb", None, None),
+    ("Unmapped", "TEAM", "team.not_a_stat", None, None),
+]
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        _seed()
+        yield app
+
+
+def _seed():
+    db.session.add(Season(id=1, season_name="2024-25", start_date=date(2024, 6, 1)))
+    db.session.add_all([Roster(id=1, season_id=1, player_name="#1 Ann"),
+                        Roster(id=2, season_id=1, player_name="#2 Bea")])
+    for game_id, scale in ((1, 1), (2, 2), (3, 3)):
+        db.session.add(Game(id=game_id, season_id=1, game_date=date(2024, 11, game_id),
+                            opponent_name=f"Opp {game_id}"))
+        db.session.add(TeamStats(game_id=game_id, season_id=1, total_points=60 + 5 * scale,
+                                 total_ftm=4 * scale, total_fta=6 * scale, is_opponent=False))
+        db.session.add(TeamStats(game_id=game_id, season_id=1, total_points=70 - scale, is_opponent=True))
+        db.session.add_all([
+            PlayerStats(game_id=game_id, season_id=1, player_name="#1 Ann", points=10 * scale, ftm=scale, fta=2 * scale),
+            PlayerStats(game_id=game_id, season_id=1, player_name="#2 Bea ", points=12, ftm=None, fta=5),
+            PlayerStats(game_id=game_id, season_id=1, player_name="#9 Walk-on", points=40),
+        ])
+        db.session.add_all([
+            BlueCollarStats(game_id=game_id, season_id=1, player_id=1, steal=scale, deflection=2),
+            BlueCollarStats(game_id=game_id, season_id=1, player_id=2, steal=1, deflection=scale),
+        ])
+        if game_id != 2:
+            db.session.add(BlueCollarStats(game_id=game_id, season_id=1, player_id=None, steal=9))
+            db.session.add(OpponentBlueCollarStats(game_id=game_id, season_id=1, def_reb=20 + scale))
+    for name, entity, stat_key, qualifier, threshold in DEFINITIONS:
+        db.session.add(RecordDefinition(name=name, category="Game", entity_type=entity, scope="GAME",
+                                        stat_key=stat_key, qualifier_stat_key=qualifier,
+                                        qualifier_threshold_override=threshold))
+    db.session.flush()
+    team_points = RecordDefinition.query.filter_by(stat_key="team.total_points").one()
+    db.session.add(RecordEntry(record_definition_id=team_points.id, holder_entity_type="TEAM", value=90,
+                               scope="GAME", source_type="MANUAL", is_current=False, is_forced_current=True))
+    db.session.commit()
+
+
+def _snapshot():
+    return sorted((
+        (e.auto_key, e.record_definition_id, e.holder_entity_type, e.holder_player_id,
+         e.holder_opponent_name, e.value, e.game_id, e.occurred_on, e.is_current, e.source_type)
+        for e in RecordEntry.query.all()
+    ), key=repr)
+
+
+def _run_per_game(definitions):
+    candidates = {}
+    for game_id in (1, 2, 3):
+        candidates[game_id] = build_game_candidates(game_id, definitions=definitions)
+        evaluate_candidates(game_id, candidates[game_id], definitions=definitions)
+        db.session.commit()
+    return candidates
+
+
+def test_candidates_frame_matches_per_game_builder(seeded):
+    definitions = RecordDefinition.query.order_by(RecordDefinition.id).all()
+    expected = [c for game_id in (1, 2, 3) for c in build_game_candidates(game_id, definitions=definitions)]
+    frame = build_candidates_frame([1, 2, 3], definitions)
+    assert frame.to_dict("records") == expected
+
+
+def test_batch_recompute_matches_per_game_loop(seeded):
+    definitions = RecordDefinition.query.order_by(RecordDefinition.id).all()
+    _run_per_game(definitions)
+    expected = _snapshot()
+
+    RecordEntry.query.filter(RecordEntry.source_type == "AUTO").delete()
+    db.session.commit()
+    stats = {}
+    evaluate_candidates_frame(build_candidates_frame([1, 2, 3], definitions), definitions, stats=stats)
+    db.session.commit()
+    assert _snapshot() == expected
+    assert stats["auto_updated"] == 0
+    assert sum(row["created"] for row in stats["per_game"].values()) == stats["auto_created"]
+
+    # A second pass only updates, and leaves current holders where they are.
+    stats = {}
+    evaluate_candidates_frame(build_candidates_frame([1, 2, 3], definitions), definitions, stats=stats)
+    db.session.commit()
+    assert _snapshot() == expected
+    assert stats["auto_created"] == 0
+    assert stats["definitions_with_current_changes"] == 0
+
+
+def test_forced_entry_stays_current(seeded):
+    definitions = RecordDefinition.query.all()
+    evaluate_candidates_frame(build_candidates_frame([1, 2, 3], definitions), definitions)
+    db.session.commit()
+    team_points = RecordDefinition.query.filter_by(stat_key="team.total_points").one()
+    current = RecordEntry.query.filter_by(record_definition_id=team_points.id, is_current=True).all()
+    assert [entry.source_type for entry in current] == ["MANUAL"]
+
+
+def test_recompute_route_batch_dry_run(seeded, client):
+    response = client.post("/admin/records/recompute", data={
+        "start_date": "2024-11-01",
+        "end_date": "2024-11-30",
+        "dry_run": "on",
+        "batch_mode": "on",
+    })
+    assert response.status_code == 200
+    assert b"Batch mode: Yes" in response.data
+    assert RecordEntry.query.filter_by(source_type="AUTO").count() == 0
@@ -0,0 +1,72 @@
+import pytest
+
+from models.database import db, PlayerStats, RecordDefinition, RecordEntry, TeamStats
+from test_records_batch import _run_per_game, _seed, _snapshot
+from utils.records import current_max
+from utils.records.incremental import evaluate_game_records
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        _seed()
+        yield app
+
+
+def _ingest(*game_ids):
+    for game_id in game_ids:
+        evaluate_game_records(game_id)
+        db.session.commit()
+
+
+def test_incremental_ingest_matches_per_game_loop(seeded):
+    definitions = RecordDefinition.query.filter_by(is_active=True).order_by(RecordDefinition.id).all()
+    _run_per_game(definitions)
+    expected = _snapshot()
+
+    RecordEntry.query.filter(RecordEntry.source_type == "AUTO").delete()
+    db.session.commit()
+    current_max.invalidate_current_max()
+    _ingest(2, 1, 3)
+    assert _snapshot() == expected
+
+
+def test_cached_maxima_skip_the_entry_scan(seeded, monkeypatch):
+    _ingest(1, 2)
+    seeded_ids = []
+    real_seed = current_max._seed
+    monkeypatch.setattr(current_max, "_seed", lambda ids: seeded_ids.extend(ids) or real_seed(ids))
+    _ingest(3)
+    assert seeded_ids == []
+
+    points = RecordDefinition.query.filter_by(stat_key="player.points").one()
+    assert current_max.load_current_max([points.id])[points.id] == {"max": 30.0, "forced": False}
+
+
+def test_reparse_lowering_the_holder_rescans(seeded):
+    _ingest(1, 2, 3)
+    points = RecordDefinition.query.filter_by(stat_key="player.points").one()
+    stat = PlayerStats.query.filter_by(game_id=3, player_name="#1 Ann").one()
+    stat.points = 5
+    db.session.commit()
+    _ingest(3)
+
+    current = RecordEntry.query.filter_by(record_definition_id=points.id, is_current=True).all()
+    assert [(entry.game_id, entry.value) for entry in current] == [(2, 20.0)]
+    assert current_max.load_current_max([points.id])[points.id]["max"] == 20.0
+
+
+def test_new_best_demotes_previous_holder(seeded):
+    _ingest(1, 2)
+    team = TeamStats.query.filter_by(game_id=3, is_opponent=False).one()
+    team.total_ftm = 1
+    team.total_fta = 20
+    opponent_points = RecordDefinition.query.filter_by(stat_key="opp.total_points").one()
+    db.session.commit()
+    _ingest(3)
+    current = RecordEntry.query.filter_by(record_definition_id=opponent_points.id, is_current=True).all()
+    assert [entry.game_id for entry in current] == [1]
+
+    team_ftm = RecordDefinition.query.filter_by(stat_key="team.total_ftm").one()
+    current = RecordEntry.query.filter_by(record_definition_id=team_ftm.id, is_current=True).all()
+    assert [entry.game_id for entry in current] == [2]
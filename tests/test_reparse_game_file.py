@@ -81,7 +81,7 @@ def test_reparse_game(client, app, monkeypatch):
 
     call_count = {'value': 0}
 
-    def fake_parse_csv(file_path, game_id, season_id):
+    def fake_parse_csv(file_path, game_id, season_id, app=None):
         call_count['value'] += 1
         filename = os.path.basename(file_path)
         game = Game.query.filter_by(csv_filename=filename).first()
@@ -124,6 +124,12 @@ def test_reparse_game(client, app, monkeypatch):
         game = Game.query.filter_by(csv_filename='game.csv').one()
         first_game_id = game.id
 
+    # Unchanged contents and parser version: nothing to do.
+    resp = client.post('/admin/reparse/1')
+    assert resp.status_code == 302
+    assert call_count['value'] == 1
+
+    csv_path.write_text('Row\nOffense\n')
     resp = client.post('/admin/reparse/1')
     assert resp.status_code == 302
 
@@ -5,7 +5,7 @@ from flask_login import LoginManager
 from werkzeug.security import generate_password_hash
 from pathlib import Path
 
-from models.database import db, Season, Roster, UploadedFile, Possession, PlayerPossession
+from models.database import db, Season, Roster, UploadedFile, Possession, PlayerPossession, PlayerStats
 from models.user import User
 from admin.routes import admin_bp
 
@@ -71,3 +71,59 @@ def test_reparse_practice(client, app):
     with app.app_context():
         assert Possession.query.count() == 2
         assert PlayerPossession.query.count() == 2
+
+
+def test_parser_version_bump_rewrites_only_changed_tables(client, app):
+    from utils.bulk_persist import PARSER_VERSION
+
+    csv_path = Path(app.config['UPLOAD_FOLDER']) / 'p.csv'
+    csv_content = 'Row,CRIMSON PLAYER POSSESSIONS,WHITE PLAYER POSSESSIONS,#1 A,#2 B\n'
+    csv_content += 'Crimson,"#1 A","#2 B",2FG+,\n'
+    csv_path.write_text(csv_content)
+    client.post('/admin/parse/1')
+
+    with app.app_context():
+        upload = db.session.get(UploadedFile, 1)
+        assert upload.parser_version == PARSER_VERSION
+        assert upload.content_hash
+        possession_ids = sorted(p.id for p in Possession.query.all())
+        stat = PlayerStats.query.filter_by(player_name='#1 A').one()
+        expected_points = stat.points
+        # Simulate rows written by an older parser: stale stats, same possessions.
+        stat.points = expected_points + 40
+        upload.parser_version = 'old'
+        db.session.commit()
+
+    client.post('/admin/reparse/1')
+
+    with app.app_context():
+        upload = db.session.get(UploadedFile, 1)
+        assert upload.parser_version == PARSER_VERSION
+        assert sorted(p.id for p in Possession.query.all()) == possession_ids
+        assert PlayerPossession.query.count() == 2
+        assert PlayerStats.query.filter_by(player_name='#1 A').one().points == expected_points
+
+
+def test_roster_edit_or_force_defeats_the_unchanged_skip(client, app):
+    from utils.reparse_uploaded_file import reparse_uploaded_file
+
+    csv_path = Path(app.config['UPLOAD_FOLDER']) / 'p.csv'
+    csv_content = 'Row,CRIMSON PLAYER POSSESSIONS,WHITE PLAYER POSSESSIONS,#1 A,#2 B\n'
+    csv_content += 'Crimson,"#1 A","#2 B",2FG+,\n'
+    csv_path.write_text(csv_content)
+    client.post('/admin/parse/1')
+
+    with app.app_context():
+        upload = db.session.get(UploadedFile, 1)
+        assert upload.roster_fingerprint
+        assert reparse_uploaded_file(upload) == {"skipped": True}
+
+        db.session.add(Roster(season_id=1, player_name='#3 C'))
+        db.session.commit()
+        assert reparse_uploaded_file(upload) != {"skipped": True}
+        assert reparse_uploaded_file(upload) == {"skipped": True}
+        parsed_at = upload.last_parsed
+
+    client.post('/admin/reparse/1', data={'force': '1'})
+    with app.app_context():
+        assert db.session.get(UploadedFile, 1).last_parsed > parsed_at
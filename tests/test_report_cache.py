@@ -0,0 +1,116 @@
+from datetime import date
+
+import pytest
+from flask import Flask
+
+from models.database import db, Season, Game, Possession
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from services.report_cache import DiskTier, ReportCache, get_report_cache
+from services.reports import (
+    cache_get_or_compute_adv_poss_game,
+    invalidate_adv_poss_game,
+    invalidate_adv_poss_season,
+    invalidate_playcall_report_season,
+)
+from services.reports import playcall as playcall_service
+
+
+def test_lru_bounds_and_versions(tmp_path):
+    cache = ReportCache(max_entries=2)
+    cache.set("a", 1, version="v1")
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a", "v1") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+    cache.set("c", 4, version="v2")
+    assert cache.get("c") is None
+    assert cache.get("c", "v2") == 4
+    assert cache.stats()["memory_hits"] == 2
+
+
+def test_disk_tier_is_shared_and_tag_invalidated(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    writer = ReportCache(DiskTier(path))
+    reader = ReportCache(DiskTier(path))
+
+    writer.set("adv:1", {"x": 1}, version="3", tags=("game:1", "season:1"))
+    writer.set("adv:2", {"x": 2}, version="3", tags=("game:2", "season:1"))
+    assert reader.get("adv:1", "3") == {"x": 1}
+    assert reader.get("adv:1", "3") == {"x": 1}
+    assert reader.stats()["disk_hits"] == 1
+    assert reader.stats()["memory_hits"] == 1
+
+    assert writer.invalidate_tags("season:1") == 2
+    assert writer.get("adv:2", "3") is None
+    assert ReportCache(DiskTier(path)).get("adv:1", "3") is None
+
+
+def test_disk_hit_keeps_tags_in_memory(tmp_path):
+    cache = ReportCache(DiskTier(str(tmp_path / "cache.sqlite")))
+    cache.set("adv:1", {"x": 1}, version="3", tags=("season:1",))
+    cache._entries.clear()
+
+    assert cache.get("adv:1", "3") == {"x": 1}
+    assert cache.stats()["disk_hits"] == 1
+    cache.invalidate_tags("season:1")
+    assert cache.get("adv:1", "3") is None
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'app.db'}"
+    app.config["REPORT_CACHE_DIR"] = str(tmp_path)
+    app.config["REPORT_CACHE_DISK"] = True
+    app.config["GAME_FRAME_DIR"] = str(tmp_path / "frames")
+    app.config["UPLOAD_FOLDER"] = str(tmp_path)
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2024-25", start_date=date(2024, 6, 1)))
+        db.session.add(Game(id=1, season_id=1, game_date=date(2024, 11, 4), opponent_name="A",
+                            csv_filename="game1.csv"))
+        db.session.add(Possession(id=1, season_id=1, game_id=1, possession_side="Offense",
+                                  points_scored=2, paint_touches="1"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_adv_poss_cache_keys_on_possessions(app):
+    cache = get_report_cache()
+    assert cache.disk is not None
+
+    first, meta = cache_get_or_compute_adv_poss_game(1)
+    assert meta["source"] == "compute"
+    _, meta = cache_get_or_compute_adv_poss_game(1)
+    assert meta["source"] == "cache"
+
+    db.session.add(Possession(id=2, season_id=1, game_id=1, possession_side="Offense", points_scored=3))
+    db.session.commit()
+    second, meta = cache_get_or_compute_adv_poss_game(1)
+    assert meta["source"] == "compute"
+    assert second != first
+
+    invalidate_adv_poss_game(1)
+    assert cache_get_or_compute_adv_poss_game(1)[1]["source"] == "compute"
+
+    invalidate_adv_poss_season(1)
+    assert cache_get_or_compute_adv_poss_game(1)[1]["source"] == "compute"
+
+
+def test_playcall_cache_follows_csv_and_season_tag(app, tmp_path):
+    csv_path = tmp_path / "game1.csv"
+    csv_path.write_text("Row,PLAYCALL\nOffense,Horns\n")
+    playcall_service.cache_get_or_compute_playcall_report(1)
+    assert playcall_service.cache_get_or_compute_playcall_report(1)[1]["source"] == "cache"
+
+    invalidate_playcall_report_season(1)
+    assert playcall_service.cache_get_or_compute_playcall_report(1)[1]["source"] == "compute"
+
+    csv_path.write_text("Row,PLAYCALL\nOffense,Horns\nOffense,Zone\n")
+    assert playcall_service.cache_get_or_compute_playcall_report(1)[1]["source"] == "compute"
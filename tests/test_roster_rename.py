@@ -15,6 +15,7 @@ from models.database import (
     PlayerDevelopmentPlan,
     SkillEntry,
 )
+from services.stat_rollups import ensure_season_rollups, rollup_sum_query
 from models.user import User
 
 
@@ -120,3 +121,15 @@ def test_roster_rename_propagates_to_related_tables(client, app):
         skill_entry = SkillEntry.query.filter_by(player_id=1).one()
         assert skill_entry.player_id == 1
         assert skill_entry.player.player_name == 'New Name'
+
+
+def test_roster_rename_moves_rollup_rows(client, app):
+    with app.app_context():
+        ensure_season_rollups(1)
+
+    client.post('/admin/roster/1/rename', data={'new_name': 'New Name'})
+
+    with app.app_context():
+        totals = {row.player: row.points for row in rollup_sum_query(1, ['points'])}
+        assert totals == {'New Name': 5}
+        assert ensure_season_rollups(1) is False
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from models.database import db, Roster, Season
+from utils.roster_resolver import RosterResolver, name_variants
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            Season(id=1, season_name="2025", start_date=date(2025, 11, 1)),
+            Season(id=2, season_name="2026", start_date=date(2026, 11, 1)),
+        ])
+        db.session.add_all([
+            Roster(id=10, season_id=1, player_name="#1 Jane Doe"),
+            Roster(id=11, season_id=1, player_name="Ann Lee"),
+            Roster(id=12, season_id=2, player_name="#1 Jane Doe"),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_name_variants():
+    assert name_variants(" #12 Jane Doe ") == ["#12 Jane Doe", "12 Jane Doe", "Jane Doe"]
+    assert name_variants("#5") == ["#5", "5"]
+    assert name_variants("") == []
+
+
+def test_resolver_loads_the_season_once(app):
+    statements = []
+
+    def _count(*args):
+        statements.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        roster = RosterResolver(1)
+        assert roster.id_for(" #1 Jane Doe ") == 10
+        assert roster.id_for("Jane Doe") is None
+        assert roster.id_for(float("nan")) is None
+        assert roster.resolve("#11 Ann Lee") == 11
+        assert roster.resolve("#1 Jane Doe") == 10
+        assert roster.resolve("#2 Nobody") is None
+        assert roster.name_for(11) == "Ann Lee"
+        assert roster.name_for(12) is None
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 1
@@ -0,0 +1,143 @@
+import json
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import event, func
+
+from models.database import db, Game, Practice, PlayerStats, PlayerStatsRollup, Season
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from services.leaderboard_game import _aggregate_rollups, _aggregate_rows, _base_game_query, _apply_date_window
+from services.stat_rollups import (
+    SUM_FIELDS,
+    ensure_season_rollups,
+    refresh_game_rollups,
+    rollup_sum_query,
+    verify_season_rollups,
+)
+
+
+def _shots(*specs):
+    return json.dumps([
+        {"shot_class": "3fg", "result": result, "3fg_shrink": shrink, "3fg_contest": contest}
+        for result, shrink, contest in specs
+    ])
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2024-25", start_date=date(2024, 6, 1)))
+        db.session.add_all([
+            Game(id=1, season_id=1, game_date=date(2024, 11, 4), opponent_name="A"),
+            Game(id=2, season_id=1, game_date=date(2024, 11, 9), opponent_name="B"),
+            Game(id=3, season_id=1, game_date=date(2024, 12, 1), opponent_name="C"),
+            Practice(id=1, season_id=1, date=date(2024, 11, 9), category="Official Practice"),
+        ])
+        db.session.add_all([
+            PlayerStats(season_id=1, game_id=1, player_name="#1 A", jersey_number=1,
+                        points=10, fg3_makes=2, fg3_attempts=5, crash_positive=1,
+                        shot_type_details=_shots(("made", "Shrink", "Contest"), ("miss", "Non-Shrink", "Late"))),
+            PlayerStats(season_id=1, game_id=2, player_name="#1 A", jersey_number=1,
+                        points=7, fg3_makes=1, fg3_attempts=2, box_out_positive=3,
+                        shot_type_details=_shots(("made", "Shrink", "No Contest"))),
+            PlayerStats(season_id=1, game_id=3, player_name="#2 B", points=4, atr_makes=2, atr_attempts=3),
+            PlayerStats(season_id=1, practice_id=1, player_name="#1 A", points=20, sprint_wins=2),
+        ])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _raw_sums(start=None, end=None):
+    query = (
+        db.session.query(PlayerStats.player_name, *[func.coalesce(func.sum(getattr(PlayerStats, f)), 0) for f in SUM_FIELDS])
+        .outerjoin(Game, PlayerStats.game_id == Game.id)
+        .outerjoin(Practice, PlayerStats.practice_id == Practice.id)
+        .filter(PlayerStats.season_id == 1)
+    )
+    session_date = func.coalesce(Game.game_date, Practice.date)
+    if start:
+        query = query.filter(session_date >= start)
+    if end:
+        query = query.filter(session_date <= end)
+    return {row[0]: tuple(row[1:]) for row in query.group_by(PlayerStats.player_name)}
+
+
+@pytest.mark.parametrize("window", [(None, None), (date(2024, 11, 5), None), (date(2024, 11, 9), date(2024, 11, 30))])
+def test_rollup_sums_match_raw_rows(app, window):
+    assert ensure_season_rollups(1) is True
+
+    start, end = window
+    rolled = {
+        row.player: tuple(getattr(row, f) for f in SUM_FIELDS)
+        for row in rollup_sum_query(1, SUM_FIELDS, start_date=start, end_date=end)
+    }
+    assert rolled == _raw_sums(start, end)
+
+
+def test_game_leaderboard_rollups_match_raw_aggregation(app):
+    start, end = date(2024, 11, 1), date(2024, 11, 30)
+    raw = _aggregate_rows(_apply_date_window(_base_game_query(1), start, end).all())
+    assert _aggregate_rollups(1, start, end) == raw
+    assert raw["#1 A"]["fg3_shrink_att"] == 2
+    assert raw["#1 A"]["fg3_contested_att"] == 1
+
+
+def test_refresh_and_self_heal(app):
+    ensure_season_rollups(1)
+    assert ensure_season_rollups(1) is False
+
+    db.session.add(PlayerStats(season_id=1, game_id=2, player_name="#2 B", box_out_positive=5))
+    db.session.flush()
+    refresh_game_rollups(2)
+    db.session.commit()
+    assert ensure_season_rollups(1) is False
+    totals = {row.player: row.box_out_positive for row in rollup_sum_query(1, ["box_out_positive"], source="game")}
+    assert totals["#2 B"] == 5
+
+    # A write path that skips the refresh is caught by the self-heal check.
+    PlayerStats.query.filter_by(game_id=1).delete()
+    db.session.commit()
+    assert ensure_season_rollups(1) is True
+    assert PlayerStatsRollup.query.filter_by(source="game", session_date=date(2024, 11, 4)).count() == 0
+
+
+def test_read_check_only_reads_the_watermark(app):
+    ensure_season_rollups(1)
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        assert ensure_season_rollups(1) is False
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+    raw_reads = [sql for sql in statements if "FROM player_stats " in sql or sql.rstrip().endswith("FROM player_stats")]
+    assert raw_reads and not any("GROUP BY" in sql for sql in raw_reads)
+
+
+def test_verify_catches_in_place_edits(app):
+    ensure_season_rollups(1)
+
+    # Same rows, different owner and values: the watermark cannot notice.
+    PlayerStats.query.filter_by(player_name="#2 B").update(
+        {PlayerStats.player_name: "#2 New", PlayerStats.atr_makes: 3}, synchronize_session=False
+    )
+    db.session.commit()
+    assert ensure_season_rollups(1) is False
+
+    assert verify_season_rollups() == [1]
+    totals = {row.player: (row.points, row.atr_makes) for row in rollup_sum_query(1, ["points", "atr_makes"])}
+    assert totals.get("#2 New") == (4, 3)
+    assert "#2 B" not in totals
+    assert verify_season_rollups([1]) == []
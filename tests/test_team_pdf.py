@@ -0,0 +1,105 @@
+from datetime import date
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from flask import Flask
+
+from models.database import db, Season, Game, GameTypeTag, Roster, PlayerStats
+from models.user import User  # noqa: F401  (page_view.user_id FK target)
+from test_parse import parse_game_dataframe, persist_game_rows
+from utils.bulk_persist import ingest_transaction
+from app.routes import pdf_routes
+from app.utils import team_pdf
+from app.utils.pdf_data_compiler import compile_player_shot_data, compile_team_shot_data
+
+SAMPLE_CSV = sorted((Path(__file__).resolve().parent.parent / "sample_game_csv").glob("*.csv"))[0]
+
+pytestmark = pytest.mark.skipif(team_pdf.PdfWriter is None, reason="pypdf/PyPDF2 not installed")
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config["TESTING"] = True
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Season(id=1, season_name="2025-26", start_date=date(2025, 6, 1)))
+        db.session.add(Game(id=1, season_id=1, game_date=date(2025, 11, 3), opponent_name="Opp"))
+        db.session.add(GameTypeTag(game_id=1, tag="Non-Conference"))
+        df = pd.read_csv(SAMPLE_CSV)
+        players = [c for c in df.columns if str(c).startswith("#")][:3]
+        db.session.add_all(Roster(season_id=1, player_name=name) for name in players)
+        db.session.commit()
+        with ingest_transaction():
+            persist_game_rows(parse_game_dataframe(df, 1, 1), 1, 1)
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _page_count(pdf_bytes):
+    return len(team_pdf.PdfReader(BytesIO(pdf_bytes)).pages)
+
+
+def test_team_prefetch_matches_per_player_compile(app):
+    players = Roster.query.order_by(Roster.id).all()
+    compiled = compile_team_shot_data(players, db.session)
+    assert [payload for _, payload in compiled] == [compile_player_shot_data(p, db.session) for p in players]
+    assert any(payload["shot_type_totals"].atr.attempts for _, payload in compiled)
+
+
+def test_team_book_reuses_unchanged_players(app):
+    players = Roster.query.order_by(Roster.id).all()
+    pdf_bytes, counts = team_pdf.render_team_pdf(compile_team_shot_data(players, db.session), workers=1)
+    assert counts == {"rendered": 3, "cached": 0}
+    first_pages = _page_count(pdf_bytes)
+    assert first_pages == 3 * 4
+
+    _, counts = team_pdf.render_team_pdf(compile_team_shot_data(players, db.session), workers=1)
+    assert counts == {"rendered": 0, "cached": 3}
+
+    stat = PlayerStats.query.filter_by(player_name=players[0].player_name).first()
+    stat.ftm = (stat.ftm or 0) + 1
+    stat.fta = (stat.fta or 0) + 1
+    db.session.commit()
+    pdf_bytes, counts = team_pdf.render_team_pdf(compile_team_shot_data(players, db.session), workers=1)
+    assert counts == {"rendered": 1, "cached": 2}
+    assert _page_count(pdf_bytes) == first_pages
+
+
+def test_team_route_renders_only_the_current_seasons_roster(app, monkeypatch):
+    app.register_blueprint(pdf_routes.pdf_bp)
+    db.session.add(Season(id=2, season_name="2024-25", start_date=date(2024, 6, 1)))
+    db.session.add_all(Roster(season_id=2, player_name=f"#{n} Old") for n in (90, 91))
+    db.session.commit()
+    seen = []
+
+    def record_compile(players, session):
+        seen.append(sorted(p.season_id for p in players))
+        return compile_team_shot_data(players, session)
+
+    monkeypatch.setattr(pdf_routes, "compile_team_shot_data", record_compile)
+    client = app.test_client()
+    response = client.get("/pdf/team/generate")
+    assert response.status_code == 200
+    assert _page_count(response.data) == 3 * 4
+    assert client.get("/pdf/team/generate?season_id=2").status_code == 200
+    assert seen == [[1, 1, 1], [2, 2]]
+
+
+def test_process_pool_matches_inline_render(app):
+    compiled = compile_team_shot_data(Roster.query.order_by(Roster.id).all(), db.session)
+    payloads = [payload for _, payload in compiled[:2]]
+    pooled = team_pdf._render_all(payloads, workers=2)
+    inline = team_pdf._render_all(payloads, workers=1)
+    assert [_page_count(chunk) for chunk in pooled] == [_page_count(chunk) for chunk in inline]
+
+
+def test_single_canvas_fallback_has_every_page(app):
+    compiled = compile_team_shot_data(Roster.query.order_by(Roster.id).all(), db.session)
+    book = team_pdf._build_single_document([payload for _, payload in compiled])
+    assert _page_count(book) == 4 * len(compiled)
@@ -0,0 +1,329 @@
+"""Bulk persistence stage shared by the game and practice CSV parsers.
+
+Parsers gather every row for a file into an :class:`IngestBatch` and write it
+with one executemany per table inside :func:`ingest_transaction`, so a failed
+ingest leaves nothing behind.
+
+A reparse whose CSV is unchanged but whose parser version moved on runs the
+parser inside :func:`replace_changed_only`. :meth:`IngestBatch.write` then
+compares each table family (see ``FAMILIES``) with the rows already stored for
+that game or practice and only deletes and rewrites the families that differ.
+"""
+
+import math
+from collections import Counter, defaultdict
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import delete, insert, select
+
+from models.database import (
+    db,
+    PlayerStats,
+    PlayerShotDetail,
+    PlayerShotLabel,
+    PlayerStatsLabel,
+    TeamStats,
+    BlueCollarStats,
+    OpponentBlueCollarStats,
+    Possession,
+    PlayerPossession,
+    ShotDetail,
+)
+from utils.lineup import invalidate_lineup_partials
+from utils.possession_index import invalidate_possession_index
+from utils.shottype import normalize_shot_detail, player_stats_labels
+
+
+# Parents before children so foreign keys always point at written rows.
+WRITE_ORDER = (
+    PlayerStats,
+    PlayerStatsLabel,
+    PlayerShotDetail,
+    PlayerShotLabel,
+    TeamStats,
+    BlueCollarStats,
+    OpponentBlueCollarStats,
+    Possession,
+    PlayerPossession,
+    ShotDetail,
+)
+
+# Tables a reparse rewrites, each with the tables hanging off it:
+# (model, ((child, foreign key column, grandchildren), ...)).
+FAMILIES = (
+    (PlayerStats, (
+        (PlayerStatsLabel, "player_stats_id", ()),
+        (PlayerShotDetail, "player_stats_id", (
+            (PlayerShotLabel, "shot_detail_id", ()),
+        )),
+    )),
+    (TeamStats, ()),
+    (BlueCollarStats, ()),
+    (OpponentBlueCollarStats, ()),
+    (Possession, (
+        (PlayerPossession, "possession_id", ()),
+        (ShotDetail, "possession_id", ()),
+    )),
+)
+
+# Bump whenever a parser change alters the rows written for the same CSV, so
+# reparse stops skipping files parsed by the older code.
+PARSER_VERSION = "2026.10.1"
+
+_replace_scope = ContextVar("ingest_replace_scope", default=None)
+
+
+@contextmanager
+def replace_changed_only(**scope):
+    """Make :meth:`IngestBatch.write` diff against the rows stored for ``scope``.
+
+    ``scope`` is ``game_id=...`` or ``practice_id=...``. Parsers must not
+    delete the session's existing rows themselves while this is active.
+    """
+    token = _replace_scope.set(scope)
+    try:
+        yield
+    finally:
+        _replace_scope.reset(token)
+
+
+def replace_scope():
+    """The active :func:`replace_changed_only` scope, or ``None``."""
+    return _replace_scope.get()
+
+
+def _parent_links(families=FAMILIES):
+    """``child model -> (parent model, foreign key column)`` from ``FAMILIES``."""
+    links = {}
+    for model, children in families:
+        for child, fk, grandchildren in children:
+            links[child] = (model, fk)
+            links.update(_parent_links(((child, grandchildren),)))
+    return links
+
+
+PARENT_LINKS = _parent_links()
+
+
+def bulk_insert(model, rows):
+    """Insert ``rows`` (dicts of column values) for ``model`` in one statement."""
+    if not rows:
+        return 0
+    db.session.execute(insert(model), rows)
+    return len(rows)
+
+
+def bulk_insert_returning_ids(model, rows):
+    """Insert ``rows`` for ``model`` and return the new ids in row order."""
+    if not rows:
+        return []
+    result = db.session.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True), rows
+    )
+    return list(result.scalars())
+
+
+@contextmanager
+def ingest_transaction():
+    """Commit everything written inside the block, or roll all of it back."""
+    try:
+        yield
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    invalidate_possession_index()
+    invalidate_lineup_partials()
+    # Imported lazily: services.correlation pulls in the app package.
+    from services.correlation import invalidate_correlation_frames
+
+    invalidate_correlation_frames()
+
+
+class IngestBatch:
+    """Rows gathered for one parsed file, keyed by model.
+
+    Parent rows (possessions, player stat rows, shot details) get a key that
+    is local to the batch so children can reference their parent without a
+    flush per row. :meth:`write` inserts each parent table with ``RETURNING``
+    and rewrites the children's foreign keys to the ids the database
+    assigned, so no id range is reserved while the file is being parsed and
+    concurrent writers cannot collide with it.
+    """
+
+    def __init__(self):
+        self.rows = defaultdict(list)
+        self._next_keys = defaultdict(lambda: 1)
+        self.unchanged = []
+
+    def add(self, model, **values):
+        """Queue one row for ``model`` and return its (mutable) value dict."""
+        self.rows[model].append(values)
+        return values
+
+    def add_with_id(self, model, **values):
+        """Queue a row for ``model`` under a batch-local ``id`` and return it."""
+        values["id"] = self._next_keys[model]
+        self._next_keys[model] += 1
+        return self.add(model, **values)
+
+    def add_possession(self, **values):
+        return self.add_with_id(Possession, **values)
+
+    def add_player_stats(self, shots=None, **values):
+        """Queue a ``PlayerStats`` row, its labels and one ``PlayerShotDetail`` per shot."""
+        stat = self.add_with_id(PlayerStats, **values)
+        shots = [shot for shot in shots or [] if isinstance(shot, Mapping)]
+        for label in player_stats_labels(shots, stat.get("stat_details")):
+            self.add(PlayerStatsLabel, player_stats_id=stat["id"], label=label)
+        for index, shot in enumerate(shots):
+            detail = normalize_shot_detail(shot)
+            labels = detail.pop("labels")
+            detail = self.add_with_id(
+                PlayerShotDetail,
+                player_stats_id=stat["id"],
+                season_id=stat["season_id"],
+                game_id=stat.get("game_id"),
+                practice_id=stat.get("practice_id"),
+                player_name=stat["player_name"],
+                shot_index=index,
+                **detail,
+            )
+            for label in labels:
+                self.add(PlayerShotLabel, shot_detail_id=detail["id"], label=label)
+        return stat
+
+    def add_possession_player(self, possession, player_id):
+        return self.add(PlayerPossession, possession_id=possession["id"], player_id=player_id)
+
+    def add_shot_detail(self, possession, event_type):
+        return self.add(ShotDetail, possession_id=possession["id"], event_type=event_type)
+
+    def count(self):
+        return sum(len(rows) for rows in self.rows.values())
+
+    def write(self):
+        """Insert every queued row, one executemany per table.
+
+        Inside :func:`replace_changed_only`, families that match the stored
+        rows are skipped (their parent tables are listed in
+        ``self.unchanged``) and the rest replace the stored rows.
+        """
+        skip = set()
+        scope = replace_scope()
+        if scope is not None:
+            for model, children in FAMILIES:
+                if self._family_keys(model, children) == _stored_family_keys(model, children, scope):
+                    skip.update(_family_models(model, children))
+                    self.unchanged.append(model.__tablename__)
+                else:
+                    _delete_family(model, children, scope)
+
+        written = {}
+        real_ids = {}
+        for model in WRITE_ORDER + tuple(m for m in self.rows if m not in WRITE_ORDER):
+            rows = self.rows.get(model)
+            if not rows or model in skip:
+                continue
+            link = PARENT_LINKS.get(model)
+            if link is not None:
+                parent_ids = real_ids.get(link[0], {})
+                rows = [{**row, link[1]: parent_ids.get(row[link[1]], row[link[1]])} for row in rows]
+            if model in self._next_keys:
+                ids = bulk_insert_returning_ids(model, [{k: v for k, v in row.items() if k != "id"} for row in rows])
+                real_ids[model] = {row["id"]: new_id for row, new_id in zip(rows, ids)}
+                written[model.__tablename__] = len(ids)
+            else:
+                written[model.__tablename__] = bulk_insert(model, rows)
+        return written
+
+    def _family_keys(self, model, children):
+        return _row_keys(model, self.rows.get(model, []), children,
+                         lambda child: self.rows.get(child, []))
+
+
+def _family_models(model, children):
+    models = [model]
+    for child, _fk, grandchildren in children:
+        models.extend(_family_models(child, grandchildren))
+    return models
+
+
+def _compared_columns(model, fk=None):
+    """(name, default) of the columns that identify a row's content."""
+    columns = []
+    for col in model.__table__.columns:
+        if col.primary_key or col.name == fk:
+            continue
+        default = col.default
+        if default is not None and not default.is_scalar:
+            continue
+        columns.append((col.name, default.arg if default is not None else None))
+    return columns
+
+
+def _plain(value):
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        value = value.item()  # numpy scalars
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _row_keys(model, rows, children, rows_of, fk=None):
+    """Multiset of ``rows`` by content, each key nesting its children's keys.
+
+    Ids and foreign keys are left out, so freshly numbered rows compare equal
+    to stored ones; missing values take the column default as on insert.
+    """
+    columns = _compared_columns(model, fk)
+    grouped = []
+    for child, child_fk, grandchildren in children:
+        by_parent = defaultdict(list)
+        for row in rows_of(child):
+            by_parent[row[child_fk]].append(row)
+        grouped.append((child, child_fk, grandchildren, by_parent))
+
+    keys = Counter()
+    for row in rows:
+        own = tuple(_plain(row.get(name, default)) for name, default in columns)
+        nested = tuple(
+            frozenset(_row_keys(child, by_parent.get(row["id"], []), grandchildren,
+                                rows_of, child_fk).items())
+            for child, child_fk, grandchildren, by_parent in grouped
+        )
+        keys[(own, nested)] += 1
+    return keys
+
+
+def _scope_filter(model, scope):
+    return [getattr(model, name) == value for name, value in scope.items()]
+
+
+def _stored_family_keys(model, children, scope):
+    stored = {}
+
+    def load(table_model, criteria, specs):
+        stored[table_model] = [
+            dict(row) for row in db.session.execute(select(table_model.__table__).where(*criteria)).mappings()
+        ]
+        ids = select(table_model.id).where(*criteria)
+        for child, fk, grandchildren in specs:
+            load(child, [getattr(child, fk).in_(ids)], grandchildren)
+
+    load(model, _scope_filter(model, scope), children)
+    return _row_keys(model, stored[model], children, lambda child: stored[child])
+
+
+def _delete_family(model, children, scope):
+    def remove(table_model, criteria, specs):
+        ids = select(table_model.id).where(*criteria)
+        for child, fk, grandchildren in specs:
+            remove(child, [getattr(child, fk).in_(ids)], grandchildren)
+        db.session.execute(
+            delete(table_model).where(*criteria).execution_options(synchronize_session=False)
+        )
+
+    remove(model, _scope_filter(model, scope), children)
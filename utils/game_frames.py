@@ -0,0 +1,147 @@
+"""Columnar snapshots of parsed game CSVs.
+
+Ingest stores each game's frame as one compressed ``.npz`` of per-column
+arrays (``<game_id>-<sha1>.npz``) under ``instance/game_frames`` so report
+code can load just the columns it needs instead of re-parsing the text CSV.
+Numeric columns keep their NumPy dtype; every other column is stored as
+integer codes into a small table of its distinct strings, which keeps a
+snapshot smaller than the CSV it came from. Loaded cells are text with
+missing values as ``""``, which is how the report parsers normalise cells
+anyway. The file hash in the name ties a snapshot to the exact CSV it came
+from; a snapshot whose hash no longer matches the upload is ignored and
+replaced.
+
+Snapshots are skipped for in-memory databases unless ``GAME_FRAME_DIR`` is set.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import logging
+import os
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from flask import current_app
+
+_LOGGER = logging.getLogger(__name__)
+_DIGESTS: Dict[str, Tuple[int, int, str]] = {}
+
+
+def snapshot_dir() -> Optional[str]:
+    try:
+        app = current_app._get_current_object()
+    except RuntimeError:
+        return None
+    directory = app.config.get("GAME_FRAME_DIR")
+    if directory:
+        return directory
+    uri = str(app.config.get("SQLALCHEMY_DATABASE_URI") or "")
+    if not uri or ":memory:" in uri or uri.rstrip("/") == "sqlite:":
+        return None
+    return os.path.join(app.instance_path, "game_frames")
+
+
+def file_digest(path: str) -> Optional[str]:
+    """SHA-1 of ``path``, recomputed only when its size or mtime changes."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cached = _DIGESTS.get(path)
+    if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    _DIGESTS[path] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def _snapshot_path(directory: str, game_id: int, digest: str) -> str:
+    return os.path.join(directory, f"{game_id}-{digest}.npz")
+
+
+def _to_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """``names`` plus ``n<i>`` (numeric) or ``c<i>``/``k<i>`` (codes/categories) per column."""
+    arrays: Dict[str, np.ndarray] = {"names": np.array([str(name) for name in df.columns])}
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf":
+            arrays[f"n{i}"] = series.to_numpy()
+            continue
+        text = ["" if pd.isna(v) else str(v) for v in series.tolist()]
+        codes, categories = pd.factorize(pd.Series(text, dtype=object), sort=False)
+        arrays[f"c{i}"] = codes.astype(np.min_scalar_type(max(len(categories) - 1, 0)))
+        arrays[f"k{i}"] = np.array(list(categories) or [""])
+    return arrays
+
+
+def _column_text(snapshot, i: int) -> np.ndarray:
+    if f"n{i}" in snapshot.files:
+        values = snapshot[f"n{i}"]
+        return np.array(["" if v != v else str(v) for v in values.tolist()], dtype=object)
+    return snapshot[f"k{i}"].astype(object)[snapshot[f"c{i}"]]
+
+
+def write_game_frame(game_id: int, df: pd.DataFrame, digest: Optional[str]) -> Optional[str]:
+    """Store ``df`` as the snapshot for ``game_id``; older snapshots are removed."""
+    directory = snapshot_dir()
+    if not directory or not digest or df is None:
+        return None
+    if len(set(map(str, df.columns))) != len(df.columns):
+        return None
+    path = _snapshot_path(directory, game_id, digest)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez_compressed(handle, **_to_arrays(df))
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        _LOGGER.exception("Failed to write game frame snapshot for game %s", game_id)
+        return None
+    # ``.npy`` files are snapshots in the older structured-array format.
+    for stale in glob.glob(os.path.join(directory, f"{game_id}-*.np[yz]")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return path
+
+
+def load_game_frame(
+    game_id: int,
+    digest: Optional[str],
+    columns: Optional[Callable[[str], bool]] = None,
+) -> Optional[pd.DataFrame]:
+    """Return the snapshot for ``game_id`` or ``None`` when absent/stale.
+
+    ``columns`` selects which fields to materialise; the arrays of unselected
+    fields are never read from the archive.
+    """
+    directory = snapshot_dir()
+    if not directory or not digest:
+        return None
+    path = _snapshot_path(directory, game_id, digest)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as snapshot:
+            names = [str(name) for name in snapshot["names"]]
+            data = {
+                name: _column_text(snapshot, i)
+                for i, name in enumerate(names)
+                if columns is None or columns(name)
+            }
+    except (OSError, ValueError, KeyError):
+        _LOGGER.exception("Ignoring unreadable game frame snapshot %s", path)
+        return None
+    return pd.DataFrame(data, columns=list(data))
+
+
+__all__ = ["file_digest", "load_game_frame", "snapshot_dir", "write_game_frame"]
@@ -5,14 +5,15 @@ from datetime import date, datetime
 from types import SimpleNamespace
 from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
-from sqlalchemy import case, func, or_, and_, select
+import numpy as np
+from sqlalchemy import func, or_, and_
 from sqlalchemy.orm import Query
 
 from models.database import (
-    db, PlayerStats, BlueCollarStats, Roster,
-    Possession, PlayerPossession, ShotDetail,
-    Game, Practice
+    db, PlayerStats, BlueCollarStats, Roster, Game, Practice
 )
+from utils.possession_index import get_possession_index
+from utils.shottype import player_stats_label_filter
 
 
 @dataclass
@@ -68,58 +69,6 @@ def _normalize_labels(labels: Optional[object]) -> Set[str]:
     }
 
 
-def _apply_possession_filters(
-    query: Query,
-    start_dt: Optional[date],
-    end_dt: Optional[date],
-    label_set: Set[str],
-    game_ids: Optional[Sequence[int]] = None,
-) -> Query:
-    normalized_game_ids = None
-    if game_ids is not None:
-        normalized_game_ids = []
-        for value in game_ids:
-            try:
-                parsed = int(value)
-            except (TypeError, ValueError):
-                continue
-            normalized_game_ids.append(parsed)
-        if not normalized_game_ids:
-            return query.filter(False)
-
-    if label_set:
-        clauses = [Possession.drill_labels.ilike(f"%{lbl}%") for lbl in label_set]
-        query = query.filter(or_(*clauses))
-    if normalized_game_ids is not None:
-        query = query.filter(Possession.game_id.in_(normalized_game_ids))
-    if start_dt or end_dt:
-        query = (
-            query.outerjoin(Game, Possession.game_id == Game.id)
-            .outerjoin(Practice, Possession.practice_id == Practice.id)
-        )
-        if start_dt:
-            query = query.filter(
-                or_(
-                    and_(Possession.game_id != None, Game.game_date >= start_dt),
-                    and_(
-                        Possession.practice_id != None,
-                        Practice.date >= start_dt,
-                    ),
-                )
-            )
-        if end_dt:
-            query = query.filter(
-                or_(
-                    and_(Possession.game_id != None, Game.game_date <= end_dt),
-                    and_(
-                        Possession.practice_id != None,
-                        Practice.date <= end_dt,
-                    ),
-                )
-            )
-    return query
-
-
 def _apply_playerstats_filters(
     query: Query,
     start_dt: Optional[date],
@@ -128,12 +77,7 @@ def _apply_playerstats_filters(
     game_ids: Optional[Sequence[int]] = None,
 ) -> Query:
     if label_set:
-        clauses = []
-        for lbl in label_set:
-            pattern = f"%{lbl}%"
-            clauses.append(PlayerStats.shot_type_details.ilike(pattern))
-            clauses.append(PlayerStats.stat_details.ilike(pattern))
-        query = query.filter(or_(*clauses))
+        query = query.filter(player_stats_label_filter(label_set))
     if game_ids is not None:
         normalized_game_ids: list[int] = []
         for value in game_ids:
@@ -173,35 +117,6 @@ def _apply_playerstats_filters(
     return query
 
 
-def _apply_side_filter(query: Query, side: str) -> Query:
-    normalized = (side or "").strip().lower()
-    if not normalized:
-        return query
-    if normalized in ("offense", "defense"):
-        return query.filter(
-            or_(
-                func.lower(Possession.possession_side) == normalized,
-                and_(
-                    or_(
-                        Possession.possession_side == None,
-                        func.trim(Possession.possession_side) == "",
-                    ),
-                    func.lower(Possession.time_segment) == normalized,
-                ),
-            )
-        )
-    return query.filter(func.lower(Possession.possession_side) == normalized)
-
-
-def _row_to_dict(row, keys: Tuple[str, ...]) -> Dict[str, float]:
-    if row is None:
-        return {key: 0 for key in keys}
-    mapping = getattr(row, "_mapping", None)
-    if mapping is None:  # pragma: no cover - compatibility with older SQLAlchemy
-        mapping = row._asdict()
-    return {key: (mapping.get(key) or 0) for key in keys}
-
-
 def _get_player_possession_totals(
     player_id: int,
     roster: Roster,
@@ -211,16 +126,9 @@ def _get_player_possession_totals(
     label_set: Set[str],
     game_ids: Optional[Sequence[int]] = None,
 ) -> Tuple[int, float]:
-    poss_q = _build_possession_id_query(
-        season_id=roster.season_id,
-        side=side,
-        start_dt=start_dt,
-        end_dt=end_dt,
-        label_set=label_set,
-        player_id=player_id,
-        game_ids=game_ids,
-    )
-    return _summarize_possessions(poss_q)
+    index = get_possession_index(roster.season_id)
+    mask = index.filter_mask(start_dt, end_dt, label_set, game_ids) & index.side_mask(side)
+    return index.summarize(mask & (index.player_counts(player_id) > 0))
 
 
 def _get_team_possession_totals(
@@ -231,111 +139,43 @@ def _get_team_possession_totals(
     label_set: Set[str],
     game_ids: Optional[Sequence[int]] = None,
 ) -> Tuple[int, float]:
-    poss_q = _build_possession_id_query(
-        season_id=season_id,
-        side=side,
-        start_dt=start_dt,
-        end_dt=end_dt,
-        label_set=label_set,
-        player_id=None,
-        game_ids=game_ids,
-    )
-    return _summarize_possessions(poss_q)
+    index = get_possession_index(season_id)
+    mask = index.filter_mask(start_dt, end_dt, label_set, game_ids) & index.side_mask(side)
+    return index.summarize(mask)
 
 
-def _build_possession_id_query(
-    *,
+def _get_possession_ids(
     season_id: int,
     side: str,
     start_dt: Optional[date],
     end_dt: Optional[date],
     label_set: Set[str],
-    player_id: Optional[int],
     game_ids: Optional[Sequence[int]] = None,
-) -> Query:
-    base = db.session.query(Possession.id).filter(Possession.season_id == season_id)
-    if player_id is not None:
-        base = base.join(PlayerPossession, PlayerPossession.possession_id == Possession.id)
-        base = base.filter(PlayerPossession.player_id == player_id)
-    base = _apply_side_filter(base, side)
-    base = _apply_possession_filters(base, start_dt, end_dt, label_set, game_ids)
-    return base.distinct()
-
-
-def _summarize_possessions(possession_query: Query) -> Tuple[int, float]:
-    """Return (possession_count, points_scored) for the provided possession ids.
-
-    This mirrors the game-report possession logic by removing neutral rows and
-    off-rebound extensions before counting possessions.
-    """
-
-    poss_subquery = possession_query.subquery()
-
-    event_counts = (
-        db.session.query(
-            ShotDetail.possession_id.label("pid"),
-            func.sum(case((ShotDetail.event_type.ilike("%Neutral%"), 1), else_=0)).label(
-                "neutral_hits"
-            ),
-            func.sum(case((ShotDetail.event_type == "TEAM Off Reb", 1), else_=0)).label(
-                "off_reb_hits"
-            ),
-        )
-        .filter(ShotDetail.possession_id.in_(select(poss_subquery.c.id)))
-        .group_by(ShotDetail.possession_id)
-        .subquery()
-    )
-
-    row = (
-        db.session.query(
-            func.count(poss_subquery.c.id).label("run_count"),
-            func.coalesce(
-                func.sum(case((event_counts.c.neutral_hits > 0, 1), else_=0)), 0
-            ).label("neutral_count"),
-            func.coalesce(
-                func.sum(case((event_counts.c.off_reb_hits > 0, 1), else_=0)), 0
-            ).label("off_reb_count"),
-            func.coalesce(func.sum(Possession.points_scored), 0).label("points"),
-        )
-        .select_from(poss_subquery)
-        .outerjoin(Possession, Possession.id == poss_subquery.c.id)
-        .outerjoin(event_counts, event_counts.c.pid == poss_subquery.c.id)
-        .one()
-    )
-
-    run_count = int(row.run_count or 0)
-    neutral_count = int(row.neutral_count or 0)
-    off_reb_count = int(row.off_reb_count or 0)
-    possessions = max(run_count - neutral_count - off_reb_count, 0)
-    return possessions, float(row.points or 0)
+) -> Tuple[List[int], List[int]]:
+    index = get_possession_index(season_id)
+    mask = index.filter_mask(start_dt, end_dt, label_set, game_ids) & index.side_mask(side)
+    practice_ids = [int(pid) for pid in np.unique(index.practice_ids[mask]) if pid > 0]
+    found_game_ids = [int(gid) for gid in np.unique(index.game_ids[mask]) if gid > 0]
+    return practice_ids, found_game_ids
 
 
-def _get_possession_ids(
-    season_id: int,
+def _player_event_totals(
+    player_id: int,
+    roster: Roster,
     side: str,
     start_dt: Optional[date],
     end_dt: Optional[date],
     label_set: Set[str],
     game_ids: Optional[Sequence[int]] = None,
-) -> Tuple[List[int], List[int]]:
-    q = db.session.query(Possession.practice_id, Possession.game_id).filter(
-        Possession.season_id == season_id,
-    )
-    q = _apply_side_filter(q, side)
-    q = _apply_possession_filters(q, start_dt, end_dt, label_set, game_ids)
-    rows = q.distinct().all()
-    practice_ids = [pid for pid, gid in rows if pid]
-    found_game_ids = [gid for pid, gid in rows if gid]
-    return practice_ids, found_game_ids
+) -> Dict[str, int]:
+    """Event counts over ``side`` possessions with the player on the floor.
 
-
-_OFFENSE_EVENT_COLUMNS: Tuple[str, ...] = (
-    "turnovers_on",
-    "off_reb_on",
-    "team_off_reb_on",
-    "fouls_on",
-    "team_misses_on",
-)
+    Counts are weighted by the player's player-possession rows, matching the
+    PlayerPossession x ShotDetail join the SQL version summed over.
+    """
+    index = get_possession_index(roster.season_id)
+    mask = index.filter_mask(start_dt, end_dt, label_set, game_ids) & index.side_mask(side)
+    return index.event_totals(index.player_counts(player_id), mask)
 
 
 def _get_offense_events(
@@ -346,55 +186,16 @@ def _get_offense_events(
     label_set: Set[str],
     game_ids: Optional[Sequence[int]] = None,
 ) -> Dict[str, float]:
-    events_q = (
-        db.session.query(
-            func.coalesce(
-                func.sum(case((ShotDetail.event_type == "Turnover", 1), else_=0)),
-                0,
-            ).label("turnovers_on"),
-            func.coalesce(
-                func.sum(case((ShotDetail.event_type == "Off Reb", 1), else_=0)),
-                0,
-            ).label("off_reb_on"),
-            func.coalesce(
-                func.sum(case((ShotDetail.event_type == "TEAM Off Reb", 1), else_=0)),
-                0,
-            ).label("team_off_reb_on"),
-            func.coalesce(
-                func.sum(case((ShotDetail.event_type == "Foul", 1), else_=0)),
-                0,
-            ).label("fouls_on"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (ShotDetail.event_type.in_(("ATR-", "2FG-", "3FG-")), 1),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("team_misses_on"),
-        )
-        .select_from(PlayerPossession)
-        .join(Possession, PlayerPossession.possession_id == Possession.id)
-        .join(ShotDetail, ShotDetail.possession_id == Possession.id)
-        .filter(
-            PlayerPossession.player_id == player_id,
-            Possession.season_id == roster.season_id,
-        )
+    events = _player_event_totals(
+        player_id, roster, "Offense", start_dt, end_dt, label_set, game_ids
     )
-    events_q = _apply_side_filter(events_q, "Offense")
-    events_q = _apply_possession_filters(events_q, start_dt, end_dt, label_set, game_ids)
-    row = events_q.one_or_none()
-    return _row_to_dict(row, _OFFENSE_EVENT_COLUMNS)
-
-
-_DEFENSE_EVENT_COLUMNS: Tuple[str, ...] = (
-    "opp_misses_on",
-    "opp_team_off_reb_on",
-    "opp_player_off_reb_on",
-    "player_def_reb_on",
-    "team_def_reb_on",
-)
+    return {
+        "turnovers_on": events["Turnover"],
+        "off_reb_on": events["Off Reb"],
+        "team_off_reb_on": events["TEAM Off Reb"],
+        "fouls_on": events["Foul"],
+        "team_misses_on": events["ATR-"] + events["2FG-"] + events["3FG-"],
+    }
 
 
 def _get_defense_events(
@@ -405,54 +206,16 @@ def _get_defense_events(
     label_set: Set[str],
     game_ids: Optional[Sequence[int]] = None,
 ) -> Dict[str, float]:
-    events_q = (
-        db.session.query(
-            func.coalesce(
-                func.sum(
-                    case(
-                        (ShotDetail.event_type.in_(("ATR-", "2FG-", "3FG-")), 1),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("opp_misses_on"),
-            func.coalesce(
-                func.sum(case((ShotDetail.event_type == "TEAM Off Reb", 1), else_=0)),
-                0,
-            ).label("opp_team_off_reb_on"),
-            func.coalesce(
-                func.sum(case((ShotDetail.event_type == "Off Reb", 1), else_=0)),
-                0,
-            ).label("opp_player_off_reb_on"),
-            func.coalesce(
-                func.sum(case((ShotDetail.event_type == "Def Reb", 1), else_=0)),
-                0,
-            ).label("player_def_reb_on"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (
-                            ShotDetail.event_type.in_(("Def Reb", "TEAM Def Reb")),
-                            1,
-                        ),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("team_def_reb_on"),
-        )
-        .select_from(PlayerPossession)
-        .join(Possession, PlayerPossession.possession_id == Possession.id)
-        .join(ShotDetail, ShotDetail.possession_id == Possession.id)
-        .filter(
-            PlayerPossession.player_id == player_id,
-            Possession.season_id == roster.season_id,
-        )
+    events = _player_event_totals(
+        player_id, roster, "Defense", start_dt, end_dt, label_set, game_ids
     )
-    events_q = _apply_side_filter(events_q, "Defense")
-    events_q = _apply_possession_filters(events_q, start_dt, end_dt, label_set, game_ids)
-    row = events_q.one_or_none()
-    return _row_to_dict(row, _DEFENSE_EVENT_COLUMNS)
+    return {
+        "opp_misses_on": events["ATR-"] + events["2FG-"] + events["3FG-"],
+        "opp_team_off_reb_on": events["TEAM Off Reb"],
+        "opp_player_off_reb_on": events["Off Reb"],
+        "player_def_reb_on": events["Def Reb"],
+        "team_def_reb_on": events["Def Reb"] + events["TEAM Def Reb"],
+    }
 
 
 def _get_player_stats_totals(
@@ -646,6 +409,20 @@ def get_on_off_summary(
         roster.season_id, "Defense", start_dt, end_dt, label_set
     )
 
+    return _build_on_off_summary(
+        (on_poss, on_pts),
+        (team_off_poss, team_off_pts),
+        (def_poss_on, def_pts_on),
+        (team_def_poss, team_def_pts),
+    )
+
+
+def _build_on_off_summary(offense_on, team_offense, defense_on, team_defense) -> OnOffSummary:
+    on_poss, on_pts = offense_on
+    team_off_poss, team_off_pts = team_offense
+    def_poss_on, def_pts_on = defense_on
+    team_def_poss, team_def_pts = team_defense
+
     off_poss_off = max(team_off_poss - on_poss, 0)
     off_pts_off = max(team_off_pts - on_pts, 0.0)
 
@@ -676,6 +453,45 @@ def get_on_off_summary(
     )
 
 
+def get_on_off_summaries(
+    player_ids: Iterable[int],
+    date_from: Optional[object] = None,
+    date_to: Optional[object] = None,
+    labels: Optional[object] = None,
+) -> Dict[int, OnOffSummary]:
+    """``get_on_off_summary`` for many players, one index pass per season."""
+
+    start_dt = _coerce_date(date_from)
+    end_dt = _coerce_date(date_to)
+    label_set = _normalize_labels(labels)
+
+    player_ids = list(player_ids)
+    rosters = {
+        r.id: r for r in Roster.query.filter(Roster.id.in_(player_ids)).all()
+    } if player_ids else {}
+    summaries = {
+        pid: OnOffSummary(0, 0, None, None, 0, 0, None, None)
+        for pid in player_ids
+        if pid not in rosters
+    }
+
+    for season_id in {r.season_id for r in rosters.values()}:
+        season_players = [pid for pid, r in rosters.items() if r.season_id == season_id]
+        index = get_possession_index(season_id)
+        window = index.filter_mask(start_dt, end_dt, label_set)
+        offense = window & index.side_mask("Offense")
+        defense = window & index.side_mask("Defense")
+        offense_on = index.summarize_players(season_players, offense)
+        defense_on = index.summarize_players(season_players, defense)
+        team_offense = index.summarize(offense)
+        team_defense = index.summarize(defense)
+        for pid in season_players:
+            summaries[pid] = _build_on_off_summary(
+                offense_on[pid], team_offense, defense_on[pid], team_defense
+            )
+    return summaries
+
+
 def get_turnover_rates_onfloor(
     player_id: int,
     date_from: Optional[object] = None,
@@ -838,12 +654,7 @@ def get_rebound_rates_onfloor(
                 PlayerStats.game_id == BlueCollarStats.game_id,
             ),
         )
-        clauses = [
-            PlayerStats.shot_type_details.ilike(f"%{lbl}%")
-            | PlayerStats.stat_details.ilike(f"%{lbl}%")
-            for lbl in label_set
-        ]
-        bc_q = bc_q.filter(or_(*clauses))
+        bc_q = bc_q.filter(player_stats_label_filter(label_set))
 
     rebound_row = bc_q.with_entities(
         func.coalesce(func.sum(BlueCollarStats.off_reb), 0).label("off_reb"),
@@ -882,112 +693,19 @@ def get_on_court_metrics(player_id, start_date=None, end_date=None, labels=None)
         return {}
 
     label_set = {lbl.strip().upper() for lbl in labels or [] if lbl.strip()}
-    offense_sides = ("Offense", "Crimson", "White")
 
-    poss_q = (
-        db.session.query(
-            func.count(PlayerPossession.id),
-            func.coalesce(func.sum(Possession.points_scored), 0),
-        )
-        .join(Possession, PlayerPossession.possession_id == Possession.id)
-        .filter(
-            PlayerPossession.player_id == player_id,
-            Possession.season_id == roster.season_id,
-        )
-    )
-    poss_q = poss_q.filter(Possession.possession_side.in_(offense_sides))
-    poss_q = poss_q.filter(func.lower(Possession.time_segment) == 'offense')
-    if start_date or end_date:
-        poss_q = (
-            poss_q.outerjoin(Game, Possession.game_id == Game.id)
-                   .outerjoin(Practice, Possession.practice_id == Practice.id)
-        )
-        if start_date:
-            poss_q = poss_q.filter(
-                or_(
-                    and_(Possession.game_id != None, Game.game_date >= start_date),
-                    and_(Possession.practice_id != None, Practice.date >= start_date),
-                )
-            )
-        if end_date:
-            poss_q = poss_q.filter(
-                or_(
-                    and_(Possession.game_id != None, Game.game_date <= end_date),
-                    and_(Possession.practice_id != None, Practice.date <= end_date),
-                )
-            )
-    if label_set:
-        clauses = [Possession.drill_labels.ilike(f"%{lbl}%") for lbl in label_set]
-        poss_q = poss_q.filter(or_(*clauses))
-    ON_poss, ON_pts = poss_q.one()
-
-    team_q = (
-        db.session.query(
-            func.count(Possession.id),
-            func.coalesce(func.sum(Possession.points_scored), 0),
-        )
-        .filter(Possession.season_id == roster.season_id)
+    # Offense possessions the player was on the floor for, counted per
+    # player-possession row like the original join-based queries.
+    index = get_possession_index(roster.season_id)
+    mask = index.court_offense_mask() & index.filter_mask(
+        _coerce_date(start_date), _coerce_date(end_date), label_set
     )
-    team_q = team_q.filter(Possession.possession_side.in_(offense_sides))
-    team_q = team_q.filter(func.lower(Possession.time_segment) == 'offense')
-    if start_date or end_date:
-        team_q = (
-            team_q.outerjoin(Game, Possession.game_id == Game.id)
-                    .outerjoin(Practice, Possession.practice_id == Practice.id)
-        )
-        if start_date:
-            team_q = team_q.filter(
-                or_(
-                    and_(Possession.game_id != None, Game.game_date >= start_date),
-                    and_(Possession.practice_id != None, Practice.date >= start_date),
-                )
-            )
-        if end_date:
-            team_q = team_q.filter(
-                or_(
-                    and_(Possession.game_id != None, Game.game_date <= end_date),
-                    and_(Possession.practice_id != None, Practice.date <= end_date),
-                )
-            )
-    if label_set:
-        clauses = [Possession.drill_labels.ilike(f"%{lbl}%") for lbl in label_set]
-        team_q = team_q.filter(or_(*clauses))
-    TEAM_poss, TEAM_pts = team_q.one()
-
-    def ev_count(ev_type: str) -> int:
-        q = (
-            db.session.query(func.count(ShotDetail.id))
-            .join(Possession, ShotDetail.possession_id == Possession.id)
-            .join(PlayerPossession, Possession.id == PlayerPossession.possession_id)
-            .filter(
-                PlayerPossession.player_id == player_id,
-                Possession.season_id == roster.season_id,
-                ShotDetail.event_type == ev_type,
-            )
-        )
-        q = q.filter(Possession.possession_side.in_(offense_sides))
-        q = q.filter(func.lower(Possession.time_segment) == 'offense')
-        if start_date or end_date:
-            q = q.outerjoin(Game, Possession.game_id == Game.id).outerjoin(Practice, Possession.practice_id == Practice.id)
-            if start_date:
-                q = q.filter(
-                    or_(
-                        and_(Possession.game_id != None, Game.game_date >= start_date),
-                        and_(Possession.practice_id != None, Practice.date >= start_date),
-                    )
-                )
-            if end_date:
-                q = q.filter(
-                    or_(
-                        and_(Possession.game_id != None, Game.game_date <= end_date),
-                        and_(Possession.practice_id != None, Practice.date <= end_date),
-                    )
-                )
-        if label_set:
-            q = q.filter(or_(*[Possession.drill_labels.ilike(f"%{lbl}%") for lbl in label_set]))
-        return q.scalar() or 0
+    on_counts = index.player_counts(player_id)
+    ON_poss = int(on_counts[mask].sum())
+    ON_pts = float((on_counts[mask] * index.points[mask]).sum())
+    events = index.event_totals(on_counts, mask)
 
-    turnovers_on = ev_count("Turnover")
+    turnovers_on = events["Turnover"]
     # Personal off rebounds and fouls are tracked in BlueCollarStats and
     # PlayerStats respectively. Pull those aggregates using the same
     # date/label filters applied above so values mirror the leaderboard.
@@ -1040,16 +758,8 @@ def get_on_court_metrics(player_id, start_date=None, end_date=None, labels=None)
                 PlayerStats.game_id == BlueCollarStats.game_id,
             ),
         )
-        clauses = [
-            PlayerStats.shot_type_details.ilike(f"%{lbl}%") | PlayerStats.stat_details.ilike(f"%{lbl}%")
-            for lbl in label_set
-        ]
-        bc_q = bc_q.filter(or_(*clauses))
-        ps_clauses = [
-            PlayerStats.shot_type_details.ilike(f"%{lbl}%") | PlayerStats.stat_details.ilike(f"%{lbl}%")
-            for lbl in label_set
-        ]
-        ps_filter_q = ps_filter_q.filter(or_(*ps_clauses))
+        bc_q = bc_q.filter(player_stats_label_filter(label_set))
+        ps_filter_q = ps_filter_q.filter(player_stats_label_filter(label_set))
     off_reb_on = bc_q.with_entities(func.coalesce(func.sum(BlueCollarStats.off_reb), 0)).scalar() or 0
     records = ps_filter_q.all()
     if label_set:
@@ -1060,7 +770,7 @@ def get_on_court_metrics(player_id, start_date=None, end_date=None, labels=None)
         totals = aggregate_stats(records)
     fouls_drawn_on = totals.foul_by
     player_turnovers = totals.turnovers
-    team_missed_on = sum(ev_count(ev) for ev in ["ATR-", "2FG-", "3FG-"])
+    team_missed_on = events["ATR-"] + events["2FG-"] + events["3FG-"]
     total_fga = totals.atr_attempts + totals.fg2_attempts + totals.fg3_attempts
     denominator = (
         player_turnovers
@@ -2,6 +2,13 @@ from collections import defaultdict
 from itertools import combinations
 import math
 
+from flask import current_app
+from sqlalchemy import func
+
+from models.database import db, Possession, PlayerPossession, Roster
+
+_PARTIALS_KEY = "lineup_partials"
+
 
 def _split_player_tokens(cell_value):
     """Split player possession cell into normalized tokens."""
@@ -48,36 +55,215 @@ def get_players_on_floor(row, df_columns):
     return _split_player_tokens(row.get("PLAYER POSSESSIONS", ""))
 
 
+class LineupAccumulator:
+    """Running lineup totals that can be fed incrementally and merged.
+
+    Player names are encoded as small integers and each lineup is keyed by a
+    bitmask of those ids, so a combination is one int lookup instead of a
+    sorted name tuple. Possession and point counters live in flat lists
+    indexed by a per-(size, side) slot. Partials built per session can be
+    merged into a season total without revisiting any possession.
+    """
+
+    def __init__(self, group_sizes=(2, 3, 4, 5)):
+        self.group_sizes = tuple(group_sizes)
+        self._player_ids = {}
+        self._players = []
+        self._sides = set()
+        # (size, side) -> {mask: slot}, plus parallel poss/pts lists per key
+        self._slots = {}
+        self._poss = {}
+        self._pts = {}
+
+    @property
+    def players(self):
+        return list(self._players)
+
+    def _player_id(self, name):
+        player_id = self._player_ids.get(name)
+        if player_id is None:
+            player_id = self._player_ids[name] = len(self._players)
+            self._players.append(name)
+        return player_id
+
+    def _counters(self, size, side):
+        key = (size, side)
+        if key not in self._slots:
+            self._slots[key] = {}
+            self._poss[key] = []
+            self._pts[key] = []
+        return self._slots[key], self._poss[key], self._pts[key]
+
+    def _bump(self, size, side, mask, poss, pts):
+        slots, poss_list, pts_list = self._counters(size, side)
+        slot = slots.get(mask)
+        if slot is None:
+            slots[mask] = len(poss_list)
+            poss_list.append(poss)
+            pts_list.append(pts)
+        else:
+            poss_list[slot] += poss
+            pts_list[slot] += pts
+
+    def add(self, possession):
+        """Count one possession dict (``side``, ``players_on_floor``, ``points_scored``)."""
+        side = normalize_lineup_side(possession.get("side"))
+        player_ids = sorted({self._player_id(p) for p in possession.get("players_on_floor", [])})
+        if side:
+            self._sides.add(side)
+        if not side or not possession.get("is_true_possession", True):
+            return self
+        pts = possession.get("points_scored", 0)
+        for size in self.group_sizes:
+            if len(player_ids) < size:
+                continue
+            for combo in combinations(player_ids, size):
+                mask = 0
+                for player_id in combo:
+                    mask |= 1 << player_id
+                self._bump(size, side, mask, 1, pts)
+        return self
+
+    def add_many(self, possessions):
+        for possession in possessions:
+            self.add(possession)
+        return self
+
+    def _names(self, mask):
+        names = []
+        player_id = 0
+        while mask:
+            if mask & 1:
+                names.append(self._players[player_id])
+            mask >>= 1
+            player_id += 1
+        return names
+
+    def merge(self, other):
+        """Add ``other``'s totals (which may use different player ids) into this one."""
+        self._sides.update(other._sides)
+        remap = [self._player_id(name) for name in other._players]
+        for (size, side), slots in other._slots.items():
+            if size not in self.group_sizes:
+                continue
+            poss_list, pts_list = other._poss[(size, side)], other._pts[(size, side)]
+            for mask, slot in slots.items():
+                new_mask = 0
+                player_id = 0
+                while mask:
+                    if mask & 1:
+                        new_mask |= 1 << remap[player_id]
+                    mask >>= 1
+                    player_id += 1
+                self._bump(size, side, new_mask, poss_list[slot], pts_list[slot])
+        for name in other._players:
+            self._player_id(name)
+        return self
+
+    def totals(self):
+        """Return ``{size: {side: {sorted name tuple: {"poss", "pts"}}}}``."""
+        raw = {size: {side: {} for side in self._sides} for size in self.group_sizes}
+        for (size, side), slots in self._slots.items():
+            poss_list, pts_list = self._poss[(size, side)], self._pts[(size, side)]
+            bucket = raw[size][side]
+            for mask, slot in slots.items():
+                bucket[tuple(sorted(self._names(mask)))] = {
+                    "poss": poss_list[slot],
+                    "pts": pts_list[slot],
+                }
+        return raw
+
+
 def compute_lineup_totals(possession_data, group_sizes=(2, 3, 4, 5)):
     """Compute total points/possessions for each lineup size and side."""
-    normalized_sides = {
-        normalize_lineup_side(p.get("side"))
-        for p in possession_data
-    }
-    normalized_sides.discard("")
-    raw = {
-        size: {
-            side: defaultdict(lambda: {"poss": 0, "pts": 0})
-            for side in normalized_sides
-        }
-        for size in group_sizes
-    }
-    for poss in possession_data:
-        if not poss.get("is_true_possession", True):
-            continue
-        side = normalize_lineup_side(poss.get("side"))
-        if not side:
-            continue
-        players = poss.get("players_on_floor", [])
-        pts = poss.get("points_scored", 0)
-        for size in group_sizes:
-            if len(players) < size:
-                continue
-            for combo in combinations(players, size):
-                key = tuple(sorted(combo))
-                raw[size][side][key]["poss"] += 1
-                raw[size][side][key]["pts"] += pts
-    return raw
+    return LineupAccumulator(group_sizes).add_many(possession_data).totals()
+
+
+def _game_signatures(game_ids):
+    """Return ``{game_id: (possessions, max possession id, max player-possession id)}``."""
+    rows = (
+        db.session.query(
+            Possession.game_id,
+            func.count(func.distinct(Possession.id)),
+            func.max(Possession.id),
+            func.max(PlayerPossession.id),
+        )
+        .outerjoin(PlayerPossession, PlayerPossession.possession_id == Possession.id)
+        .filter(Possession.game_id.in_(game_ids))
+        .group_by(Possession.game_id)
+    )
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _build_game_partials(game_ids, group_sizes):
+    """Build one :class:`LineupAccumulator` per game from a single query."""
+    rows = (
+        db.session.query(
+            Possession.game_id,
+            Possession.id,
+            Possession.points_scored,
+            Possession.time_segment,
+            Possession.possession_side,
+            Roster.player_name,
+        )
+        .join(PlayerPossession, PlayerPossession.possession_id == Possession.id)
+        .join(Roster, Roster.id == PlayerPossession.player_id)
+        .filter(Possession.game_id.in_(game_ids))
+    )
+    possessions = {}
+    for game_id, possession_id, points, segment, side, player_name in rows:
+        entry = possessions.setdefault(
+            possession_id,
+            (game_id, {
+                "side": segment or side or "",
+                "points_scored": points or 0,
+                "players_on_floor": set(),
+            }),
+        )[1]
+        name = str(player_name).strip() if player_name else ""
+        if name:
+            entry["players_on_floor"].add(name)
+    partials = {game_id: LineupAccumulator(group_sizes) for game_id in game_ids}
+    for game_id, entry in possessions.values():
+        partials[game_id].add(entry)
+    return partials
+
+
+def game_lineup_accumulator(game_ids, group_sizes=(2, 3, 4, 5)):
+    """Return a merged accumulator for ``game_ids`` built from per-game partials.
+
+    Partials are cached on the app per (game, group sizes) and reused while the
+    game's possession signature is unchanged, so a season view only rebuilds
+    the games that were ingested or reparsed since the last request.
+    """
+    game_ids = [gid for gid in dict.fromkeys(game_ids) if gid is not None]
+    group_sizes = tuple(group_sizes)
+    merged = LineupAccumulator(group_sizes)
+    if not game_ids:
+        return merged
+
+    cache = current_app.extensions.setdefault(_PARTIALS_KEY, {})
+    signatures = _game_signatures(game_ids)
+    stale = [
+        gid for gid in game_ids
+        if (cached := cache.get((gid, group_sizes))) is None
+        or cached[0] != signatures.get(gid)
+    ]
+    if stale:
+        for gid, partial in _build_game_partials(stale, group_sizes).items():
+            cache[(gid, group_sizes)] = (signatures.get(gid), partial)
+    for gid in game_ids:
+        merged.merge(cache[(gid, group_sizes)][1])
+    return merged
+
+
+def invalidate_lineup_partials():
+    """Drop every cached per-game lineup partial for the current app.
+
+    The possession signature does not cover roster names, so ingest and
+    roster renames call this explicitly.
+    """
+    current_app.extensions.pop(_PARTIALS_KEY, None)
 
 
 def compute_lineup_efficiencies(possession_data, group_sizes=(2, 3, 4, 5), min_poss=5):
@@ -0,0 +1,348 @@
+"""In-memory per-season possession index for on/off and on-court metrics.
+
+Every possession in a season is loaded once into NumPy columns: id, session
+ids and dates, side flags, points, an integer code for its ``drill_labels``
+string, a per-player on-floor count matrix and a per-event-type count
+matrix. Date, label, game and side filters become boolean masks, so on/off,
+turnover-rate and rebound-rate numbers for a whole roster come from a few
+array reductions instead of one SQL round trip per player and event type.
+
+Indexes live on ``current_app.extensions`` keyed by season. They are dropped
+when an ingest transaction commits and are also checked against a cheap
+signature query (possession count/max id, max player-possession and
+shot-detail ids, plus the season's game and practice dates), so writes from
+other processes and edited session dates are picked up too.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import func
+
+from models.database import Game, PlayerPossession, Possession, Practice, ShotDetail, db
+
+_LOGGER = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "possession_index"
+
+EVENT_TYPES: Tuple[str, ...] = (
+    "Turnover",
+    "Off Reb",
+    "TEAM Off Reb",
+    "Foul",
+    "ATR-",
+    "2FG-",
+    "3FG-",
+    "Def Reb",
+    "TEAM Def Reb",
+)
+_EVENT_COLUMN = {name: i for i, name in enumerate(EVENT_TYPES)}
+COURT_OFFENSE_SIDES = ("Offense", "Crimson", "White")
+
+
+def _ordinal(value: Optional[date]) -> int:
+    return value.toordinal() if value is not None else 0
+
+
+@dataclass
+class PossessionIndex:
+    season_id: int
+    signature: Tuple
+    ids: np.ndarray
+    game_ids: np.ndarray          # -1 when NULL
+    practice_ids: np.ndarray      # -1 when NULL
+    game_dates: np.ndarray        # date ordinals, 0 when the game row is missing
+    practice_dates: np.ndarray
+    points: np.ndarray
+    sides: np.ndarray             # lower-cased possession_side (None when NULL)
+    blank_sides: np.ndarray       # possession_side NULL or whitespace
+    segments: np.ndarray          # lower-cased time_segment
+    raw_sides: np.ndarray         # possession_side as stored (court-offense check)
+    label_codes: np.ndarray       # index into ``label_values``; -1 when NULL
+    label_values: Tuple[str, ...]
+    on_floor: np.ndarray          # [possession, player column] player-possession row counts
+    player_columns: Dict[int, int]
+    events: np.ndarray            # [possession, EVENT_TYPES] counts
+    neutral: np.ndarray           # any event matching '%Neutral%'
+    _label_masks: Dict[frozenset, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # -- masks -------------------------------------------------------------
+    def side_mask(self, side: str) -> np.ndarray:
+        """Match ``possession_side``; blank sides fall back to ``time_segment``."""
+        normalized = (side or "").strip().lower()
+        if not normalized:
+            return np.ones(len(self), dtype=bool)
+        mask = self.sides == normalized
+        if normalized in ("offense", "defense"):
+            mask |= self.blank_sides & (self.segments == normalized)
+        return mask
+
+    def court_offense_mask(self) -> np.ndarray:
+        """Offense possessions as counted by ``get_on_court_metrics``."""
+        return np.isin(self.raw_sides, COURT_OFFENSE_SIDES) & (self.segments == "offense")
+
+    def label_mask(self, label_set: Set[str]) -> np.ndarray:
+        """Possessions whose ``drill_labels`` contain any label (case-insensitive)."""
+        key = frozenset(label_set)
+        mask = self._label_masks.get(key)
+        if mask is None:
+            needles = [lbl.lower() for lbl in key]
+            matching = np.array(
+                [any(n in value.lower() for n in needles) for value in self.label_values] + [False],
+                dtype=bool,
+            )
+            # code -1 indexes the trailing False
+            mask = self._label_masks[key] = matching[self.label_codes]
+        return mask
+
+    def filter_mask(
+        self,
+        start_dt: Optional[date] = None,
+        end_dt: Optional[date] = None,
+        label_set: Optional[Set[str]] = None,
+        game_ids: Optional[Sequence[int]] = None,
+    ) -> np.ndarray:
+        """Possessions inside the game list, label set and game/practice date window.
+
+        An empty (but not ``None``) ``game_ids`` matches nothing.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if game_ids is not None:
+            normalized = []
+            for value in game_ids:
+                try:
+                    normalized.append(int(value))
+                except (TypeError, ValueError):
+                    continue
+            if not normalized:
+                return np.zeros(len(self), dtype=bool)
+            mask &= np.isin(self.game_ids, normalized)
+        if label_set:
+            mask &= self.label_mask(label_set)
+        if start_dt:
+            start = start_dt.toordinal()
+            mask &= ((self.game_dates > 0) & (self.game_dates >= start)) | (
+                (self.practice_dates > 0) & (self.practice_dates >= start)
+            )
+        if end_dt:
+            end = end_dt.toordinal()
+            mask &= ((self.game_dates > 0) & (self.game_dates <= end)) | (
+                (self.practice_dates > 0) & (self.practice_dates <= end)
+            )
+        return mask
+
+    def player_counts(self, player_id: int) -> np.ndarray:
+        column = self.player_columns.get(player_id)
+        if column is None:
+            return np.zeros(len(self), dtype=self.on_floor.dtype)
+        return self.on_floor[:, column]
+
+    # -- reductions --------------------------------------------------------
+    def summarize(self, mask: np.ndarray) -> Tuple[int, float]:
+        """(possessions, points) for distinct possessions, as ``_summarize_possessions``.
+
+        Neutral rows and TEAM off-rebound extensions are subtracted from the
+        run count.
+        """
+        run_count = int(mask.sum())
+        if not run_count:
+            return 0, 0.0
+        neutral = int((self.neutral & mask).sum())
+        off_reb = int(((self.events[:, _EVENT_COLUMN["TEAM Off Reb"]] > 0) & mask).sum())
+        return max(run_count - neutral - off_reb, 0), float(self.points[mask].sum())
+
+    def summarize_players(
+        self, player_ids: Iterable[int], mask: np.ndarray
+    ) -> Dict[int, Tuple[int, float]]:
+        """``summarize`` of each player's on-floor possessions in one pass."""
+        player_ids = list(player_ids)
+        columns = [self.player_columns.get(pid) for pid in player_ids]
+        present = [c for c in columns if c is not None]
+        results = {pid: (0, 0.0) for pid in player_ids}
+        if not present:
+            return results
+        on = (self.on_floor[:, present] > 0) & mask[:, None]
+        run = on.sum(axis=0)
+        neutral = (on & self.neutral[:, None]).sum(axis=0)
+        team_off_reb = self.events[:, _EVENT_COLUMN["TEAM Off Reb"]] > 0
+        off_reb = (on & team_off_reb[:, None]).sum(axis=0)
+        points = (on * self.points[:, None]).sum(axis=0)
+        position = 0
+        for pid, column in zip(player_ids, columns):
+            if column is None:
+                continue
+            results[pid] = (
+                max(int(run[position]) - int(neutral[position]) - int(off_reb[position]), 0),
+                float(points[position]),
+            )
+            position += 1
+        return results
+
+    def event_totals(self, weights: np.ndarray, mask: np.ndarray) -> Dict[str, int]:
+        """Per event type, sum of event counts times ``weights`` over ``mask``."""
+        weighted = self.events[mask] * weights[mask][:, None].astype(np.int64)
+        totals = weighted.sum(axis=0)
+        return {name: int(totals[i]) for i, name in enumerate(EVENT_TYPES)}
+
+
+def _signature(season_id: int) -> Tuple:
+    row = db.session.query(
+        db.session.query(func.count(Possession.id))
+        .filter(Possession.season_id == season_id)
+        .scalar_subquery(),
+        db.session.query(func.max(Possession.id))
+        .filter(Possession.season_id == season_id)
+        .scalar_subquery(),
+        db.session.query(func.max(PlayerPossession.id)).scalar_subquery(),
+        db.session.query(func.max(ShotDetail.id)).scalar_subquery(),
+    ).one()
+    # Session dates are edited in place (no new ids), so fold them in too.
+    game_dates = (
+        db.session.query(Game.id, Game.game_date)
+        .filter(Game.season_id == season_id)
+        .order_by(Game.id)
+        .all()
+    )
+    practice_dates = (
+        db.session.query(Practice.id, Practice.date)
+        .filter(Practice.season_id == season_id)
+        .order_by(Practice.id)
+        .all()
+    )
+    return (*row, hash((tuple(map(tuple, game_dates)), tuple(map(tuple, practice_dates)))))
+
+
+def build_possession_index(season_id: int, signature: Optional[Tuple] = None) -> PossessionIndex:
+    """Load every possession of ``season_id`` into a :class:`PossessionIndex`."""
+    rows = (
+        db.session.query(
+            Possession.id,
+            Possession.game_id,
+            Possession.practice_id,
+            Game.game_date,
+            Practice.date,
+            Possession.points_scored,
+            Possession.possession_side,
+            Possession.time_segment,
+            Possession.drill_labels,
+        )
+        .outerjoin(Game, Possession.game_id == Game.id)
+        .outerjoin(Practice, Possession.practice_id == Practice.id)
+        .filter(Possession.season_id == season_id)
+        .order_by(Possession.id)
+        .all()
+    )
+    n = len(rows)
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+    position = {int(pid): i for i, pid in enumerate(ids)}
+
+    label_lookup: Dict[str, int] = {}
+    label_codes = np.full(n, -1, dtype=np.int32)
+    for i, r in enumerate(rows):
+        if r[8] is not None:
+            label_codes[i] = label_lookup.setdefault(r[8], len(label_lookup))
+
+    pp_rows = (
+        db.session.query(PlayerPossession.possession_id, PlayerPossession.player_id)
+        .join(Possession, PlayerPossession.possession_id == Possession.id)
+        .filter(Possession.season_id == season_id)
+        .all()
+    )
+    player_columns: Dict[int, int] = {}
+    for _pid, player_id in pp_rows:
+        if player_id is not None:
+            player_columns.setdefault(player_id, len(player_columns))
+    on_floor = np.zeros((n, len(player_columns)), dtype=np.int32)
+    if pp_rows:
+        row_idx = [position[p] for p, player in pp_rows if player is not None]
+        col_idx = [player_columns[player] for _p, player in pp_rows if player is not None]
+        np.add.at(on_floor, (np.array(row_idx, dtype=np.int64), np.array(col_idx, dtype=np.int64)), 1)
+
+    events = np.zeros((n, len(EVENT_TYPES)), dtype=np.int32)
+    neutral = np.zeros(n, dtype=bool)
+    event_rows = (
+        db.session.query(ShotDetail.possession_id, ShotDetail.event_type, func.count(ShotDetail.id))
+        .join(Possession, ShotDetail.possession_id == Possession.id)
+        .filter(Possession.season_id == season_id)
+        .group_by(ShotDetail.possession_id, ShotDetail.event_type)
+        .all()
+    )
+    for pid, event_type, count in event_rows:
+        i = position[pid]
+        column = _EVENT_COLUMN.get(event_type)
+        if column is not None:
+            events[i, column] += count
+        if event_type and "neutral" in event_type.lower():
+            neutral[i] = True
+
+    return PossessionIndex(
+        season_id=season_id,
+        signature=signature if signature is not None else _signature(season_id),
+        ids=ids,
+        game_ids=np.fromiter((r[1] if r[1] is not None else -1 for r in rows), dtype=np.int64, count=n),
+        practice_ids=np.fromiter((r[2] if r[2] is not None else -1 for r in rows), dtype=np.int64, count=n),
+        game_dates=np.fromiter(
+            (_ordinal(r[3]) if r[1] is not None else 0 for r in rows), dtype=np.int64, count=n
+        ),
+        practice_dates=np.fromiter(
+            (_ordinal(r[4]) if r[2] is not None else 0 for r in rows), dtype=np.int64, count=n
+        ),
+        points=np.fromiter((r[5] or 0 for r in rows), dtype=np.float64, count=n),
+        sides=np.array([r[6].lower() if r[6] is not None else None for r in rows], dtype=object),
+        blank_sides=np.fromiter((not (r[6] or "").strip() for r in rows), dtype=bool, count=n),
+        segments=np.array([(r[7] or "").lower() for r in rows], dtype=object),
+        raw_sides=np.array([r[6] for r in rows], dtype=object),
+        label_codes=label_codes,
+        label_values=tuple(label_lookup),
+        on_floor=on_floor,
+        player_columns=player_columns,
+        events=events,
+        neutral=neutral,
+    )
+
+
+def _cache() -> Dict[int, PossessionIndex]:
+    return current_app.extensions.setdefault(_EXTENSION_KEY, {})
+
+
+def get_possession_index(season_id: int) -> PossessionIndex:
+    """Return the (cached) index for ``season_id``, rebuilding it when stale."""
+    cache = _cache()
+    signature = _signature(season_id)
+    index = cache.get(season_id)
+    if index is None or index.signature != signature:
+        index = cache[season_id] = build_possession_index(season_id, signature)
+        _LOGGER.debug("Built possession index for season %s (%s possessions)", season_id, len(index))
+    return index
+
+
+def invalidate_possession_index(season_id: Optional[int] = None) -> None:
+    """Drop cached indexes (all seasons when ``season_id`` is ``None``)."""
+    if not has_app_context():
+        return
+    cache = current_app.extensions.get(_EXTENSION_KEY)
+    if not cache:
+        return
+    if season_id is None:
+        cache.clear()
+    else:
+        cache.pop(season_id, None)
+
+
+__all__ = [
+    "COURT_OFFENSE_SIDES",
+    "EVENT_TYPES",
+    "PossessionIndex",
+    "build_possession_index",
+    "get_possession_index",
+    "invalidate_possession_index",
+]
@@ -0,0 +1,421 @@
+"""Set-based record recompute across many games.
+
+``build_candidates_frame`` loads TeamStats, PlayerStats and blue-collar rows
+for every game at once and produces the same candidates as
+:func:`utils.records.candidate_builder.build_game_candidates` would per game,
+as one DataFrame. ``evaluate_candidates_frame`` applies qualification,
+upserts AUTO entries against a preloaded ``auto_key -> id`` map with bulk
+INSERT/UPDATE statements, then recomputes current holders for every touched
+definition with a single windowed query. Duplicate auto keys resolve the way
+the per-game loop does: the last candidate wins.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import case, func, insert, select, update
+
+from models.database import (
+    BlueCollarStats,
+    Game,
+    OpponentBlueCollarStats,
+    PlayerStats,
+    RecordDefinition,
+    RecordEntry,
+    Roster,
+    TeamStats,
+    db,
+)
+from utils.records.candidate_builder import (
+    BLUE_COLLAR_COLUMNS,
+    _is_blue_collar,
+    _resolve_stat_attr,
+    _select_mapping,
+)
+from utils.records.current_max import invalidate_current_max
+from utils.records.qualifications import get_threshold
+from utils.records.stat_keys import canonicalize_stat_key
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_COLUMNS = [
+    "definition_id",
+    "definition_stat_key",
+    "holder_entity_type",
+    "holder_player_id",
+    "holder_opponent_name",
+    "value",
+    "game_id",
+    "occurred_on",
+    "qualifier_value",
+]
+_ORDER_COLUMNS = ["_game_pos", "_def_pos", "_row_pos"]
+_CHUNK = 500
+
+
+def _frame(query, columns: Sequence[str]) -> pd.DataFrame:
+    rows = db.session.execute(query).all()
+    return pd.DataFrame([tuple(row) for row in rows], columns=list(columns))
+
+
+def _chunks(values: Sequence[Any]):
+    for start in range(0, len(values), _CHUNK):
+        yield values[start:start + _CHUNK]
+
+
+def _first_per_game(df: pd.DataFrame) -> pd.DataFrame:
+    # ``Query.first()`` without ORDER BY returns the lowest rowid in SQLite.
+    return df.sort_values("id").drop_duplicates("game_id", keep="first")
+
+
+def _load_sources(game_ids: Sequence[int]) -> Dict[str, pd.DataFrame]:
+    team_columns = [c.name for c in TeamStats.__table__.columns]
+    player_columns = [c.name for c in PlayerStats.__table__.columns]
+    bc_columns = ["id", "game_id", "player_id", *BLUE_COLLAR_COLUMNS]
+
+    frames: Dict[str, List[pd.DataFrame]] = {
+        key: [] for key in ("games", "team", "opponent", "players", "bc", "opp_bc")
+    }
+    for chunk in _chunks(list(game_ids)):
+        frames["games"].append(_frame(
+            select(Game.id, Game.season_id, Game.game_date, Game.opponent_name).where(Game.id.in_(chunk)),
+            ["game_id", "season_id", "game_date", "opponent_name"],
+        ))
+        team_rows = _frame(
+            select(*TeamStats.__table__.columns).where(TeamStats.game_id.in_(chunk)), team_columns
+        )
+        frames["team"].append(team_rows[team_rows["is_opponent"].isna() | (team_rows["is_opponent"] == False)])  # noqa: E712
+        frames["opponent"].append(team_rows[team_rows["is_opponent"] == True])  # noqa: E712
+        frames["players"].append(_frame(
+            select(*PlayerStats.__table__.columns).where(PlayerStats.game_id.in_(chunk)), player_columns
+        ))
+        frames["bc"].append(_frame(
+            select(*(getattr(BlueCollarStats, c) for c in bc_columns)).where(BlueCollarStats.game_id.in_(chunk)),
+            bc_columns,
+        ))
+        frames["opp_bc"].append(_frame(
+            select(*(getattr(OpponentBlueCollarStats, c) for c in bc_columns)).where(
+                OpponentBlueCollarStats.game_id.in_(chunk),
+                OpponentBlueCollarStats.player_id.is_(None),
+            ),
+            bc_columns,
+        ))
+    return {key: pd.concat(parts, ignore_index=True) for key, parts in frames.items()}
+
+
+def _roster_lookup(season_ids: Iterable[int]) -> Dict[tuple, int]:
+    lookup: Dict[tuple, int] = {}
+    rows = db.session.execute(
+        select(Roster.id, Roster.season_id, Roster.player_name)
+        .where(Roster.season_id.in_(list(season_ids)))
+        .order_by(Roster.id)
+    )
+    for roster_id, season_id, player_name in rows:
+        lookup[(season_id, player_name.strip().lower())] = roster_id
+    return lookup
+
+
+def _team_blue_collar(bc: pd.DataFrame) -> pd.DataFrame:
+    """Team rows, falling back to summed player rows for games without one."""
+    team_rows = _first_per_game(bc[bc["player_id"].isna()])
+    player_rows = bc[bc["player_id"].notna()]
+    summed = (
+        player_rows[~player_rows["game_id"].isin(team_rows["game_id"])]
+        .groupby("game_id", as_index=False)[list(BLUE_COLLAR_COLUMNS)]
+        .sum(min_count=0)
+    )
+    summed["id"] = 0
+    return pd.concat([team_rows, summed], ignore_index=True)
+
+
+def build_candidates_frame(
+    game_ids: Sequence[int],
+    definitions: Iterable[RecordDefinition],
+) -> pd.DataFrame:
+    """Return every game candidate for ``game_ids`` ordered like the per-game loop."""
+    definitions = list(definitions)
+    game_ids = list(dict.fromkeys(game_ids))
+    empty = pd.DataFrame(columns=CANDIDATE_COLUMNS)
+    if not game_ids or not definitions:
+        return empty
+
+    src = _load_sources(game_ids)
+    games = src["games"].set_index("game_id")
+    game_pos = {game_id: pos for pos, game_id in enumerate(game_ids)}
+    occurred_on = {
+        game_id: (row.game_date or date.today()) for game_id, row in games.iterrows()
+    }
+
+    players = src["players"].sort_values("id").copy()
+    roster = _roster_lookup(games["season_id"].dropna().unique().tolist())
+    seasons = games["season_id"].to_dict()
+    players["holder_player_id"] = [
+        roster.get((seasons.get(gid), (name or "").strip().lower()))
+        for gid, name in zip(players["game_id"], players["player_name"])
+    ]
+    unresolved = players["holder_player_id"].isna().sum()
+    if unresolved:
+        logger.warning("Unable to resolve roster ids for %s player stat rows", unresolved)
+    players = players[players["holder_player_id"].notna()]
+
+    bc = src["bc"].sort_values("id")
+    sources = {
+        ("TEAM", False): _first_per_game(src["team"]),
+        ("TEAM", True): _team_blue_collar(bc),
+        ("OPPONENT", False): _first_per_game(src["opponent"]),
+        ("OPPONENT", True): _first_per_game(src["opp_bc"]),
+        ("PLAYER", False): players,
+        ("PLAYER", True): bc[bc["player_id"].notna()].assign(holder_player_id=lambda df: df["player_id"]),
+    }
+
+    parts: List[pd.DataFrame] = []
+    for def_pos, definition in enumerate(definitions):
+        stat_key = canonicalize_stat_key(definition.stat_key or "")
+        qualifier_key = canonicalize_stat_key(definition.qualifier_stat_key or "")
+        mapping = _select_mapping(definition.entity_type, stat_key)
+        if not mapping or stat_key not in mapping:
+            logger.warning(
+                "No mapping for definition %s (entity_type=%s stat_key=%s)",
+                definition.id,
+                definition.entity_type,
+                stat_key,
+            )
+            continue
+        source = sources[(definition.entity_type, _is_blue_collar(stat_key))]
+        if source.empty:
+            continue
+        value_attr = _resolve_stat_attr(stat_key, mapping)
+        values = pd.to_numeric(source[value_attr], errors="coerce")
+        mask = values.notna()
+        qualifiers = pd.Series(float("nan"), index=source.index)
+        if qualifier_key:
+            qualifier_attr = _resolve_stat_attr(qualifier_key, mapping)
+            if not qualifier_attr or qualifier_attr not in source:
+                continue
+            qualifiers = pd.to_numeric(source[qualifier_attr], errors="coerce")
+            mask &= qualifiers.notna()
+        selected = source[mask]
+        if selected.empty:
+            continue
+
+        holder_ids = (
+            selected["holder_player_id"].astype("int64").astype(object)
+            if definition.entity_type == "PLAYER"
+            else pd.Series(None, index=selected.index, dtype=object)
+        )
+        opponent_names = (
+            selected["game_id"].map(games["opponent_name"]).astype(object)
+            if definition.entity_type == "OPPONENT"
+            else pd.Series(None, index=selected.index, dtype=object)
+        )
+        part = pd.DataFrame({
+            "definition_id": definition.id,
+            "definition_stat_key": stat_key,
+            "holder_entity_type": definition.entity_type,
+            "holder_player_id": holder_ids,
+            "holder_opponent_name": opponent_names,
+            "value": values[mask].astype(float),
+            "game_id": selected["game_id"].astype("int64"),
+            "occurred_on": selected["game_id"].map(occurred_on),
+            "qualifier_value": qualifiers[mask].astype(float),
+            "_game_pos": selected["game_id"].map(game_pos),
+            "_def_pos": def_pos,
+            "_row_pos": range(len(selected)),
+        })
+        parts.append(part)
+
+    if not parts:
+        return empty
+    frame = pd.concat(parts, ignore_index=True)
+    frame = frame.sort_values(_ORDER_COLUMNS, kind="stable").reset_index(drop=True)
+    for column in ("holder_player_id", "holder_opponent_name", "qualifier_value"):
+        frame[column] = frame[column].astype(object).where(frame[column].notna(), None)
+    logger.info(
+        "Built %s game record candidates from %s definitions for %s games",
+        len(frame),
+        len(definitions),
+        len(game_ids),
+    )
+    return frame[CANDIDATE_COLUMNS]
+
+
+def _auto_keys(frame: pd.DataFrame) -> pd.Series:
+    holders = frame["holder_player_id"].map(lambda v: "NONE" if v is None or pd.isna(v) else str(int(v)))
+    return (
+        frame["definition_id"].astype(str) + ":" + frame["game_id"].astype(str) + ":"
+        + frame["holder_entity_type"] + ":" + holders
+    )
+
+
+def _none_if_nan(value):
+    return None if value is None or (isinstance(value, float) and pd.isna(value)) else value
+
+
+def recompute_current_holders(definition_ids: Iterable[int]) -> int:
+    """Reset ``is_current`` for ``definition_ids``; returns definitions whose holders changed.
+
+    Forced current entries win and are never demoted, as in the per-game path.
+    """
+    definition_ids = sorted(set(definition_ids))
+    if not definition_ids:
+        return 0
+    partition = RecordEntry.record_definition_id
+    max_value = func.max(RecordEntry.value).over(partition_by=partition)
+    has_forced = func.max(case((RecordEntry.is_forced_current.is_(True), 1), else_=0)).over(
+        partition_by=partition
+    )
+    rows = db.session.execute(
+        select(
+            RecordEntry.id,
+            RecordEntry.record_definition_id,
+            RecordEntry.is_current,
+            RecordEntry.is_forced_current,
+            RecordEntry.value,
+            max_value,
+            has_forced,
+        ).where(partition.in_(definition_ids), RecordEntry.is_active.is_(True))
+    ).all()
+
+    changes: List[Dict[str, Any]] = []
+    changed_definitions = set()
+    for entry_id, definition_id, is_current, is_forced, value, top, forced in rows:
+        if forced:
+            if is_forced and not is_current:
+                changes.append({"id": entry_id, "is_current": True})
+            continue
+        target = value == top
+        if bool(is_current) != target:
+            changes.append({"id": entry_id, "is_current": target})
+            changed_definitions.add(definition_id)
+    if changes:
+        db.session.execute(update(RecordEntry), changes)
+    invalidate_current_max(*definition_ids)
+    return len(changed_definitions)
+
+
+def qualify_candidates_frame(
+    frame: pd.DataFrame,
+    definitions_by_id: Dict[int, RecordDefinition],
+) -> pd.DataFrame:
+    """Drop candidates failing their definition's qualifier and add ``auto_key``."""
+    frame = frame[frame["definition_id"].isin(definitions_by_id)].copy()
+    thresholds = {
+        def_id: get_threshold(definition)
+        for def_id, definition in definitions_by_id.items()
+        if definition.qualifier_stat_key
+    }
+    threshold = frame["definition_id"].map(thresholds).astype(float)
+    qualifier = pd.to_numeric(frame["qualifier_value"], errors="coerce")
+    qualified = threshold.isna() | (qualifier.notna() & (qualifier >= threshold))
+    frame = frame[qualified].reset_index(drop=True)
+    frame["auto_key"] = _auto_keys(frame) if not frame.empty else pd.Series(dtype=str)
+    return frame
+
+
+def existing_auto_entries(
+    definition_ids: Iterable[int],
+    game_ids: Optional[Iterable[int]] = None,
+) -> Dict[str, tuple]:
+    """Map ``auto_key -> (id, value, is_current)`` for the given definitions."""
+    query = select(RecordEntry.auto_key, RecordEntry.id, RecordEntry.value, RecordEntry.is_current).where(
+        RecordEntry.record_definition_id.in_(list(definition_ids)),
+        RecordEntry.auto_key.isnot(None),
+    )
+    if game_ids is not None:
+        query = query.where(RecordEntry.game_id.in_(list(game_ids)))
+    return {auto_key: tuple(rest) for auto_key, *rest in db.session.execute(query)}
+
+
+def upsert_candidates_frame(
+    frame: pd.DataFrame,
+    definitions_by_id: Dict[int, RecordDefinition],
+    existing: Dict[str, tuple],
+) -> pd.Series:
+    """Bulk INSERT/UPDATE AUTO entries for ``frame``; returns the per-row created mask."""
+    first_seen = ~frame["auto_key"].duplicated(keep="first")
+    created_mask = first_seen & ~frame["auto_key"].isin(existing)
+    final = frame.drop_duplicates("auto_key", keep="last")
+
+    inserts: List[Dict[str, Any]] = []
+    updates: List[Dict[str, Any]] = []
+    for row in final.itertuples(index=False):
+        definition = definitions_by_id[row.definition_id]
+        values = {
+            "holder_entity_type": row.holder_entity_type,
+            "holder_player_id": _none_if_nan(row.holder_player_id),
+            "holder_opponent_name": _none_if_nan(row.holder_opponent_name),
+            "value": float(row.value),
+            "scope": definition.scope,
+            "season_year": None,
+            "game_id": int(row.game_id),
+            "occurred_on": row.occurred_on,
+        }
+        current = existing.get(row.auto_key)
+        if current is None:
+            inserts.append({
+                **values,
+                "record_definition_id": definition.id,
+                "source_type": "AUTO",
+                "notes": None,
+                "auto_key": row.auto_key,
+                "is_current": False,
+                "is_forced_current": False,
+                "is_active": True,
+            })
+        else:
+            updates.append({"id": current[0], **values})
+    if inserts:
+        db.session.execute(insert(RecordEntry), inserts)
+    if updates:
+        db.session.execute(update(RecordEntry), updates)
+    return created_mask
+
+
+def evaluate_candidates_frame(
+    frame: pd.DataFrame,
+    definitions: Iterable[RecordDefinition],
+    *,
+    stats: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Qualify, bulk-upsert and re-rank ``frame`` (from :func:`build_candidates_frame`)."""
+    definitions_by_id = {definition.id: definition for definition in definitions}
+    frame = qualify_candidates_frame(frame, definitions_by_id)
+    existing = (
+        existing_auto_entries(frame["definition_id"].unique().tolist()) if not frame.empty else {}
+    )
+    created_mask = upsert_candidates_frame(frame, definitions_by_id, existing)
+
+    current_changed = recompute_current_holders(frame["definition_id"].unique().tolist())
+    auto_created = int(created_mask.sum())
+    logger.info(
+        "Bulk auto record entries created=%s updated=%s current_changes=%s",
+        auto_created,
+        len(frame) - auto_created,
+        current_changed,
+    )
+
+    if stats is not None:
+        per_game = pd.DataFrame({"game_id": frame["game_id"], "created": created_mask.astype(int)})
+        grouped = per_game.groupby("game_id")["created"].agg(["sum", "count"])
+        stats["candidates_evaluated"] = len(frame)
+        stats["auto_created"] = auto_created
+        stats["auto_updated"] = len(frame) - auto_created
+        stats["definitions_with_current_changes"] = current_changed
+        stats["per_game"] = {
+            int(game_id): {"created": int(row["sum"]), "updated": int(row["count"] - row["sum"])}
+            for game_id, row in grouped.iterrows()
+        }
+
+
+__all__ = [
+    "CANDIDATE_COLUMNS",
+    "build_candidates_frame",
+    "evaluate_candidates_frame",
+    "existing_auto_entries",
+    "qualify_candidates_frame",
+    "recompute_current_holders",
+    "upsert_candidates_frame",
+]
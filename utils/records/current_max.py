@@ -0,0 +1,97 @@
+"""Cached per-definition record maxima.
+
+Ingest compares a new game's values against ``{"max": float | None,
+"forced": bool}`` per definition instead of reloading every RecordEntry. The
+values live in the shared report cache (the cross-process tier when there is
+one) under ``records:current-max:<definition_id>``; a miss is seeded with one
+grouped query. Anything that writes RecordEntry rows outside the incremental
+path must call :func:`invalidate_current_max`.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, func, select
+
+from models.database import RecordEntry, db
+from services.report_cache import get_report_cache, shared_store
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "records:current-max:"
+_TAG = "records:current-max"
+_TIMEOUT = 30 * 24 * 60 * 60
+
+
+def _key(definition_id: int) -> str:
+    return f"{_KEY_PREFIX}{definition_id}"
+
+
+def _store():
+    return shared_store() or get_report_cache()
+
+
+def _seed(definition_ids: Iterable[int]) -> Dict[int, dict]:
+    definition_ids = list(definition_ids)
+    maxima = {definition_id: {"max": None, "forced": False} for definition_id in definition_ids}
+    rows = db.session.execute(
+        select(
+            RecordEntry.record_definition_id,
+            func.max(RecordEntry.value),
+            func.max(case((RecordEntry.is_forced_current.is_(True), 1), else_=0)),
+        )
+        .where(
+            RecordEntry.record_definition_id.in_(definition_ids),
+            RecordEntry.is_active.is_(True),
+        )
+        .group_by(RecordEntry.record_definition_id)
+    )
+    for definition_id, max_value, forced in rows:
+        maxima[definition_id] = {
+            "max": float(max_value) if max_value is not None else None,
+            "forced": bool(forced),
+        }
+    return maxima
+
+
+def load_current_max(definition_ids: Iterable[int]) -> Dict[int, dict]:
+    """Return the cached maximum for each id, seeding misses from the database."""
+    store = _store()
+    maxima: Dict[int, dict] = {}
+    missing = []
+    for definition_id in sorted(set(definition_ids)):
+        cached = store.get(_key(definition_id)) if store is not None else None
+        if cached is None:
+            missing.append(definition_id)
+        else:
+            maxima[definition_id] = cached
+    if missing:
+        seeded = _seed(missing)
+        maxima.update(seeded)
+        store_current_max(seeded)
+    return maxima
+
+
+def store_current_max(maxima: Dict[int, dict]) -> None:
+    store = _store()
+    if store is None:
+        return
+    for definition_id, value in maxima.items():
+        store.set(_key(definition_id), dict(value), timeout=_TIMEOUT, tags=(_TAG,))
+
+
+def invalidate_current_max(*definition_ids: Optional[int]) -> None:
+    """Forget cached maxima for ``definition_ids`` (all definitions when none given)."""
+    cache = get_report_cache()
+    if cache is None:
+        return
+    if not definition_ids:
+        cache.invalidate_tags(_TAG)
+        return
+    for definition_id in definition_ids:
+        if definition_id is not None:
+            cache.delete(_key(definition_id))
+
+
+__all__ = ["invalidate_current_max", "load_current_max", "store_current_max"]
@@ -0,0 +1,138 @@
+"""Incremental record evaluation for one freshly ingested game.
+
+Only the definitions that produce candidates for the game are touched. Each
+one is compared against its cached maximum (:mod:`utils.records.current_max`)
+instead of reloading every entry: a new best takes over as the current
+holder, a tie joins it, anything lower leaves holders alone. The one case a
+cached maximum cannot answer is a reparse that lowers an entry which was the
+current holder; those definitions fall back to
+:func:`utils.records.batch.recompute_current_holders`.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, update
+
+from models.database import RecordDefinition, RecordEntry, db
+from utils.records.batch import (
+    build_candidates_frame,
+    existing_auto_entries,
+    qualify_candidates_frame,
+    recompute_current_holders,
+    upsert_candidates_frame,
+)
+from utils.records.current_max import load_current_max, store_current_max
+
+logger = logging.getLogger(__name__)
+
+
+def _game_definitions(include_inactive: bool = False) -> List[RecordDefinition]:
+    query = RecordDefinition.query.filter_by(scope="GAME")
+    if not include_inactive:
+        query = query.filter_by(is_active=True)
+    return query.all()
+
+
+def evaluate_game_records(
+    game_id: int,
+    *,
+    definitions: Optional[Iterable[RecordDefinition]] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Upsert ``game_id``'s AUTO entries and update current holders incrementally.
+
+    The caller commits.
+    """
+    definitions = list(definitions) if definitions is not None else _game_definitions()
+    definitions_by_id = {definition.id: definition for definition in definitions}
+    frame = qualify_candidates_frame(build_candidates_frame([game_id], definitions), definitions_by_id)
+    touched = sorted(frame["definition_id"].unique().tolist()) if not frame.empty else []
+    if not touched:
+        if stats is not None:
+            stats.update(candidates_evaluated=0, auto_created=0, auto_updated=0,
+                         definitions_with_current_changes=0)
+        return
+
+    existing = existing_auto_entries(touched, game_ids=[game_id])
+    maxima = load_current_max(touched)
+    created_mask = upsert_candidates_frame(frame, definitions_by_id, existing)
+
+    final = frame.drop_duplicates("auto_key", keep="last")
+    keys_by_definition: Dict[int, List[str]] = {}
+    for definition_id, auto_key in zip(final["definition_id"], final["auto_key"]):
+        keys_by_definition.setdefault(int(definition_id), []).append(auto_key)
+    entries = {
+        auto_key: (entry_id, value, is_current)
+        for auto_key, entry_id, value, is_current in db.session.execute(
+            select(RecordEntry.auto_key, RecordEntry.id, RecordEntry.value, RecordEntry.is_current).where(
+                RecordEntry.auto_key.in_(final["auto_key"].tolist()),
+                RecordEntry.is_active.is_(True),
+            )
+        )
+    }
+
+    rescan: List[int] = []
+    changes: List[Dict[str, Any]] = []
+    changed = 0
+    for definition_id in touched:
+        cached = maxima[definition_id]
+        rows = [entries[key] for key in keys_by_definition[definition_id] if key in entries]
+        if cached["forced"] or not rows:
+            continue
+        lowered_holder = any(
+            key in existing and existing[key][2] and key in entries and entries[key][1] < existing[key][1]
+            for key in keys_by_definition[definition_id]
+        )
+        if lowered_holder:
+            rescan.append(definition_id)
+            continue
+
+        top = max(value for _, value, _ in rows)
+        best = cached["max"]
+        if best is None or top > best:
+            winners = [entry_id for entry_id, value, _ in rows if value == top]
+            db.session.execute(
+                update(RecordEntry)
+                .where(
+                    RecordEntry.record_definition_id == definition_id,
+                    RecordEntry.is_current.is_(True),
+                    RecordEntry.id.notin_(winners),
+                )
+                .values(is_current=False)
+                .execution_options(synchronize_session=False)
+            )
+            changes.extend({"id": entry_id, "is_current": True} for entry_id in winners)
+            maxima[definition_id] = {"max": float(top), "forced": False}
+            changed += 1
+        elif top == best:
+            promoted = [entry_id for entry_id, value, is_current in rows if value == top and not is_current]
+            changes.extend({"id": entry_id, "is_current": True} for entry_id in promoted)
+            changed += bool(promoted)
+    if changes:
+        db.session.execute(update(RecordEntry), changes)
+    if rescan:
+        # recompute_current_holders also drops their cached maxima.
+        changed += recompute_current_holders(rescan)
+    store_current_max({definition_id: maxima[definition_id] for definition_id in touched
+                       if definition_id not in rescan})
+
+    auto_created = int(created_mask.sum())
+    logger.info(
+        "Incremental records for game %s: definitions=%s created=%s updated=%s current_changes=%s rescanned=%s",
+        game_id,
+        len(touched),
+        auto_created,
+        len(frame) - auto_created,
+        changed,
+        len(rescan),
+    )
+    if stats is not None:
+        stats["candidates_evaluated"] = len(frame)
+        stats["auto_created"] = auto_created
+        stats["auto_updated"] = len(frame) - auto_created
+        stats["definitions_with_current_changes"] = changed
+
+
+__all__ = ["evaluate_game_records"]
@@ -1,5 +1,7 @@
+import hashlib
 import json
 import os
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Optional
 
@@ -13,24 +15,66 @@ from models.database import (
     PlayerStats,
     Possession,
     Practice,
+    Roster,
     TeamStats,
     db,
 )
 from models.uploaded_file import UploadedFile
-from utils.records.candidate_builder import build_game_candidates
-from utils.records.evaluator import evaluate_candidates
+from utils.bulk_persist import PARSER_VERSION, replace_changed_only
+from utils.records.current_max import invalidate_current_max
+from utils.records.incremental import evaluate_game_records
 from utils.lineup import format_lineup_efficiencies
+from utils.shottype import delete_player_shot_details
 
 
 def _format_lineup_efficiencies(raw_lineups: dict) -> dict:
     return format_lineup_efficiencies(raw_lineups)
 
 
-def reparse_uploaded_file(file: UploadedFile) -> Optional[dict]:
+def file_content_hash(path: str) -> str:
+    """Hex sha256 of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def roster_fingerprint(season_id: Optional[int]) -> str:
+    """Hex sha256 of the season id and its roster's ``(id, player_name)`` rows.
+
+    The parsers resolve player tokens against this roster, so the same CSV
+    can produce different rows after a roster edit or a season change.
+    """
+    rows = (
+        db.session.query(Roster.id, Roster.player_name)
+        .filter(Roster.season_id == season_id)
+        .order_by(Roster.id)
+        .all()
+    )
+    return hashlib.sha256(
+        json.dumps([season_id, [list(row) for row in rows]]).encode("utf-8")
+    ).hexdigest()
+
+
+def record_parse_fingerprint(file: UploadedFile, path: str) -> None:
+    """Remember which CSV contents, roster and parser version produced the stored rows."""
+    file.content_hash = file_content_hash(path)
+    file.roster_fingerprint = roster_fingerprint(file.season_id)
+    file.parser_version = PARSER_VERSION
+
+
+def reparse_uploaded_file(file: UploadedFile, force: bool = False) -> Optional[dict]:
     """Re-parse an uploaded CSV using existing Game/Practice records.
 
     This helper clears previously parsed stats for the associated record,
     re-runs the appropriate parser, and refreshes the UploadedFile metadata.
+
+    A file already parsed from the same contents against the same season
+    roster by the current ``PARSER_VERSION`` is skipped
+    (``{"skipped": True}``) unless ``force``. When only the parser version or
+    the roster changed, nothing is cleared up front: the parser runs under
+    ``replace_changed_only`` and rewrites just the tables whose rows differ.
     """
 
     upload_folder = current_app.config.get("UPLOAD_FOLDER", "")
@@ -41,6 +85,21 @@ def reparse_uploaded_file(file: UploadedFile) -> Optional[dict]:
             f"File '{file.filename}' not found in upload folder '{upload_folder}'"
         )
 
+    content_hash = file_content_hash(filepath)
+    roster_hash = roster_fingerprint(file.season_id)
+    same_contents = (
+        file.parse_status == "Parsed Successfully" and file.content_hash == content_hash
+    )
+    same_inputs = (
+        same_contents
+        and file.roster_fingerprint == roster_hash
+        and file.parser_version == PARSER_VERSION
+    )
+    if same_inputs and not force:
+        current_app.logger.info("Skipping reparse of unchanged file %s", file.filename)
+        return {"skipped": True}
+    diff_only = same_contents and not force
+
     result: Optional[dict] = None
 
     game_id: Optional[int] = None
@@ -54,24 +113,30 @@ def reparse_uploaded_file(file: UploadedFile) -> Optional[dict]:
                 "No existing Game found for reparse; refusing to create a new one."
             )
 
-        TeamStats.query.filter_by(game_id=game.id).delete()
-        PlayerStats.query.filter_by(game_id=game.id).delete()
-        BlueCollarStats.query.filter_by(game_id=game.id).delete()
-        OpponentBlueCollarStats.query.filter_by(game_id=game.id).delete()
+        if not diff_only:
+            TeamStats.query.filter_by(game_id=game.id).delete()
+            delete_player_shot_details(PlayerStats.game_id == game.id)
+            PlayerStats.query.filter_by(game_id=game.id).delete()
+            BlueCollarStats.query.filter_by(game_id=game.id).delete()
+            OpponentBlueCollarStats.query.filter_by(game_id=game.id).delete()
 
-        possession_ids = [p.id for p in Possession.query.filter_by(game_id=game.id).all()]
-        if possession_ids:
-            PlayerPossession.query.filter(
-                PlayerPossession.possession_id.in_(possession_ids)
-            ).delete(synchronize_session=False)
-        Possession.query.filter_by(game_id=game.id).delete()
-        db.session.commit()
+            possession_ids = [p.id for p in Possession.query.filter_by(game_id=game.id).all()]
+            if possession_ids:
+                PlayerPossession.query.filter(
+                    PlayerPossession.possession_id.in_(possession_ids)
+                ).delete(synchronize_session=False)
+            Possession.query.filter_by(game_id=game.id).delete()
+            db.session.commit()
 
         from admin import routes as admin_routes
 
-        result = admin_routes.parse_csv(
-            filepath, game_id=None, season_id=file.season_id
-        )
+        with replace_changed_only(game_id=game.id) if diff_only else nullcontext():
+            result = admin_routes.parse_csv(
+                filepath,
+                game_id=None,
+                season_id=file.season_id,
+                app=current_app._get_current_object(),
+            )
         game_id = game.id
 
     elif file.category in {"Official Practice", "Fall Workouts", "Summer Workouts", "Pickup"}:
@@ -90,27 +155,30 @@ def reparse_uploaded_file(file: UploadedFile) -> Optional[dict]:
                 "No existing Practice found for reparse; refusing to create a new one."
             )
 
-        TeamStats.query.filter_by(practice_id=practice.id).delete()
-        PlayerStats.query.filter_by(practice_id=practice.id).delete()
-        BlueCollarStats.query.filter_by(practice_id=practice.id).delete()
-        OpponentBlueCollarStats.query.filter_by(practice_id=practice.id).delete()
-
-        possession_ids = [
-            p.id for p in Possession.query.filter_by(practice_id=practice.id).all()
-        ]
-        if possession_ids:
-            PlayerPossession.query.filter(
-                PlayerPossession.possession_id.in_(possession_ids)
-            ).delete(synchronize_session=False)
-        Possession.query.filter_by(practice_id=practice.id).delete()
-        db.session.commit()
-
-        result = admin_routes.parse_practice_csv(
-            filepath,
-            season_id=file.season_id,
-            category=normalized_category,
-            file_date=file.file_date,
-        )
+        if not diff_only:
+            TeamStats.query.filter_by(practice_id=practice.id).delete()
+            delete_player_shot_details(PlayerStats.practice_id == practice.id)
+            PlayerStats.query.filter_by(practice_id=practice.id).delete()
+            BlueCollarStats.query.filter_by(practice_id=practice.id).delete()
+            OpponentBlueCollarStats.query.filter_by(practice_id=practice.id).delete()
+
+            possession_ids = [
+                p.id for p in Possession.query.filter_by(practice_id=practice.id).all()
+            ]
+            if possession_ids:
+                PlayerPossession.query.filter(
+                    PlayerPossession.possession_id.in_(possession_ids)
+                ).delete(synchronize_session=False)
+            Possession.query.filter_by(practice_id=practice.id).delete()
+            db.session.commit()
+
+        with replace_changed_only(practice_id=practice.id) if diff_only else nullcontext():
+            result = admin_routes.parse_practice_csv(
+                filepath,
+                season_id=file.season_id,
+                category=normalized_category,
+                file_date=file.file_date,
+            )
 
     if result is None:
         return None
@@ -176,15 +244,18 @@ def reparse_uploaded_file(file: UploadedFile) -> Optional[dict]:
 
     file.parse_status = "Parsed Successfully"
     file.last_parsed = datetime.utcnow()
+    file.content_hash = content_hash
+    file.roster_fingerprint = roster_hash
+    file.parser_version = PARSER_VERSION
     db.session.commit()
 
     if game_id is not None:
         try:
-            candidates = build_game_candidates(game_id)
-            evaluate_candidates(game_id, candidates)
+            evaluate_game_records(game_id)
             db.session.commit()
         except Exception:
             db.session.rollback()
+            invalidate_current_max()
             current_app.logger.exception(
                 "Failed to update game records after reparse for game %s",
                 game_id,
@@ -0,0 +1,79 @@
+"""Per-file roster lookups for the practice and game parsers.
+
+The parsers used to run a ``Roster.query.filter_by(...).first()`` for every
+player token (up to three per token in the game parser) and a
+``db.session.get(Roster, ...)`` per player when writing stats. A
+:class:`RosterResolver` loads the season's roster with one query when a file
+parse starts and answers every lookup from dicts afterwards.
+
+Build one per (season, file) parse rather than caching it across requests:
+roster edits between uploads are then always picked up.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from models.database import Roster, db
+
+
+def name_variants(token: str) -> List[str]:
+    """Raw token, then without a leading ``#``, then without a jersey number.
+
+    ``"#12 Jane Doe"`` -> ``["#12 Jane Doe", "12 Jane Doe", "Jane Doe"]``.
+    """
+    variants: List[str] = []
+
+    raw = token.strip()
+    if raw:
+        variants.append(raw)
+
+    no_hash = raw.lstrip("#").strip()
+    if no_hash and no_hash not in variants:
+        variants.append(no_hash)
+
+    parts = no_hash.split(None, 1)
+    if parts and parts[0].isdigit():
+        without_jersey = parts[1].strip() if len(parts) > 1 else ""
+        if without_jersey and without_jersey not in variants:
+            variants.append(without_jersey)
+
+    return variants
+
+
+class RosterResolver:
+    """Season roster keyed by exact ``player_name`` (unique per season)."""
+
+    def __init__(self, season_id: Optional[int]):
+        self.season_id = season_id
+        rows = (
+            db.session.query(Roster.id, Roster.player_name)
+            .filter(Roster.season_id == season_id)
+            .all()
+        )
+        self._by_name: Dict[str, int] = {name: rid for rid, name in rows}
+        self._names: Dict[int, str] = {rid: name for rid, name in rows}
+        self._resolved: Dict[str, Optional[int]] = {}
+
+    def id_for(self, name) -> Optional[int]:
+        """Roster id for an exact player name (surrounding whitespace ignored)."""
+        if not isinstance(name, str):
+            return None
+        return self._by_name.get(name.strip())
+
+    def resolve(self, token) -> Optional[int]:
+        """Roster id for a player token, trying each of :func:`name_variants`."""
+        if not isinstance(token, str) or not token:
+            return None
+        if token not in self._resolved:
+            self._resolved[token] = next(
+                (self._by_name[v] for v in name_variants(token) if v in self._by_name),
+                None,
+            )
+        return self._resolved[token]
+
+    def name_for(self, roster_id: int) -> Optional[str]:
+        return self._names.get(roster_id)
+
+
+__all__ = ["RosterResolver", "name_variants"]
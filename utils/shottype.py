@@ -11,9 +11,33 @@ import re
 from collections.abc import Sequence
 from typing import Iterable, List, Mapping, MutableMapping
 
-from sqlalchemy import and_, or_
-
-from models.database import Game, Practice, PlayerStats, Roster, db
+from sqlalchemy import and_, case, func, or_, select
+
+from models.database import (
+    Game,
+    Practice,
+    PlayerShotDetail,
+    PlayerShotLabel,
+    PlayerStats,
+    PlayerStatsLabel,
+    Roster,
+    db,
+)
+
+FG3_COUNT_KEYS = (
+    "fg3_makes",
+    "fg3_att",
+    "fg3_shrink_makes",
+    "fg3_shrink_att",
+    "fg3_nonshrink_makes",
+    "fg3_nonshrink_att",
+    "fg3_contest_makes",
+    "fg3_contest_attempts",
+    "fg3_late_makes",
+    "fg3_late_attempts",
+    "fg3_no_contest_makes",
+    "fg3_no_contest_attempts",
+)
 
 
 def _normalize_iterable(value):
@@ -78,9 +102,62 @@ def gather_labels_for_shot(shot: Mapping) -> set[str]:
     return set(labels)
 
 
+def _normalized_contest(value: object) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if not text:
+        return None
+    text = text.replace("-", " ").replace("_", " ")
+    normalized = re.sub(r"[^a-z]", "", text)
+    if not normalized:
+        return None
+    mapping = {
+        "contest": "contest",
+        "contested": "contest",
+        "late": "late",
+        "latecontest": "late",
+        "latecontested": "late",
+        "latecloseout": "late",
+        "nocontest": "no_contest",
+        "uncontested": "no_contest",
+        "none": "no_contest",
+    }
+    return mapping.get(normalized)
+
+
+def _contest_level(shot: Mapping) -> str | None:
+    return _normalized_contest(
+        shot.get("contest_level") or shot.get("3fg_contest") or shot.get("contest")
+    )
+
+
+def _shrink_flag(labels: Iterable[str]) -> bool | None:
+    """``True`` for Shrink, ``False`` for Non-Shrink, ``None`` when untagged."""
+
+    has_nonshrink = False
+    for cand in labels:
+        plain = str(cand).strip().lower().replace("-", "").replace(" ", "")
+        if plain == "shrink":
+            return True
+        if plain == "nonshrink":
+            has_nonshrink = True
+    return False if has_nonshrink else None
+
+
 def compute_3fg_breakdown_from_shots(shot_list: Iterable[Mapping]) -> MutableMapping[str, float]:
     """Return shrink/non-shrink and contest totals for 3FG shot detail dicts."""
 
+    return fg3_breakdown_from_counts(count_3fg_shots(shot_list))
+
+
+def count_3fg_shots(shot_list: Iterable[Mapping]) -> MutableMapping[str, int]:
+    """Return the raw make/attempt counts behind ``compute_3fg_breakdown_from_shots``.
+
+    Counts are additive, so per-session results can be summed and passed to
+    :func:`fg3_breakdown_from_counts` later.
+    """
+
     total_att = total_makes = 0
     shrink_att = shrink_makes = 0
     non_att = non_makes = 0
@@ -91,29 +168,6 @@ def compute_3fg_breakdown_from_shots(shot_list: Iterable[Mapping]) -> MutableMap
         "no_contest": {"attempts": 0, "makes": 0},
     }
 
-    def _normalized_contest(value: object) -> str | None:
-        if value is None:
-            return None
-        text = str(value).strip().lower()
-        if not text:
-            return None
-        text = text.replace("-", " ").replace("_", " ")
-        normalized = re.sub(r"[^a-z]", "", text)
-        if not normalized:
-            return None
-        mapping = {
-            "contest": "contest",
-            "contested": "contest",
-            "late": "late",
-            "latecontest": "late",
-            "latecontested": "late",
-            "latecloseout": "late",
-            "nocontest": "no_contest",
-            "uncontested": "no_contest",
-            "none": "no_contest",
-        }
-        return mapping.get(normalized)
-
     for shot in shot_list:
         if (shot.get("shot_class") or "").lower() != "3fg":
             continue
@@ -123,81 +177,71 @@ def compute_3fg_breakdown_from_shots(shot_list: Iterable[Mapping]) -> MutableMap
         if made:
             total_makes += 1
 
-        has_shrink = False
-        has_nonshrink = False
-        for cand in gather_labels_for_shot(shot):
-            norm = str(cand).strip().lower()
-            plain = norm.replace("-", "").replace(" ", "")
-            if plain == "shrink":
-                has_shrink = True
-                break
-            if plain == "nonshrink":
-                has_nonshrink = True
-
-        if has_shrink:
+        shrink = _shrink_flag(gather_labels_for_shot(shot))
+
+        if shrink is True:
             shrink_att += 1
             if made:
                 shrink_makes += 1
-        elif has_nonshrink:
+        elif shrink is False:
             non_att += 1
             if made:
                 non_makes += 1
 
-        contest_value = (
-            shot.get("contest_level")
-            or shot.get("3fg_contest")
-            or shot.get("contest")
-        )
-        contest_key = _normalized_contest(contest_value)
+        contest_key = _contest_level(shot)
         if contest_key and contest_key in contest_totals:
             contest_totals[contest_key]["attempts"] += 1
             if made:
                 contest_totals[contest_key]["makes"] += 1
 
-    def pct(makes: int, attempts: int) -> float:
-        return (makes / attempts * 100.0) if attempts else 0.0
-
-    def freq(attempts: int, total: int) -> float:
-        return (attempts / total * 100.0) if total else 0.0
-
     return {
         "fg3_makes": total_makes,
         "fg3_att": total_att,
-        "fg3_pct": pct(total_makes, total_att),
         "fg3_shrink_makes": shrink_makes,
         "fg3_shrink_att": shrink_att,
-        "fg3_shrink_pct": pct(shrink_makes, shrink_att),
-        "fg3_shrink_freq_pct": freq(shrink_att, total_att),
         "fg3_nonshrink_makes": non_makes,
         "fg3_nonshrink_att": non_att,
-        "fg3_nonshrink_pct": pct(non_makes, non_att),
-        "fg3_nonshrink_freq_pct": freq(non_att, total_att),
         "fg3_contest_makes": contest_totals["contest"]["makes"],
         "fg3_contest_attempts": contest_totals["contest"]["attempts"],
-        "fg3_contest_pct": pct(
-            contest_totals["contest"]["makes"], contest_totals["contest"]["attempts"]
-        ),
-        "fg3_contest_freq_pct": freq(
-            contest_totals["contest"]["attempts"], total_att
-        ),
         "fg3_late_makes": contest_totals["late"]["makes"],
         "fg3_late_attempts": contest_totals["late"]["attempts"],
-        "fg3_late_pct": pct(
-            contest_totals["late"]["makes"], contest_totals["late"]["attempts"]
-        ),
-        "fg3_late_freq_pct": freq(contest_totals["late"]["attempts"], total_att),
         "fg3_no_contest_makes": contest_totals["no_contest"]["makes"],
         "fg3_no_contest_attempts": contest_totals["no_contest"]["attempts"],
-        "fg3_no_contest_pct": pct(
-            contest_totals["no_contest"]["makes"],
-            contest_totals["no_contest"]["attempts"],
-        ),
-        "fg3_no_contest_freq_pct": freq(
-            contest_totals["no_contest"]["attempts"], total_att
-        ),
     }
 
 
+def fg3_breakdown_from_counts(counts: Mapping[str, int]) -> MutableMapping[str, float]:
+    """Add percentage and frequency keys to counts from :func:`count_3fg_shots`."""
+
+    def pct(makes: int, attempts: int) -> float:
+        return (makes / attempts * 100.0) if attempts else 0.0
+
+    def freq(attempts: int, total: int) -> float:
+        return (attempts / total * 100.0) if total else 0.0
+
+    total_att = counts.get("fg3_att", 0)
+    total_makes = counts.get("fg3_makes", 0)
+    result: MutableMapping[str, float] = {
+        "fg3_makes": total_makes,
+        "fg3_att": total_att,
+        "fg3_pct": pct(total_makes, total_att),
+    }
+    for prefix, att_suffix in (
+        ("fg3_shrink", "att"),
+        ("fg3_nonshrink", "att"),
+        ("fg3_contest", "attempts"),
+        ("fg3_late", "attempts"),
+        ("fg3_no_contest", "attempts"),
+    ):
+        makes = counts.get(f"{prefix}_makes", 0)
+        attempts = counts.get(f"{prefix}_{att_suffix}", 0)
+        result[f"{prefix}_makes"] = makes
+        result[f"{prefix}_{att_suffix}"] = attempts
+        result[f"{prefix}_pct"] = pct(makes, attempts)
+        result[f"{prefix}_freq_pct"] = freq(attempts, total_att)
+    return result
+
+
 def _collect_shots_from_query(rows: Iterable) -> List[Mapping]:
     """Expand serialized ``shot_type_details`` blobs into shot dicts."""
 
@@ -214,29 +258,209 @@ def _collect_shots_from_query(rows: Iterable) -> List[Mapping]:
     return shots
 
 
+def _drill_labels(shot: Mapping) -> list[str]:
+    labels: list[str] = []
+    for item in _normalize_iterable(shot.get("drill_labels")):
+        if item is None:
+            continue
+        labels.extend(lbl.strip() for lbl in str(item).split(",") if lbl.strip())
+    return labels
+
+
+def _optional_text(value: object) -> str | None:
+    text = "" if value is None else str(value).strip()
+    return text or None
+
+
+def normalize_shot_detail(shot: Mapping) -> dict:
+    """Return ``PlayerShotDetail`` column values for one shot dict.
+
+    The extra ``labels`` key holds the shot's tags plus any drill labels, one
+    ``PlayerShotLabel`` row each. ``shrink`` and ``contest_level`` are decided
+    exactly as :func:`count_3fg_shots` decides them.
+    """
+
+    labels = gather_labels_for_shot(shot)
+    return {
+        "shot_class": (_optional_text(shot.get("shot_class")) or "").lower() or None,
+        "made": shot.get("result") == "made",
+        "shrink": _shrink_flag(labels),
+        "contest_level": _contest_level(shot),
+        "assisted": bool(shot.get("Assisted")),
+        "shot_location": _optional_text(shot.get("shot_location")),
+        "possession_type": _optional_text(shot.get("possession_type")),
+        "labels": sorted(labels.union(_drill_labels(shot))),
+    }
+
+
 def persist_player_shot_details(
     player_stat: PlayerStats,
     shots: Iterable[Mapping] | None,
     *,
     replace: bool = False,
 ) -> None:
-    """Persist ``shots`` to ``player_stat.shot_type_details`` as JSON."""
+    """Persist ``shots`` to ``player_stat.shot_type_details`` and its detail rows.
+
+    The row's ``PlayerStatsLabel`` rows are rebuilt from both JSON blobs.
+    """
 
     if player_stat is None:
         return
 
-    if replace:
-        player_stat.shot_type_details = None
+    shots = [dict(shot) for shot in shots or [] if isinstance(shot, Mapping)]
+    serialized = serialize_shot_details(shots)
+    if serialized is not None or replace:
+        player_stat.shot_type_details = serialized
+        details = []
+        for index, shot in enumerate(shots):
+            values = normalize_shot_detail(shot)
+            labels = values.pop("labels")
+            details.append(
+                PlayerShotDetail(
+                    season_id=player_stat.season_id,
+                    game_id=player_stat.game_id,
+                    practice_id=player_stat.practice_id,
+                    player_name=player_stat.player_name,
+                    shot_index=index,
+                    labels=[PlayerShotLabel(label=label) for label in labels],
+                    **values,
+                )
+            )
+        player_stat.player_shot_details = details
+
+    player_stat.labels = [
+        PlayerStatsLabel(label=label)
+        for label in player_stats_labels(player_stat.shot_type_details, player_stat.stat_details)
+    ]
+
+
+def serialize_shot_details(shots: Iterable[Mapping] | None) -> str | None:
+    """Return the JSON stored in ``shot_type_details`` for ``shots`` (or ``None``)."""
 
     normalized: list[Mapping] = []
     for shot in shots or []:
         if isinstance(shot, Mapping):
             normalized.append(dict(shot))
 
-    if normalized:
-        player_stat.shot_type_details = json.dumps(normalized)
-    elif replace:
-        player_stat.shot_type_details = None
+    return json.dumps(normalized) if normalized else None
+
+
+def delete_player_shot_details(*criteria) -> int:
+    """Delete the detail and label rows of the ``PlayerStats`` matching ``criteria``.
+
+    Bulk ``PlayerStats.query...delete()`` bypasses the ORM cascade, so call
+    this first with the same filter. ``PlayerStatsLabel`` rows go too.
+    """
+
+    stat_ids = select(PlayerStats.id).where(*criteria)
+    detail_ids = select(PlayerShotDetail.id).where(PlayerShotDetail.player_stats_id.in_(stat_ids))
+    PlayerShotLabel.query.filter(PlayerShotLabel.shot_detail_id.in_(detail_ids)).delete(
+        synchronize_session=False
+    )
+    PlayerStatsLabel.query.filter(PlayerStatsLabel.player_stats_id.in_(stat_ids)).delete(
+        synchronize_session=False
+    )
+    return PlayerShotDetail.query.filter(PlayerShotDetail.player_stats_id.in_(stat_ids)).delete(
+        synchronize_session=False
+    )
+
+
+def player_stats_labels(shot_type_details, stat_details) -> list[str]:
+    """Return the upper-cased labels a ``PlayerStats`` row carries.
+
+    Accepts the JSON blobs (or already decoded lists). A shot contributes its
+    possession type and drill labels, a stat event its drill labels -- the
+    same labels ``compute_filtered_totals`` matches against.
+    """
+
+    labels: set[str] = set()
+    for shot in _load_shot_blob(shot_type_details):
+        labels.update(str(shot.get("possession_type") or "").split(","))
+        labels.update(_drill_labels(shot))
+    for event in _load_shot_blob(stat_details):
+        labels.update(_drill_labels(event))
+    return sorted({label.strip().upper() for label in labels if label.strip()})
+
+
+def player_stats_label_filter(label_set: Iterable[str]):
+    """SQL criterion for ``PlayerStats`` rows carrying any label in ``label_set``."""
+
+    wanted = sorted({str(label).strip().upper() for label in label_set if str(label).strip()})
+    return PlayerStats.id.in_(
+        select(PlayerStatsLabel.player_stats_id).where(PlayerStatsLabel.label.in_(wanted))
+    )
+
+
+def _fg3_count_columns():
+    fg3 = PlayerShotDetail.shot_class == "3fg"
+    made = PlayerShotDetail.made.is_(True)
+
+    def total(*conditions):
+        return func.coalesce(func.sum(case((and_(fg3, *conditions), 1), else_=0)), 0)
+
+    columns = {"fg3_att": total(), "fg3_makes": total(made)}
+    for prefix, att_suffix, condition in (
+        ("fg3_shrink", "att", PlayerShotDetail.shrink.is_(True)),
+        ("fg3_nonshrink", "att", PlayerShotDetail.shrink.is_(False)),
+        ("fg3_contest", "attempts", PlayerShotDetail.contest_level == "contest"),
+        ("fg3_late", "attempts", PlayerShotDetail.contest_level == "late"),
+        ("fg3_no_contest", "attempts", PlayerShotDetail.contest_level == "no_contest"),
+    ):
+        columns[f"{prefix}_{att_suffix}"] = total(condition)
+        columns[f"{prefix}_makes"] = total(condition, made)
+    return [columns[key].label(key) for key in FG3_COUNT_KEYS]
+
+
+def count_3fg_shots_by_stat(stat_ids) -> dict[int, dict[str, int]]:
+    """Return :func:`count_3fg_shots` counts per ``PlayerStats`` id via SQL.
+
+    ``stat_ids`` is a list of ids or a select of them. Stat rows without any
+    ``PlayerShotDetail`` rows are absent from the result.
+    """
+
+    rows = (
+        db.session.query(PlayerShotDetail.player_stats_id, *_fg3_count_columns())
+        .filter(PlayerShotDetail.player_stats_id.in_(stat_ids))
+        .group_by(PlayerShotDetail.player_stats_id)
+    )
+    return {row[0]: dict(zip(FG3_COUNT_KEYS, (int(v) for v in row[1:]))) for row in rows}
+
+
+def add_3fg_counts(total: MutableMapping[str, int], counts: Mapping[str, int]) -> MutableMapping[str, int]:
+    for key in FG3_COUNT_KEYS:
+        total[key] = total.get(key, 0) + counts.get(key, 0)
+    return total
+
+
+def _load_shot_blob(blob) -> List[Mapping]:
+    if not blob:
+        return []
+    try:
+        data = json.loads(blob) if isinstance(blob, str) else blob
+    except (TypeError, ValueError):
+        return []
+    if isinstance(data, list):
+        return [item for item in data if isinstance(item, Mapping)]
+    if isinstance(data, Mapping):
+        return [data]
+    return []
+
+
+def count_3fg_shots_for_stats(stats: Iterable, chunk_size: int = 500) -> dict[int, dict[str, int]]:
+    """Per-row 3FG counts for loaded ``PlayerStats`` rows.
+
+    Rows with ``PlayerShotDetail`` rows are counted in SQL; rows written
+    before the detail table existed fall back to decoding their JSON.
+    """
+
+    stats = [stat for stat in stats if stat.shot_type_details]
+    counts: dict[int, dict[str, int]] = {}
+    for start in range(0, len(stats), chunk_size):
+        counts.update(count_3fg_shots_by_stat([stat.id for stat in stats[start:start + chunk_size]]))
+    for stat in stats:
+        if stat.id not in counts:
+            counts[stat.id] = count_3fg_shots(_load_shot_blob(stat.shot_type_details))
+    return counts
 
 
 def _apply_common_filters(query, practice, start_date, end_date):
@@ -302,13 +526,16 @@ def get_player_shottype_3fg_breakdown(
     q = _apply_common_filters(q, practice, start_date, end_date)
 
     if label_set:
-        clauses = []
-        for lbl in label_set:
-            pattern = f"%{lbl}%"
-            clauses.append(PlayerStats.shot_type_details.ilike(pattern))
-            clauses.append(PlayerStats.stat_details.ilike(pattern))
-        q = q.filter(or_(*clauses))
-
-    rows = q.with_entities(PlayerStats.shot_type_details).all()
-    shots = _collect_shots_from_query(rows)
-    return compute_3fg_breakdown_from_shots(shots)
+        q = q.filter(player_stats_label_filter(label_set))
+
+    totals: MutableMapping[str, int] = {}
+    for counts in count_3fg_shots_by_stat(q.with_entities(PlayerStats.id)).values():
+        add_3fg_counts(totals, counts)
+
+    legacy_rows = (
+        q.filter(PlayerStats.shot_type_details.isnot(None), ~PlayerStats.player_shot_details.any())
+        .with_entities(PlayerStats.shot_type_details)
+        .all()
+    )
+    add_3fg_counts(totals, count_3fg_shots(_collect_shots_from_query(legacy_rows)))
+    return fg3_breakdown_from_counts(totals)